@@ -13,6 +13,7 @@ class Clean:
         """
         self.df = dataframe.copy()
         self.original_shape = self.df.shape
+        self.duplicates_removed = 0
     
     def clean_data(self):
         """
@@ -195,6 +196,7 @@ class Clean:
         
         final_count = len(self.df)
         removed_count = initial_count - final_count
+        self.duplicates_removed = removed_count
         
         if removed_count > 0:
             print(f"   ✓ {removed_count} registros duplicados eliminados")
@@ -1,9 +1,25 @@
 import os
+import contextvars
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+
+# Motor de lectura elegido para la operación en curso (lo fija ReadRouting en
+# los métodos de lectura de los repositorios; None = base de datos principal)
+read_engine = contextvars.ContextVar('read_engine', default=None)
+
+class RoutingSession(Session):
+    """Sesión que envía las consultas de los métodos de lectura a una réplica"""
+    
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        engine = read_engine.get()
+        if bind is None and engine is not None and not self._flushing:
+            return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
 
 # Inicialización de la base de datos
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 class Config:
     """Configuración para el proceso ETL y la API"""
@@ -26,6 +42,90 @@ class Config:
         f'sqlite:///{os.path.join(BASE_DIR, "data", "pokemon.db")}'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
+    # Perfil de SQLite para producción: PRAGMAs que se aplican a cada conexión
+    # nueva. Con WAL los lectores no se bloquean mientras hay una escritura
+    SQLITE_TUNING = (os.environ.get('SQLITE_TUNING') or 'true').lower() == 'true'
+    SQLITE_JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE') or 'WAL'
+    SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS') or 'NORMAL'  # seguro con WAL
+    SQLITE_CACHE_SIZE = int(os.environ.get('SQLITE_CACHE_SIZE') or -65536)  # negativo = KiB (64 MB)
+    SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE') or 268435456)  # bytes (256 MB)
+    SQLITE_TEMP_STORE = os.environ.get('SQLITE_TEMP_STORE') or 'MEMORY'
+    SQLITE_BUSY_TIMEOUT = int(os.environ.get('SQLITE_BUSY_TIMEOUT') or 5000)  # milisegundos
+    
+    # Pool de conexiones para motores distintos de SQLite (MySQL, PostgreSQL)
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE') or 10)
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW') or 20)
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE') or 1800)  # segundos
+    DB_POOL_PRE_PING = (os.environ.get('DB_POOL_PRE_PING') or 'true').lower() == 'true'
+    
+    # Réplicas de lectura. READ_REPLICA_URLS son réplicas reales (URLs separadas
+    # por coma); READ_REPLICA_LOCAL_COUNT crea copias SQLite locales de la base
+    # principal que se refrescan con la API de backup. Sin réplicas todo va a la principal
+    READ_REPLICA_URLS = [url.strip() for url in (os.environ.get('READ_REPLICA_URLS') or '').split(',') if url.strip()]
+    READ_REPLICA_LOCAL_COUNT = int(os.environ.get('READ_REPLICA_LOCAL_COUNT') or 0)
+    READ_REPLICA_REFRESH_INTERVAL = float(os.environ.get('READ_REPLICA_REFRESH_INTERVAL') or 2.0)  # segundos
+    # Consistencia de las lecturas después de una escritura:
+    #   'session'  - el cliente que escribió lee de la principal hasta que la réplica tenga su escritura
+    #   'strong'   - cualquier escritura de este proceso envía las lecturas a la principal hasta entonces
+    #   'eventual' - las lecturas usan la réplica aunque no tenga las últimas escrituras
+    READ_REPLICA_CONSISTENCY = os.environ.get('READ_REPLICA_CONSISTENCY') or 'session'
+    READ_REPLICA_MAX_STALENESS = float(os.environ.get('READ_REPLICA_MAX_STALENESS') or 30.0)  # segundos
+    READ_REPLICA_LAG = float(os.environ.get('READ_REPLICA_LAG') or 1.0)  # retraso supuesto de READ_REPLICA_URLS
+    
+    # Particionado opcional de la tabla pokemon en varios archivos SQLite
+    # (<base>_shard_<n>.db junto a la base principal). SHARD_BY: 'generacion'
+    # (generación módulo SHARD_COUNT) o 'id' (hash del id); vacío = sin particionar
+    SHARD_BY = os.environ.get('SHARD_BY') or ''
+    SHARD_COUNT = int(os.environ.get('SHARD_COUNT') or 4)
+    SHARD_WORKERS = int(os.environ.get('SHARD_WORKERS') or 0)  # hilos de las consultas a todas las particiones (0 = una por partición)
+    
+    # Configuración de la carga a la base de datos
+    ETL_LOAD_MODE = os.environ.get('ETL_LOAD_MODE') or 'bulk'  # 'bulk', 'merge' u 'orm'
+    ETL_BATCH_SIZE = int(os.environ.get('ETL_BATCH_SIZE') or 5000)
+    # El CSV limpio es una salida secundaria que se escribe en paralelo a la carga
+    ETL_WRITE_CSV = (os.environ.get('ETL_WRITE_CSV') or 'true').lower() == 'true'
+    
+    # Recarga automática cuando cambia el archivo fuente (INPUT_PATH)
+    WATCH_SOURCE = (os.environ.get('WATCH_SOURCE') or 'false').lower() == 'true'
+    WATCH_POLL_INTERVAL = float(os.environ.get('WATCH_POLL_INTERVAL') or 2.0)  # segundos entre revisiones
+    WATCH_DEBOUNCE_SECONDS = float(os.environ.get('WATCH_DEBOUNCE_SECONDS') or 5.0)  # espera sin escrituras
+    WATCH_MIN_RELOAD_INTERVAL = float(os.environ.get('WATCH_MIN_RELOAD_INTERVAL') or 60.0)  # mínimo entre recargas
+    WATCH_LOAD_MODE = os.environ.get('WATCH_LOAD_MODE') or 'merge'  # modo de carga a la BD al recargar
+    
+    # Historial de ejecuciones del ETL (SQLite local)
+    ETL_RUNS_DB_PATH = os.environ.get('ETL_RUNS_DB_PATH') or os.path.join(BASE_DIR, "data", "etl_runs.db")
+    ETL_TRACK_MEMORY = (os.environ.get('ETL_TRACK_MEMORY') or 'false').lower() == 'true'  # pico de memoria con tracemalloc en vez del RSS (más detallado, pero hace el ETL más lento)
+    
+    # Caché de los totales de la paginación (segundos; 0 la desactiva). Las
+    # escrituras de la API y las recargas del ETL la invalidan de inmediato
+    COUNT_CACHE_TTL = float(os.environ.get('COUNT_CACHE_TTL') or 300)
+    
+    # Caché de respuestas de estadísticas, legendarios, tipos y rango de poder:
+    # máximo de respuestas guardadas (se descarta la usada hace más tiempo) y
+    # segundos de vigencia (0 la desactiva). Es por proceso: las escrituras de
+    # este proceso la invalidan de inmediato, las de otros procesos al expirar
+    RESPONSE_CACHE_SIZE = int(os.environ.get('RESPONSE_CACHE_SIZE') or 256)
+    RESPONSE_CACHE_TTL = float(os.environ.get('RESPONSE_CACHE_TTL') or 300)
+    # Las respuestas transmitidas solo se guardan si no superan estos registros
+    RESPONSE_CACHE_MAX_ITEMS = int(os.environ.get('RESPONSE_CACHE_MAX_ITEMS') or 2000)
+    
+    # Registros que se leen del cursor del servidor por lote al transmitir
+    # respuestas (tipos, legendarios, rango de poder y exportación)
+    STREAM_BATCH_SIZE = int(os.environ.get('STREAM_BATCH_SIZE') or 500)
+    
+    # Máximo de registros por petición a POST /api/pokemon/bulk
+    BULK_CREATE_MAX_ITEMS = int(os.environ.get('BULK_CREATE_MAX_ITEMS') or 1000)
+    
+    # Máximo de ids por petición a PATCH/DELETE /api/pokemon/bulk (con filtros no hay límite)
+    BULK_MAX_IDS = int(os.environ.get('BULK_MAX_IDS') or 10000)
+    
+    # Agregar el encabezado X-Query-Count (consultas SQL de la petición) a las respuestas de la API
+    QUERY_COUNT_HEADER = (os.environ.get('QUERY_COUNT_HEADER') or 'false').lower() == 'true'
+    
+    # API asíncrona (asgi.py): URL con controlador asíncrono. Por defecto se
+    # deriva de SQLALCHEMY_DATABASE_URI (ver async_database_url)
+    ASYNC_DATABASE_URL = os.environ.get('ASYNC_DATABASE_URL')
+    
     # Configuración de la API
     JSON_SORT_KEYS = False
     JSONIFY_PRETTYPRINT_REGULAR = True
@@ -33,12 +133,142 @@ class Config:
 def init_db(app):
     """Inicializa la base de datos con la aplicación Flask"""
     app.config.from_object(Config)
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config['SQLALCHEMY_DATABASE_URI'])
     db.init_app(app)
     
     with app.app_context():
+        configure_engine(db.engine)
         try:
             # Crear todas las tablas
             db.create_all()
+            ensure_indexes()
             print("✅ Base de datos inicializada correctamente")
         except Exception as e:
             print(f"❌ Error al inicializar la base de datos: {str(e)}")
+
+def engine_options(database_url):
+    """
+    Opciones del motor de SQLAlchemy según la base de datos. El pool y el
+    pre-ping solo se configuran para motores cliente/servidor
+    
+    Args:
+        database_url (str): URL de la base de datos
+        
+    Returns:
+        dict: Opciones para SQLALCHEMY_ENGINE_OPTIONS
+    """
+    if database_url.startswith('sqlite'):
+        return {}
+    
+    return {
+        'pool_size': Config.DB_POOL_SIZE,
+        'max_overflow': Config.DB_MAX_OVERFLOW,
+        'pool_recycle': Config.DB_POOL_RECYCLE,
+        'pool_pre_ping': Config.DB_POOL_PRE_PING
+    }
+
+def async_database_url(database_url=None):
+    """
+    URL de la base de datos con el controlador asíncrono equivalente para la
+    extensión asyncio de SQLAlchemy (aiosqlite, aiomysql o asyncpg)
+    
+    Args:
+        database_url (str): URL síncrona (por defecto SQLALCHEMY_DATABASE_URI)
+        
+    Returns:
+        str: URL asíncrona (ASYNC_DATABASE_URL si está configurada)
+    """
+    if Config.ASYNC_DATABASE_URL and database_url is None:
+        return Config.ASYNC_DATABASE_URL
+    
+    database_url = database_url or Config.SQLALCHEMY_DATABASE_URI
+    scheme, rest = database_url.split('://', 1)
+    dialect = scheme.split('+', 1)[0]
+    drivers = {'sqlite': 'aiosqlite', 'mysql': 'aiomysql', 'postgresql': 'asyncpg'}
+    if dialect not in drivers:
+        raise ValueError(f"No hay controlador asíncrono para '{dialect}'")
+    
+    return f"{dialect}+{drivers[dialect]}://{rest}"
+
+def sqlite_pragmas():
+    """
+    PRAGMAs del perfil de producción de SQLite (vacío si SQLITE_TUNING es false)
+    
+    Returns:
+        list: Pares (pragma, valor) en el orden en que se aplican
+    """
+    if not Config.SQLITE_TUNING:
+        return []
+    
+    return [
+        ('busy_timeout', Config.SQLITE_BUSY_TIMEOUT),
+        ('journal_mode', Config.SQLITE_JOURNAL_MODE),
+        ('synchronous', Config.SQLITE_SYNCHRONOUS),
+        ('cache_size', Config.SQLITE_CACHE_SIZE),
+        ('mmap_size', Config.SQLITE_MMAP_SIZE),
+        ('temp_store', Config.SQLITE_TEMP_STORE)
+    ]
+
+def configure_engine(engine):
+    """
+    Aplica el perfil de SQLite a cada conexión nueva del motor (no hace nada
+    con otros motores). Las conexiones ya abiertas se descartan para que
+    todas pasen por el perfil
+    
+    Args:
+        engine (Engine): Motor de SQLAlchemy
+    """
+    if engine.dialect.name != 'sqlite':
+        return
+    
+    pragmas = sqlite_pragmas()
+    if not pragmas or event.contains(engine, 'connect', _apply_sqlite_pragmas):
+        return
+    
+    event.listen(engine, 'connect', _apply_sqlite_pragmas)
+    engine.dispose()
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    """Listener 'connect': ejecuta los PRAGMAs del perfil en la conexión nueva"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma, value in sqlite_pragmas():
+            cursor.execute(f'PRAGMA {pragma} = {value}')
+    finally:
+        cursor.close()
+
+def ensure_indexes():
+    """
+    Crea en las tablas existentes los índices declarados en los modelos que
+    falten (create_all solo los crea junto con tablas nuevas). Se comparan por
+    columnas y no por nombre, porque la recarga por staging alterna el nombre
+    de los índices con el sufijo __swap
+    
+    Returns:
+        list: Nombres de los índices creados
+    """
+    from sqlalchemy import inspect
+    
+    inspector = inspect(db.engine)
+    created = []
+    
+    for table in db.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        
+        existing = {tuple(index['column_names']) for index in inspector.get_indexes(table.name)}
+        live_names = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            columns = tuple(column.name for column in index.columns)
+            if columns in existing:
+                continue
+            if index.name in live_names:
+                # Nombre ocupado por otra definición: no se toca
+                continue
+            index.create(db.engine)
+            created.append(index.name)
+    
+    if created:
+        print(f"🗂️ Índices creados: {', '.join(created)}")
+    
+    return created
@@ -0,0 +1,348 @@
+from quart import Blueprint, request, jsonify
+from Services.AsyncServices import AsyncPokemonService
+from Services.Services import PokemonService
+from Controllers.Controllers import read_fields, read_filters, read_bulk_body
+from Config.Config import Config
+
+# Las mismas rutas que pokemon_blueprint con manejadores asíncronos (Quart, ver asgi.py)
+async_pokemon_blueprint = Blueprint('pokemon_async', __name__)
+
+@async_pokemon_blueprint.route('/pokemon', methods=['GET'])
+async def get_all_pokemon():
+    """
+    Obtiene todos los Pokemon con paginación y filtros opcionales (mismos
+    parámetros que GET /pokemon de la API Flask)
+    """
+    try:
+        page = int(request.args.get('page', 1))
+        per_page = min(int(request.args.get('per_page', 20)), 100)
+        sort = request.args.get('sort')
+        order = request.args.get('order', 'asc').lower()
+        cursor = request.args.get('cursor')
+        include_total = request.args.get('include_total', 'true').lower() != 'false'
+        fields, error = read_fields(request.args)
+        if error:
+            return jsonify(error), 400
+        
+        filters, error = read_filters(request.args)
+        if error:
+            return jsonify(error), 400
+        busqueda = request.args.get('search', '').strip() or None
+        
+        if sort is not None or cursor is not None:
+            sort = sort or 'id'
+            if sort not in PokemonService.SORTABLE_FIELDS:
+                return jsonify({
+                    'error': f'Campo de orden inválido. Valores válidos: {", ".join(PokemonService.SORTABLE_FIELDS)}'
+                }), 400
+            if order not in ('asc', 'desc'):
+                return jsonify({'error': 'El parámetro "order" debe ser "asc" o "desc"'}), 400
+            
+            decoded_cursor = None
+            if cursor:
+                decoded_cursor = PokemonService.decode_cursor(cursor)
+                if decoded_cursor is None:
+                    return jsonify({'error': 'Cursor inválido'}), 400
+            
+            result = await AsyncPokemonService.get_pokemon_page(per_page, sort, order, decoded_cursor, fields,
+                                                                filters, busqueda)
+            return jsonify(result), 500 if 'error' in result else 200
+        
+        result = await AsyncPokemonService.get_all_pokemon(page, per_page, include_total, fields, filters, busqueda)
+        return jsonify(result), 500 if 'error' in result else 200
+    
+    except ValueError as e:
+        return jsonify({'error': 'Parámetros de paginación inválidos'}), 400
+    except Exception as e:
+        return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
+
+@async_pokemon_blueprint.route('/pokemon/<int:pokemon_id>', methods=['GET'])
+async def get_pokemon_by_id(pokemon_id):
+    """Obtiene un Pokemon específico por su ID"""
+    try:
+        result = await AsyncPokemonService.get_pokemon_by_id(pokemon_id)
+        return jsonify(result), 404 if 'error' in result else 200
+    except Exception as e:
+        return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
+
+@async_pokemon_blueprint.route('/pokemon', methods=['POST'])
+async def create_pokemon():
+    """Crea un nuevo Pokemon (mismo body que POST /pokemon de la API Flask)"""
+    try:
+        if not request.is_json:
+            return jsonify({'error': 'Content-Type debe ser application/json'}), 400
+        
+        pokemon_data = await request.get_json()
+        
+        if not pokemon_data:
+            return jsonify({'error': 'Body JSON requerido'}), 400
+        
+        validation = PokemonService.validate_pokemon_data(pokemon_data)
+        if not validation['is_valid']:
+            return jsonify({
+                'error': 'Datos inválidos',
+                'validation_errors': validation['errors'],
+                'warnings': validation['warnings']
+            }), 400
+        
+        result = await AsyncPokemonService.create_pokemon(pokemon_data)
+        return jsonify(result), 400 if 'error' in result else 201
+    
+    except Exception as e:
+        return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
+
+@async_pokemon_blueprint.route('/pokemon/bulk', methods=['POST'])
+async def create_pokemon_bulk():
+    """Crea varios Pokemon en una sola transacción (201, 207 o 400 como en la API Flask)"""
+    try:
+        if not request.is_json:
+            return jsonify({'error': 'Content-Type debe ser application/json'}), 400
+        
+        pokemon_list = await request.get_json()
+        if isinstance(pokemon_list, dict):
+            pokemon_list = pokemon_list.get('pokemon')
+        
+        if not isinstance(pokemon_list, list) or not pokemon_list:
+            return jsonify({'error': 'Body JSON requerido: lista de Pokemon'}), 400
+        
+        if len(pokemon_list) > Config.BULK_CREATE_MAX_ITEMS:
+            return jsonify({
+                'error': f'Máximo {Config.BULK_CREATE_MAX_ITEMS} Pokemon por petición (se recibieron {len(pokemon_list)})'
+            }), 413
+        
+        result = await AsyncPokemonService.create_pokemon_bulk(pokemon_list)
+        
+        if 'error' in result:
+            return jsonify(result), 500
+        
+        if result['error_count'] == 0:
+            return jsonify(result), 201
+        
+        return jsonify(result), 207 if result['created_count'] else 400
+    
+    except Exception as e:
+        return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
+
+async def parse_bulk_request():
+    """
+    Lee el cuerpo de PATCH/DELETE /pokemon/bulk
+    
+    Returns:
+        tuple: (datos del body, respuesta de error o None)
+    """
+    if not request.is_json:
+        return None, (jsonify({'error': 'Content-Type debe ser application/json'}), 400)
+    
+    data, error = read_bulk_body(await request.get_json())
+    return data, (jsonify(error), 400) if error else None
+
+@async_pokemon_blueprint.route('/pokemon/bulk', methods=['PATCH'])
+async def update_pokemon_bulk():
+    """Actualiza varios Pokemon con una sola sentencia UPDATE"""
+    try:
+        data, error = await parse_bulk_request()
+        if error:
+            return error
+        
+        result = await AsyncPokemonService.update_pokemon_bulk(data.get('changes'), ids=data.get('ids'),
+                                                               filters=data.get('filter'))
+        
+        if 'error' in result:
+            return jsonify(result), 400 if 'validation_errors' in result else 500
+        
+        return jsonify(result), 200
+    
+    except Exception as e:
+        return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
+
+@async_pokemon_blueprint.route('/pokemon/bulk', methods=['DELETE'])
+async def delete_pokemon_bulk():
+    """Elimina varios Pokemon con una sola sentencia DELETE"""
+    try:
+        data, error = await parse_bulk_request()
+        if error:
+            return error
+        
+        result = await AsyncPokemonService.delete_pokemon_bulk(ids=data.get('ids'), filters=data.get('filter'))
+        
+        if 'error' in result:
+            return jsonify(result), 400 if 'validation_errors' in result else 500
+        
+        return jsonify(result), 200
+    
+    except Exception as e:
+        return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
+
+@async_pokemon_blueprint.route('/pokemon/<int:pokemon_id>', methods=['PUT'])
+async def update_pokemon(pokemon_id):
+    """Actualiza un Pokemon existente"""
+    try:
+        if not request.is_json:
+            return jsonify({'error': 'Content-Type debe ser application/json'}), 400
+        
+        pokemon_data = await request.get_json()
+        
+        if not pokemon_data:
+            return jsonify({'error': 'Body JSON requerido'}), 400
+        
+        validation = PokemonService.validate_pokemon_data(pokemon_data)
+        if validation['errors']:
+            return jsonify({
+                'error': 'Datos inválidos',
+                'validation_errors': validation['errors']
+            }), 400
+        
+        result = await AsyncPokemonService.update_pokemon(pokemon_id, pokemon_data)
+        
+        if 'error' in result:
+            return jsonify(result), 404 if 'no encontrado' in result['error'] else 400
+        
+        return jsonify(result), 200
+    
+    except Exception as e:
+        return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
+
+@async_pokemon_blueprint.route('/pokemon/<int:pokemon_id>', methods=['DELETE'])
+async def delete_pokemon(pokemon_id):
+    """Elimina un Pokemon"""
+    try:
+        result = await AsyncPokemonService.delete_pokemon(pokemon_id)
+        return jsonify(result), 404 if 'error' in result else 200
+    except Exception as e:
+        return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
+
+@async_pokemon_blueprint.route('/pokemon/search', methods=['GET'])
+async def search_pokemon():
+    """Busca Pokemon por diferentes criterios (q, type, fields)"""
+    try:
+        query = request.args.get('q', '').strip()
+        search_type = request.args.get('type', 'all')
+        fields, error = read_fields(request.args)
+        if error:
+            return jsonify(error), 400
+        
+        if not query:
+            return jsonify({'error': 'Parámetro de búsqueda "q" requerido'}), 400
+        
+        valid_search_types = ['all', 'name', 'type', 'generation']
+        if search_type not in valid_search_types:
+            return jsonify({
+                'error': f'Tipo de búsqueda inválido. Valores válidos: {", ".join(valid_search_types)}'
+            }), 400
+        
+        result = await AsyncPokemonService.search_pokemon(query, search_type, fields)
+        return jsonify(result), 500 if 'error' in result else 200
+    
+    except Exception as e:
+        return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
+
+@async_pokemon_blueprint.route('/pokemon/types/<string:tipo>', methods=['GET'])
+async def get_pokemon_by_type(tipo):
+    """Obtiene Pokemon por tipo específico"""
+    try:
+        fields, error = read_fields(request.args)
+        if error:
+            return jsonify(error), 400
+        
+        result = await AsyncPokemonService.get_pokemon_by_type(tipo.title(), fields)
+        return jsonify(result), 500 if 'error' in result else 200
+    
+    except Exception as e:
+        return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
+
+@async_pokemon_blueprint.route('/pokemon/legendary', methods=['GET'])
+async def get_legendary_pokemon():
+    """Obtiene todos los Pokemon legendarios"""
+    try:
+        fields, error = read_fields(request.args)
+        if error:
+            return jsonify(error), 400
+        
+        result = await AsyncPokemonService.get_legendary_pokemon(fields)
+        return jsonify(result), 500 if 'error' in result else 200
+    
+    except Exception as e:
+        return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
+
+@async_pokemon_blueprint.route('/pokemon/power', methods=['GET'])
+async def get_pokemon_by_power():
+    """Obtiene Pokemon por rango de poder (min, max, fields)"""
+    try:
+        min_power = request.args.get('min')
+        max_power = request.args.get('max')
+        fields, error = read_fields(request.args)
+        if error:
+            return jsonify(error), 400
+        
+        if min_power:
+            try:
+                min_power = int(min_power)
+            except ValueError:
+                return jsonify({'error': 'El parámetro "min" debe ser un número entero'}), 400
+        
+        if max_power:
+            try:
+                max_power = int(max_power)
+            except ValueError:
+                return jsonify({'error': 'El parámetro "max" debe ser un número entero'}), 400
+        
+        if min_power is not None and max_power is not None and min_power > max_power:
+            return jsonify({'error': 'El poder mínimo no puede ser mayor al máximo'}), 400
+        
+        result = await AsyncPokemonService.get_pokemon_by_power_range(min_power, max_power, fields)
+        return jsonify(result), 500 if 'error' in result else 200
+    
+    except Exception as e:
+        return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
+
+@async_pokemon_blueprint.route('/pokemon/statistics', methods=['GET'])
+async def get_pokemon_statistics():
+    """Obtiene estadísticas generales de los Pokemon"""
+    try:
+        result = await AsyncPokemonService.get_pokemon_statistics()
+        return jsonify(result), 500 if 'error' in result else 200
+    except Exception as e:
+        return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
+
+@async_pokemon_blueprint.route('/pokemon/statistics/verify', methods=['GET'])
+async def verify_pokemon_statistics():
+    """Compara el resumen de estadísticas con un recálculo completo"""
+    try:
+        result = await AsyncPokemonService.verify_statistics()
+        
+        if 'error' in result:
+            return jsonify(result), 500
+        
+        return jsonify(result), 200 if result['consistente'] else 409
+    
+    except Exception as e:
+        return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
+
+@async_pokemon_blueprint.route('/pokemon/validate', methods=['POST'])
+async def validate_pokemon_data():
+    """Valida datos de Pokemon sin crear el registro"""
+    try:
+        if not request.is_json:
+            return jsonify({'error': 'Content-Type debe ser application/json'}), 400
+        
+        pokemon_data = await request.get_json()
+        
+        if not pokemon_data:
+            return jsonify({'error': 'Body JSON requerido'}), 400
+        
+        return jsonify(PokemonService.validate_pokemon_data(pokemon_data)), 200
+    
+    except Exception as e:
+        return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
+
+@async_pokemon_blueprint.errorhandler(404)
+async def not_found(error):
+    return jsonify({'error': 'Recurso no encontrado'}), 404
+
+@async_pokemon_blueprint.errorhandler(405)
+async def method_not_allowed(error):
+    return jsonify({'error': 'Método no permitido'}), 405
+
+@async_pokemon_blueprint.errorhandler(500)
+async def internal_error(error):
+    return jsonify({'error': 'Error interno del servidor'}), 500
@@ -1,48 +1,341 @@
-from flask import Blueprint, request, jsonify
+import functools
+from datetime import datetime, timezone
+from flask import Blueprint, Response, current_app, request, jsonify, make_response
 from Services.Services import PokemonService
+from Services.ResponseCache import ResponseCache
+from Config.Config import Config
+from Repositories.UnitOfWork import UnitOfWork
+from Repositories.ReadRouting import ReadRouting
 
 # Crear el blueprint para las rutas de Pokemon
 pokemon_blueprint = Blueprint('pokemon', __name__)
 
+def parse_fields():
+    """
+    Lee el parámetro fields (campos separados por coma, ej: fields=id,nombre)
+    
+    Returns:
+        tuple: (Lista de campos o None para todos, respuesta de error o None)
+    """
+    fields, error = read_fields(request.args)
+    return fields, (jsonify(error), 400) if error else None
+
+def read_fields(args):
+    """
+    Lee el parámetro fields de los argumentos de la petición (la comparte la
+    API asíncrona)
+    
+    Args:
+        args (MultiDict): Argumentos de la petición
+        
+    Returns:
+        tuple: (Lista de campos o None para todos, diccionario de error o None)
+    """
+    raw_fields = args.get('fields')
+    if not raw_fields:
+        return None, None
+    
+    fields = [field.strip() for field in raw_fields.split(',') if field.strip()]
+    unknown = [field for field in fields if field not in PokemonService.FIELDS]
+    if unknown:
+        return None, {
+            'error': f'Campos desconocidos: {", ".join(unknown)}. Valores válidos: {", ".join(PokemonService.FIELDS)}'
+        }
+    
+    return fields or None, None
+
+def parse_filters():
+    """
+    Lee los filtros del listado y los convierte en una expresión de filtro
+    (ver PokemonRepository.filter_conditions). Todos se combinan con AND
+    
+    Returns:
+        tuple: (Expresión de filtro, respuesta de error o None)
+    """
+    filters, error = read_filters(request.args)
+    return filters, (jsonify(error), 400) if error else None
+
+def read_filters(args):
+    """
+    Convierte los argumentos de la petición en la expresión de filtro del
+    listado (la comparte la API asíncrona)
+    
+    Args:
+        args (MultiDict): Argumentos de la petición
+        
+    Returns:
+        tuple: (Expresión de filtro, diccionario de error o None)
+    """
+    filters = {}
+    
+    tipos = [tipo.strip() for tipo in args.get('type', '').split(',') if tipo.strip()]
+    if tipos:
+        filters['tipo'] = tipos
+    
+    generaciones = [value.strip() for value in args.get('generation', '').split(',') if value.strip()]
+    if generaciones:
+        try:
+            filters['generacion'] = [int(value) for value in generaciones]
+        except ValueError:
+            return None, {'error': 'El parámetro "generation" debe ser un número entero (o varios separados por coma)'}
+    
+    for param, field in (('legendary', 'es_legendario'), ('mega', 'es_mega')):
+        value = args.get(param)
+        if value is not None:
+            if value.lower() not in ('true', 'false'):
+                return None, {'error': f'El parámetro "{param}" debe ser "true" o "false"'}
+            filters[field] = value.lower() == 'true'
+    
+    # min_power/max_power y un rango por estadística (ej: hp_min=100&velocidad_max=50)
+    ranges = [('min_power', 'poder_total_min'), ('max_power', 'poder_total_max')]
+    ranges += [(f'{field}_{bound}', f'{field}_{bound}') for field in PokemonService.RANGE_FIELDS for bound in ('min', 'max')]
+    for param, key in ranges:
+        value = args.get(param)
+        if value is not None:
+            try:
+                filters[key] = int(value)
+            except ValueError:
+                return None, {'error': f'El parámetro "{param}" debe ser un número entero'}
+    
+    for field in PokemonService.RANGE_FIELDS:
+        if filters.get(f'{field}_min', float('-inf')) > filters.get(f'{field}_max', float('inf')):
+            return None, {'error': f'El mínimo de {field} no puede ser mayor al máximo'}
+    
+    return filters, None
+
+def data_etag(version, modified):
+    """
+    ETag de una versión de los datos. Incluye la fecha de la escritura para
+    que una base de datos recreada (la versión vuelve a empezar) no repita etiquetas
+    
+    Args:
+        version (int): Versión de los datos
+        modified (datetime): Fecha de la última escritura (UTC) o None
+        
+    Returns:
+        str: Etiqueta sin comillas
+    """
+    stamp = int(modified.replace(tzinfo=timezone.utc).timestamp() * 1_000_000) if modified else 0
+    return f'{version}-{stamp:x}'
+
+def is_not_modified(etag, last_modified):
+    """
+    Indica si la copia del cliente sigue vigente. If-None-Match tiene prioridad
+    sobre If-Modified-Since (que tiene resolución de segundos)
+    
+    Args:
+        etag (str): ETag actual
+        last_modified (datetime): Fecha de la última modificación (UTC) o None
+        
+    Returns:
+        bool: True si se puede responder 304
+    """
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    
+    since = request.if_modified_since
+    if since is None or last_modified is None:
+        return False
+    return last_modified.replace(tzinfo=timezone.utc, microsecond=0) <= since
+
+def with_validators(response, etag, last_modified):
+    """
+    Agrega ETag y Last-Modified a una respuesta. Cache-Control: no-cache hace
+    que el cliente revalide cada vez en lugar de suponer que su copia sigue fresca
+    
+    Args:
+        response (Response): Respuesta
+        etag (str): ETag actual
+        last_modified (datetime): Fecha de la última modificación (UTC) o None
+        
+    Returns:
+        Response: La misma respuesta
+    """
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified.replace(tzinfo=timezone.utc)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def conditional(view):
+    """
+    Decorador para rutas de lectura: responde 304 sin ejecutar la ruta (sin
+    consultar ni serializar) si el cliente ya tiene la versión actual de los
+    datos, y agrega ETag y Last-Modified a las respuestas 200. La versión y
+    los datos de la respuesta se leen del mismo motor (ReadRouting.pinned): con
+    réplicas refrescadas en momentos distintos, el ETag de una réplica al día
+    no debe acompañar a datos de una réplica atrasada
+    
+    Args:
+        view (function): Ruta de lectura
+        
+    Returns:
+        function: Ruta con GET condicional
+    """
+    @functools.wraps(view)
+    @ReadRouting.pinned
+    def wrapper(*args, **kwargs):
+        version, modified = PokemonService.get_data_version()
+        etag = data_etag(version, modified)
+        if is_not_modified(etag, modified):
+            return with_validators(make_response('', 304), etag, modified)
+        
+        response = make_response(view(*args, **kwargs))
+        if response.status_code in (200, 304):
+            # La ruta puede haber fijado un Last-Modified más preciso (el del registro)
+            with_validators(response, etag, response.last_modified or modified)
+        return response
+    
+    return wrapper
+
+def parse_stream_format():
+    """
+    Lee el formato de una respuesta transmitida: ?format=json|ndjson o, sin
+    el parámetro, Accept: application/x-ndjson
+    
+    Returns:
+        tuple: ('json' o 'ndjson', respuesta de error o None)
+    """
+    stream_format = request.args.get('format')
+    if stream_format is None:
+        accepted = request.accept_mimetypes
+        ndjson = accepted.quality('application/x-ndjson') > accepted.quality('application/json')
+        return 'ndjson' if ndjson else 'json', None
+    
+    if stream_format not in ('json', 'ndjson'):
+        return None, (jsonify({'error': 'El parámetro "format" debe ser "json" o "ndjson"'}), 400)
+    return stream_format, None
+
+def stream_response(result, stream_format):
+    """
+    Transmite una respuesta cuyo 'pokemon' es un iterador (ver
+    PokemonService.stream_pokemon_by_type). El primer fragmento sale antes de
+    leer el primer registro y cada lote de STREAM_BATCH_SIZE Pokemon se envía
+    al serializarse, así que la memoria no depende del tamaño del resultado.
+    Los iteradores no usan el contexto de la petición (la consulta ya se
+    preparó y usa su propia conexión), así que no se necesita stream_with_context.
+    En JSON la respuesta es la misma que con jsonify (claves ordenadas y
+    'total' contado al transmitir); en NDJSON es un Pokemon por línea
+    
+    Args:
+        result (dict): Respuesta del servicio
+        stream_format (str): 'json' o 'ndjson'
+        
+    Returns:
+        Response: Respuesta transmitida
+    """
+    dumps = current_app.json.dumps
+    rows = result['pokemon']
+    
+    def batches(prefix, separator, suffix):
+        count = 0
+        chunk = [prefix]
+        try:
+            for row in rows:
+                chunk.append((separator if count else '') + dumps(row) + suffix)
+                count += 1
+                # El primer registro sale solo; después, por lotes
+                if count == 1 or len(chunk) >= Config.STREAM_BATCH_SIZE:
+                    yield ''.join(chunk)
+                    chunk = []
+        except Exception as e:
+            # Los encabezados ya se enviaron: la respuesta queda incompleta
+            print(f"❌ Error al transmitir la respuesta: {str(e)}")
+            raise
+        if chunk:
+            yield ''.join(chunk)
+        return count
+    
+    def ndjson():
+        yield from batches('', '', '\n')
+    
+    def json_document():
+        # 'total' va después de 'pokemon' en el orden de las claves: se conoce al terminar la lista
+        envelope = {key: value for key, value in result.items() if key != 'pokemon'}
+        keys = sorted(set(envelope) | {'pokemon', 'total'})
+        total = None
+        yield '{'
+        for index, key in enumerate(keys):
+            prefix = (',' if index else '') + dumps(key) + ':'
+            if key == 'pokemon':
+                total = yield from batches(prefix + '[', ',', '')
+                yield ']'
+            elif key == 'total':
+                yield prefix + dumps(total)
+            else:
+                yield prefix + dumps(envelope[key])
+        yield '}\n'
+    
+    if stream_format == 'ndjson':
+        return Response(ndjson(), mimetype='application/x-ndjson')
+    return Response(json_document(), mimetype='application/json')
+
 @pokemon_blueprint.route('/pokemon', methods=['GET'])
+@conditional
 def get_all_pokemon():
     """
-    Obtiene todos los Pokemon con paginación y filtros opcionales
+    Obtiene todos los Pokemon con paginación y filtros opcionales. Los filtros
+    y la búsqueda se combinan en una sola consulta y se pueden paginar y ordenar
     
     Query parameters:
     - page: número de página (default: 1)
     - per_page: registros por página (default: 20, max: 100)
-    - type: filtrar por tipo
-    - generation: filtrar por generación
+    - type: filtrar por tipo principal o secundario (varios separados por coma)
+    - generation: filtrar por generación (varias separadas por coma)
     - legendary: filtrar legendarios (true/false)
-    - search: búsqueda por nombre
+    - mega: filtrar megaevoluciones (true/false)
+    - min_power, max_power: rango de poder total
+    - <estadística>_min, <estadística>_max: rango de hp, ataque, defensa,
+      ataque_especial, defensa_especial, velocidad, poder_total o generacion
+    - search: búsqueda por nombre y tipos (sin sort, ordenada por relevancia)
+    - sort: paginación por cursor ordenada por 'id', 'poder_total' o 'velocidad'
+    - order: 'asc' (default) o 'desc'
+    - cursor: token next_cursor de la página anterior (paginación por cursor)
+    - include_total: 'false' para omitir el total y el número de páginas
+    - fields: campos a devolver separados por coma (ej: id,nombre)
     """
     try:
         # Obtener parámetros de consulta
         page = int(request.args.get('page', 1))
         per_page = min(int(request.args.get('per_page', 20)), 100)
-        
-        # Filtros
-        tipo = request.args.get('type')
-        generacion = request.args.get('generation')
-        legendario = request.args.get('legendary')
-        busqueda = request.args.get('search')
-        
-        # Si hay filtros específicos, usar servicios especializados
-        if busqueda:
-            result = PokemonService.search_pokemon(busqueda)
-            return jsonify(result), 200
-        
-        if tipo:
-            result = PokemonService.get_pokemon_by_type(tipo)
-            return jsonify(result), 200
-        
-        if legendario and legendario.lower() == 'true':
-            result = PokemonService.get_legendary_pokemon()
+        sort = request.args.get('sort')
+        order = request.args.get('order', 'asc').lower()
+        cursor = request.args.get('cursor')
+        include_total = request.args.get('include_total', 'true').lower() != 'false'
+        fields, error_response = parse_fields()
+        if error_response:
+            return error_response
+        
+        filters, error_response = parse_filters()
+        if error_response:
+            return error_response
+        busqueda = request.args.get('search', '').strip() or None
+        
+        # Paginación por cursor: latencia constante sin importar la profundidad
+        if sort is not None or cursor is not None:
+            sort = sort or 'id'
+            if sort not in PokemonService.SORTABLE_FIELDS:
+                return jsonify({
+                    'error': f'Campo de orden inválido. Valores válidos: {", ".join(PokemonService.SORTABLE_FIELDS)}'
+                }), 400
+            if order not in ('asc', 'desc'):
+                return jsonify({'error': 'El parámetro "order" debe ser "asc" o "desc"'}), 400
+            
+            decoded_cursor = None
+            if cursor:
+                decoded_cursor = PokemonService.decode_cursor(cursor)
+                if decoded_cursor is None:
+                    return jsonify({'error': 'Cursor inválido'}), 400
+            
+            result = PokemonService.get_pokemon_page(per_page, sort, order, decoded_cursor, fields, filters, busqueda)
+            
+            if 'error' in result:
+                return jsonify(result), 500
+            
             return jsonify(result), 200
         
         # Obtener todos con paginación
-        result = PokemonService.get_all_pokemon(page, per_page)
+        result = PokemonService.get_all_pokemon(page, per_page, include_total, fields, filters, busqueda)
         
         if 'error' in result:
             return jsonify(result), 500
@@ -55,9 +348,12 @@ def get_all_pokemon():
         return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
 
 @pokemon_blueprint.route('/pokemon/<int:pokemon_id>', methods=['GET'])
+@conditional
 def get_pokemon_by_id(pokemon_id):
     """
-    Obtiene un Pokemon específico por su ID
+    Obtiene un Pokemon específico por su ID. Last-Modified es la fecha de
+    actualización del registro: If-Modified-Since se compara con ella aunque
+    hayan cambiado otros registros
     
     Args:
         pokemon_id (int): ID del Pokemon
@@ -68,7 +364,14 @@ def get_pokemon_by_id(pokemon_id):
         if 'error' in result:
             return jsonify(result), 404
         
-        return jsonify(result), 200
+        updated = result['pokemon'].get('fecha_actualizacion')
+        updated = datetime.fromisoformat(updated) if updated else None
+        if updated is not None and not request.if_none_match and is_not_modified('', updated):
+            response = make_response('', 304)
+        else:
+            response = make_response(jsonify(result), 200)
+        response.last_modified = updated.replace(tzinfo=timezone.utc) if updated else None
+        return response
         
     except Exception as e:
         return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
@@ -121,6 +424,123 @@ def create_pokemon():
     except Exception as e:
         return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
 
+@pokemon_blueprint.route('/pokemon/bulk', methods=['POST'])
+def create_pokemon_bulk():
+    """
+    Crea varios Pokemon en una sola transacción
+    
+    Body JSON requerido: lista de objetos con los mismos campos que POST /pokemon
+    (también se acepta {"pokemon": [...]}). Responde 201 si se crearon todos,
+    207 si solo algunos y 400 si ninguno; cada elemento de "results" indica el
+    estado del registro en la misma posición
+    """
+    try:
+        if not request.is_json:
+            return jsonify({'error': 'Content-Type debe ser application/json'}), 400
+        
+        pokemon_list = request.get_json()
+        if isinstance(pokemon_list, dict):
+            pokemon_list = pokemon_list.get('pokemon')
+        
+        if not isinstance(pokemon_list, list) or not pokemon_list:
+            return jsonify({'error': 'Body JSON requerido: lista de Pokemon'}), 400
+        
+        if len(pokemon_list) > Config.BULK_CREATE_MAX_ITEMS:
+            return jsonify({
+                'error': f'Máximo {Config.BULK_CREATE_MAX_ITEMS} Pokemon por petición (se recibieron {len(pokemon_list)})'
+            }), 413
+        
+        result = PokemonService.create_pokemon_bulk(pokemon_list)
+        
+        if 'error' in result:
+            return jsonify(result), 500
+        
+        if result['error_count'] == 0:
+            return jsonify(result), 201
+        
+        return jsonify(result), 207 if result['created_count'] else 400
+        
+    except Exception as e:
+        return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
+
+def parse_bulk_request():
+    """
+    Lee el cuerpo de PATCH/DELETE /pokemon/bulk
+    
+    Returns:
+        tuple: (datos del body, respuesta de error o None)
+    """
+    if not request.is_json:
+        return None, (jsonify({'error': 'Content-Type debe ser application/json'}), 400)
+    
+    data, error = read_bulk_body(request.get_json())
+    return data, (jsonify(error), 400) if error else None
+
+def read_bulk_body(data):
+    """
+    Valida el cuerpo JSON de PATCH/DELETE /pokemon/bulk (la comparte la API asíncrona)
+    
+    Args:
+        data: Cuerpo JSON decodificado
+        
+    Returns:
+        tuple: (datos del body, diccionario de error o None)
+    """
+    if not isinstance(data, dict):
+        return None, {'error': 'Body JSON requerido: {"ids": [...]} o {"filter": {...}}'}
+    
+    ids = data.get('ids')
+    if ids is not None and (not isinstance(ids, list) or len(ids) > Config.BULK_MAX_IDS):
+        return None, {'error': f'ids debe ser una lista de máximo {Config.BULK_MAX_IDS} elementos'}
+    
+    return data, None
+
+@pokemon_blueprint.route('/pokemon/bulk', methods=['PATCH'])
+def update_pokemon_bulk():
+    """
+    Actualiza varios Pokemon con una sola sentencia UPDATE
+    
+    Body JSON: {"ids": [1, 2], "filter": {"tipo": "Fire", "poder_total_min": 500},
+    "changes": {"es_legendario": true}}. Se requieren ids, filter o ambos; los
+    campos derivados se recalculan
+    """
+    try:
+        data, error = parse_bulk_request()
+        if error:
+            return error
+        
+        result = PokemonService.update_pokemon_bulk(data.get('changes'), ids=data.get('ids'), filters=data.get('filter'))
+        
+        if 'error' in result:
+            return jsonify(result), 400 if 'validation_errors' in result else 500
+        
+        return jsonify(result), 200
+        
+    except Exception as e:
+        return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
+
+@pokemon_blueprint.route('/pokemon/bulk', methods=['DELETE'])
+def delete_pokemon_bulk():
+    """
+    Elimina varios Pokemon con una sola sentencia DELETE
+    
+    Body JSON: {"ids": [1, 2]} y/o {"filter": {"generacion": 1, "es_mega": true}}
+    """
+    try:
+        data, error = parse_bulk_request()
+        if error:
+            return error
+        
+        result = PokemonService.delete_pokemon_bulk(ids=data.get('ids'), filters=data.get('filter'))
+        
+        if 'error' in result:
+            return jsonify(result), 400 if 'validation_errors' in result else 500
+        
+        return jsonify(result), 200
+        
+    except Exception as e:
+        return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
+
 @pokemon_blueprint.route('/pokemon/<int:pokemon_id>', methods=['PUT'])
 def update_pokemon(pokemon_id):
     """
@@ -185,10 +605,14 @@ def search_pokemon():
     Query parameters:
     - q: término de búsqueda (requerido)
     - type: tipo de búsqueda ('all', 'name', 'type', 'generation')
+    - fields: campos a devolver separados por coma (ej: id,nombre)
     """
     try:
         query = request.args.get('q', '').strip()
         search_type = request.args.get('type', 'all')
+        fields, error_response = parse_fields()
+        if error_response:
+            return error_response
         
         if not query:
             return jsonify({'error': 'Parámetro de búsqueda "q" requerido'}), 400
@@ -199,7 +623,7 @@ def search_pokemon():
                 'error': f'Tipo de búsqueda inválido. Valores válidos: {", ".join(valid_search_types)}'
             }), 400
         
-        result = PokemonService.search_pokemon(query, search_type)
+        result = PokemonService.search_pokemon(query, search_type, fields)
         
         if 'error' in result:
             return jsonify(result), 500
@@ -216,14 +640,26 @@ def get_pokemon_by_type(tipo):
     
     Args:
         tipo (str): Tipo de Pokemon (ej: Fire, Water, Grass)
+    
+    Query parameters:
+    - fields: campos a devolver separados por coma (ej: id,nombre)
+    - format: json (default) o ndjson (un Pokemon por línea); la respuesta se transmite
     """
     try:
-        result = PokemonService.get_pokemon_by_type(tipo.title())
+        fields, error_response = parse_fields()
+        if error_response:
+            return error_response
+        
+        stream_format, error_response = parse_stream_format()
+        if error_response:
+            return error_response
+        
+        result = PokemonService.stream_pokemon_by_type(tipo.title(), fields)
         
         if 'error' in result:
             return jsonify(result), 500
         
-        return jsonify(result), 200
+        return stream_response(result, stream_format)
         
     except Exception as e:
         return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
@@ -232,14 +668,26 @@ def get_pokemon_by_type(tipo):
 def get_legendary_pokemon():
     """
     Obtiene todos los Pokemon legendarios
+    
+    Query parameters:
+    - fields: campos a devolver separados por coma (ej: id,nombre)
+    - format: json (default) o ndjson (un Pokemon por línea); la respuesta se transmite
     """
     try:
-        result = PokemonService.get_legendary_pokemon()
+        fields, error_response = parse_fields()
+        if error_response:
+            return error_response
+        
+        stream_format, error_response = parse_stream_format()
+        if error_response:
+            return error_response
+        
+        result = PokemonService.stream_legendary_pokemon(fields)
         
         if 'error' in result:
             return jsonify(result), 500
         
-        return jsonify(result), 200
+        return stream_response(result, stream_format)
         
     except Exception as e:
         return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
@@ -252,10 +700,15 @@ def get_pokemon_by_power():
     Query parameters:
     - min: poder mínimo
     - max: poder máximo
+    - fields: campos a devolver separados por coma (ej: id,nombre)
+    - format: json (default) o ndjson (un Pokemon por línea); la respuesta se transmite
     """
     try:
         min_power = request.args.get('min')
         max_power = request.args.get('max')
+        fields, error_response = parse_fields()
+        if error_response:
+            return error_response
         
         # Convertir a enteros si están presentes
         if min_power:
@@ -273,17 +726,56 @@ def get_pokemon_by_power():
         if min_power is not None and max_power is not None and min_power > max_power:
             return jsonify({'error': 'El poder mínimo no puede ser mayor al máximo'}), 400
         
-        result = PokemonService.get_pokemon_by_power_range(min_power, max_power)
+        stream_format, error_response = parse_stream_format()
+        if error_response:
+            return error_response
+        
+        result = PokemonService.stream_pokemon_by_power_range(min_power, max_power, fields)
         
         if 'error' in result:
             return jsonify(result), 500
         
-        return jsonify(result), 200
+        return stream_response(result, stream_format)
+        
+    except Exception as e:
+        return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
+
+@pokemon_blueprint.route('/pokemon/export', methods=['GET'])
+def export_pokemon():
+    """
+    Exporta la tabla completa transmitiéndola desde un cursor del servidor
+    (sin paginación; el primer registro sale de inmediato)
+    
+    Query parameters:
+    - format: json (default, {"pokemon": [...], "total": N}) o ndjson (un Pokemon por línea)
+    - fields: campos a devolver separados por coma (ej: id,nombre)
+    - los filtros del listado (type, generation, legendary, mega, min_power, max_power, <estadística>_min/_max)
+    """
+    try:
+        fields, error_response = parse_fields()
+        if error_response:
+            return error_response
+        
+        filters, error_response = parse_filters()
+        if error_response:
+            return error_response
+        
+        stream_format, error_response = parse_stream_format()
+        if error_response:
+            return error_response
+        
+        result = PokemonService.export_pokemon(filters, fields)
+        
+        if 'error' in result:
+            return jsonify(result), 500
+        
+        return stream_response(result, stream_format)
         
     except Exception as e:
         return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
 
 @pokemon_blueprint.route('/pokemon/statistics', methods=['GET'])
+@conditional
 def get_pokemon_statistics():
     """
     Obtiene estadísticas generales de los Pokemon
@@ -299,6 +791,30 @@ def get_pokemon_statistics():
     except Exception as e:
         return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
 
+@pokemon_blueprint.route('/pokemon/statistics/verify', methods=['GET'])
+def verify_pokemon_statistics():
+    """
+    Compara el resumen de estadísticas con un recálculo completo
+    """
+    try:
+        result = PokemonService.verify_statistics()
+        
+        if 'error' in result:
+            return jsonify(result), 500
+        
+        return jsonify(result), 200 if result['consistente'] else 409
+    
+    except Exception as e:
+        return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
+
+@pokemon_blueprint.route('/pokemon/cache/stats', methods=['GET'])
+def get_response_cache_stats():
+    """
+    Contadores de la caché de respuestas (aciertos, fallos, desalojos e
+    invalidaciones) de este proceso
+    """
+    return jsonify(ResponseCache.stats()), 200
+
 @pokemon_blueprint.route('/pokemon/validate', methods=['POST'])
 def validate_pokemon_data():
     """
@@ -322,6 +838,13 @@ def validate_pokemon_data():
         return jsonify({'error': f'Error interno del servidor: {str(e)}'}), 500
 
 # Manejadores de errores específicos para el blueprint
+@pokemon_blueprint.after_request
+def add_query_count(response):
+    """Agrega el número de consultas SQL de la petición (si QUERY_COUNT_HEADER está activo)"""
+    if Config.QUERY_COUNT_HEADER:
+        response.headers['X-Query-Count'] = str(UnitOfWork.query_count() or 0)
+    return response
+
 @pokemon_blueprint.errorhandler(404)
 def not_found(error):
     return jsonify({'error': 'Recurso no encontrado'}), 404
@@ -0,0 +1,18 @@
+from Config.Config import db
+from datetime import datetime
+
+class DataVersion(db.Model):
+    """Versión de los datos de Pokemon (una sola fila, id = 1): avanza con cada escritura y recarga del ETL"""
+    
+    __tablename__ = 'data_version'
+    
+    VERSION_ID = 1
+    
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.BigInteger, nullable=False, default=0)
+    
+    # Momento de la última escritura (Last-Modified de los listados y estadísticas)
+    fecha_actualizacion = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<DataVersion version={self.version}>'
@@ -1,11 +1,23 @@
 from Config.Config import db
 from datetime import datetime
+from sqlalchemy import and_, case, cast, literal
 
 class Pokemon(db.Model):
     """Modelo de datos para Pokemon"""
     
     __tablename__ = 'pokemon'
     
+    # Índices secundarios para los filtros de PokemonRepository. Los compuestos
+    # también sirven para filtrar solo por su primera columna
+    __table_args__ = (
+        db.Index('ix_pokemon_tipo_principal_generacion', 'tipo_principal', 'generacion'),
+        db.Index('ix_pokemon_tipo_secundario', 'tipo_secundario'),
+        db.Index('ix_pokemon_generacion_poder_total', 'generacion', 'poder_total'),
+        db.Index('ix_pokemon_es_legendario_poder_total', 'es_legendario', 'poder_total'),
+        db.Index('ix_pokemon_poder_total', 'poder_total'),
+        db.Index('ix_pokemon_velocidad', 'velocidad'),
+    )
+    
     # Campos principales
     id = db.Column(db.Integer, primary_key=True)
     nombre = db.Column(db.String(100), nullable=False, unique=True)
@@ -38,6 +50,16 @@ class Pokemon(db.Model):
     fecha_creacion = db.Column(db.DateTime, default=datetime.utcnow)
     fecha_actualizacion = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Campos públicos (los de to_dict) que se pueden pedir con ?fields=
+    FIELDS = ['id', 'nombre', 'tipo_principal', 'tipo_secundario', 'hp', 'ataque', 'defensa',
+              'ataque_especial', 'defensa_especial', 'velocidad', 'poder_total', 'generacion',
+              'es_legendario', 'es_mega', 'forma_especial', 'combinacion_tipos', 'poder_ofensivo',
+              'poder_defensivo', 'ratio_ataque_defensa', 'categoria_poder', 'fecha_creacion',
+              'fecha_actualizacion']
+    
+    # Categorías por poder total (mínimo, categoría); por debajo de todas: 'Muy Bajo'
+    POWER_CATEGORIES = [(600, 'Muy Alto'), (500, 'Alto'), (400, 'Medio'), (300, 'Bajo')]
+    
     def __repr__(self):
         return f'<Pokemon {self.nombre} - {self.tipo_principal}>'
     
@@ -68,85 +90,205 @@ class Pokemon(db.Model):
             'fecha_actualizacion': self.fecha_actualizacion.isoformat() if self.fecha_actualizacion else None
         }
     
+    @staticmethod
+    def row_to_dict(row):
+        """
+        Convierte una fila de una consulta proyectada (solo algunas columnas)
+        al mismo formato que to_dict
+        
+        Args:
+            row (RowMapping): Fila con las columnas seleccionadas
+            
+        Returns:
+            dict: Campos de la fila
+        """
+        return {
+            key: value.isoformat() if isinstance(value, datetime) else value
+            for key, value in row.items()
+        }
+    
     @staticmethod
     def from_dict(data):
         """Crea un objeto Pokemon desde un diccionario"""
         pokemon = Pokemon()
+        for column, value in Pokemon.record_from_dict(data).items():
+            setattr(pokemon, column, value)
+        return pokemon
+    
+    @staticmethod
+    def record_from_dict(data):
+        """
+        Obtiene los valores de columna de un Pokemon desde un diccionario, con
+        los mismos valores por defecto que from_dict
         
-        # Campos básicos
-        pokemon.id = data.get('id')
-        pokemon.nombre = data.get('nombre')
-        pokemon.tipo_principal = data.get('tipo_principal')
-        pokemon.tipo_secundario = data.get('tipo_secundario', 'Sin tipo secundario')
-        
-        # Estadísticas
-        pokemon.hp = data.get('hp', 0)
-        pokemon.ataque = data.get('ataque', 0)
-        pokemon.defensa = data.get('defensa', 0)
-        pokemon.ataque_especial = data.get('ataque_especial', 0)
-        pokemon.defensa_especial = data.get('defensa_especial', 0)
-        pokemon.velocidad = data.get('velocidad', 0)
-        pokemon.poder_total = data.get('poder_total', 0)
-        
-        # Información adicional
-        pokemon.generacion = data.get('generacion', 1)
-        pokemon.es_legendario = data.get('es_legendario', False)
-        pokemon.es_mega = data.get('es_mega', False)
-        pokemon.forma_especial = data.get('forma_especial', 'Forma base')
-        pokemon.combinacion_tipos = data.get('combinacion_tipos')
-        
-        # Campos calculados
-        pokemon.poder_ofensivo = data.get('poder_ofensivo')
-        pokemon.poder_defensivo = data.get('poder_defensivo')
-        pokemon.ratio_ataque_defensa = data.get('ratio_ataque_defensa')
-        pokemon.categoria_poder = data.get('categoria_poder')
+        Args:
+            data (dict): Datos del Pokemon
+            
+        Returns:
+            dict: Valores de columna
+        """
+        return {
+            # Campos básicos
+            'id': data.get('id'),
+            'nombre': data.get('nombre'),
+            'tipo_principal': data.get('tipo_principal'),
+            'tipo_secundario': data.get('tipo_secundario', 'Sin tipo secundario'),
+            
+            # Estadísticas
+            'hp': data.get('hp', 0),
+            'ataque': data.get('ataque', 0),
+            'defensa': data.get('defensa', 0),
+            'ataque_especial': data.get('ataque_especial', 0),
+            'defensa_especial': data.get('defensa_especial', 0),
+            'velocidad': data.get('velocidad', 0),
+            'poder_total': data.get('poder_total', 0),
+            
+            # Información adicional
+            'generacion': data.get('generacion', 1),
+            'es_legendario': data.get('es_legendario', False),
+            'es_mega': data.get('es_mega', False),
+            'forma_especial': data.get('forma_especial', 'Forma base'),
+            'combinacion_tipos': data.get('combinacion_tipos'),
+            
+            # Campos calculados
+            'poder_ofensivo': data.get('poder_ofensivo'),
+            'poder_defensivo': data.get('poder_defensivo'),
+            'ratio_ataque_defensa': data.get('ratio_ataque_defensa'),
+            'categoria_poder': data.get('categoria_poder')
+        }
+    
+    @staticmethod
+    def build_record(data):
+        """
+        Obtiene los valores de columna de un Pokemon nuevo con los campos
+        derivados calculados, sin crear el objeto (para inserciones masivas)
         
-        return pokemon
+        Args:
+            data (dict): Datos del Pokemon
+            
+        Returns:
+            dict: Valores de columna listos para insertar
+        """
+        record = Pokemon.record_from_dict(data)
+        record.update(Pokemon.derived_fields(record))
+        return record
     
     def calculate_fields(self):
         """Calcula los campos derivados"""
-        self.poder_ofensivo = self.ataque + self.ataque_especial
-        self.poder_defensivo = self.defensa + self.defensa_especial
-        self.ratio_ataque_defensa = self.poder_ofensivo / (self.poder_defensivo + 1)
+        for column, value in Pokemon.derived_fields(self._values()).items():
+            setattr(self, column, value)
+    
+    @staticmethod
+    def derived_fields(values):
+        """
+        Calcula los campos derivados a partir de los valores de columna
+        
+        Args:
+            values (dict): Valores de columna del Pokemon
+            
+        Returns:
+            dict: poder_ofensivo, poder_defensivo, ratio_ataque_defensa,
+                categoria_poder y combinacion_tipos
+        """
+        poder_ofensivo = values['ataque'] + values['ataque_especial']
+        poder_defensivo = values['defensa'] + values['defensa_especial']
         
         # Categorizar por poder total
-        if self.poder_total >= 600:
-            self.categoria_poder = 'Muy Alto'
-        elif self.poder_total >= 500:
-            self.categoria_poder = 'Alto'
-        elif self.poder_total >= 400:
-            self.categoria_poder = 'Medio'
-        elif self.poder_total >= 300:
-            self.categoria_poder = 'Bajo'
-        else:
-            self.categoria_poder = 'Muy Bajo'
+        categoria_poder = next(
+            (category for minimum, category in Pokemon.POWER_CATEGORIES if values['poder_total'] >= minimum),
+            'Muy Bajo'
+        )
         
         # Combinación de tipos
-        if self.tipo_secundario and self.tipo_secundario != 'Sin tipo secundario':
-            self.combinacion_tipos = f"{self.tipo_principal}/{self.tipo_secundario}"
+        tipo_secundario = values['tipo_secundario']
+        if tipo_secundario and tipo_secundario != 'Sin tipo secundario':
+            combinacion_tipos = f"{values['tipo_principal']}/{tipo_secundario}"
         else:
-            self.combinacion_tipos = self.tipo_principal
+            combinacion_tipos = values['tipo_principal']
+        
+        return {
+            'poder_ofensivo': poder_ofensivo,
+            'poder_defensivo': poder_defensivo,
+            'ratio_ataque_defensa': poder_ofensivo / (poder_defensivo + 1),
+            'categoria_poder': categoria_poder,
+            'combinacion_tipos': combinacion_tipos
+        }
+    
+    @staticmethod
+    def derived_expressions(values):
+        """
+        Versión SQL de derived_fields para un UPDATE masivo: cada campo derivado
+        se calcula en la base de datos con los valores nuevos de values y los
+        actuales de cada fila para el resto de las columnas
+        
+        Args:
+            values (dict): Valores nuevos por columna
+            
+        Returns:
+            dict: Columna derivada -> expresión SQL
+        """
+        table = Pokemon.__table__
+        
+        def value(column):
+            # En un UPDATE las columnas conservan su valor anterior: se usa el nuevo si cambia
+            return literal(values[column], table.c[column].type) if column in values else table.c[column]
+        
+        poder_ofensivo = value('ataque') + value('ataque_especial')
+        poder_defensivo = value('defensa') + value('defensa_especial')
+        tipo_principal, tipo_secundario = value('tipo_principal'), value('tipo_secundario')
+        
+        return {
+            'poder_ofensivo': poder_ofensivo,
+            'poder_defensivo': poder_defensivo,
+            'ratio_ataque_defensa': cast(poder_ofensivo, db.Float) / (poder_defensivo + 1),
+            'categoria_poder': case(
+                *[(value('poder_total') >= minimum, category) for minimum, category in Pokemon.POWER_CATEGORIES],
+                else_='Muy Bajo'
+            ),
+            'combinacion_tipos': case(
+                (and_(tipo_secundario.is_not(None), tipo_secundario != '',
+                      tipo_secundario != 'Sin tipo secundario'), tipo_principal + '/' + tipo_secundario),
+                else_=tipo_principal
+            )
+        }
     
     def validate(self):
         """Valida los datos del Pokemon"""
+        return Pokemon.validate_record(self._values())
+    
+    @staticmethod
+    def validate_record(values):
+        """
+        Valida los valores de columna de un Pokemon
+        
+        Args:
+            values (dict): Valores de columna del Pokemon
+            
+        Returns:
+            list: Mensajes de error (vacía si es válido)
+        """
         errors = []
         
-        if not self.nombre or len(self.nombre.strip()) == 0:
+        if not values['nombre'] or len(values['nombre'].strip()) == 0:
             errors.append("El nombre es requerido")
         
-        if not self.tipo_principal or len(self.tipo_principal.strip()) == 0:
+        if not values['tipo_principal'] or len(values['tipo_principal'].strip()) == 0:
             errors.append("El tipo principal es requerido")
         
-        if self.hp < 0:
+        if values['hp'] < 0:
             errors.append("HP no puede ser negativo")
         
-        if self.ataque < 0:
+        if values['ataque'] < 0:
             errors.append("Ataque no puede ser negativo")
         
-        if self.defensa < 0:
+        if values['defensa'] < 0:
             errors.append("Defensa no puede ser negativo")
         
-        if self.generacion < 1:
+        if values['generacion'] < 1:
             errors.append("La generación debe ser mayor a 0")
         
-        return errors
\ No newline at end of file
+        return errors
+    
+    def _values(self):
+        """Valores de columna actuales del objeto como diccionario"""
+        return {column.name: getattr(self, column.name) for column in Pokemon.__table__.columns}
\ No newline at end of file
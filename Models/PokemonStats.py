@@ -0,0 +1,37 @@
+from Config.Config import db
+from datetime import datetime
+
+class PokemonStatsSummary(db.Model):
+    """Resumen materializado de las estadísticas de Pokemon (una sola fila, id = 1)"""
+    
+    __tablename__ = 'pokemon_stats_summary'
+    
+    SUMMARY_ID = 1
+    
+    id = db.Column(db.Integer, primary_key=True)
+    
+    # Conteos
+    total = db.Column(db.Integer, nullable=False, default=0)
+    legendarios = db.Column(db.Integer, nullable=False, default=0)
+    mega = db.Column(db.Integer, nullable=False, default=0)
+    
+    # Momentos de poder_total (promedio y desviación estándar)
+    suma_poder = db.Column(db.BigInteger, nullable=False, default=0)
+    suma_cuadrados_poder = db.Column(db.BigInteger, nullable=False, default=0)
+    
+    # Distribuciones {valor: cantidad}. El histograma de poder_total da la
+    # mediana, el mínimo y el máximo sin recorrer la tabla
+    por_tipo = db.Column(db.JSON, nullable=False, default=dict)
+    por_generacion = db.Column(db.JSON, nullable=False, default=dict)
+    por_categoria = db.Column(db.JSON, nullable=False, default=dict)
+    histograma_poder = db.Column(db.JSON, nullable=False, default=dict)
+    
+    # Top-K [[valor, id, nombre], ...] ordenados por valor descendente e id
+    top_poder = db.Column(db.JSON, nullable=False, default=list)
+    top_velocidad = db.Column(db.JSON, nullable=False, default=list)
+    top_hp = db.Column(db.JSON, nullable=False, default=list)
+    
+    fecha_actualizacion = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<PokemonStatsSummary total={self.total}>'
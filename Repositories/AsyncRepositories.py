@@ -0,0 +1,611 @@
+from Models.Pokemon import Pokemon
+from Models.PokemonStats import PokemonStatsSummary
+from Config.Config import db, Config, configure_engine, async_database_url
+from Repositories.Repositories import PokemonRepository
+from Repositories.CountCache import CountCache
+from Repositories.DataVersionRepository import DataVersionRepository
+from Repositories.FullTextSearch import FullTextSearch
+from Repositories.PokemonStatsRepository import PokemonStatsRepository
+from sqlalchemy import or_, func, insert, select, update, delete
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+class AsyncDatabase:
+    """
+    Motor y sesiones de la extensión asyncio de SQLAlchemy para la API
+    asíncrona (asgi.py). Usa las mismas tablas, índices y perfil de SQLite
+    que la aplicación Flask
+    """
+    
+    engine = None
+    sessionmaker = None
+    full_text = False  # índice FTS5 disponible
+    
+    @staticmethod
+    async def init(database_url=None):
+        """
+        Crea el motor asíncrono, las tablas que falten y el índice de texto completo
+        
+        Args:
+            database_url (str): URL asíncrona (por defecto async_database_url())
+            
+        Raises:
+            ValueError: Si hay particiones configuradas (SHARD_BY): la API
+                asíncrona solo conoce la tabla pokemon de la base principal
+        """
+        if Config.SHARD_BY:
+            raise ValueError(f"La API asíncrona no admite particiones (SHARD_BY='{Config.SHARD_BY}'): "
+                             "los datos están en las bases de las particiones, no en la tabla pokemon")
+        
+        database_url = database_url or async_database_url()
+        engine = create_async_engine(database_url, **AsyncDatabase.engine_options(database_url))
+        configure_engine(engine.sync_engine)
+        
+        async with engine.begin() as conn:
+            await conn.run_sync(db.metadata.create_all)
+        
+        full_text = False
+        if engine.dialect.name == 'sqlite':
+            try:
+                async with engine.begin() as conn:
+                    await conn.run_sync(FullTextSearch.install)
+                full_text = True
+            except Exception as e:
+                print(f"⚠️ Búsqueda de texto completo no disponible, se usará LIKE: {str(e)}")
+        
+        AsyncDatabase.engine = engine
+        # Los objetos conservan sus valores después del commit: releerlos
+        # requeriría una consulta fuera del await
+        AsyncDatabase.sessionmaker = async_sessionmaker(engine, expire_on_commit=False)
+        AsyncDatabase.full_text = full_text
+        print(f"✅ Base de datos asíncrona inicializada ({engine.dialect.name}+{engine.dialect.driver})")
+    
+    @staticmethod
+    def engine_options(database_url):
+        """
+        Opciones del motor asíncrono: el mismo pool que engine_options para
+        motores cliente/servidor
+        
+        Args:
+            database_url (str): URL de la base de datos
+            
+        Returns:
+            dict: Opciones para create_async_engine
+        """
+        if database_url.startswith('sqlite'):
+            return {}
+        
+        return {
+            'pool_size': Config.DB_POOL_SIZE,
+            'max_overflow': Config.DB_MAX_OVERFLOW,
+            'pool_recycle': Config.DB_POOL_RECYCLE,
+            'pool_pre_ping': Config.DB_POOL_PRE_PING
+        }
+    
+    @staticmethod
+    def session():
+        """
+        Abre una sesión asíncrona (usar con async with, una por petición)
+        
+        Returns:
+            AsyncSession: Sesión nueva
+        """
+        return AsyncDatabase.sessionmaker()
+    
+    @staticmethod
+    async def close():
+        """Cierra las conexiones del motor"""
+        if AsyncDatabase.engine is not None:
+            await AsyncDatabase.engine.dispose()
+            AsyncDatabase.engine = None
+
+class AsyncPokemonRepository:
+    """
+    Versión asíncrona de PokemonRepository: las mismas consultas (comparte el
+    planificador, los filtros y las expresiones de los campos derivados) con
+    una AsyncSession. El resumen de estadísticas se actualiza en la misma
+    transacción con el código síncrono a través de AsyncSession.run_sync
+    """
+    
+    @staticmethod
+    def _select(columns=None):
+        """
+        SELECT base: objetos Pokemon o solo las columnas pedidas (ver PokemonRepository._projection)
+        
+        Args:
+            columns (list): Columnas pedidas o None
+            
+        Returns:
+            tuple: (Select, columnas seleccionadas o None)
+        """
+        selected = PokemonRepository._projection(columns)
+        if not selected:
+            return select(Pokemon), None
+        return select(*[Pokemon.__table__.c[column] for column in selected]), selected
+    
+    @staticmethod
+    async def _fetch(session, statement, selected=None):
+        """
+        Ejecuta un SELECT de _select
+        
+        Returns:
+            list: Objetos Pokemon o diccionarios con las columnas pedidas
+        """
+        result = await session.execute(statement)
+        if not selected:
+            return list(result.scalars())
+        return [Pokemon.row_to_dict(row) for row in result.mappings()]
+    
+    @staticmethod
+    def _plan(statement, filters=None, search=None, search_fields=None):
+        """
+        Agrega al SELECT los filtros y la búsqueda (ver PokemonRepository.plan_conditions)
+        
+        Returns:
+            tuple: (Select filtrado, columna de relevancia de la búsqueda o None)
+        """
+        conditions, fts, rank = PokemonRepository.plan_conditions(
+            filters, search, search_fields, full_text=bool(search) and AsyncDatabase.full_text
+        )
+        if fts is not None:
+            statement = statement.join(fts, fts.c.rowid == Pokemon.id)
+        return statement.where(*conditions), rank
+    
+    @staticmethod
+    async def get_all(session, limit=None, offset=None, columns=None, filters=None, search=None):
+        """
+        Obtiene todos los Pokemon con paginación opcional (ver PokemonRepository.get_all)
+        
+        Returns:
+            list: Lista de Pokemon ordenada por id (por relevancia si hay búsqueda)
+        """
+        try:
+            statement, selected = AsyncPokemonRepository._select(columns)
+            statement, rank = AsyncPokemonRepository._plan(statement, filters, search)
+            statement = statement.order_by(*([rank] if rank is not None else []), Pokemon.id)
+            
+            if offset:
+                statement = statement.offset(offset)
+            if limit:
+                statement = statement.limit(limit)
+            
+            return await AsyncPokemonRepository._fetch(session, statement, selected)
+        except Exception as e:
+            print(f"Error al obtener todos los Pokemon: {str(e)}")
+            return []
+    
+    @staticmethod
+    async def get_page(session, limit, sort_by='id', descending=False, after=None, columns=None, filters=None,
+                       search=None):
+        """
+        Obtiene una página ordenada por clave (ver PokemonRepository.get_page)
+        
+        Returns:
+            list: Lista de Pokemon ordenada por (sort_by, id)
+        """
+        try:
+            if sort_by not in PokemonRepository.SORTABLE_COLUMNS:
+                raise ValueError(f"No se puede ordenar por '{sort_by}'")
+            
+            if columns and sort_by not in columns:
+                columns = list(columns) + [sort_by]
+            
+            statement, selected = AsyncPokemonRepository._select(columns)
+            statement, _ = AsyncPokemonRepository._plan(statement, filters, search)
+            condition, order = PokemonRepository.keyset(sort_by, descending, after)
+            if condition is not None:
+                statement = statement.where(condition)
+            
+            return await AsyncPokemonRepository._fetch(session, statement.order_by(*order).limit(limit), selected)
+        except Exception as e:
+            print(f"Error al obtener página de Pokemon: {str(e)}")
+            return []
+    
+    @staticmethod
+    async def count(session, filters=None, search=None):
+        """
+        Cuenta los Pokemon que cumplen los filtros (con CountCache, ver PokemonRepository.count)
+        
+        Returns:
+            int: Número total de Pokemon
+        """
+        try:
+            key = CountCache.make_key(str(AsyncDatabase.engine.url), filters, search)
+            cached = CountCache.get(key)
+            if cached is not None:
+                return cached
+            
+            generation = CountCache.generation()
+            statement, _ = AsyncPokemonRepository._plan(select(func.count(Pokemon.id)), filters, search)
+            total = (await session.execute(statement)).scalar()
+            CountCache.set(key, total, generation)
+            return total
+        except Exception as e:
+            print(f"Error al contar Pokemon: {str(e)}")
+            return 0
+    
+    @staticmethod
+    async def get_by_id(session, pokemon_id):
+        """
+        Obtiene un Pokemon por su ID (el mapa de identidad de la sesión evita
+        volver a cargarlo en la misma petición)
+        
+        Returns:
+            Pokemon: Objeto Pokemon o None si no se encuentra
+        """
+        try:
+            return await session.get(Pokemon, pokemon_id)
+        except Exception as e:
+            print(f"Error al obtener Pokemon por ID {pokemon_id}: {str(e)}")
+            return None
+    
+    @staticmethod
+    async def get_by_name(session, name):
+        """
+        Obtiene un Pokemon por su nombre
+        
+        Returns:
+            Pokemon: Objeto Pokemon o None si no se encuentra
+        """
+        try:
+            return (await session.execute(select(Pokemon).where(Pokemon.nombre == name))).scalars().first()
+        except Exception as e:
+            print(f"Error al obtener Pokemon por nombre {name}: {str(e)}")
+            return None
+    
+    @staticmethod
+    async def get_by_type(session, tipo, is_secondary=False, columns=None):
+        """
+        Obtiene Pokemon por tipo
+        
+        Returns:
+            list: Lista de Pokemon del tipo especificado
+        """
+        try:
+            statement, selected = AsyncPokemonRepository._select(columns)
+            if is_secondary:
+                statement = statement.where(Pokemon.tipo_secundario == tipo)
+            else:
+                statement = statement.where(or_(Pokemon.tipo_principal == tipo, Pokemon.tipo_secundario == tipo))
+            return await AsyncPokemonRepository._fetch(session, statement, selected)
+        except Exception as e:
+            print(f"Error al obtener Pokemon por tipo {tipo}: {str(e)}")
+            return []
+    
+    @staticmethod
+    async def get_legendary(session, limit=None, columns=None):
+        """
+        Obtiene Pokemon legendarios
+        
+        Returns:
+            list: Lista de Pokemon legendarios
+        """
+        try:
+            statement, selected = AsyncPokemonRepository._select(columns)
+            statement = statement.where(Pokemon.es_legendario == True)
+            if limit:
+                statement = statement.limit(limit)
+            return await AsyncPokemonRepository._fetch(session, statement, selected)
+        except Exception as e:
+            print(f"Error al obtener Pokemon legendarios: {str(e)}")
+            return []
+    
+    @staticmethod
+    async def get_by_generation(session, generation, columns=None):
+        """
+        Obtiene Pokemon por generación
+        
+        Returns:
+            list: Lista de Pokemon de la generación especificada
+        """
+        try:
+            statement, selected = AsyncPokemonRepository._select(columns)
+            return await AsyncPokemonRepository._fetch(session, statement.where(Pokemon.generacion == generation),
+                                                       selected)
+        except Exception as e:
+            print(f"Error al obtener Pokemon de generación {generation}: {str(e)}")
+            return []
+    
+    @staticmethod
+    async def search(session, query_text, fields=None, limit=None, columns=None):
+        """
+        Busca Pokemon por texto (índice FTS5 ordenado por relevancia, o LIKE;
+        ver PokemonRepository.search)
+        
+        Returns:
+            list: Lista de Pokemon que coinciden con la búsqueda
+        """
+        try:
+            statement, selected = AsyncPokemonRepository._select(columns)
+            statement, rank = AsyncPokemonRepository._plan(statement, search=query_text, search_fields=fields)
+            if rank is not None:
+                statement = statement.order_by(rank)
+            if limit:
+                statement = statement.limit(limit)
+            return await AsyncPokemonRepository._fetch(session, statement, selected)
+        except Exception as e:
+            print(f"Error en búsqueda de Pokemon: {str(e)}")
+            return []
+    
+    @staticmethod
+    async def get_by_power_range(session, min_power=None, max_power=None, columns=None):
+        """
+        Obtiene Pokemon por rango de poder total
+        
+        Returns:
+            list: Lista de Pokemon en el rango de poder especificado
+        """
+        try:
+            statement, selected = AsyncPokemonRepository._select(columns)
+            if min_power is not None:
+                statement = statement.where(Pokemon.poder_total >= min_power)
+            if max_power is not None:
+                statement = statement.where(Pokemon.poder_total <= max_power)
+            return await AsyncPokemonRepository._fetch(session, statement, selected)
+        except Exception as e:
+            print(f"Error al obtener Pokemon por rango de poder: {str(e)}")
+            return []
+    
+    @staticmethod
+    async def _apply_stats(session, removed=(), added=()):
+        """Actualiza el resumen de estadísticas en la transacción de la sesión"""
+        await session.run_sync(
+            lambda sync_session: PokemonStatsRepository.apply_changes(removed, added, session=sync_session)
+        )
+    
+    @staticmethod
+    async def _bump_version(session):
+        """Avanza la versión de los datos en la transacción de la sesión (ver DataVersionRepository)"""
+        await session.run_sync(lambda sync_session: DataVersionRepository.bump(sync_session.connection()))
+    
+    @staticmethod
+    async def create(session, pokemon_data):
+        """
+        Crea un nuevo Pokemon
+        
+        Returns:
+            Pokemon: Objeto Pokemon creado o None si hay error
+        """
+        try:
+            pokemon = Pokemon.from_dict(pokemon_data)
+            pokemon.calculate_fields()
+            
+            errors = pokemon.validate()
+            if errors:
+                print(f"Errores de validación: {errors}")
+                return None
+            
+            session.add(pokemon)
+            await session.flush()
+            await AsyncPokemonRepository._apply_stats(session, added=[PokemonStatsRepository.snapshot(pokemon)])
+            await AsyncPokemonRepository._bump_version(session)
+            await session.commit()
+            CountCache.invalidate()
+            return pokemon
+        except Exception as e:
+            await session.rollback()
+            print(f"Error al crear Pokemon: {str(e)}")
+            return None
+    
+    @staticmethod
+    async def update(session, pokemon_id, pokemon_data):
+        """
+        Actualiza un Pokemon existente
+        
+        Returns:
+            Pokemon: Objeto Pokemon actualizado o None si hay error
+        """
+        try:
+            pokemon = await session.get(Pokemon, pokemon_id)
+            if not pokemon:
+                return None
+            
+            previous = PokemonStatsRepository.snapshot(pokemon)
+            for key, value in pokemon_data.items():
+                if hasattr(pokemon, key) and key != 'id':
+                    setattr(pokemon, key, value)
+            pokemon.calculate_fields()
+            
+            errors = pokemon.validate()
+            if errors:
+                print(f"Errores de validación: {errors}")
+                await session.rollback()
+                return None
+            
+            await session.flush()
+            await AsyncPokemonRepository._apply_stats(session, removed=[previous],
+                                                      added=[PokemonStatsRepository.snapshot(pokemon)])
+            await AsyncPokemonRepository._bump_version(session)
+            await session.commit()
+            CountCache.invalidate()
+            return pokemon
+        except Exception as e:
+            await session.rollback()
+            print(f"Error al actualizar Pokemon {pokemon_id}: {str(e)}")
+            return None
+    
+    @staticmethod
+    async def delete(session, pokemon_id):
+        """
+        Elimina un Pokemon
+        
+        Returns:
+            bool: True si se eliminó correctamente, False en caso contrario
+        """
+        try:
+            pokemon = await session.get(Pokemon, pokemon_id)
+            if not pokemon:
+                return False
+            
+            previous = PokemonStatsRepository.snapshot(pokemon)
+            await session.delete(pokemon)
+            await session.flush()
+            await AsyncPokemonRepository._apply_stats(session, removed=[previous])
+            await AsyncPokemonRepository._bump_version(session)
+            await session.commit()
+            CountCache.invalidate()
+            return True
+        except Exception as e:
+            await session.rollback()
+            print(f"Error al eliminar Pokemon {pokemon_id}: {str(e)}")
+            return False
+    
+    @staticmethod
+    async def update_many(session, changes, ids=None, filters=None):
+        """
+        Actualiza todos los Pokemon que cumplen la condición con un solo UPDATE
+        (ver PokemonRepository.update_many)
+        
+        Returns:
+            list: IDs actualizados
+            
+        Raises:
+            ValueError: Si la condición o los cambios no son válidos
+            Exception: Si falla la actualización (la transacción se revierte)
+        """
+        unknown = [column for column in changes if column not in PokemonRepository.BULK_UPDATE_FIELDS]
+        if unknown or not changes:
+            raise ValueError(f"Campos que no se pueden actualizar en lote: {', '.join(unknown) or 'ninguno'}")
+        
+        table = Pokemon.__table__
+        where = PokemonRepository._bulk_where(ids, filters)
+        snapshot_columns = [table.c[field] for field in PokemonStatsRepository.SNAPSHOT_FIELDS]
+        tracked = PokemonStatsRepository.affects_summary(changes)
+        
+        values = dict(changes)
+        values.update(Pokemon.derived_expressions(changes))
+        
+        try:
+            previous = []
+            if tracked:
+                result = await session.execute(select(*snapshot_columns).where(where))
+                previous = [dict(row) for row in result.mappings()]
+            
+            result = await session.execute(update(table).where(where).values(values).returning(*snapshot_columns))
+            updated = [dict(row) for row in result.mappings()]
+            
+            if tracked and updated:
+                await AsyncPokemonRepository._apply_stats(session, removed=previous, added=updated)
+            await AsyncPokemonRepository._bump_version(session)
+            await session.commit()
+            CountCache.invalidate()
+        except Exception as e:
+            await session.rollback()
+            print(f"Error en la actualización masiva: {str(e)}")
+            raise
+        
+        return [row['id'] for row in updated]
+    
+    @staticmethod
+    async def delete_many(session, ids=None, filters=None):
+        """
+        Elimina todos los Pokemon que cumplen la condición con un solo DELETE
+        (ver PokemonRepository.delete_many)
+        
+        Returns:
+            list: IDs eliminados
+            
+        Raises:
+            ValueError: Si la condición no es válida
+            Exception: Si falla la eliminación (la transacción se revierte)
+        """
+        table = Pokemon.__table__
+        where = PokemonRepository._bulk_where(ids, filters)
+        statement = delete(table).where(where).returning(
+            *[table.c[field] for field in PokemonStatsRepository.SNAPSHOT_FIELDS]
+        )
+        
+        try:
+            removed = [dict(row) for row in (await session.execute(statement)).mappings()]
+            if removed:
+                await AsyncPokemonRepository._apply_stats(session, removed=removed)
+            await AsyncPokemonRepository._bump_version(session)
+            await session.commit()
+            CountCache.invalidate()
+        except Exception as e:
+            await session.rollback()
+            print(f"Error en la eliminación masiva: {str(e)}")
+            raise
+        
+        return [row['id'] for row in removed]
+    
+    @staticmethod
+    async def insert_records(session, records, batch_size=None):
+        """
+        Inserta registros ya validados en una sola transacción (ver PokemonRepository.insert_records)
+        
+        Returns:
+            list: ids asignados, en el mismo orden que records
+            
+        Raises:
+            Exception: Si falla la inserción (la transacción se revierte completa)
+        """
+        table = Pokemon.__table__
+        batch_size = batch_size or Config.ETL_BATCH_SIZE
+        statement = insert(table).returning(table.c.id, table.c.nombre)
+        
+        try:
+            ids_by_name = {}
+            for start in range(0, len(records), batch_size):
+                result = await session.execute(statement, records[start:start + batch_size])
+                ids_by_name.update((nombre, pokemon_id) for pokemon_id, nombre in result)
+            ids = [ids_by_name[record['nombre']] for record in records]
+            
+            await AsyncPokemonRepository._apply_stats(
+                session, added=[dict(PokemonStatsRepository.snapshot(record), id=pokemon_id)
+                                for record, pokemon_id in zip(records, ids)]
+            )
+            await AsyncPokemonRepository._bump_version(session)
+            await session.commit()
+            CountCache.invalidate()
+        except Exception as e:
+            await session.rollback()
+            print(f"Error en la inserción masiva: {str(e)}")
+            raise
+        
+        for record, pokemon_id in zip(records, ids):
+            record['id'] = pokemon_id
+        return ids
+    
+    @staticmethod
+    async def find_existing(session, column, values):
+        """
+        Busca cuáles de los valores ya existen en una columna (ver PokemonRepository.find_existing)
+        
+        Returns:
+            set: Valores que ya existen
+        """
+        target = getattr(Pokemon, column)
+        values = list(dict.fromkeys(value for value in values if value is not None))
+        existing = set()
+        
+        for start in range(0, len(values), 500):
+            chunk = values[start:start + 500]
+            existing.update((await session.execute(select(target).where(target.in_(chunk)))).scalars())
+        
+        return existing
+    
+    @staticmethod
+    async def get_statistics_summary(session):
+        """
+        Lee el resumen de estadísticas y lo construye si falta (ver
+        PokemonStatsRepository.get_or_rebuild)
+        
+        Returns:
+            PokemonStatsSummary: Resumen actual
+        """
+        summary = await session.get(PokemonStatsSummary, PokemonStatsSummary.SUMMARY_ID)
+        if summary is None:
+            await session.run_sync(lambda sync_session: PokemonStatsRepository.rebuild(sync_session.connection()))
+            await session.commit()
+            summary = await session.get(PokemonStatsSummary, PokemonStatsSummary.SUMMARY_ID)
+        return summary
+    
+    @staticmethod
+    async def verify_statistics(session):
+        """
+        Compara el resumen guardado con un recálculo completo
+        
+        Returns:
+            dict: {'consistente': bool, 'diferencias': {...}}
+        """
+        return await session.run_sync(lambda sync_session: PokemonStatsRepository.verify(session=sync_session))
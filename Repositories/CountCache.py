@@ -0,0 +1,88 @@
+import threading
+import time
+from Config.Config import Config
+
+class CountCache:
+    """Caché en memoria de los totales de Pokemon por combinación de filtros"""
+    
+    _lock = threading.Lock()
+    _entries = {}
+    _generation = 0
+    hits = 0
+    misses = 0
+    
+    @staticmethod
+    def make_key(database_url, filters=None, search=None):
+        """
+        Construye la clave de caché de un conteo
+        
+        Args:
+            database_url (str): URL de la base de datos (separa bases distintas en el mismo proceso)
+            filters (dict): Expresión de filtro aplicada al conteo (las listas se ordenan)
+            search (str): Texto de búsqueda aplicado al conteo
+            
+        Returns:
+            tuple: Clave de caché
+        """
+        normalized = tuple(sorted(
+            (key, tuple(sorted(value, key=str)) if isinstance(value, list) else value)
+            for key, value in (filters or {}).items()
+        ))
+        return database_url, normalized, search
+    
+    @staticmethod
+    def get(key):
+        """
+        Obtiene un conteo de la caché
+        
+        Args:
+            key (tuple): Clave creada con make_key
+            
+        Returns:
+            int: Conteo guardado o None si no está o ya expiró
+        """
+        with CountCache._lock:
+            entry = CountCache._entries.get(key)
+            if entry is not None and time.monotonic() - entry[1] < Config.COUNT_CACHE_TTL:
+                CountCache.hits += 1
+                return entry[0]
+            
+            CountCache.misses += 1
+            return None
+    
+    @staticmethod
+    def generation():
+        """
+        Obtiene la generación actual de la caché. Se lee antes de ejecutar el
+        conteo y se pasa a set() para no guardar un valor calculado antes de una
+        invalidación
+        
+        Returns:
+            int: Generación actual
+        """
+        with CountCache._lock:
+            return CountCache._generation
+    
+    @staticmethod
+    def set(key, value, generation):
+        """
+        Guarda un conteo en la caché
+        
+        Args:
+            key (tuple): Clave creada con make_key
+            value (int): Conteo
+            generation (int): Generación leída antes de ejecutar el conteo
+        """
+        if Config.COUNT_CACHE_TTL <= 0:
+            return
+        
+        with CountCache._lock:
+            if generation == CountCache._generation:
+                CountCache._entries[key] = (value, time.monotonic())
+    
+    @staticmethod
+    def invalidate():
+        """Descarta todos los conteos (después de escrituras y recargas del ETL)"""
+        with CountCache._lock:
+            CountCache._entries.clear()
+            CountCache._generation += 1
@@ -0,0 +1,48 @@
+from datetime import datetime
+from sqlalchemy import select, insert, update
+from Models.DataVersion import DataVersion
+from Config.Config import db
+from Repositories.ReadRouting import ReadRouting
+
+class DataVersionRepository:
+    """Versión monótona de los datos de Pokemon, base de los ETag y Last-Modified de la API"""
+    
+    @staticmethod
+    def bump(conn):
+        """
+        Avanza la versión. Las escrituras del repositorio la llaman dentro de
+        su transacción (antes de commit), así la versión cambia junto con los datos
+        
+        Args:
+            conn (Connection): Conexión de la escritura
+        """
+        table = DataVersion.__table__
+        now = datetime.utcnow()
+        result = conn.execute(
+            update(table).where(table.c.id == DataVersion.VERSION_ID)
+            .values(version=table.c.version + 1, fecha_actualizacion=now)
+        )
+        if result.rowcount == 0:
+            conn.execute(insert(table).values(id=DataVersion.VERSION_ID, version=1, fecha_actualizacion=now))
+    
+    @staticmethod
+    def bump_committed():
+        """Avanza la versión en una transacción propia (después de una recarga del ETL)"""
+        with db.engine.begin() as conn:
+            DataVersionRepository.bump(conn)
+    
+    @staticmethod
+    @ReadRouting.reads
+    def current():
+        """
+        Lee la versión actual (una lectura por clave primaria, sin pasar por el
+        mapa de identidad de la sesión)
+        
+        Returns:
+            tuple: (versión, fecha de la última escritura o None)
+        """
+        table = DataVersion.__table__
+        row = db.session.execute(
+            select(table.c.version, table.c.fecha_actualizacion).where(table.c.id == DataVersion.VERSION_ID)
+        ).first()
+        return (row.version, row.fecha_actualizacion) if row is not None else (0, None)
@@ -0,0 +1,115 @@
+import os
+import sqlite3
+import threading
+from Config.Config import Config
+
+class ETLRunRepository:
+    """Repositorio del historial de ejecuciones del ETL (SQLite local, independiente de la API)"""
+    
+    PHASES = ['extract', 'clean', 'load', 'db_load']
+    
+    COLUMNS = (
+        ['origen', 'iniciado', 'finalizado', 'exito', 'error', 'duracion_total'] +
+        [f'duracion_{phase}' for phase in PHASES] +
+        [f'filas_{phase}_{sentido}' for phase in PHASES for sentido in ('entrada', 'salida')] +
+        ['duplicados_eliminados', 'bytes_salida', 'memoria_pico_bytes', 'memoria_metodo']
+    )
+    
+    _lock = threading.Lock()
+    _initialized_paths = set()
+    
+    @staticmethod
+    def _connect():
+        """
+        Abre una conexión a la base de datos del historial y crea la tabla si no existe
+        
+        Returns:
+            sqlite3.Connection: Conexión abierta
+        """
+        db_path = Config.ETL_RUNS_DB_PATH
+        db_dir = os.path.dirname(db_path)
+        if db_dir and not os.path.exists(db_dir):
+            os.makedirs(db_dir, exist_ok=True)
+        
+        conn = sqlite3.connect(db_path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        
+        with ETLRunRepository._lock:
+            if db_path not in ETLRunRepository._initialized_paths:
+                column_types = {
+                    'origen': 'TEXT', 'iniciado': 'TEXT', 'finalizado': 'TEXT',
+                    'exito': 'INTEGER', 'error': 'TEXT', 'memoria_metodo': 'TEXT'
+                }
+                column_defs = ', '.join(
+                    f"{col} {column_types.get(col, 'REAL' if col.startswith('duracion') else 'INTEGER')}"
+                    for col in ETLRunRepository.COLUMNS
+                )
+                conn.execute(f"CREATE TABLE IF NOT EXISTS etl_runs (id INTEGER PRIMARY KEY AUTOINCREMENT, {column_defs})")
+                conn.execute("CREATE INDEX IF NOT EXISTS ix_etl_runs_iniciado ON etl_runs (iniciado)")
+                
+                # Historiales anteriores a memoria_metodo: los picos guardados eran de tracemalloc
+                existing = {row['name'] for row in conn.execute("PRAGMA table_info(etl_runs)")}
+                if 'memoria_metodo' not in existing:
+                    conn.execute("ALTER TABLE etl_runs ADD COLUMN memoria_metodo TEXT")
+                    conn.execute("UPDATE etl_runs SET memoria_metodo = 'tracemalloc' WHERE memoria_pico_bytes IS NOT NULL")
+                conn.commit()
+                ETLRunRepository._initialized_paths.add(db_path)
+        
+        return conn
+    
+    @staticmethod
+    def save(run):
+        """
+        Guarda una ejecución del ETL
+        
+        Args:
+            run (dict): Métricas de la ejecución (claves de COLUMNS)
+            
+        Returns:
+            int: ID de la ejecución guardada o None si hay error
+        """
+        try:
+            columns = ETLRunRepository.COLUMNS
+            conn = ETLRunRepository._connect()
+            try:
+                cursor = conn.execute(
+                    f"INSERT INTO etl_runs ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+                    [run.get(col) for col in columns]
+                )
+                conn.commit()
+                return cursor.lastrowid
+            finally:
+                conn.close()
+        except Exception as e:
+            print(f"Error al guardar la ejecución del ETL: {str(e)}")
+            return None
+    
+    @staticmethod
+    def get_recent(limit=20, origen=None):
+        """
+        Obtiene las ejecuciones más recientes
+        
+        Args:
+            limit (int): Número máximo de ejecuciones
+            origen (str): Filtrar por origen ('main', 'app_simple', ...)
+            
+        Returns:
+            list: Ejecuciones de la más reciente a la más antigua
+        """
+        try:
+            conn = ETLRunRepository._connect()
+            try:
+                query = "SELECT * FROM etl_runs"
+                params = []
+                if origen:
+                    query += " WHERE origen = ?"
+                    params.append(origen)
+                query += " ORDER BY id DESC LIMIT ?"
+                params.append(limit)
+                
+                return [dict(row) for row in conn.execute(query, params)]
+            finally:
+                conn.close()
+        except Exception as e:
+            print(f"Error al obtener el historial del ETL: {str(e)}")
+            return []
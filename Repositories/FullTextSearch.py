@@ -0,0 +1,107 @@
+import re
+import threading
+from Config.Config import db
+
+class FullTextSearch:
+    """Índice de texto completo (SQLite FTS5) sobre nombre y tipos de la tabla pokemon"""
+    
+    TABLE = 'pokemon_fts'
+    COLUMNS = ['nombre', 'tipo_principal', 'tipo_secundario']
+    
+    _lock = threading.Lock()
+    _ready = {}  # URL de la base de datos -> True si FTS5 está disponible
+    
+    @staticmethod
+    def ensure():
+        """
+        Crea el índice y sus triggers si no existen (una vez por base de datos)
+        
+        Returns:
+            bool: True si la búsqueda de texto completo está disponible
+        """
+        url = str(db.engine.url)
+        with FullTextSearch._lock:
+            if url in FullTextSearch._ready:
+                return FullTextSearch._ready[url]
+            
+            available = False
+            if db.engine.dialect.name == 'sqlite':
+                try:
+                    with db.engine.begin() as conn:
+                        FullTextSearch.install(conn)
+                    available = True
+                except Exception as e:
+                    print(f"⚠️ Búsqueda de texto completo no disponible, se usará LIKE: {str(e)}")
+            
+            FullTextSearch._ready[url] = available
+            return available
+    
+    @staticmethod
+    def install(conn, rebuild=False):
+        """
+        Crea la tabla virtual (contenido externo: la tabla pokemon) y los triggers
+        que la mantienen sincronizada. Se reconstruye si se acaba de crear, si
+        faltaba algún trigger (pudo haber escrituras sin indexar) o si se pide,
+        por ejemplo después de reemplazar la tabla pokemon en una recarga
+        
+        Args:
+            conn (Connection): Conexión dentro de una transacción
+            rebuild (bool): Reconstruir el índice desde la tabla pokemon
+        """
+        table = FullTextSearch.TABLE
+        columns = ', '.join(FullTextSearch.COLUMNS)
+        new_values = ', '.join(f'new.{column}' for column in FullTextSearch.COLUMNS)
+        old_values = ', '.join(f'old.{column}' for column in FullTextSearch.COLUMNS)
+        
+        exists = conn.exec_driver_sql(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        ).first() is not None
+        triggers = conn.exec_driver_sql(
+            "SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'pokemon' "
+            "AND name IN (?, ?, ?)", (f'{table}_ai', f'{table}_ad', f'{table}_au')
+        ).scalar()
+        
+        if not exists:
+            conn.exec_driver_sql(
+                f"CREATE VIRTUAL TABLE {table} USING fts5({columns}, content='pokemon', "
+                f"content_rowid='id', tokenize='unicode61 remove_diacritics 2')"
+            )
+        
+        # Los triggers pertenecen a la tabla pokemon: desaparecen cuando se reemplaza
+        conn.exec_driver_sql(
+            f"CREATE TRIGGER IF NOT EXISTS {table}_ai AFTER INSERT ON pokemon BEGIN "
+            f"INSERT INTO {table}(rowid, {columns}) VALUES (new.id, {new_values}); END"
+        )
+        conn.exec_driver_sql(
+            f"CREATE TRIGGER IF NOT EXISTS {table}_ad AFTER DELETE ON pokemon BEGIN "
+            f"INSERT INTO {table}({table}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); END"
+        )
+        conn.exec_driver_sql(
+            f"CREATE TRIGGER IF NOT EXISTS {table}_au AFTER UPDATE ON pokemon BEGIN "
+            f"INSERT INTO {table}({table}, rowid, {columns}) VALUES ('delete', old.id, {old_values}); "
+            f"INSERT INTO {table}(rowid, {columns}) VALUES (new.id, {new_values}); END"
+        )
+        
+        if rebuild or not exists or triggers < 3:
+            conn.exec_driver_sql(f"INSERT INTO {table}({table}) VALUES ('rebuild')")
+    
+    @staticmethod
+    def build_match_query(query_text, fields):
+        """
+        Convierte el texto del usuario en una expresión MATCH de FTS5: cada
+        palabra se busca como prefijo y todas deben aparecer en los campos dados
+        
+        Args:
+            query_text (str): Texto a buscar
+            fields (list): Campos donde buscar (subconjunto de COLUMNS)
+            
+        Returns:
+            str: Expresión MATCH o None si el texto no tiene palabras
+        """
+        terms = re.findall(r'\w+', query_text)
+        columns = [field for field in fields if field in FullTextSearch.COLUMNS]
+        if not terms or not columns:
+            return None
+        
+        phrases = ' '.join(f'"{term}"*' for term in terms)
+        return f"{{{' '.join(columns)}}} : ({phrases})"
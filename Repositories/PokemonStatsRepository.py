@@ -0,0 +1,281 @@
+from datetime import datetime
+from sqlalchemy import select, insert, delete, func, case
+from Models.Pokemon import Pokemon
+from Models.PokemonStats import PokemonStatsSummary
+from Config.Config import db
+from Repositories.ReadRouting import ReadRouting
+
+class PokemonStatsRepository:
+    """Mantiene el resumen materializado de estadísticas de Pokemon"""
+    
+    # Tamaño de cada lista top-K y cuántas posiciones necesita la API de cada una
+    TOP_K = 10
+    TOP_COLUMNS = {'top_poder': ('poder_total', 5), 'top_velocidad': ('velocidad', 1), 'top_hp': ('hp', 1)}
+    
+    # Distribuciones: columna del resumen -> columna de pokemon
+    DISTRIBUTIONS = {'por_tipo': 'tipo_principal', 'por_generacion': 'generacion',
+                     'por_categoria': 'categoria_poder', 'histograma_poder': 'poder_total'}
+    
+    # Campos de un Pokemon que afectan al resumen
+    SNAPSHOT_FIELDS = ['id', 'nombre', 'tipo_principal', 'generacion', 'categoria_poder',
+                       'es_legendario', 'es_mega', 'poder_total', 'velocidad', 'hp']
+    
+    @staticmethod
+    def snapshot(pokemon):
+        """
+        Copia los campos de un Pokemon que afectan al resumen
+        
+        Args:
+            pokemon (Pokemon | dict): Objeto Pokemon o sus valores de columna
+            
+        Returns:
+            dict: Campos relevantes para el resumen
+        """
+        if isinstance(pokemon, dict):
+            return {field: pokemon.get(field) for field in PokemonStatsRepository.SNAPSHOT_FIELDS}
+        return {field: getattr(pokemon, field) for field in PokemonStatsRepository.SNAPSHOT_FIELDS}
+    
+    @staticmethod
+    def affects_summary(columns):
+        """
+        Indica si cambiar esas columnas modifica el resumen (categoria_poder se
+        deriva de poder_total, que ya está entre los campos del snapshot)
+        
+        Args:
+            columns (iterable): Columnas que cambian
+            
+        Returns:
+            bool: True si hay que actualizar el resumen
+        """
+        return bool(set(columns) & set(PokemonStatsRepository.SNAPSHOT_FIELDS))
+    
+    @staticmethod
+    @ReadRouting.reads
+    def get():
+        """
+        Lee el resumen (una lectura por clave primaria)
+        
+        Returns:
+            PokemonStatsSummary: Resumen o None si aún no se ha construido
+        """
+        return db.session.get(PokemonStatsSummary, PokemonStatsSummary.SUMMARY_ID)
+    
+    @staticmethod
+    def get_or_rebuild():
+        """
+        Lee el resumen y lo construye si falta (base de datos creada antes de
+        que existiera el resumen)
+        
+        Returns:
+            PokemonStatsSummary: Resumen actual
+        """
+        summary = PokemonStatsRepository.get()
+        if summary is None:
+            PokemonStatsRepository.rebuild(db.session.connection())
+            db.session.commit()
+            ReadRouting.record_write()
+            summary = db.session.get(PokemonStatsSummary, PokemonStatsSummary.SUMMARY_ID)
+        return summary
+    
+    @staticmethod
+    def compute(conn):
+        """
+        Calcula el resumen completo con consultas agregadas sobre la tabla pokemon
+        
+        Args:
+            conn (Connection): Conexión a la base de datos
+            
+        Returns:
+            dict: Valores de las columnas del resumen
+        """
+        table = Pokemon.__table__
+        total, legendarios, mega, suma, suma_cuadrados = conn.execute(select(
+            func.count(),
+            func.sum(case((table.c.es_legendario == True, 1), else_=0)),
+            func.sum(case((table.c.es_mega == True, 1), else_=0)),
+            func.sum(table.c.poder_total),
+            func.sum(table.c.poder_total * table.c.poder_total)
+        )).one()
+        
+        summary = {
+            'id': PokemonStatsSummary.SUMMARY_ID,
+            'total': total,
+            'legendarios': legendarios or 0,
+            'mega': mega or 0,
+            'suma_poder': suma or 0,
+            'suma_cuadrados_poder': suma_cuadrados or 0,
+            'fecha_actualizacion': datetime.utcnow()
+        }
+        
+        for summary_column, column in PokemonStatsRepository.DISTRIBUTIONS.items():
+            rows = conn.execute(select(table.c[column], func.count()).group_by(table.c[column]))
+            summary[summary_column] = {str(value): count for value, count in rows}
+        
+        for summary_column, (column, _) in PokemonStatsRepository.TOP_COLUMNS.items():
+            summary[summary_column] = PokemonStatsRepository._query_top(conn, column)
+        
+        return summary
+    
+    @staticmethod
+    def rebuild(conn):
+        """
+        Recalcula y guarda el resumen (después de una carga del ETL). Debe
+        llamarse dentro de la misma transacción que la carga
+        
+        Args:
+            conn (Connection): Conexión dentro de una transacción
+            
+        Returns:
+            dict: Resumen guardado
+        """
+        summary_table = PokemonStatsSummary.__table__
+        summary_table.create(conn, checkfirst=True)
+        
+        summary = PokemonStatsRepository.compute(conn)
+        conn.execute(delete(summary_table))
+        conn.execute(insert(summary_table), [summary])
+        return summary
+    
+    @staticmethod
+    def apply_changes(removed=(), added=(), session=None):
+        """
+        Actualiza el resumen con los cambios de una escritura, en la misma
+        transacción de la sesión (se llama después de flush y antes de commit).
+        Una actualización es un registro eliminado (valores anteriores) más uno
+        agregado (valores nuevos)
+        
+        Args:
+            removed (list): Snapshots de los registros eliminados o sus valores anteriores
+            added (list): Snapshots de los registros nuevos o sus valores nuevos
+            session (Session): Sesión de la escritura (por defecto db.session; la
+                API asíncrona pasa la sesión síncrona de AsyncSession.run_sync)
+        """
+        session = session or db.session
+        summary = session.query(PokemonStatsSummary).filter_by(
+            id=PokemonStatsSummary.SUMMARY_ID
+        ).with_for_update().first()
+        
+        if summary is None:
+            # Primera escritura sin resumen previo: la tabla ya incluye el cambio
+            PokemonStatsRepository.rebuild(session.connection())
+            return
+        
+        # Se trabaja sobre copias y se reasignan para que el ORM detecte el cambio
+        distributions = {column: dict(getattr(summary, column)) for column in PokemonStatsRepository.DISTRIBUTIONS}
+        tops = {column: [list(entry) for entry in getattr(summary, column)]
+                for column in PokemonStatsRepository.TOP_COLUMNS}
+        total = summary.total
+        
+        for sign, records in ((-1, removed), (1, added)):
+            for record in records:
+                summary.legendarios += sign * bool(record['es_legendario'])
+                summary.mega += sign * bool(record['es_mega'])
+                summary.suma_poder += sign * record['poder_total']
+                summary.suma_cuadrados_poder += sign * record['poder_total'] ** 2
+                
+                for summary_column, column in PokemonStatsRepository.DISTRIBUTIONS.items():
+                    key = str(record[column])
+                    count = distributions[summary_column].get(key, 0) + sign
+                    if count > 0:
+                        distributions[summary_column][key] = count
+                    else:
+                        distributions[summary_column].pop(key, None)
+                
+                for summary_column, (column, _) in PokemonStatsRepository.TOP_COLUMNS.items():
+                    top = tops[summary_column]
+                    if sign < 0:
+                        # Sin el registro, la lista sigue siendo el top exacto del resto
+                        tops[summary_column] = [entry for entry in top if entry[1] != record['id']]
+                    else:
+                        PokemonStatsRepository._offer_top(top, record, column, total)
+                
+                total += sign
+        
+        summary.total = total
+        for column, values in distributions.items():
+            setattr(summary, column, values)
+        
+        for summary_column, (column, needed) in PokemonStatsRepository.TOP_COLUMNS.items():
+            top = tops[summary_column]
+            if len(top) < min(needed, total):
+                # Se eliminaron posiciones que no se pueden deducir: releer el top
+                top = PokemonStatsRepository._query_top(session.connection(), column)
+            setattr(summary, summary_column, top)
+        
+        summary.fecha_actualizacion = datetime.utcnow()
+    
+    @staticmethod
+    def _offer_top(top, record, column, total_others):
+        """
+        Inserta un registro en una lista top-K si le corresponde. La lista es el
+        top exacto de la tabla: un registro entra si supera al último o si la
+        lista contiene todos los demás registros
+        
+        Args:
+            top (list): Lista [[valor, id, nombre], ...] (se modifica)
+            record (dict): Snapshot del registro
+            column (str): Columna del top
+            total_others (int): Registros en la tabla sin contar este
+        """
+        entry = [record[column], record['id'], record['nombre']]
+        rank = lambda item: (-item[0], item[1])
+        
+        if len(top) >= total_others or (top and rank(entry) < rank(top[-1])):
+            top.append(entry)
+            top.sort(key=rank)
+            del top[PokemonStatsRepository.TOP_K:]
+    
+    @staticmethod
+    def _query_top(conn, column):
+        """
+        Lee el top-K de una columna desde la tabla pokemon
+        
+        Args:
+            conn (Connection): Conexión a la base de datos
+            column (str): Columna del top
+            
+        Returns:
+            list: [[valor, id, nombre], ...]
+        """
+        table = Pokemon.__table__
+        rows = conn.execute(
+            select(table.c[column], table.c.id, table.c.nombre)
+            .order_by(table.c[column].desc(), table.c.id)
+            .limit(PokemonStatsRepository.TOP_K)
+        )
+        return [list(row) for row in rows]
+    
+    @staticmethod
+    def verify(session=None):
+        """
+        Compara el resumen guardado con un recálculo completo
+        
+        Args:
+            session (Session): Sesión a usar (por defecto db.session)
+            
+        Returns:
+            dict: {'consistente': bool, 'diferencias': {columna: {'guardado', 'recalculado'}}}
+        """
+        # Ambos desde la base principal (una réplica puede estar atrasada)
+        session = session or db.session
+        summary = session.get(PokemonStatsSummary, PokemonStatsSummary.SUMMARY_ID, populate_existing=True)
+        expected = PokemonStatsRepository.compute(session.connection())
+        
+        differences = {}
+        for column, value in expected.items():
+            if column == 'fecha_actualizacion':
+                continue
+            stored = getattr(summary, column) if summary is not None else None
+            
+            if column in PokemonStatsRepository.TOP_COLUMNS and stored is not None:
+                # Las listas top-K pueden quedar más cortas después de eliminar
+                # registros: deben ser un prefijo exacto con las posiciones necesarias
+                needed = min(PokemonStatsRepository.TOP_COLUMNS[column][1], expected['total'])
+                consistent = len(stored) >= needed and stored == value[:len(stored)]
+            else:
+                consistent = stored == value
+            
+            if not consistent:
+                differences[column] = {'guardado': stored, 'recalculado': value}
+        
+        return {'consistente': not differences, 'diferencias': differences}
@@ -0,0 +1,333 @@
+import contextvars
+import functools
+import itertools
+import os
+import sqlite3
+import threading
+import time
+from flask import current_app, has_app_context, has_request_context, session
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from Config.Config import Config, db, read_engine, engine_options, configure_engine
+from Repositories.FullTextSearch import FullTextSearch
+
+class Replica:
+    """Réplica de lectura: su motor y hasta qué momento tiene todas las escrituras"""
+    
+    def __init__(self, engine, path=None):
+        self.engine = engine
+        self.path = path  # archivo SQLite local que se refresca (None = réplica externa)
+        self.snapshot_time = None  # time.time() hasta el que la copia local está completa
+    
+    def snapshot(self):
+        """
+        Momento hasta el que la réplica incluye todas las escrituras de la principal
+        
+        Returns:
+            float: time.time() o None si la réplica local aún no tiene datos
+        """
+        if self.path is None:
+            return time.time() - Config.READ_REPLICA_LAG
+        return self.snapshot_time
+
+class ReplicaSet:
+    """Réplicas de lectura de una aplicación y el hilo que refresca las locales"""
+    
+    def __init__(self, replicas, primary_path=None):
+        self.replicas = replicas
+        self.primary_path = primary_path
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._source = None
+        self._data_version = None
+    
+    def pick(self, min_snapshot):
+        """
+        Elige una réplica (por turnos) que tenga todas las escrituras hasta min_snapshot
+        
+        Args:
+            min_snapshot (float): time.time() mínimo que debe cubrir la réplica
+            
+        Returns:
+            Engine: Motor de la réplica o None si ninguna está al día
+        """
+        candidates = [replica for replica in self.replicas
+                      if replica.snapshot() is not None and replica.snapshot() >= min_snapshot]
+        if not candidates:
+            return None
+        return candidates[next(self._counter) % len(candidates)].engine
+    
+    def refresh(self):
+        """
+        Copia la base principal a las réplicas locales con la API de backup de
+        SQLite, solo si hubo escrituras desde la copia anterior (PRAGMA
+        data_version cambia cuando otra conexión confirma una transacción)
+        """
+        local = [replica for replica in self.replicas if replica.path is not None]
+        if not local:
+            return
+        
+        with self._lock:
+            if self._source is None:
+                self._source = sqlite3.connect(self.primary_path, timeout=Config.SQLITE_BUSY_TIMEOUT / 1000,
+                                               check_same_thread=False)
+            
+            # El momento se toma antes de leer data_version: lo que se copie
+            # incluye al menos todo lo confirmado hasta entonces
+            now = time.time()
+            version = self._source.execute('PRAGMA data_version').fetchone()[0]
+            if version == self._data_version and all(replica.snapshot_time for replica in local):
+                for replica in local:
+                    replica.snapshot_time = now
+                return
+            
+            for replica in local:
+                target = sqlite3.connect(replica.path, timeout=Config.SQLITE_BUSY_TIMEOUT / 1000)
+                try:
+                    self._source.backup(target)
+                finally:
+                    target.close()
+                replica.snapshot_time = now
+            self._data_version = version
+    
+    def start(self):
+        """Inicia el hilo que refresca las réplicas locales cada READ_REPLICA_REFRESH_INTERVAL"""
+        if self._thread is not None or not any(replica.path for replica in self.replicas):
+            return
+        
+        def run():
+            while not self._stop.wait(Config.READ_REPLICA_REFRESH_INTERVAL):
+                try:
+                    self.refresh()
+                except Exception as e:
+                    print(f"⚠️ Error al refrescar las réplicas de lectura: {str(e)}")
+        
+        self._thread = threading.Thread(target=run, name='read-replica-refresh', daemon=True)
+        self._thread.start()
+    
+    def close(self):
+        """Detiene el hilo de refresco y cierra las conexiones de las réplicas"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        with self._lock:
+            if self._source is not None:
+                self._source.close()
+                self._source = None
+        for replica in self.replicas:
+            replica.engine.dispose()
+
+class ReadRouting:
+    """Enruta los métodos de lectura de los repositorios a réplicas de lectura"""
+    
+    EXTENSION = 'read_routing'
+    SESSION_KEY = '_ultima_escritura'  # momento de la última escritura del cliente (cookie de sesión)
+    
+    _lock = threading.Lock()
+    _last_write = 0.0  # momento de la última escritura de este proceso
+    _primary_only = contextvars.ContextVar('primary_only', default=False)
+    
+    @staticmethod
+    def init_app(app):
+        """
+        Crea los motores de las réplicas configuradas (READ_REPLICA_URLS y
+        READ_REPLICA_LOCAL_COUNT), hace la primera copia de las réplicas locales
+        e inicia su refresco. Sin réplicas configuradas no hace nada
+        
+        Args:
+            app (Flask): Aplicación con la base de datos ya inicializada
+            
+        Returns:
+            ReplicaSet: Réplicas de la aplicación o None
+        """
+        replicas = [Replica(ReadRouting._create_engine(url)) for url in Config.READ_REPLICA_URLS]
+        primary_path = None
+        
+        if Config.READ_REPLICA_LOCAL_COUNT > 0:
+            primary_url = make_url(app.config['SQLALCHEMY_DATABASE_URI'])
+            if primary_url.get_backend_name() != 'sqlite' or not primary_url.database:
+                print("⚠️ Las réplicas locales solo están disponibles con un archivo SQLite")
+            else:
+                primary_path = primary_url.database
+                base, extension = os.path.splitext(primary_path)
+                for i in range(Config.READ_REPLICA_LOCAL_COUNT):
+                    path = f'{base}_replica_{i}{extension}'
+                    replicas.append(Replica(ReadRouting._create_engine(f'sqlite:///{path}'), path))
+        
+        if not replicas:
+            return None
+        
+        replica_set = ReplicaSet(replicas, primary_path)
+        app.extensions[ReadRouting.EXTENSION] = replica_set
+        
+        with app.app_context():
+            # La búsqueda necesita el índice de texto completo también en las réplicas
+            FullTextSearch.ensure()
+        
+        replica_set.refresh()
+        replica_set.start()
+        print(f"📚 Réplicas de lectura: {len(replicas)} (consistencia '{Config.READ_REPLICA_CONSISTENCY}')")
+        return replica_set
+    
+    @staticmethod
+    def _create_engine(url):
+        """
+        Crea el motor de una réplica. Las conexiones SQLite usan el perfil de
+        producción y quedan en solo lectura (PRAGMA query_only)
+        
+        Args:
+            url (str): URL de la réplica
+            
+        Returns:
+            Engine: Motor de SQLAlchemy
+        """
+        engine = create_engine(url, **engine_options(url))
+        configure_engine(engine)
+        
+        if engine.dialect.name == 'sqlite':
+            @event.listens_for(engine, 'connect')
+            def read_only(dbapi_connection, connection_record):
+                dbapi_connection.execute('PRAGMA query_only = ON')
+        
+        return engine
+    
+    @staticmethod
+    def choose_engine():
+        """
+        Elige el motor para una lectura según READ_REPLICA_CONSISTENCY y
+        READ_REPLICA_MAX_STALENESS
+        
+        Returns:
+            Engine: Motor de una réplica o None para leer de la principal
+        """
+        if read_engine.get() is not None:
+            return read_engine.get()  # operación fijada a un motor (pinned)
+        
+        if not has_app_context():
+            return None
+        
+        replica_set = current_app.extensions.get(ReadRouting.EXTENSION)
+        if replica_set is None or ReadRouting._primary_only.get():
+            return None
+        
+        # Cambios sin confirmar en la sesión: solo la principal los ve
+        if db.session.new or db.session.dirty or db.session.deleted:
+            return None
+        
+        required = time.time() - Config.READ_REPLICA_MAX_STALENESS
+        if Config.READ_REPLICA_CONSISTENCY == 'strong':
+            required = max(required, ReadRouting._last_write)
+        elif Config.READ_REPLICA_CONSISTENCY == 'session' and has_request_context():
+            required = max(required, session.get(ReadRouting.SESSION_KEY, 0.0))
+        
+        return replica_set.pick(required)
+    
+    @staticmethod
+    def reads(method):
+        """
+        Decorador para los métodos de lectura de los repositorios: sus consultas
+        van a la réplica que elija choose_engine
+        
+        Args:
+            method (function): Método de lectura
+            
+        Returns:
+            function: Método enrutado
+        """
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            if read_engine.get() is not None:
+                return method(*args, **kwargs)
+            
+            engine = ReadRouting.choose_engine()
+            if engine is None:
+                return method(*args, **kwargs)
+            
+            token = read_engine.set(engine)
+            try:
+                return method(*args, **kwargs)
+            finally:
+                read_engine.reset(token)
+        
+        return wrapper
+    
+    @staticmethod
+    def pinned(method):
+        """
+        Decorador para operaciones con varias lecturas que deben ver los mismos
+        datos (por ejemplo la versión de los datos y la respuesta que describe
+        su ETag): el motor se elige una sola vez y todas sus lecturas van a él.
+        Sin pin, cada método de lectura elige por turnos y dos lecturas seguidas
+        pueden ir a réplicas refrescadas en momentos distintos
+        
+        Args:
+            method (function): Operación de lectura
+            
+        Returns:
+            function: Operación que lee de un solo motor
+        """
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            if read_engine.get() is not None or ReadRouting._primary_only.get():
+                return method(*args, **kwargs)
+            
+            engine = ReadRouting.choose_engine()
+            if engine is None:
+                return ReadRouting.writes(method)(*args, **kwargs)
+            
+            token = read_engine.set(engine)
+            try:
+                return method(*args, **kwargs)
+            finally:
+                read_engine.reset(token)
+        
+        return wrapper
+    
+    @staticmethod
+    def writes(method):
+        """
+        Decorador para operaciones que escriben: todas sus lecturas (por ejemplo
+        verificar que un nombre no exista) van a la base principal, aunque se
+        llamen dentro de una operación fijada a una réplica (pinned)
+        
+        Args:
+            method (function): Operación de escritura
+            
+        Returns:
+            function: Operación que solo lee de la principal
+        """
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            token = ReadRouting._primary_only.set(True)
+            engine_token = read_engine.set(None)
+            try:
+                return method(*args, **kwargs)
+            finally:
+                read_engine.reset(engine_token)
+                ReadRouting._primary_only.reset(token)
+        
+        return wrapper
+    
+    @staticmethod
+    def record_write():
+        """Registra una escritura confirmada (para leer lo escrito según la consistencia)"""
+        now = time.time()
+        with ReadRouting._lock:
+            ReadRouting._last_write = max(ReadRouting._last_write, now)
+        
+        if has_request_context() and current_app.extensions.get(ReadRouting.EXTENSION) is not None:
+            session[ReadRouting.SESSION_KEY] = now
+    
+    @staticmethod
+    def shutdown(app):
+        """
+        Detiene el refresco y cierra las réplicas de una aplicación
+        
+        Args:
+            app (Flask): Aplicación
+        """
+        replica_set = app.extensions.pop(ReadRouting.EXTENSION, None)
+        if replica_set is not None:
+            replica_set.close()
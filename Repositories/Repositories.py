@@ -1,39 +1,248 @@
 from Models.Pokemon import Pokemon
-from Config.Config import db
-from sqlalchemy import or_, and_
+from Config.Config import db, Config
+from Repositories.CountCache import CountCache
+from Repositories.DataVersionRepository import DataVersionRepository
+from Repositories.FullTextSearch import FullTextSearch
+from Repositories.PokemonStatsRepository import PokemonStatsRepository
+from Repositories.ReadRouting import ReadRouting
+from Repositories.Sharding import Sharding
+from Repositories.UnitOfWork import UnitOfWork
+from sqlalchemy import or_, and_, tuple_, text, func, case, distinct, insert, select, update, delete, table, column, literal_column
+from sqlalchemy.orm.attributes import set_committed_value
 
 class PokemonRepository:
     """Repositorio para operaciones de acceso a datos de Pokemon"""
     
+    # Columnas por las que se puede paginar con cursor (todas tienen índice;
+    # en SQLite cada índice incluye el id como desempate)
+    SORTABLE_COLUMNS = ('id', 'poder_total', 'velocidad')
+    
+    # Columnas que se pueden seleccionar en las consultas proyectadas
+    FIELDS = Pokemon.FIELDS
+    
+    # Expresiones de filtro (ver filter_conditions): igualdad (o lista de valores)
+    # y rangos con los sufijos _min y _max
+    FILTER_FIELDS = ('tipo', 'tipo_principal', 'tipo_secundario', 'generacion', 'es_legendario',
+                     'es_mega', 'categoria_poder', 'forma_especial')
+    RANGE_FIELDS = ('hp', 'ataque', 'defensa', 'ataque_especial', 'defensa_especial', 'velocidad',
+                    'poder_total', 'generacion')
+    
+    # Columnas que se pueden cambiar con update_many (el nombre es único y los
+    # campos derivados se recalculan)
+    BULK_UPDATE_FIELDS = ('tipo_principal', 'tipo_secundario', 'hp', 'ataque', 'defensa', 'ataque_especial',
+                          'defensa_especial', 'velocidad', 'poder_total', 'generacion', 'es_legendario',
+                          'es_mega', 'forma_especial')
+    
     @staticmethod
-    def get_all(limit=None, offset=None):
+    @Sharding.routes
+    @ReadRouting.reads
+    def get_all(limit=None, offset=None, columns=None, filters=None, search=None):
         """
         Obtiene todos los Pokemon con paginación opcional
         
         Args:
             limit (int): Número máximo de registros a retornar
             offset (int): Número de registros a saltar
+            columns (list): Solo estas columnas (ver _fetch)
+            filters (dict): Expresión de filtro (ver filter_conditions)
+            search (str): Texto a buscar en nombre y tipos (ver plan)
             
         Returns:
-            list: Lista de Pokemon
+            list: Lista de Pokemon ordenada por id (por relevancia si hay búsqueda)
         """
         try:
-            query = Pokemon.query
+            query, rank = PokemonRepository.plan(filters, search)
+            query = query.order_by(*([rank] if rank is not None else []), Pokemon.id)
             
             if offset:
                 query = query.offset(offset)
             if limit:
                 query = query.limit(limit)
                 
-            return query.all()
+            return PokemonRepository._fetch(query, columns)
         except Exception as e:
             print(f"Error al obtener todos los Pokemon: {str(e)}")
             return []
     
     @staticmethod
+    @Sharding.routes
+    @ReadRouting.reads
+    def get_page(limit, sort_by='id', descending=False, after=None, columns=None, filters=None, search=None):
+        """
+        Obtiene una página ordenada por clave (keyset): en lugar de saltar filas
+        con OFFSET filtra a partir de la última clave vista, así el costo de cada
+        página no crece con la profundidad
+        
+        Args:
+            limit (int): Número máximo de registros a retornar
+            sort_by (str): Columna de orden (una de SORTABLE_COLUMNS)
+            descending (bool): Orden descendente
+            after (tuple): (valor de sort_by, id) del último registro de la página anterior
+            columns (list): Solo estas columnas (ver _fetch); se agrega sort_by para el cursor
+            filters (dict): Expresión de filtro (ver filter_conditions)
+            search (str): Texto a buscar en nombre y tipos (ver plan)
+            
+        Returns:
+            list: Lista de Pokemon ordenada por (sort_by, id)
+        """
+        try:
+            if sort_by not in PokemonRepository.SORTABLE_COLUMNS:
+                raise ValueError(f"No se puede ordenar por '{sort_by}'")
+            
+            query, _ = PokemonRepository.plan(filters, search)
+            condition, order = PokemonRepository.keyset(sort_by, descending, after)
+            if condition is not None:
+                query = query.filter(condition)
+            
+            if columns and sort_by not in columns:
+                columns = list(columns) + [sort_by]
+            
+            return PokemonRepository._fetch(query.order_by(*order).limit(limit), columns)
+        except Exception as e:
+            print(f"Error al obtener página de Pokemon: {str(e)}")
+            return []
+    
+    @staticmethod
+    def keyset(sort_by, descending=False, after=None):
+        """
+        Condición y orden de la paginación por clave (ver get_page)
+        
+        Args:
+            sort_by (str): Columna de orden (una de SORTABLE_COLUMNS)
+            descending (bool): Orden descendente
+            after (tuple): (valor de sort_by, id) del último registro de la página anterior
+            
+        Returns:
+            tuple: (Condición a partir de la clave o None, columnas de ORDER BY)
+        """
+        sort_column = getattr(Pokemon, sort_by)
+        
+        if sort_by == 'id':
+            key, order = Pokemon.id, [Pokemon.id]
+            bound = after[1] if after is not None else None
+        else:
+            key, order = tuple_(sort_column, Pokemon.id), [sort_column, Pokemon.id]
+            bound = tuple_(*after) if after is not None else None
+        
+        condition = None
+        if bound is not None:
+            condition = key < bound if descending else key > bound
+        if descending:
+            order = [column.desc() for column in order]
+        
+        return condition, order
+    
+    @staticmethod
+    def plan(filters=None, search=None, search_fields=None):
+        """
+        Planificador de las consultas del listado: combina la expresión de
+        filtro y la búsqueda de texto en una sola consulta, a la que get_all,
+        get_page y count agregan orden, paginación o conteo
+        
+        Args:
+            filters (dict): Expresión de filtro (ver filter_conditions)
+            search (str): Texto a buscar (cada palabra como prefijo)
+            search_fields (list): Campos de la búsqueda (por defecto nombre y tipos)
+            
+        Returns:
+            tuple: (Query filtrada, columna de relevancia de la búsqueda o None)
+            
+        Raises:
+            ValueError: Si hay filtros desconocidos
+        """
+        conditions, fts, rank = PokemonRepository.plan_conditions(
+            filters, search, search_fields, full_text=bool(search) and FullTextSearch.ensure()
+        )
+        query = Pokemon.query
+        if fts is not None:
+            query = query.join(fts, fts.c.rowid == Pokemon.id)
+        return query.filter(*conditions), rank
+    
+    @staticmethod
+    def plan_conditions(filters=None, search=None, search_fields=None, full_text=True):
+        """
+        Parte del plan que no depende de la sesión (la comparte el repositorio
+        asíncrono). Los filtros de igualdad y rango usan los índices
+        secundarios; la búsqueda usa el índice FTS5 unido por rowid, o LIKE si
+        no está disponible o el texto no tiene palabras
+        
+        Args:
+            filters (dict): Expresión de filtro (ver filter_conditions)
+            search (str): Texto a buscar
+            search_fields (list): Campos de la búsqueda (por defecto nombre y tipos)
+            full_text (bool): El índice FTS5 está disponible
+            
+        Returns:
+            tuple: (condiciones, tabla FTS a unir por rowid o None, columna de relevancia o None)
+            
+        Raises:
+            ValueError: Si hay filtros desconocidos
+        """
+        conditions = PokemonRepository.filter_conditions(filters or {})
+        fields = search_fields or FullTextSearch.COLUMNS
+        fts = rank = None
+        
+        if search:
+            match_query = FullTextSearch.build_match_query(search, fields) if full_text else None
+            if match_query:
+                fts = table(FullTextSearch.TABLE, column('rowid'), column('rank'))
+                conditions.append(literal_column(FullTextSearch.TABLE).match(match_query))
+                rank = fts.c.rank
+            else:
+                pattern = f"%{search}%"
+                conditions.append(or_(*[getattr(Pokemon, field).like(pattern) for field in fields]))
+        
+        return conditions, fts, rank
+    
+    @staticmethod
+    def _projection(columns):
+        """
+        Normaliza la lista de columnas pedidas: se validan contra Pokemon.FIELDS,
+        se respeta el orden de to_dict y siempre se incluye el id
+        
+        Args:
+            columns (list): Columnas pedidas o None
+            
+        Returns:
+            list: Columnas a seleccionar o None para el objeto completo
+        """
+        if not columns:
+            return None
+        
+        unknown = [column for column in columns if column not in Pokemon.FIELDS]
+        if unknown:
+            raise ValueError(f"Campos desconocidos: {', '.join(unknown)}")
+        
+        requested = set(columns) | {'id'}
+        return [field for field in Pokemon.FIELDS if field in requested]
+    
+    @staticmethod
+    def _fetch(query, columns=None):
+        """
+        Ejecuta una consulta del repositorio. Sin columns devuelve objetos Pokemon;
+        con columns ejecuta un SELECT de Core solo con esas columnas (sin crear
+        objetos del ORM) y devuelve diccionarios con el formato de to_dict
+        
+        Args:
+            query (Query): Consulta con filtros, orden y límites
+            columns (list): Columnas a seleccionar
+            
+        Returns:
+            list: Objetos Pokemon o diccionarios con las columnas pedidas
+        """
+        selected = PokemonRepository._projection(columns)
+        if not selected:
+            return query.all()
+        
+        statement = query.with_entities(*[Pokemon.__table__.c[column] for column in selected]).statement
+        return [Pokemon.row_to_dict(row) for row in db.session.execute(statement).mappings()]
+    
+    @staticmethod
+    @Sharding.routes
+    @ReadRouting.reads
     def get_by_id(pokemon_id):
         """
-        Obtiene un Pokemon por su ID
+        Obtiene un Pokemon por su ID (una vez por petición, ver UnitOfWork)
         
         Args:
             pokemon_id (int): ID del Pokemon
@@ -42,15 +251,17 @@ class PokemonRepository:
             Pokemon: Objeto Pokemon o None si no se encuentra
         """
         try:
-            return Pokemon.query.get(pokemon_id)
+            return UnitOfWork.lookup('id', pokemon_id, lambda: Pokemon.query.get(pokemon_id))
         except Exception as e:
             print(f"Error al obtener Pokemon por ID {pokemon_id}: {str(e)}")
             return None
     
     @staticmethod
+    @Sharding.routes
+    @ReadRouting.reads
     def get_by_name(name):
         """
-        Obtiene un Pokemon por su nombre
+        Obtiene un Pokemon por su nombre (una vez por petición, ver UnitOfWork)
         
         Args:
             name (str): Nombre del Pokemon
@@ -59,41 +270,48 @@ class PokemonRepository:
             Pokemon: Objeto Pokemon o None si no se encuentra
         """
         try:
-            return Pokemon.query.filter_by(nombre=name).first()
+            return UnitOfWork.lookup('nombre', name, lambda: Pokemon.query.filter_by(nombre=name).first())
         except Exception as e:
             print(f"Error al obtener Pokemon por nombre {name}: {str(e)}")
             return None
     
     @staticmethod
-    def get_by_type(tipo, is_secondary=False):
+    @Sharding.routes
+    @ReadRouting.reads
+    def get_by_type(tipo, is_secondary=False, columns=None):
         """
         Obtiene Pokemon por tipo
         
         Args:
             tipo (str): Tipo de Pokemon
             is_secondary (bool): Si buscar en tipo secundario
+            columns (list): Solo estas columnas (ver _fetch)
             
         Returns:
             list: Lista de Pokemon del tipo especificado
         """
         try:
             if is_secondary:
-                return Pokemon.query.filter_by(tipo_secundario=tipo).all()
+                query = Pokemon.query.filter_by(tipo_secundario=tipo)
             else:
-                return Pokemon.query.filter(
+                query = Pokemon.query.filter(
                     or_(Pokemon.tipo_principal == tipo, Pokemon.tipo_secundario == tipo)
-                ).all()
+                )
+            return PokemonRepository._fetch(query, columns)
         except Exception as e:
             print(f"Error al obtener Pokemon por tipo {tipo}: {str(e)}")
             return []
     
     @staticmethod
-    def get_legendary(limit=None):
+    @Sharding.routes
+    @ReadRouting.reads
+    def get_legendary(limit=None, columns=None):
         """
         Obtiene Pokemon legendarios
         
         Args:
             limit (int): Número máximo de registros
+            columns (list): Solo estas columnas (ver _fetch)
             
         Returns:
             list: Lista de Pokemon legendarios
@@ -102,36 +320,45 @@ class PokemonRepository:
             query = Pokemon.query.filter_by(es_legendario=True)
             if limit:
                 query = query.limit(limit)
-            return query.all()
+            return PokemonRepository._fetch(query, columns)
         except Exception as e:
             print(f"Error al obtener Pokemon legendarios: {str(e)}")
             return []
     
     @staticmethod
-    def get_by_generation(generation):
+    @Sharding.routes
+    @ReadRouting.reads
+    def get_by_generation(generation, columns=None):
         """
         Obtiene Pokemon por generación
         
         Args:
             generation (int): Número de generación
+            columns (list): Solo estas columnas (ver _fetch)
             
         Returns:
             list: Lista de Pokemon de la generación especificada
         """
         try:
-            return Pokemon.query.filter_by(generacion=generation).all()
+            return PokemonRepository._fetch(Pokemon.query.filter_by(generacion=generation), columns)
         except Exception as e:
             print(f"Error al obtener Pokemon de generación {generation}: {str(e)}")
             return []
     
     @staticmethod
-    def search(query_text, fields=None):
+    @Sharding.routes
+    @ReadRouting.reads
+    def search(query_text, fields=None, limit=None, columns=None):
         """
-        Busca Pokemon por texto en múltiples campos
+        Busca Pokemon por texto en múltiples campos. En SQLite usa el índice FTS5
+        (cada palabra como prefijo, resultados ordenados por relevancia); en otros
+        motores, o si el texto no tiene palabras, busca con LIKE
         
         Args:
             query_text (str): Texto a buscar
             fields (list): Lista de campos donde buscar. Por defecto busca en nombre y tipos
+            limit (int): Número máximo de resultados
+            columns (list): Solo estas columnas (ver _fetch)
             
         Returns:
             list: Lista de Pokemon que coinciden con la búsqueda
@@ -140,6 +367,22 @@ class PokemonRepository:
             if fields is None:
                 fields = ['nombre', 'tipo_principal', 'tipo_secundario']
             
+            match_query = FullTextSearch.build_match_query(query_text, fields)
+            if match_query and FullTextSearch.ensure():
+                table = FullTextSearch.TABLE
+                selected = PokemonRepository._projection(columns)
+                select_list = ', '.join(f'pokemon.{column}' for column in selected) if selected else 'pokemon.*'
+                sql = (f"SELECT {select_list} FROM pokemon JOIN {table} ON {table}.rowid = pokemon.id "
+                       f"WHERE {table} MATCH :query ORDER BY {table}.rank")
+                params = {'query': match_query}
+                if limit:
+                    sql += " LIMIT :limit"
+                    params['limit'] = limit
+                
+                if selected:
+                    return [Pokemon.row_to_dict(row) for row in db.session.execute(text(sql), params).mappings()]
+                return Pokemon.query.from_statement(text(sql)).params(**params).all()
+            
             search_filters = []
             query_text = f"%{query_text}%"
             
@@ -150,19 +393,25 @@ class PokemonRepository:
             if 'tipo_secundario' in fields:
                 search_filters.append(Pokemon.tipo_secundario.like(query_text))
             
-            return Pokemon.query.filter(or_(*search_filters)).all()
+            query = Pokemon.query.filter(or_(*search_filters))
+            if limit:
+                query = query.limit(limit)
+            return PokemonRepository._fetch(query, columns)
         except Exception as e:
             print(f"Error en búsqueda de Pokemon: {str(e)}")
             return []
     
     @staticmethod
-    def get_by_power_range(min_power=None, max_power=None):
+    @Sharding.routes
+    @ReadRouting.reads
+    def get_by_power_range(min_power=None, max_power=None, columns=None):
         """
         Obtiene Pokemon por rango de poder total
         
         Args:
             min_power (int): Poder mínimo
             max_power (int): Poder máximo
+            columns (list): Solo estas columnas (ver _fetch)
             
         Returns:
             list: Lista de Pokemon en el rango de poder especificado
@@ -175,12 +424,57 @@ class PokemonRepository:
             if max_power is not None:
                 query = query.filter(Pokemon.poder_total <= max_power)
                 
-            return query.all()
+            return PokemonRepository._fetch(query, columns)
         except Exception as e:
             print(f"Error al obtener Pokemon por rango de poder: {str(e)}")
             return []
     
     @staticmethod
+    @Sharding.routes
+    def stream(filters=None, columns=None):
+        """
+        Lee los Pokemon que cumplen la expresión de filtro con un cursor del
+        servidor (yield_per de STREAM_BATCH_SIZE registros), sin cargar el
+        resultado completo en memoria. La consulta se prepara y valida al
+        llamar; los registros se leen a medida que se consume el iterador, en
+        su propia conexión (del motor que elija ReadRouting)
+        
+        Args:
+            filters (dict): Expresión de filtro (ver filter_conditions)
+            columns (list): Solo estas columnas (todas si es None)
+            
+        Returns:
+            iterator: Diccionarios con el formato de to_dict
+            
+        Raises:
+            ValueError: Si hay campos o filtros desconocidos
+        """
+        selected = PokemonRepository._projection(columns) or Pokemon.FIELDS
+        statement = (select(*[Pokemon.__table__.c[column] for column in selected])
+                     .where(*PokemonRepository.filter_conditions(filters or {})))
+        return PokemonRepository._stream_rows(ReadRouting.choose_engine() or db.engine, statement)
+    
+    @staticmethod
+    def _stream_rows(engine, statement):
+        """
+        Ejecuta una consulta con un cursor del servidor y devuelve sus filas
+        como diccionarios (la comparte el repositorio particionado). La conexión
+        se libera al agotar o cerrar el iterador
+        
+        Args:
+            engine (Engine): Motor en el que se ejecuta
+            statement (Select): Consulta de Core
+            
+        Returns:
+            iterator: Diccionarios con el formato de to_dict
+        """
+        with engine.connect() as connection:
+            result = connection.execution_options(yield_per=Config.STREAM_BATCH_SIZE).execute(statement)
+            for row in result.mappings():
+                yield Pokemon.row_to_dict(row)
+    
+    @staticmethod
+    @Sharding.routes
     def create(pokemon_data):
         """
         Crea un nuevo Pokemon
@@ -203,16 +497,58 @@ class PokemonRepository:
                 print(f"Errores de validación: {errors}")
                 return None
             
+            # El resumen de estadísticas se actualiza en la misma transacción
             db.session.add(pokemon)
-            db.session.commit()
+            db.session.flush()
+            PokemonStatsRepository.apply_changes(added=[PokemonStatsRepository.snapshot(pokemon)])
+            DataVersionRepository.bump(db.session.connection())
+            PokemonRepository._commit(written=[pokemon])
+            CountCache.invalidate()
+            UnitOfWork.invalidate(written=[pokemon])
+            ReadRouting.record_write()
             
             return pokemon
         except Exception as e:
             db.session.rollback()
+            UnitOfWork.invalidate()
             print(f"Error al crear Pokemon: {str(e)}")
             return None
     
     @staticmethod
+    def _get_for_write(pokemon_id):
+        """
+        Carga un Pokemon para modificarlo, siempre desde la base principal
+        aunque una lectura previa lo trajera de una réplica. Si ya se cargó de
+        la principal en esta petición (por ejemplo, al verificar que existe) no
+        se vuelve a consultar
+        
+        Args:
+            pokemon_id (int): ID del Pokemon
+            
+        Returns:
+            Pokemon: Objeto Pokemon o None si no existe
+        """
+        return UnitOfWork.lookup('id', pokemon_id,
+                                 lambda: db.session.get(Pokemon, pokemon_id, populate_existing=True))
+    
+    @staticmethod
+    def _commit(written=()):
+        """
+        Confirma la sesión. Los Pokemon escritos conservan los valores que se
+        acaban de confirmar en lugar de expirar, así la respuesta no los vuelve
+        a leer de la base de datos
+        
+        Args:
+            written (list): Pokemon creados o actualizados en la transacción
+        """
+        committed = [(pokemon, pokemon._values()) for pokemon in written]
+        db.session.commit()
+        for pokemon, values in committed:
+            for column, value in values.items():
+                set_committed_value(pokemon, column, value)
+    
+    @staticmethod
+    @Sharding.routes
     def update(pokemon_id, pokemon_data):
         """
         Actualiza un Pokemon existente
@@ -225,10 +561,12 @@ class PokemonRepository:
             Pokemon: Objeto Pokemon actualizado o None si hay error
         """
         try:
-            pokemon = Pokemon.query.get(pokemon_id)
+            pokemon = PokemonRepository._get_for_write(pokemon_id)
             if not pokemon:
                 return None
             
+            previous = PokemonStatsRepository.snapshot(pokemon)
+            
             # Actualizar campos
             for key, value in pokemon_data.items():
                 if hasattr(pokemon, key) and key != 'id':
@@ -243,14 +581,22 @@ class PokemonRepository:
                 print(f"Errores de validación: {errors}")
                 return None
             
-            db.session.commit()
+            db.session.flush()
+            PokemonStatsRepository.apply_changes(removed=[previous], added=[PokemonStatsRepository.snapshot(pokemon)])
+            DataVersionRepository.bump(db.session.connection())
+            PokemonRepository._commit(written=[pokemon])
+            CountCache.invalidate()
+            UnitOfWork.invalidate(written=[pokemon])
+            ReadRouting.record_write()
             return pokemon
         except Exception as e:
             db.session.rollback()
+            UnitOfWork.invalidate()
             print(f"Error al actualizar Pokemon {pokemon_id}: {str(e)}")
             return None
     
     @staticmethod
+    @Sharding.routes
     def delete(pokemon_id):
         """
         Elimina un Pokemon
@@ -262,94 +608,470 @@ class PokemonRepository:
             bool: True si se eliminó correctamente, False en caso contrario
         """
         try:
-            pokemon = Pokemon.query.get(pokemon_id)
+            pokemon = PokemonRepository._get_for_write(pokemon_id)
             if not pokemon:
                 return False
             
+            previous = PokemonStatsRepository.snapshot(pokemon)
             db.session.delete(pokemon)
+            db.session.flush()
+            PokemonStatsRepository.apply_changes(removed=[previous])
+            DataVersionRepository.bump(db.session.connection())
             db.session.commit()
+            CountCache.invalidate()
+            UnitOfWork.invalidate(deleted=[(previous['id'], previous['nombre'])])
+            ReadRouting.record_write()
             return True
         except Exception as e:
             db.session.rollback()
+            UnitOfWork.invalidate()
             print(f"Error al eliminar Pokemon {pokemon_id}: {str(e)}")
             return False
     
     @staticmethod
-    def count():
+    def filter_conditions(filters):
+        """
+        Convierte una expresión de filtro en condiciones SQL. Cada clave es un
+        campo de FILTER_FIELDS (un valor o una lista de valores; 'tipo' busca en
+        ambos tipos) o un campo de RANGE_FIELDS con sufijo _min o _max
+        
+        Args:
+            filters (dict): Expresión de filtro, ej: {'tipo': 'Fire', 'poder_total_min': 500}
+            
+        Returns:
+            list: Condiciones para combinar con and_
+            
+        Raises:
+            ValueError: Si hay campos desconocidos
+        """
+        conditions = []
+        unknown = []
+        
+        for key, value in filters.items():
+            if key in PokemonRepository.FILTER_FIELDS:
+                values = value if isinstance(value, list) else [value]
+                if key == 'tipo':
+                    conditions.append(or_(Pokemon.tipo_principal.in_(values), Pokemon.tipo_secundario.in_(values)))
+                else:
+                    conditions.append(getattr(Pokemon, key).in_(values))
+            elif key.endswith('_min') and key[:-4] in PokemonRepository.RANGE_FIELDS:
+                conditions.append(getattr(Pokemon, key[:-4]) >= value)
+            elif key.endswith('_max') and key[:-4] in PokemonRepository.RANGE_FIELDS:
+                conditions.append(getattr(Pokemon, key[:-4]) <= value)
+            else:
+                unknown.append(key)
+        
+        if unknown:
+            raise ValueError(f"Filtros desconocidos: {', '.join(unknown)}")
+        
+        return conditions
+    
+    @staticmethod
+    def _bulk_where(ids=None, filters=None):
         """
-        Cuenta el total de Pokemon en la base de datos
+        Condición WHERE de una escritura masiva: lista de ids y/o expresión de filtro
         
+        Args:
+            ids (list): IDs de los Pokemon
+            filters (dict): Expresión de filtro (ver filter_conditions)
+            
+        Returns:
+            ColumnElement: Condición combinada
+            
+        Raises:
+            ValueError: Sin ids ni filtros (afectaría a toda la tabla)
+        """
+        conditions = PokemonRepository.filter_conditions(filters or {})
+        if ids is not None:
+            conditions.append(Pokemon.id.in_(ids))
+        
+        if not conditions:
+            raise ValueError("Se requieren ids o filtros")
+        
+        return and_(*conditions)
+    
+    @staticmethod
+    @Sharding.routes
+    def update_many(changes, ids=None, filters=None):
+        """
+        Actualiza todos los Pokemon que cumplen la condición con un solo UPDATE.
+        Los campos derivados se recalculan en la misma sentencia (ver
+        Pokemon.derived_expressions) y el resumen de estadísticas se actualiza
+        en la misma transacción solo si cambian columnas que lo afectan
+        
+        Args:
+            changes (dict): Nuevos valores (columnas de BULK_UPDATE_FIELDS)
+            ids (list): IDs de los Pokemon
+            filters (dict): Expresión de filtro (ver filter_conditions)
+            
+        Returns:
+            list: IDs actualizados
+            
+        Raises:
+            ValueError: Si la condición o los cambios no son válidos
+            Exception: Si falla la actualización (la transacción se revierte)
+        """
+        unknown = [column for column in changes if column not in PokemonRepository.BULK_UPDATE_FIELDS]
+        if unknown or not changes:
+            raise ValueError(f"Campos que no se pueden actualizar en lote: {', '.join(unknown) or 'ninguno'}")
+        
+        table = Pokemon.__table__
+        where = PokemonRepository._bulk_where(ids, filters)
+        snapshot_columns = [table.c[field] for field in PokemonStatsRepository.SNAPSHOT_FIELDS]
+        tracked = PokemonStatsRepository.affects_summary(changes)
+        
+        values = dict(changes)
+        values.update(Pokemon.derived_expressions(changes))
+        
+        try:
+            previous = []
+            if tracked:
+                previous = [dict(row) for row in db.session.execute(select(*snapshot_columns).where(where)).mappings()]
+            
+            statement = update(table).where(where).values(values).returning(*snapshot_columns)
+            updated = [dict(row) for row in db.session.execute(statement).mappings()]
+            
+            if tracked and updated:
+                PokemonStatsRepository.apply_changes(removed=previous, added=updated)
+            DataVersionRepository.bump(db.session.connection())
+            db.session.commit()
+            CountCache.invalidate()
+            UnitOfWork.invalidate()
+            ReadRouting.record_write()
+        except Exception as e:
+            db.session.rollback()
+            UnitOfWork.invalidate()
+            print(f"Error en la actualización masiva: {str(e)}")
+            raise
+        
+        return [row['id'] for row in updated]
+    
+    @staticmethod
+    @Sharding.routes
+    def delete_many(ids=None, filters=None):
+        """
+        Elimina todos los Pokemon que cumplen la condición con un solo DELETE
+        (RETURNING entrega lo necesario para actualizar el resumen de estadísticas)
+        
+        Args:
+            ids (list): IDs de los Pokemon
+            filters (dict): Expresión de filtro (ver filter_conditions)
+            
+        Returns:
+            list: IDs eliminados
+            
+        Raises:
+            ValueError: Si la condición no es válida
+            Exception: Si falla la eliminación (la transacción se revierte)
+        """
+        table = Pokemon.__table__
+        where = PokemonRepository._bulk_where(ids, filters)
+        statement = delete(table).where(where).returning(
+            *[table.c[field] for field in PokemonStatsRepository.SNAPSHOT_FIELDS]
+        )
+        
+        try:
+            removed = [dict(row) for row in db.session.execute(statement).mappings()]
+            if removed:
+                PokemonStatsRepository.apply_changes(removed=removed)
+            DataVersionRepository.bump(db.session.connection())
+            db.session.commit()
+            CountCache.invalidate()
+            UnitOfWork.invalidate()
+            ReadRouting.record_write()
+        except Exception as e:
+            db.session.rollback()
+            UnitOfWork.invalidate()
+            print(f"Error en la eliminación masiva: {str(e)}")
+            raise
+        
+        return [row['id'] for row in removed]
+    
+    @staticmethod
+    @Sharding.routes
+    @ReadRouting.reads
+    def count(filters=None, search=None):
+        """
+        Cuenta el total de Pokemon en la base de datos. El resultado se guarda
+        en CountCache por combinación de filtros hasta la siguiente escritura
+        
+        Args:
+            filters (dict): Expresión de filtro (ver filter_conditions)
+            search (str): Texto a buscar en nombre y tipos (ver plan)
+            
         Returns:
             int: Número total de Pokemon
         """
         try:
-            return Pokemon.query.count()
+            key = CountCache.make_key(str(db.engine.url), filters, search)
+            cached = CountCache.get(key)
+            if cached is not None:
+                return cached
+            
+            generation = CountCache.generation()
+            query, _ = PokemonRepository.plan(filters, search)
+            total = query.count()
+            CountCache.set(key, total, generation)
+            return total
         except Exception as e:
             print(f"Error al contar Pokemon: {str(e)}")
             return 0
     
     @staticmethod
+    @Sharding.routes
+    @ReadRouting.reads
     def get_statistics():
         """
-        Obtiene estadísticas generales de los Pokemon
+        Obtiene estadísticas generales de los Pokemon (una sola consulta agregada)
         
         Returns:
             dict: Estadísticas de la base de datos
         """
         try:
+            row = db.session.query(
+                func.count(),
+                func.sum(case((Pokemon.es_legendario == True, 1), else_=0)),
+                func.sum(case((Pokemon.es_mega == True, 1), else_=0)),
+                func.count(distinct(Pokemon.generacion)),
+                func.count(distinct(Pokemon.tipo_principal)),
+                func.avg(Pokemon.poder_total)
+            ).one()
+            
             stats = {
-                'total_pokemon': Pokemon.query.count(),
-                'pokemon_legendarios': Pokemon.query.filter_by(es_legendario=True).count(),
-                'pokemon_mega': Pokemon.query.filter_by(es_mega=True).count(),
-                'generaciones': db.session.query(Pokemon.generacion).distinct().count(),
-                'tipos_principales': db.session.query(Pokemon.tipo_principal).distinct().count(),
-                'poder_promedio': db.session.query(db.func.avg(Pokemon.poder_total)).scalar() or 0
+                'total_pokemon': row[0],
+                'pokemon_legendarios': row[1] or 0,
+                'pokemon_mega': row[2] or 0,
+                'generaciones': row[3],
+                'tipos_principales': row[4],
+                'poder_promedio': round(float(row[5] or 0), 2)
             }
             
-            # Redondear el poder promedio
-            stats['poder_promedio'] = round(stats['poder_promedio'], 2)
-            
             return stats
         except Exception as e:
             print(f"Error al obtener estadísticas: {str(e)}")
             return {}
     
+    @staticmethod
+    @Sharding.routes
+    @ReadRouting.reads
+    def get_distribution(column):
+        """
+        Cuenta los Pokemon agrupados por una columna (GROUP BY en la base de datos)
+        
+        Args:
+            column (str): Columna por la que se agrupa (ej: 'tipo_principal')
+            
+        Returns:
+            list: Tuplas (valor, cantidad) ordenadas por cantidad descendente
+        """
+        try:
+            group_column = getattr(Pokemon, column)
+            total = func.count()
+            return [tuple(row) for row in db.session.query(group_column, total)
+                    .group_by(group_column).order_by(total.desc(), group_column).all()]
+        except Exception as e:
+            print(f"Error al obtener distribución por {column}: {str(e)}")
+            return []
+    
+    @staticmethod
+    @Sharding.routes
+    @ReadRouting.reads
+    def get_column_statistics(column):
+        """
+        Calcula promedio, mediana, máximo, mínimo y desviación estándar (muestral)
+        de una columna numérica en la base de datos. La desviación se obtiene de la
+        suma y la suma de cuadrados, y la mediana leyendo solo las filas centrales
+        
+        Args:
+            column (str): Columna numérica (ej: 'poder_total')
+            
+        Returns:
+            dict: Estadísticas de la columna (None si no hay registros)
+        """
+        try:
+            value = getattr(Pokemon, column)
+            count, total, total_squares, maximum, minimum = db.session.query(
+                func.count(value), func.sum(value), func.sum(value * value), func.max(value), func.min(value)
+            ).one()
+            
+            if not count:
+                return {'promedio': None, 'mediana': None, 'maximo': None, 'minimo': None,
+                        'desviacion_estandar': None}
+            
+            # Filas centrales: una si count es impar, dos si es par
+            middle = [row[0] for row in db.session.query(value).filter(value.isnot(None))
+                      .order_by(value).offset((count - 1) // 2).limit(2 - count % 2)]
+            
+            std = None
+            if count > 1:
+                variance = (count * total_squares - total * total) / (count * (count - 1))
+                std = max(variance, 0) ** 0.5
+            
+            return {
+                'promedio': total / count,
+                'mediana': sum(middle) / len(middle),
+                'maximo': maximum,
+                'minimo': minimum,
+                'desviacion_estandar': std
+            }
+        except Exception as e:
+            print(f"Error al obtener estadísticas de {column}: {str(e)}")
+            return {}
+    
+    @staticmethod
+    @Sharding.routes
+    @ReadRouting.reads
+    def get_top(column, limit=5, fields=('nombre',)):
+        """
+        Obtiene los registros con el mayor valor de una columna (en empate, el
+        de menor id)
+        
+        Args:
+            column (str): Columna por la que se ordena
+            limit (int): Número de registros
+            fields (tuple): Columnas a devolver además de column
+            
+        Returns:
+            list: Diccionarios con fields y column
+        """
+        try:
+            value = getattr(Pokemon, column)
+            columns = [getattr(Pokemon, field) for field in fields] + [value]
+            rows = db.session.query(*columns).order_by(value.desc(), Pokemon.id).limit(limit)
+            return [dict(row._mapping) for row in rows]
+        except Exception as e:
+            print(f"Error al obtener top de {column}: {str(e)}")
+            return []
+    
+    @staticmethod
+    @Sharding.routes
+    def get_statistics_summary():
+        """
+        Obtiene el resumen materializado de estadísticas (ver PokemonStatsRepository)
+        
+        Returns:
+            PokemonStatsSummary: Resumen actual
+        """
+        return PokemonStatsRepository.get_or_rebuild()
+    
+    @staticmethod
+    @Sharding.routes
+    def verify_statistics():
+        """
+        Compara el resumen materializado con un recálculo completo
+        
+        Returns:
+            dict: {'consistente': bool, 'diferencias': {...}}
+        """
+        return PokemonStatsRepository.verify()
+    
     @staticmethod
     def bulk_create(pokemon_list):
         """
-        Crea múltiples Pokemon de una vez
+        Crea múltiples Pokemon de una vez: arma y valida los registros sin crear
+        objetos del ORM y los inserta con insert_records
         
         Args:
             pokemon_list (list): Lista de diccionarios con datos de Pokemon
             
         Returns:
-            tuple: (Lista de Pokemon creados, Lista de errores)
+            tuple: (Lista de registros creados con su id, Lista de errores)
         """
-        created_pokemon = []
+        records = []
         errors = []
         
+        for pokemon_data in pokemon_list:
+            try:
+                record = Pokemon.build_record(pokemon_data)
+                validation_errors = Pokemon.validate_record(record)
+                if validation_errors:
+                    errors.append(f"Pokemon {pokemon_data.get('nombre', 'sin nombre')}: {validation_errors}")
+                    continue
+                records.append(record)
+            except Exception as e:
+                errors.append(f"Error con Pokemon {pokemon_data.get('nombre', 'sin nombre')}: {str(e)}")
+        
+        if not records:
+            return [], errors
+        
         try:
-            for pokemon_data in pokemon_list:
-                try:
-                    pokemon = Pokemon.from_dict(pokemon_data)
-                    pokemon.calculate_fields()
-                    
-                    validation_errors = pokemon.validate()
-                    if validation_errors:
-                        errors.append(f"Pokemon {pokemon_data.get('nombre', 'sin nombre')}: {validation_errors}")
-                        continue
-                    
-                    db.session.add(pokemon)
-                    created_pokemon.append(pokemon)
-                    
-                except Exception as e:
-                    errors.append(f"Error con Pokemon {pokemon_data.get('nombre', 'sin nombre')}: {str(e)}")
+            PokemonRepository.insert_records(records)
+        except Exception as e:
+            errors.append(f"Error en la transacción: {str(e)}")
+            records = []
+        
+        return records, errors
+    
+    @staticmethod
+    @Sharding.routes
+    def insert_records(records, batch_size=None):
+        """
+        Inserta registros ya validados (ver Pokemon.build_record) en una sola
+        transacción con insert() por lotes, junto con el resumen de estadísticas.
+        Los registros reciben el id asignado
+        
+        Args:
+            records (list): Valores de columna de cada Pokemon
+            batch_size (int): Registros por lote (por defecto Config.ETL_BATCH_SIZE)
             
-            db.session.commit()
+        Returns:
+            list: ids asignados, en el mismo orden que records
             
+        Raises:
+            Exception: Si falla la inserción (la transacción se revierte completa)
+        """
+        table = Pokemon.__table__
+        batch_size = batch_size or Config.ETL_BATCH_SIZE
+        # sort_by_parameter_order haría que SQLite ejecute un INSERT por fila:
+        # los ids se asocian por nombre, que es único
+        statement = insert(table).returning(table.c.id, table.c.nombre)
+        
+        try:
+            ids_by_name = {}
+            for start in range(0, len(records), batch_size):
+                batch = records[start:start + batch_size]
+                ids_by_name.update((nombre, pokemon_id) for pokemon_id, nombre in db.session.execute(statement, batch))
+            ids = [ids_by_name[record['nombre']] for record in records]
+            
+            PokemonStatsRepository.apply_changes(
+                added=[dict(PokemonStatsRepository.snapshot(record), id=pokemon_id)
+                       for record, pokemon_id in zip(records, ids)]
+            )
+            DataVersionRepository.bump(db.session.connection())
+            db.session.commit()
+            CountCache.invalidate()
+            UnitOfWork.invalidate()
+            ReadRouting.record_write()
         except Exception as e:
             db.session.rollback()
-            errors.append(f"Error en la transacción: {str(e)}")
-            created_pokemon = []
+            UnitOfWork.invalidate()
+            print(f"Error en la inserción masiva: {str(e)}")
+            raise
+        
+        for record, pokemon_id in zip(records, ids):
+            record['id'] = pokemon_id
+        return ids
+    
+    @staticmethod
+    @Sharding.routes
+    def find_existing(column, values):
+        """
+        Busca cuáles de los valores ya existen en una columna (una consulta IN
+        por cada 500 valores)
+        
+        Args:
+            column (str): Columna única, 'id' o 'nombre'
+            values (list): Valores a buscar
+            
+        Returns:
+            set: Valores que ya existen
+        """
+        target = getattr(Pokemon, column)
+        values = list(dict.fromkeys(value for value in values if value is not None))
+        existing = set()
+        
+        for start in range(0, len(values), 500):
+            chunk = values[start:start + 500]
+            existing.update(db.session.execute(select(target).where(target.in_(chunk))).scalars())
         
-        return created_pokemon, errors
+        return existing
@@ -0,0 +1,764 @@
+import heapq
+import itertools
+from collections import Counter, defaultdict
+from datetime import datetime
+from sqlalchemy import or_, select, insert, update, delete, func
+from Models.Pokemon import Pokemon
+from Models.PokemonStats import PokemonStatsSummary
+from Config.Config import Config
+from Repositories.CountCache import CountCache
+from Repositories.DataVersionRepository import DataVersionRepository
+from Repositories.PokemonStatsRepository import PokemonStatsRepository
+from Repositories.ReadRouting import ReadRouting
+from Repositories.Repositories import PokemonRepository
+from Repositories.Sharding import Sharding
+from Repositories.UnitOfWork import UnitOfWork
+
+class ShardedPokemonRepository:
+    """
+    PokemonRepository sobre particiones (ver Sharding): mismos métodos y
+    resultados. Las consultas que fijan la clave de partición van directo a
+    su partición; las demás se ejecutan en todas al mismo tiempo y se mezclan
+    los resultados ya ordenados de cada una
+    """
+    
+    @staticmethod
+    def _run(shard, selected, conditions, fts=None, order=(), limit=None):
+        """
+        Ejecuta una consulta en una partición. Cada resultado lleva su clave de
+        orden (los valores descendentes se niegan) para mezclarlo con los demás
+        
+        Args:
+            shard (Shard): Partición
+            selected (list): Columnas (ver PokemonRepository._projection) o None para objetos
+            conditions (list): Condiciones WHERE
+            fts (Table): Tabla FTS a unir por rowid o None
+            order (list): [(expresión, descendente), ...]
+            limit (int): Máximo de registros de la partición
+            
+        Returns:
+            list: Pares (clave de orden, Pokemon o diccionario)
+        """
+        table = Pokemon.__table__
+        keys = [expression.label(f'_orden_{index}') for index, (expression, _) in enumerate(order)]
+        entities = [table.c[column] for column in selected] if selected else [Pokemon]
+        source = table.join(fts, fts.c.rowid == table.c.id) if fts is not None else table
+        
+        statement = (select(*entities, *keys).select_from(source).where(*conditions)
+                     .order_by(*[expression.desc() if descending else expression for expression, descending in order]))
+        if limit:
+            statement = statement.limit(limit)
+        
+        with shard.session() as session:
+            rows = session.execute(statement).all()
+        
+        results = []
+        width = len(entities)
+        for row in rows:
+            key = tuple(-value if descending else value
+                        for value, (_, descending) in zip(row[width:], order))
+            item = Pokemon.row_to_dict(dict(zip(selected, row[:width]))) if selected else row[0]
+            results.append((key, item))
+        return results
+    
+    @staticmethod
+    def _query(shards, columns, conditions, fts=None, order=None, limit=None, offset=None):
+        """
+        Consulta varias particiones al mismo tiempo y mezcla sus resultados
+        (cada partición devuelve a lo sumo offset + limit registros)
+        
+        Args:
+            shards (list): Particiones a consultar
+            columns (list): Solo estas columnas (ver PokemonRepository._projection)
+            conditions (list): Condiciones WHERE
+            fts (Table): Tabla FTS a unir por rowid o None
+            order (list): [(expresión, descendente), ...] (por defecto el id)
+            limit (int): Número máximo de registros
+            offset (int): Registros a saltar
+            
+        Returns:
+            list: Objetos Pokemon o diccionarios, en el orden pedido
+        """
+        shard_set = Sharding.active()
+        selected = PokemonRepository._projection(columns)
+        order = order or [(Pokemon.id, False)]
+        offset = offset or 0
+        per_shard = offset + limit if limit else None
+        
+        parts = shard_set.scatter(
+            lambda shard: ShardedPokemonRepository._run(shard, selected, conditions, fts, order, per_shard),
+            shards
+        )
+        merged = [item for _, item in heapq.merge(*parts, key=lambda pair: pair[0])]
+        return merged[offset:offset + limit] if limit else merged[offset:]
+    
+    @staticmethod
+    def _plan(filters=None, search=None, search_fields=None):
+        """
+        Plan de una consulta del listado (ver PokemonRepository.plan_conditions)
+        
+        Returns:
+            tuple: (condiciones, tabla FTS o None, columna de relevancia o None)
+        """
+        full_text = bool(search) and Sharding.active().full_text
+        return PokemonRepository.plan_conditions(filters, search, search_fields, full_text=full_text)
+    
+    @staticmethod
+    def _written(written=(), deleted=()):
+        """
+        Avanza la versión de los datos (en la base principal, después de que
+        confirman las particiones) e invalida las cachés
+        """
+        with Sharding.active().primary_engine.begin() as conn:
+            DataVersionRepository.bump(conn)
+        CountCache.invalidate()
+        UnitOfWork.invalidate(written=written, deleted=deleted)
+        ReadRouting.record_write()
+    
+    @staticmethod
+    def get_all(limit=None, offset=None, columns=None, filters=None, search=None):
+        """Ver PokemonRepository.get_all"""
+        try:
+            conditions, fts, rank = ShardedPokemonRepository._plan(filters, search)
+            order = ([(rank, False)] if rank is not None else []) + [(Pokemon.id, False)]
+            shards = Sharding.active().shards_for(filters)
+            return ShardedPokemonRepository._query(shards, columns, conditions, fts, order, limit, offset)
+        except Exception as e:
+            print(f"Error al obtener todos los Pokemon: {str(e)}")
+            return []
+    
+    @staticmethod
+    def get_page(limit, sort_by='id', descending=False, after=None, columns=None, filters=None, search=None):
+        """Ver PokemonRepository.get_page"""
+        try:
+            if sort_by not in PokemonRepository.SORTABLE_COLUMNS:
+                raise ValueError(f"No se puede ordenar por '{sort_by}'")
+            
+            conditions, fts, _ = ShardedPokemonRepository._plan(filters, search)
+            condition, _ = PokemonRepository.keyset(sort_by, descending, after)
+            if condition is not None:
+                conditions.append(condition)
+            
+            order = [(Pokemon.id, descending)]
+            if sort_by != 'id':
+                order.insert(0, (getattr(Pokemon, sort_by), descending))
+            if columns and sort_by not in columns:
+                columns = list(columns) + [sort_by]
+            
+            shards = Sharding.active().shards_for(filters)
+            return ShardedPokemonRepository._query(shards, columns, conditions, fts, order, limit)
+        except Exception as e:
+            print(f"Error al obtener página de Pokemon: {str(e)}")
+            return []
+    
+    @staticmethod
+    def count(filters=None, search=None):
+        """Ver PokemonRepository.count (la suma de los conteos de cada partición)"""
+        try:
+            shard_set = Sharding.active()
+            key = CountCache.make_key(shard_set.key, filters, search)
+            cached = CountCache.get(key)
+            if cached is not None:
+                return cached
+            
+            generation = CountCache.generation()
+            conditions, fts, _ = ShardedPokemonRepository._plan(filters, search)
+            table = Pokemon.__table__
+            source = table.join(fts, fts.c.rowid == table.c.id) if fts is not None else table
+            statement = select(func.count()).select_from(source).where(*conditions)
+            
+            def count_shard(shard):
+                with shard.session() as session:
+                    return session.execute(statement).scalar()
+            
+            total = sum(shard_set.scatter(count_shard, shard_set.shards_for(filters)))
+            CountCache.set(key, total, generation)
+            return total
+        except Exception as e:
+            print(f"Error al contar Pokemon: {str(e)}")
+            return 0
+    
+    @staticmethod
+    def _find(conditions, shards=None):
+        """
+        Primer Pokemon que cumple las condiciones en cualquiera de las particiones
+        
+        Returns:
+            Pokemon: Objeto Pokemon o None
+        """
+        shard_set = Sharding.active()
+        found = ShardedPokemonRepository._query(shard_set.shards if shards is None else shards,
+                                                None, conditions, limit=1)
+        return found[0] if found else None
+    
+    @staticmethod
+    def get_by_id(pokemon_id):
+        """Ver PokemonRepository.get_by_id (con SHARD_BY=id se consulta solo su partición)"""
+        try:
+            shards = Sharding.active().shards_for(ids=[pokemon_id])
+            return UnitOfWork.lookup('id', pokemon_id,
+                                     lambda: ShardedPokemonRepository._find([Pokemon.id == pokemon_id], shards))
+        except Exception as e:
+            print(f"Error al obtener Pokemon por ID {pokemon_id}: {str(e)}")
+            return None
+    
+    @staticmethod
+    def get_by_name(name):
+        """Ver PokemonRepository.get_by_name"""
+        try:
+            return UnitOfWork.lookup('nombre', name,
+                                     lambda: ShardedPokemonRepository._find([Pokemon.nombre == name]))
+        except Exception as e:
+            print(f"Error al obtener Pokemon por nombre {name}: {str(e)}")
+            return None
+    
+    @staticmethod
+    def get_by_type(tipo, is_secondary=False, columns=None):
+        """Ver PokemonRepository.get_by_type"""
+        try:
+            if is_secondary:
+                conditions = [Pokemon.tipo_secundario == tipo]
+            else:
+                conditions = [or_(Pokemon.tipo_principal == tipo, Pokemon.tipo_secundario == tipo)]
+            return ShardedPokemonRepository._query(Sharding.active().shards, columns, conditions)
+        except Exception as e:
+            print(f"Error al obtener Pokemon por tipo {tipo}: {str(e)}")
+            return []
+    
+    @staticmethod
+    def get_legendary(limit=None, columns=None):
+        """Ver PokemonRepository.get_legendary"""
+        try:
+            return ShardedPokemonRepository._query(Sharding.active().shards, columns,
+                                                   [Pokemon.es_legendario == True], limit=limit)
+        except Exception as e:
+            print(f"Error al obtener Pokemon legendarios: {str(e)}")
+            return []
+    
+    @staticmethod
+    def get_by_generation(generation, columns=None):
+        """Ver PokemonRepository.get_by_generation (con SHARD_BY=generacion, una sola partición)"""
+        try:
+            shards = Sharding.active().shards_for({'generacion': generation})
+            return ShardedPokemonRepository._query(shards, columns, [Pokemon.generacion == generation])
+        except Exception as e:
+            print(f"Error al obtener Pokemon de generación {generation}: {str(e)}")
+            return []
+    
+    @staticmethod
+    def search(query_text, fields=None, limit=None, columns=None):
+        """
+        Ver PokemonRepository.search. La relevancia de FTS5 se calcula en cada
+        partición con sus propias frecuencias, así que el orden entre
+        particiones es aproximado
+        """
+        try:
+            conditions, fts, rank = ShardedPokemonRepository._plan(None, query_text, fields)
+            order = ([(rank, False)] if rank is not None else []) + [(Pokemon.id, False)]
+            return ShardedPokemonRepository._query(Sharding.active().shards, columns, conditions, fts, order, limit)
+        except Exception as e:
+            print(f"Error en búsqueda de Pokemon: {str(e)}")
+            return []
+    
+    @staticmethod
+    def get_by_power_range(min_power=None, max_power=None, columns=None):
+        """Ver PokemonRepository.get_by_power_range"""
+        try:
+            conditions = []
+            if min_power is not None:
+                conditions.append(Pokemon.poder_total >= min_power)
+            if max_power is not None:
+                conditions.append(Pokemon.poder_total <= max_power)
+            return ShardedPokemonRepository._query(Sharding.active().shards, columns, conditions)
+        except Exception as e:
+            print(f"Error al obtener Pokemon por rango de poder: {str(e)}")
+            return []
+    
+    @staticmethod
+    def stream(filters=None, columns=None):
+        """
+        Ver PokemonRepository.stream. Las particiones se leen una detrás de
+        otra, cada una con su cursor, así que solo hay una conexión abierta a
+        la vez (sin orden entre particiones, como la versión sin particiones)
+        """
+        selected = PokemonRepository._projection(columns) or Pokemon.FIELDS
+        statement = (select(*[Pokemon.__table__.c[column] for column in selected])
+                     .where(*PokemonRepository.filter_conditions(filters or {})))
+        return itertools.chain.from_iterable(
+            PokemonRepository._stream_rows(shard.engine, statement)
+            for shard in Sharding.active().shards_for(filters)
+        )
+    
+    @staticmethod
+    def create(pokemon_data):
+        """
+        Ver PokemonRepository.create. El id sale de la secuencia global y el
+        nombre se comprueba en todas las particiones (cada una solo garantiza
+        que sea único dentro de ella)
+        """
+        try:
+            shard_set = Sharding.active()
+            pokemon = Pokemon.from_dict(pokemon_data)
+            pokemon.calculate_fields()
+            
+            errors = pokemon.validate()
+            if errors:
+                print(f"Errores de validación: {errors}")
+                return None
+            
+            if ShardedPokemonRepository._find([Pokemon.nombre == pokemon.nombre]) is not None:
+                print(f"Error al crear Pokemon: el nombre {pokemon.nombre} ya existe")
+                return None
+            
+            if pokemon.id is None:
+                pokemon.id = shard_set.allocate_ids(1)[0]
+            else:
+                shard_set.reserve_ids([pokemon.id])
+            
+            with shard_set.shard_for(pokemon).session() as session:
+                session.add(pokemon)
+                session.flush()
+                PokemonStatsRepository.apply_changes(added=[PokemonStatsRepository.snapshot(pokemon)], session=session)
+                session.commit()
+            
+            ShardedPokemonRepository._written(written=[pokemon])
+            return pokemon
+        except Exception as e:
+            UnitOfWork.invalidate()
+            print(f"Error al crear Pokemon: {str(e)}")
+            return None
+    
+    @staticmethod
+    def _move(shard_set, rows, source):
+        """
+        Lleva a su partición los registros que quedaron en otra después de
+        cambiar la clave de partición: primero se insertan en la nueva y luego
+        se eliminan de la anterior, cada paso con su resumen de estadísticas
+        
+        Args:
+            shard_set (ShardSet): Particiones (se llama también desde los hilos del pool)
+            rows (list): Valores de columna completos de los registros
+            source (Shard): Partición donde están ahora
+        """
+        table = Pokemon.__table__
+        by_target = defaultdict(list)
+        for row in rows:
+            by_target[shard_set.shard_for(row).index].append(row)
+        
+        def insert_rows(target):
+            with target.session() as session:
+                session.execute(insert(table), by_target[target.index])
+                PokemonStatsRepository.apply_changes(
+                    added=[PokemonStatsRepository.snapshot(row) for row in by_target[target.index]], session=session
+                )
+                session.commit()
+        
+        shard_set.scatter(insert_rows, [shard for shard in shard_set.shards if shard.index in by_target])
+        
+        with source.session() as session:
+            session.execute(delete(table).where(table.c.id.in_([row['id'] for row in rows])))
+            PokemonStatsRepository.apply_changes(
+                removed=[PokemonStatsRepository.snapshot(row) for row in rows], session=session
+            )
+            session.commit()
+    
+    @staticmethod
+    def update(pokemon_id, pokemon_data):
+        """
+        Ver PokemonRepository.update. Si cambia la generación (con
+        SHARD_BY=generacion) el registro se mueve de partición
+        """
+        try:
+            shard_set = Sharding.active()
+            for source in shard_set.shards_for(ids=[pokemon_id]):
+                with source.session() as session:
+                    pokemon = session.get(Pokemon, pokemon_id)
+                    if pokemon is None:
+                        continue
+                    
+                    previous = PokemonStatsRepository.snapshot(pokemon)
+                    for key, value in pokemon_data.items():
+                        if hasattr(pokemon, key) and key != 'id':
+                            setattr(pokemon, key, value)
+                    pokemon.calculate_fields()
+                    
+                    errors = pokemon.validate()
+                    if errors:
+                        print(f"Errores de validación: {errors}")
+                        return None
+                    
+                    if pokemon.nombre != previous['nombre'] and \
+                            ShardedPokemonRepository._find([Pokemon.nombre == pokemon.nombre]) is not None:
+                        print(f"Error al actualizar Pokemon {pokemon_id}: el nombre {pokemon.nombre} ya existe")
+                        return None
+                    
+                    session.flush()
+                    PokemonStatsRepository.apply_changes(removed=[previous], added=[PokemonStatsRepository.snapshot(pokemon)],
+                                                         session=session)
+                    session.commit()
+                
+                if shard_set.shard_for(pokemon) is not source:
+                    ShardedPokemonRepository._move(shard_set, [pokemon._values()], source)
+                
+                ShardedPokemonRepository._written(written=[pokemon])
+                return pokemon
+            return None
+        except Exception as e:
+            UnitOfWork.invalidate()
+            print(f"Error al actualizar Pokemon {pokemon_id}: {str(e)}")
+            return None
+    
+    @staticmethod
+    def delete(pokemon_id):
+        """Ver PokemonRepository.delete"""
+        try:
+            for shard in Sharding.active().shards_for(ids=[pokemon_id]):
+                with shard.session() as session:
+                    pokemon = session.get(Pokemon, pokemon_id)
+                    if pokemon is None:
+                        continue
+                    
+                    previous = PokemonStatsRepository.snapshot(pokemon)
+                    session.delete(pokemon)
+                    session.flush()
+                    PokemonStatsRepository.apply_changes(removed=[previous], session=session)
+                    session.commit()
+                
+                ShardedPokemonRepository._written(deleted=[(previous['id'], previous['nombre'])])
+                return True
+            return False
+        except Exception as e:
+            UnitOfWork.invalidate()
+            print(f"Error al eliminar Pokemon {pokemon_id}: {str(e)}")
+            return False
+    
+    @staticmethod
+    def update_many(changes, ids=None, filters=None):
+        """
+        Ver PokemonRepository.update_many: un UPDATE por partición, al mismo
+        tiempo. Los registros cuya clave de partición cambia se mueven después
+        (ver _move). Cada partición confirma su propia transacción
+        """
+        unknown = [column for column in changes if column not in PokemonRepository.BULK_UPDATE_FIELDS]
+        if unknown or not changes:
+            raise ValueError(f"Campos que no se pueden actualizar en lote: {', '.join(unknown) or 'ninguno'}")
+        
+        shard_set = Sharding.active()
+        table = Pokemon.__table__
+        where = PokemonRepository._bulk_where(ids, filters)
+        snapshot_columns = [table.c[field] for field in PokemonStatsRepository.SNAPSHOT_FIELDS]
+        tracked = PokemonStatsRepository.affects_summary(changes)
+        
+        values = dict(changes)
+        values.update(Pokemon.derived_expressions(changes))
+        
+        def update_shard(shard):
+            with shard.session() as session:
+                previous = []
+                if tracked:
+                    previous = [dict(row) for row in session.execute(select(*snapshot_columns).where(where)).mappings()]
+                
+                statement = update(table).where(where).values(values).returning(*table.c)
+                updated = [dict(row) for row in session.execute(statement).mappings()]
+                
+                if tracked and updated:
+                    PokemonStatsRepository.apply_changes(
+                        removed=previous, added=[PokemonStatsRepository.snapshot(row) for row in updated], session=session
+                    )
+                session.commit()
+            
+            moved = [row for row in updated if shard_set.shard_for(row) is not shard]
+            if moved:
+                ShardedPokemonRepository._move(shard_set, moved, shard)
+            return [row['id'] for row in updated]
+        
+        try:
+            updated_ids = shard_set.scatter(update_shard, shard_set.shards_for(filters, ids))
+        except Exception as e:
+            print(f"Error en la actualización masiva: {str(e)}")
+            raise
+        finally:
+            ShardedPokemonRepository._written()
+        
+        return sorted(pokemon_id for part in updated_ids for pokemon_id in part)
+    
+    @staticmethod
+    def delete_many(ids=None, filters=None):
+        """Ver PokemonRepository.delete_many: un DELETE por partición, al mismo tiempo"""
+        shard_set = Sharding.active()
+        table = Pokemon.__table__
+        where = PokemonRepository._bulk_where(ids, filters)
+        statement = delete(table).where(where).returning(
+            *[table.c[field] for field in PokemonStatsRepository.SNAPSHOT_FIELDS]
+        )
+        
+        def delete_shard(shard):
+            with shard.session() as session:
+                removed = [dict(row) for row in session.execute(statement).mappings()]
+                if removed:
+                    PokemonStatsRepository.apply_changes(removed=removed, session=session)
+                session.commit()
+            return [row['id'] for row in removed]
+        
+        try:
+            deleted_ids = shard_set.scatter(delete_shard, shard_set.shards_for(filters, ids))
+        except Exception as e:
+            print(f"Error en la eliminación masiva: {str(e)}")
+            raise
+        finally:
+            ShardedPokemonRepository._written()
+        
+        return sorted(pokemon_id for part in deleted_ids for pokemon_id in part)
+    
+    @staticmethod
+    def insert_records(records, batch_size=None):
+        """
+        Ver PokemonRepository.insert_records: los registros sin id lo reciben
+        de la secuencia global y cada partición inserta los suyos en su propia
+        transacción, al mismo tiempo
+        """
+        shard_set = Sharding.active()
+        table = Pokemon.__table__
+        batch_size = batch_size or Config.ETL_BATCH_SIZE
+        
+        pending = [record for record in records if record.get('id') is None]
+        for record, pokemon_id in zip(pending, shard_set.allocate_ids(len(pending))):
+            record['id'] = pokemon_id
+        shard_set.reserve_ids([record['id'] for record in records])
+        
+        by_shard = defaultdict(list)
+        for record in records:
+            by_shard[shard_set.shard_for(record).index].append(record)
+        
+        def insert_shard(shard):
+            rows = by_shard[shard.index]
+            with shard.session() as session:
+                for start in range(0, len(rows), batch_size):
+                    session.execute(insert(table), rows[start:start + batch_size])
+                PokemonStatsRepository.apply_changes(
+                    added=[PokemonStatsRepository.snapshot(record) for record in rows], session=session
+                )
+                session.commit()
+        
+        try:
+            shard_set.scatter(insert_shard, [shard for shard in shard_set.shards if shard.index in by_shard])
+        except Exception as e:
+            print(f"Error en la inserción masiva: {str(e)}")
+            raise
+        finally:
+            ShardedPokemonRepository._written()
+        
+        return [record['id'] for record in records]
+    
+    @staticmethod
+    def replace_all(records, batch_size=None):
+        """
+        Reemplaza el contenido de todas las particiones (carga del ETL): cada
+        una borra sus registros, inserta los que le tocan y reconstruye su
+        resumen en una sola transacción
+        
+        Args:
+            records (list): Valores de columna de cada Pokemon, con id
+            batch_size (int): Registros por lote (por defecto Config.ETL_BATCH_SIZE)
+        """
+        shard_set = Sharding.active()
+        table = Pokemon.__table__
+        batch_size = batch_size or Config.ETL_BATCH_SIZE
+        
+        by_shard = defaultdict(list)
+        for record in records:
+            by_shard[shard_set.shard_for(record).index].append(record)
+        
+        def load_shard(shard):
+            rows = by_shard[shard.index]
+            with shard.engine.begin() as conn:
+                conn.execute(delete(table))
+                for start in range(0, len(rows), batch_size):
+                    conn.execute(insert(table), rows[start:start + batch_size])
+                PokemonStatsRepository.rebuild(conn)
+        
+        shard_set.scatter(load_shard)
+        shard_set.reserve_ids([record['id'] for record in records])
+    
+    @staticmethod
+    def find_existing(column, values):
+        """Ver PokemonRepository.find_existing (una consulta por partición, al mismo tiempo)"""
+        shard_set = Sharding.active()
+        target = getattr(Pokemon, column)
+        values = list(dict.fromkeys(value for value in values if value is not None))
+        shards = shard_set.shards_for(ids=values) if column == 'id' else shard_set.shards
+        
+        def find_in_shard(shard):
+            existing = set()
+            with shard.session() as session:
+                for start in range(0, len(values), 500):
+                    chunk = values[start:start + 500]
+                    existing.update(session.execute(select(target).where(target.in_(chunk))).scalars())
+            return existing
+        
+        return set().union(*shard_set.scatter(find_in_shard, shards)) if values else set()
+    
+    @staticmethod
+    def get_statistics_summary():
+        """
+        Combina los resúmenes de estadísticas de las particiones en uno solo (no
+        se guarda): suma conteos, sumas y distribuciones, y mezcla las listas top-K
+        
+        Returns:
+            PokemonStatsSummary: Resumen de toda la tabla
+        """
+        shard_set = Sharding.active()
+        
+        def read_summary(shard):
+            with shard.session() as session:
+                summary = session.get(PokemonStatsSummary, PokemonStatsSummary.SUMMARY_ID)
+                if summary is None:
+                    PokemonStatsRepository.rebuild(session.connection())
+                    session.commit()
+                    summary = session.get(PokemonStatsSummary, PokemonStatsSummary.SUMMARY_ID)
+                return summary
+        
+        summaries = shard_set.scatter(read_summary)
+        merged = PokemonStatsSummary(
+            id=PokemonStatsSummary.SUMMARY_ID,
+            total=sum(summary.total for summary in summaries),
+            legendarios=sum(summary.legendarios for summary in summaries),
+            mega=sum(summary.mega for summary in summaries),
+            suma_poder=sum(summary.suma_poder for summary in summaries),
+            suma_cuadrados_poder=sum(summary.suma_cuadrados_poder for summary in summaries),
+            fecha_actualizacion=max((summary.fecha_actualizacion or datetime.min) for summary in summaries)
+        )
+        
+        for column in PokemonStatsRepository.DISTRIBUTIONS:
+            counts = Counter()
+            for summary in summaries:
+                counts.update(getattr(summary, column))
+            setattr(merged, column, dict(counts))
+        
+        # Cada lista es un prefijo exacto del top de su partición: la mezcla es
+        # exacta hasta las posiciones que necesita la API
+        for column in PokemonStatsRepository.TOP_COLUMNS:
+            entries = [entry for summary in summaries for entry in getattr(summary, column)]
+            entries.sort(key=lambda entry: (-entry[0], entry[1]))
+            setattr(merged, column, entries[:PokemonStatsRepository.TOP_K])
+        
+        return merged
+    
+    @staticmethod
+    def verify_statistics():
+        """
+        Verifica el resumen de cada partición (ver PokemonStatsRepository.verify)
+        
+        Returns:
+            dict: {'consistente': bool, 'diferencias': {'particion_<n>': {...}}}
+        """
+        def verify_shard(shard):
+            with shard.session() as session:
+                return PokemonStatsRepository.verify(session=session)
+        
+        shard_set = Sharding.active()
+        results = shard_set.scatter(verify_shard)
+        differences = {f'particion_{shard.index}': result['diferencias']
+                       for shard, result in zip(shard_set.shards, results) if not result['consistente']}
+        return {'consistente': not differences, 'diferencias': differences}
+    
+    @staticmethod
+    def get_statistics():
+        """Ver PokemonRepository.get_statistics (a partir de get_statistics_summary)"""
+        try:
+            summary = ShardedPokemonRepository.get_statistics_summary()
+            return {
+                'total_pokemon': summary.total,
+                'pokemon_legendarios': summary.legendarios,
+                'pokemon_mega': summary.mega,
+                'generaciones': len(summary.por_generacion),
+                'tipos_principales': len(summary.por_tipo),
+                'poder_promedio': round(summary.suma_poder / summary.total, 2) if summary.total else 0.0
+            }
+        except Exception as e:
+            print(f"Error al obtener estadísticas: {str(e)}")
+            return {}
+    
+    @staticmethod
+    def _group_counts(column):
+        """
+        Cuenta los registros por valor de una columna en todas las particiones
+        
+        Returns:
+            Counter: {valor: cantidad}
+        """
+        value = getattr(Pokemon, column)
+        statement = select(value, func.count()).group_by(value)
+        
+        def count_shard(shard):
+            with shard.session() as session:
+                return dict(session.execute(statement).all())
+        
+        counts = Counter()
+        for part in Sharding.active().scatter(count_shard):
+            counts.update(part)
+        return counts
+    
+    @staticmethod
+    def get_distribution(column):
+        """Ver PokemonRepository.get_distribution"""
+        try:
+            counts = ShardedPokemonRepository._group_counts(column)
+            return sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+        except Exception as e:
+            print(f"Error al obtener distribución por {column}: {str(e)}")
+            return []
+    
+    @staticmethod
+    def get_column_statistics(column):
+        """
+        Ver PokemonRepository.get_column_statistics. La mediana sale de los
+        conteos por valor de todas las particiones
+        """
+        try:
+            counts = ShardedPokemonRepository._group_counts(column)
+            counts.pop(None, None)
+            count = sum(counts.values())
+            if not count:
+                return {'promedio': None, 'mediana': None, 'maximo': None, 'minimo': None,
+                        'desviacion_estandar': None}
+            
+            total = sum(value * times for value, times in counts.items())
+            total_squares = sum(value * value * times for value, times in counts.items())
+            
+            positions = sorted({(count - 1) // 2, count // 2})
+            middle = []
+            seen = 0
+            for value, times in sorted(counts.items()):
+                seen += times
+                while positions and positions[0] < seen:
+                    middle.append(value)
+                    positions.pop(0)
+            
+            std = None
+            if count > 1:
+                variance = (count * total_squares - total * total) / (count * (count - 1))
+                std = max(variance, 0) ** 0.5
+            
+            return {
+                'promedio': total / count,
+                'mediana': sum(middle) / len(middle),
+                'maximo': max(counts),
+                'minimo': min(counts),
+                'desviacion_estandar': std
+            }
+        except Exception as e:
+            print(f"Error al obtener estadísticas de {column}: {str(e)}")
+            return {}
+    
+    @staticmethod
+    def get_top(column, limit=5, fields=('nombre',)):
+        """Ver PokemonRepository.get_top"""
+        try:
+            value = getattr(Pokemon, column)
+            rows = ShardedPokemonRepository._query(Sharding.active().shards, list(fields) + [column], [],
+                                                   order=[(value, True), (Pokemon.id, False)], limit=limit)
+            return [{field: row[field] for field in list(fields) + [column]} for row in rows]
+        except Exception as e:
+            print(f"Error al obtener top de {column}: {str(e)}")
+            return []
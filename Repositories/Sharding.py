@@ -0,0 +1,278 @@
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app, has_app_context
+from sqlalchemy import create_engine, select, update, func, Table, Column, Integer, MetaData
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+from Config.Config import Config, db, configure_engine
+from Repositories.FullTextSearch import FullTextSearch
+
+# Secuencia global de ids (en la base principal): con varias particiones el
+# autoincremento de cada archivo repetiría ids
+id_sequence = Table('pokemon_id_sequence', MetaData(),
+                    Column('id', Integer, primary_key=True),
+                    Column('next_id', Integer, nullable=False))
+
+class Shard:
+    """Partición de la tabla pokemon: un archivo SQLite con su motor"""
+    
+    def __init__(self, index, engine, path):
+        self.index = index
+        self.engine = engine
+        self.path = path
+    
+    def session(self):
+        """
+        Abre una sesión de la partición (usar con with). Los objetos conservan
+        sus valores después del commit y al cerrar la sesión
+        
+        Returns:
+            Session: Sesión nueva
+        """
+        return Session(self.engine, expire_on_commit=False)
+
+class ShardSet:
+    """Particiones de una aplicación, la regla de enrutamiento y el pool de hilos"""
+    
+    def __init__(self, shards, strategy, primary_engine):
+        self.shards = shards
+        self.strategy = strategy  # 'generacion' o 'id'
+        self.primary_engine = primary_engine
+        self.full_text = False
+        self.key = f"shards:{strategy}:{','.join(shard.path for shard in shards)}"  # para CountCache
+        self._executor = ThreadPoolExecutor(max_workers=Config.SHARD_WORKERS or len(shards),
+                                            thread_name_prefix='shard')
+    
+    def index_for(self, generacion=None, pokemon_id=None):
+        """
+        Partición de un registro según la estrategia
+        
+        Args:
+            generacion (int): Generación del registro
+            pokemon_id (int): ID del registro
+            
+        Returns:
+            int: Índice de la partición
+        """
+        if self.strategy == 'generacion':
+            return (int(generacion) - 1) % len(self.shards)
+        # Hash multiplicativo (Knuth): ids consecutivos se reparten sin patrón
+        return ((int(pokemon_id) * 2654435761) & 0xFFFFFFFF) % len(self.shards)
+    
+    def shard_for(self, record):
+        """
+        Partición de un registro completo
+        
+        Args:
+            record (dict | Pokemon): Valores de columna o el objeto
+            
+        Returns:
+            Shard: Partición donde se guarda
+        """
+        get = record.get if isinstance(record, dict) else lambda field: getattr(record, field)
+        return self.shards[self.index_for(get('generacion'), get('id'))]
+    
+    def shards_for(self, filters=None, ids=None):
+        """
+        Particiones que pueden tener registros que cumplan la condición: solo
+        las de la clave de partición si la condición la fija, todas si no
+        
+        Args:
+            filters (dict): Expresión de filtro (ver PokemonRepository.filter_conditions)
+            ids (list): IDs buscados
+            
+        Returns:
+            list: Particiones a consultar
+        """
+        filters = filters or {}
+        indexes = None
+        
+        if self.strategy == 'id' and ids is not None:
+            indexes = {self.index_for(pokemon_id=pokemon_id) for pokemon_id in ids}
+        
+        if self.strategy == 'generacion':
+            if 'generacion' in filters:
+                values = filters['generacion'] if isinstance(filters['generacion'], list) else [filters['generacion']]
+                indexes = {self.index_for(generacion=value) for value in values}
+            low, high = filters.get('generacion_min'), filters.get('generacion_max')
+            if low is not None and high is not None and high - low < len(self.shards):
+                in_range = {self.index_for(generacion=value) for value in range(low, high + 1)}
+                indexes = in_range if indexes is None else indexes & in_range
+        
+        if indexes is None:
+            return list(self.shards)
+        return [shard for shard in self.shards if shard.index in indexes]
+    
+    def scatter(self, function, shards=None):
+        """
+        Ejecuta function en cada partición al mismo tiempo (una sola partición
+        se consulta directamente, sin pasar por el pool)
+        
+        Args:
+            function (function): Recibe la partición y devuelve su resultado
+            shards (list): Particiones (por defecto todas)
+            
+        Returns:
+            list: Resultados en el orden de las particiones
+        """
+        shards = self.shards if shards is None else shards
+        if len(shards) == 1:
+            return [function(shards[0])]
+        return list(self._executor.map(function, shards))
+    
+    def allocate_ids(self, count):
+        """
+        Reserva ids consecutivos de la secuencia global
+        
+        Args:
+            count (int): Cantidad de ids
+            
+        Returns:
+            list: ids reservados
+        """
+        if count <= 0:
+            return []
+        with self.primary_engine.begin() as conn:
+            last = conn.execute(update(id_sequence).where(id_sequence.c.id == 1)
+                                .values(next_id=id_sequence.c.next_id + count)
+                                .returning(id_sequence.c.next_id)).scalar()
+        return list(range(last - count, last))
+    
+    def reserve_ids(self, ids):
+        """
+        Adelanta la secuencia después de ids explícitos (ETL o creación con id)
+        
+        Args:
+            ids (list): ids ya usados
+        """
+        ids = [pokemon_id for pokemon_id in ids if pokemon_id is not None]
+        if not ids:
+            return
+        with self.primary_engine.begin() as conn:
+            conn.execute(update(id_sequence).where(id_sequence.c.id == 1)
+                         .values(next_id=func.max(id_sequence.c.next_id, max(ids) + 1)))
+    
+    def close(self):
+        """Detiene el pool y cierra las conexiones de las particiones"""
+        self._executor.shutdown(wait=True)
+        for shard in self.shards:
+            shard.engine.dispose()
+
+class Sharding:
+    """
+    Backend particionado de PokemonRepository: los métodos marcados con
+    routes se ejecutan en ShardedPokemonRepository cuando la aplicación
+    tiene particiones configuradas (SHARD_BY)
+    """
+    
+    EXTENSION = 'sharding'
+    STRATEGIES = ('generacion', 'id')
+    
+    @staticmethod
+    def init_app(app):
+        """
+        Crea las particiones configuradas (SHARD_BY y SHARD_COUNT) con sus
+        tablas e índices, y la secuencia global de ids. Sin SHARD_BY no hace nada
+        
+        Args:
+            app (Flask): Aplicación con la base de datos ya inicializada
+            
+        Returns:
+            ShardSet: Particiones de la aplicación o None
+        """
+        if not Config.SHARD_BY:
+            return None
+        
+        if Config.SHARD_BY not in Sharding.STRATEGIES:
+            raise ValueError(f"SHARD_BY debe ser uno de: {', '.join(Sharding.STRATEGIES)}")
+        
+        primary_url = make_url(app.config['SQLALCHEMY_DATABASE_URI'])
+        if primary_url.get_backend_name() != 'sqlite' or not primary_url.database:
+            print("⚠️ El particionado solo está disponible con un archivo SQLite")
+            return None
+        
+        base, extension = os.path.splitext(primary_url.database)
+        shards = []
+        for index in range(Config.SHARD_COUNT):
+            path = f'{base}_shard_{index}{extension}'
+            engine = create_engine(f'sqlite:///{path}')
+            configure_engine(engine)
+            db.metadata.create_all(engine)
+            shards.append(Shard(index, engine, path))
+        
+        with app.app_context():
+            shard_set = ShardSet(shards, Config.SHARD_BY, db.engine)
+            id_sequence.create(db.engine, checkfirst=True)
+        
+        # La búsqueda usa el índice FTS5 de cada partición
+        try:
+            for shard in shards:
+                with shard.engine.begin() as conn:
+                    FullTextSearch.install(conn)
+            shard_set.full_text = True
+        except Exception as e:
+            print(f"⚠️ Búsqueda de texto completo no disponible en las particiones, se usará LIKE: {str(e)}")
+        
+        # La secuencia continúa después del mayor id guardado en cualquier partición
+        from Models.Pokemon import Pokemon
+        
+        def highest_id(shard):
+            with shard.engine.connect() as conn:
+                return conn.execute(select(func.max(Pokemon.id))).scalar() or 0
+        
+        highest = max(shard_set.scatter(highest_id))
+        with shard_set.primary_engine.begin() as conn:
+            if conn.execute(select(id_sequence.c.next_id)).first() is None:
+                conn.execute(id_sequence.insert().values(id=1, next_id=highest + 1))
+        shard_set.reserve_ids([highest])
+        
+        app.extensions[Sharding.EXTENSION] = shard_set
+        print(f"🧩 Particiones: {len(shards)} por '{Config.SHARD_BY}'")
+        return shard_set
+    
+    @staticmethod
+    def active():
+        """
+        Particiones de la aplicación actual
+        
+        Returns:
+            ShardSet: Particiones o None si la tabla no está particionada
+        """
+        if not has_app_context():
+            return None
+        return current_app.extensions.get(Sharding.EXTENSION)
+    
+    @staticmethod
+    def routes(method):
+        """
+        Decorador para los métodos de PokemonRepository: con particiones
+        configuradas se ejecuta el método del mismo nombre de ShardedPokemonRepository
+        
+        Args:
+            method (function): Método del repositorio
+            
+        Returns:
+            function: Método enrutado
+        """
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            if Sharding.active() is None:
+                return method(*args, **kwargs)
+            
+            from Repositories.ShardedRepository import ShardedPokemonRepository
+            return getattr(ShardedPokemonRepository, method.__name__)(*args, **kwargs)
+        
+        return wrapper
+    
+    @staticmethod
+    def shutdown(app):
+        """
+        Detiene el pool y cierra las particiones de una aplicación
+        
+        Args:
+            app (Flask): Aplicación
+        """
+        shard_set = app.extensions.pop(Sharding.EXTENSION, None)
+        if shard_set is not None:
+            shard_set.close()
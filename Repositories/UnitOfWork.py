@@ -0,0 +1,112 @@
+from flask import g, has_request_context
+from sqlalchemy import event, inspect
+from sqlalchemy.engine import Engine
+from Config.Config import read_engine
+
+class UnitOfWork:
+    """
+    Mapa de identidad por petición: memoriza las búsquedas de Pokemon por id y
+    por nombre (también las que no encontraron nada) para que cada registro se
+    cargue a lo sumo una vez por petición, y cuenta las consultas de la petición
+    """
+    
+    G_KEY = '_unit_of_work'
+    
+    def __init__(self):
+        self.entries = {}  # ('id' | 'nombre', valor) -> (Pokemon o None, leído de la principal)
+        self.queries = 0
+    
+    @staticmethod
+    def current():
+        """
+        Obtiene la unidad de trabajo de la petición actual (se crea al primer uso)
+        
+        Returns:
+            UnitOfWork: Unidad de trabajo o None fuera de una petición
+        """
+        if not has_request_context():
+            return None
+        
+        unit = g.get(UnitOfWork.G_KEY)
+        if unit is None:
+            unit = UnitOfWork()
+            setattr(g, UnitOfWork.G_KEY, unit)
+        return unit
+    
+    @staticmethod
+    def lookup(key, value, loader):
+        """
+        Busca un Pokemon memorizado en la petición o lo carga con loader. Lo
+        leído de una réplica no se usa para una lectura de la principal (por
+        ejemplo, antes de modificarlo)
+        
+        Args:
+            key (str): 'id' o 'nombre'
+            value: Valor buscado
+            loader (function): Carga el Pokemon (o None) si no está memorizado
+            
+        Returns:
+            Pokemon: Objeto Pokemon o None si no existe
+        """
+        unit = UnitOfWork.current()
+        if unit is None:
+            return loader()
+        
+        primary = read_engine.get() is None
+        entry = unit.entries.get((key, value))
+        if entry is not None and (entry[1] or not primary):
+            return entry[0]
+        
+        pokemon = loader()
+        if pokemon is None:
+            unit.entries[(key, value)] = (None, primary)
+        else:
+            unit._remember(pokemon, primary)
+        return pokemon
+    
+    @staticmethod
+    def invalidate(written=(), deleted=()):
+        """
+        Descarta lo memorizado después de una escritura confirmada o revertida.
+        Los Pokemon escritos quedan memorizados (sus valores son los de la
+        principal) y los eliminados se recuerdan como inexistentes
+        
+        Args:
+            written (list): Pokemon creados o actualizados
+            deleted (list): (id, nombre) de los Pokemon eliminados
+        """
+        unit = UnitOfWork.current()
+        if unit is None:
+            return
+        
+        unit.entries.clear()
+        for pokemon in written:
+            unit._remember(pokemon, True)
+        for pokemon_id, name in deleted:
+            unit.entries[('id', pokemon_id)] = (None, True)
+            unit.entries[('nombre', name)] = (None, True)
+    
+    def _remember(self, pokemon, primary):
+        """Memoriza un Pokemon cargado por su id y por su nombre"""
+        # La identidad no requiere cargar el objeto si ya expiró
+        self.entries[('id', inspect(pokemon).identity[0])] = (pokemon, primary)
+        self.entries[('nombre', pokemon.nombre)] = (pokemon, primary)
+    
+    @staticmethod
+    def query_count():
+        """
+        Obtiene el número de sentencias ejecutadas en la petición actual (en
+        todos los motores, incluidas las réplicas)
+        
+        Returns:
+            int: Número de consultas o None fuera de una petición
+        """
+        unit = UnitOfWork.current()
+        return unit.queries if unit is not None else None
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    """Cuenta cada sentencia ejecutada dentro de una petición"""
+    unit = UnitOfWork.current()
+    if unit is not None:
+        unit.queries += 1
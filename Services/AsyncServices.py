@@ -0,0 +1,412 @@
+from Repositories.AsyncRepositories import AsyncDatabase, AsyncPokemonRepository
+from Services.Services import PokemonService
+from Services.ResponseCache import ResponseCache
+
+class AsyncPokemonService:
+    """
+    Versión asíncrona de PokemonService para la API ASGI. Cada método abre
+    una sesión asíncrona; la validación, los cursores y el formato de las
+    respuestas son los de PokemonService
+    """
+    
+    @staticmethod
+    async def get_all_pokemon(page=1, per_page=20, include_total=True, fields=None, filters=None, search=None):
+        """
+        Obtiene todos los Pokemon con paginación (ver PokemonService.get_all_pokemon)
+        
+        Returns:
+            dict: Datos paginados y metadatos
+        """
+        try:
+            offset = (page - 1) * per_page
+            
+            async with AsyncDatabase.session() as session:
+                if not include_total:
+                    pokemon_list = await AsyncPokemonRepository.get_all(session, per_page + 1, offset, fields,
+                                                                        filters, search)
+                    has_next = len(pokemon_list) > per_page
+                    return {
+                        'pokemon': PokemonService._serialize(pokemon_list[:per_page], fields),
+                        'pagination': {
+                            'page': page,
+                            'per_page': per_page,
+                            'has_next': has_next,
+                            'has_prev': page > 1
+                        }
+                    }
+                
+                pokemon_list = await AsyncPokemonRepository.get_all(session, per_page, offset, fields, filters, search)
+                total_count = await AsyncPokemonRepository.count(session, filters, search)
+            
+            return {
+                'pokemon': PokemonService._serialize(pokemon_list, fields),
+                'pagination': {
+                    'page': page,
+                    'per_page': per_page,
+                    'total': total_count,
+                    'pages': (total_count + per_page - 1) // per_page,
+                    'has_next': page * per_page < total_count,
+                    'has_prev': page > 1
+                }
+            }
+        except Exception as e:
+            return {'error': f'Error al obtener Pokemon: {str(e)}'}
+    
+    @staticmethod
+    async def get_pokemon_page(per_page=20, sort='id', order='asc', cursor=None, fields=None, filters=None,
+                               search=None):
+        """
+        Obtiene una página de Pokemon con paginación por cursor (ver PokemonService.get_pokemon_page)
+        
+        Returns:
+            dict: Datos de la página y cursor de la siguiente
+        """
+        try:
+            after = None
+            if cursor:
+                sort, order = cursor['sort'], cursor['order']
+                after = (cursor['value'], cursor['id'])
+            
+            async with AsyncDatabase.session() as session:
+                pokemon_list = await AsyncPokemonRepository.get_page(session, per_page + 1, sort, order == 'desc',
+                                                                     after, fields, filters, search)
+            has_next = len(pokemon_list) > per_page
+            pokemon_list = PokemonService._serialize(pokemon_list[:per_page], fields)
+            
+            next_cursor = None
+            if has_next and pokemon_list:
+                last = pokemon_list[-1]
+                next_cursor = PokemonService.encode_cursor(sort, order, last[sort], last['id'])
+            
+            if fields and sort not in fields and sort != 'id':
+                for pokemon in pokemon_list:
+                    pokemon.pop(sort, None)
+            
+            return {
+                'pokemon': pokemon_list,
+                'pagination': {
+                    'per_page': per_page,
+                    'sort': sort,
+                    'order': order,
+                    'has_next': has_next,
+                    'next_cursor': next_cursor
+                }
+            }
+        except Exception as e:
+            return {'error': f'Error al obtener Pokemon: {str(e)}'}
+    
+    @staticmethod
+    async def get_pokemon_by_id(pokemon_id):
+        """
+        Obtiene un Pokemon específico por ID
+        
+        Returns:
+            dict: Datos del Pokemon o mensaje de error
+        """
+        try:
+            async with AsyncDatabase.session() as session:
+                pokemon = await AsyncPokemonRepository.get_by_id(session, pokemon_id)
+            if pokemon:
+                return {'pokemon': pokemon.to_dict()}
+            return {'error': f'Pokemon con ID {pokemon_id} no encontrado'}
+        except Exception as e:
+            return {'error': f'Error al obtener Pokemon: {str(e)}'}
+    
+    @staticmethod
+    @ResponseCache.invalidates
+    async def create_pokemon(pokemon_data):
+        """
+        Crea un nuevo Pokemon
+        
+        Returns:
+            dict: Pokemon creado o mensaje de error
+        """
+        try:
+            required_fields = ['nombre', 'tipo_principal', 'hp', 'ataque', 'defensa']
+            missing_fields = [field for field in required_fields if field not in pokemon_data]
+            
+            if missing_fields:
+                return {'error': f'Campos requeridos faltantes: {", ".join(missing_fields)}'}
+            
+            async with AsyncDatabase.session() as session:
+                if await AsyncPokemonRepository.get_by_name(session, pokemon_data['nombre']):
+                    return {'error': f'Ya existe un Pokemon con el nombre "{pokemon_data["nombre"]}"'}
+                
+                pokemon = await AsyncPokemonRepository.create(session, pokemon_data)
+            
+            if pokemon:
+                return {'pokemon': pokemon.to_dict(), 'message': 'Pokemon creado exitosamente'}
+            return {'error': 'Error al crear el Pokemon'}
+        
+        except Exception as e:
+            return {'error': f'Error al crear Pokemon: {str(e)}'}
+    
+    @staticmethod
+    @ResponseCache.invalidates
+    async def create_pokemon_bulk(pokemon_list):
+        """
+        Crea varios Pokemon en una sola transacción (ver PokemonService.create_pokemon_bulk)
+        
+        Returns:
+            dict: Resultado por registro (en el orden recibido) y conteos
+        """
+        try:
+            results, pending = PokemonService.validate_bulk_items(pokemon_list)
+            
+            async with AsyncDatabase.session() as session:
+                existing_names = await AsyncPokemonRepository.find_existing(
+                    session, 'nombre', [record['nombre'] for _, record in pending]
+                )
+                existing_ids = await AsyncPokemonRepository.find_existing(
+                    session, 'id', [record['id'] for _, record in pending]
+                )
+                valid = PokemonService.reject_existing(pending, existing_names, existing_ids)
+                
+                if valid:
+                    try:
+                        ids = await AsyncPokemonRepository.insert_records(session, [record for _, record in valid])
+                        PokemonService.mark_created(valid, ids)
+                    except Exception as e:
+                        for result, _ in valid:
+                            result['errors'] = [f'Error en la transacción: {str(e)}']
+            
+            return PokemonService.bulk_summary(results)
+        
+        except Exception as e:
+            return {'error': f'Error en la creación masiva: {str(e)}'}
+    
+    @staticmethod
+    @ResponseCache.invalidates
+    async def update_pokemon(pokemon_id, pokemon_data):
+        """
+        Actualiza un Pokemon existente
+        
+        Returns:
+            dict: Pokemon actualizado o mensaje de error
+        """
+        try:
+            async with AsyncDatabase.session() as session:
+                existing_pokemon = await AsyncPokemonRepository.get_by_id(session, pokemon_id)
+                if not existing_pokemon:
+                    return {'error': f'Pokemon con ID {pokemon_id} no encontrado'}
+                
+                if 'nombre' in pokemon_data and pokemon_data['nombre'] != existing_pokemon.nombre:
+                    if await AsyncPokemonRepository.get_by_name(session, pokemon_data['nombre']):
+                        return {'error': f'Ya existe un Pokemon con el nombre "{pokemon_data["nombre"]}"'}
+                
+                pokemon = await AsyncPokemonRepository.update(session, pokemon_id, pokemon_data)
+            
+            if pokemon:
+                return {'pokemon': pokemon.to_dict(), 'message': 'Pokemon actualizado exitosamente'}
+            return {'error': 'Error al actualizar el Pokemon'}
+        
+        except Exception as e:
+            return {'error': f'Error al actualizar Pokemon: {str(e)}'}
+    
+    @staticmethod
+    @ResponseCache.invalidates
+    async def delete_pokemon(pokemon_id):
+        """
+        Elimina un Pokemon
+        
+        Returns:
+            dict: Mensaje de éxito o error
+        """
+        try:
+            async with AsyncDatabase.session() as session:
+                existing_pokemon = await AsyncPokemonRepository.get_by_id(session, pokemon_id)
+                if not existing_pokemon:
+                    return {'error': f'Pokemon con ID {pokemon_id} no encontrado'}
+                
+                name = existing_pokemon.nombre
+                success = await AsyncPokemonRepository.delete(session, pokemon_id)
+            
+            if success:
+                return {'message': f'Pokemon "{name}" eliminado exitosamente'}
+            return {'error': 'Error al eliminar el Pokemon'}
+        
+        except Exception as e:
+            return {'error': f'Error al eliminar Pokemon: {str(e)}'}
+    
+    @staticmethod
+    @ResponseCache.invalidates
+    async def update_pokemon_bulk(changes, ids=None, filters=None):
+        """
+        Actualiza varios Pokemon con un solo UPDATE (ver PokemonService.update_pokemon_bulk)
+        
+        Returns:
+            dict: IDs actualizados y conteos, o error (con validation_errors si la petición no es válida)
+        """
+        try:
+            ids, filters, errors = PokemonService._bulk_target(ids, filters)
+            changes, change_errors = PokemonService.validate_bulk_changes(changes)
+            errors.extend(change_errors)
+            
+            if errors:
+                return {'error': 'Datos inválidos', 'validation_errors': errors}
+            
+            async with AsyncDatabase.session() as session:
+                updated_ids = await AsyncPokemonRepository.update_many(session, changes, ids=ids, filters=filters)
+            
+            result = {
+                'ids': updated_ids,
+                'updated_count': len(updated_ids),
+                'message': f'Se actualizaron {len(updated_ids)} Pokemon'
+            }
+            if ids is not None:
+                result['not_found'] = sorted(set(ids) - set(updated_ids))
+            return result
+        
+        except Exception as e:
+            return {'error': f'Error en la actualización masiva: {str(e)}'}
+    
+    @staticmethod
+    @ResponseCache.invalidates
+    async def delete_pokemon_bulk(ids=None, filters=None):
+        """
+        Elimina varios Pokemon con un solo DELETE (ver PokemonService.delete_pokemon_bulk)
+        
+        Returns:
+            dict: IDs eliminados y conteos, o error (con validation_errors si la petición no es válida)
+        """
+        try:
+            ids, filters, errors = PokemonService._bulk_target(ids, filters)
+            if errors:
+                return {'error': 'Datos inválidos', 'validation_errors': errors}
+            
+            async with AsyncDatabase.session() as session:
+                deleted_ids = await AsyncPokemonRepository.delete_many(session, ids=ids, filters=filters)
+            
+            result = {
+                'ids': deleted_ids,
+                'deleted_count': len(deleted_ids),
+                'message': f'Se eliminaron {len(deleted_ids)} Pokemon'
+            }
+            if ids is not None:
+                result['not_found'] = sorted(set(ids) - set(deleted_ids))
+            return result
+        
+        except Exception as e:
+            return {'error': f'Error en la eliminación masiva: {str(e)}'}
+    
+    @staticmethod
+    async def search_pokemon(query, search_type='all', fields=None):
+        """
+        Busca Pokemon según diferentes criterios (ver PokemonService.search_pokemon)
+        
+        Returns:
+            dict: Resultados de la búsqueda
+        """
+        try:
+            pokemon_list = []
+            
+            async with AsyncDatabase.session() as session:
+                if search_type == 'all':
+                    pokemon_list = await AsyncPokemonRepository.search(session, query, columns=fields)
+                elif search_type == 'name':
+                    pokemon_list = await AsyncPokemonRepository.search(session, query, ['nombre'], columns=fields)
+                elif search_type == 'type':
+                    pokemon_list = await AsyncPokemonRepository.get_by_type(session, query, columns=fields)
+                elif search_type == 'generation' and query.isdigit():
+                    pokemon_list = await AsyncPokemonRepository.get_by_generation(session, int(query), columns=fields)
+            
+            pokemon_list = PokemonService._serialize(pokemon_list, fields)
+            
+            return {
+                'pokemon': pokemon_list,
+                'total_found': len(pokemon_list),
+                'search_query': query,
+                'search_type': search_type
+            }
+        
+        except Exception as e:
+            return {'error': f'Error en la búsqueda: {str(e)}'}
+    
+    @staticmethod
+    async def get_pokemon_by_type(tipo, fields=None):
+        """
+        Obtiene Pokemon por tipo
+        
+        Returns:
+            dict: Lista de Pokemon del tipo especificado
+        """
+        try:
+            async with AsyncDatabase.session() as session:
+                pokemon_list = await AsyncPokemonRepository.get_by_type(session, tipo, columns=fields)
+            return {
+                'pokemon': PokemonService._serialize(pokemon_list, fields),
+                'total': len(pokemon_list),
+                'type': tipo
+            }
+        except Exception as e:
+            return {'error': f'Error al obtener Pokemon por tipo: {str(e)}'}
+    
+    @staticmethod
+    async def get_legendary_pokemon(fields=None):
+        """
+        Obtiene todos los Pokemon legendarios
+        
+        Returns:
+            dict: Lista de Pokemon legendarios
+        """
+        try:
+            async with AsyncDatabase.session() as session:
+                pokemon_list = await AsyncPokemonRepository.get_legendary(session, columns=fields)
+            return {
+                'pokemon': PokemonService._serialize(pokemon_list, fields),
+                'total': len(pokemon_list)
+            }
+        except Exception as e:
+            return {'error': f'Error al obtener Pokemon legendarios: {str(e)}'}
+    
+    @staticmethod
+    async def get_pokemon_statistics():
+        """
+        Obtiene estadísticas generales desde el resumen materializado
+        
+        Returns:
+            dict: Estadísticas completas
+        """
+        try:
+            async with AsyncDatabase.session() as session:
+                summary = await AsyncPokemonRepository.get_statistics_summary(session)
+            return PokemonService.format_statistics(summary)
+        except Exception as e:
+            return {'error': f'Error al obtener estadísticas: {str(e)}'}
+    
+    @staticmethod
+    async def verify_statistics():
+        """
+        Compara el resumen materializado con un recálculo completo
+        
+        Returns:
+            dict: {'consistente': bool, 'diferencias': {...}}
+        """
+        try:
+            async with AsyncDatabase.session() as session:
+                return await AsyncPokemonRepository.verify_statistics(session)
+        except Exception as e:
+            return {'error': f'Error al verificar estadísticas: {str(e)}'}
+    
+    @staticmethod
+    async def get_pokemon_by_power_range(min_power=None, max_power=None, fields=None):
+        """
+        Obtiene Pokemon por rango de poder
+        
+        Returns:
+            dict: Lista de Pokemon en el rango especificado
+        """
+        try:
+            async with AsyncDatabase.session() as session:
+                pokemon_list = await AsyncPokemonRepository.get_by_power_range(session, min_power, max_power,
+                                                                               columns=fields)
+            return {
+                'pokemon': PokemonService._serialize(pokemon_list, fields),
+                'total': len(pokemon_list),
+                'filters': {
+                    'min_power': min_power,
+                    'max_power': max_power
+                }
+            }
+        except Exception as e:
+            return {'error': f'Error al obtener Pokemon por rango de poder: {str(e)}'}
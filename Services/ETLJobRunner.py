@@ -0,0 +1,136 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+
+class ETLJobRunner:
+    """Ejecuta el proceso ETL en un hilo de fondo y guarda el estado de cada ejecución"""
+
+    def __init__(self, etl_function, max_jobs=50):
+        """
+        Inicializa el ejecutor de trabajos ETL
+
+        Args:
+            etl_function (callable): Función ETL. Recibe un callback progress(fase, progreso, **filas)
+                y devuelve True si terminó correctamente
+            max_jobs (int): Número máximo de trabajos que se conservan en memoria
+        """
+        self.etl_function = etl_function
+        self.max_jobs = max_jobs
+        self._jobs = OrderedDict()
+        self._active_job_id = None
+        self._lock = threading.Lock()
+
+    def submit(self):
+        """
+        Inicia un ETL en segundo plano. Si ya hay uno en ejecución no se lanza
+        otro: se devuelve el trabajo activo (las peticiones se coalescen)
+
+        Returns:
+            tuple: (Estado del trabajo, True si se creó un trabajo nuevo)
+        """
+        with self._lock:
+            if self._active_job_id is not None:
+                return self._snapshot(self._jobs[self._active_job_id]), False
+
+            job_id = uuid.uuid4().hex
+            job = {
+                'job_id': job_id,
+                'estado': 'pendiente',
+                'fase': None,
+                'progreso': 0,
+                'filas': {},
+                'tiempos': {},
+                'error': None,
+                'creado': datetime.now().isoformat(),
+                'iniciado': None,
+                'finalizado': None,
+                '_phase_start': None
+            }
+            self._jobs[job_id] = job
+            self._active_job_id = job_id
+
+            # Descartar los trabajos más antiguos
+            while len(self._jobs) > self.max_jobs:
+                self._jobs.popitem(last=False)
+
+            thread = threading.Thread(target=self._run, args=(job_id,), name=f'etl-job-{job_id[:8]}', daemon=True)
+            thread.start()
+
+            return self._snapshot(job), True
+
+    def get(self, job_id):
+        """
+        Obtiene el estado de un trabajo
+
+        Args:
+            job_id (str): Identificador del trabajo
+
+        Returns:
+            dict: Estado del trabajo o None si no existe
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return self._snapshot(job) if job else None
+
+    def is_running(self):
+        """
+        Indica si hay un ETL en ejecución
+
+        Returns:
+            bool: True si hay un trabajo activo
+        """
+        with self._lock:
+            return self._active_job_id is not None
+
+    def _run(self, job_id):
+        """Ejecuta el ETL en el hilo de fondo y registra el resultado"""
+        with self._lock:
+            job = self._jobs[job_id]
+            job['estado'] = 'en_ejecucion'
+            job['iniciado'] = datetime.now().isoformat()
+        start_time = time.perf_counter()
+
+        def progress(fase, progreso, **filas):
+            self._update_progress(job, fase, progreso, filas)
+
+        try:
+            success = self.etl_function(progress=progress)
+            error = None if success else 'El proceso ETL no se completó correctamente'
+        except Exception as e:
+            success = False
+            error = str(e)
+
+        with self._lock:
+            self._close_phase(job)
+            job['tiempos']['total'] = round(time.perf_counter() - start_time, 4)
+            job['estado'] = 'completado' if success else 'fallido'
+            job['error'] = error
+            if success:
+                job['progreso'] = 100
+            job['finalizado'] = datetime.now().isoformat()
+            self._active_job_id = None
+
+    def _update_progress(self, job, fase, progreso, filas):
+        """Registra el avance reportado por el ETL y el tiempo de cada fase"""
+        with self._lock:
+            if fase != job['fase']:
+                self._close_phase(job)
+                job['fase'] = fase
+                job['_phase_start'] = time.perf_counter()
+            job['progreso'] = progreso
+            job['filas'].update(filas)
+
+    def _close_phase(self, job):
+        """Guarda la duración de la fase en curso"""
+        if job['fase'] is not None and job['_phase_start'] is not None:
+            job['tiempos'][job['fase']] = round(time.perf_counter() - job['_phase_start'], 4)
+            job['_phase_start'] = None
+
+    def _snapshot(self, job):
+        """Copia pública del trabajo (sin campos internos)"""
+        snapshot = {key: value for key, value in job.items() if not key.startswith('_')}
+        snapshot['filas'] = dict(job['filas'])
+        snapshot['tiempos'] = dict(job['tiempos'])
+        return snapshot
@@ -0,0 +1,182 @@
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from Config.Config import Config
+from Repositories.ETLRunRepository import ETLRunRepository
+
+try:
+    import resource
+except ImportError:  # Windows no tiene el módulo resource
+    resource = None
+
+
+def _peak_rss_bytes():
+    """
+    Pico de memoria residente (RSS) del proceso, leído con getrusage (no
+    ralentiza el ETL). Es el máximo alcanzado desde que arrancó el proceso
+    
+    Returns:
+        int: Bytes o None si la plataforma no lo permite
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa kilobytes y macOS bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class ETLRunMetrics:
+    """Recolecta las métricas de una ejecución del ETL y las guarda en el historial"""
+    
+    def __init__(self, origen):
+        """
+        Inicia la medición de una ejecución
+        
+        Args:
+            origen (str): Quién ejecuta el ETL ('main', 'app_simple', ...)
+        """
+        self.origen = origen
+        self.iniciado = datetime.now()
+        self.phases = {}
+        self.duplicates_removed = None
+        self.output_bytes = None
+        self._start = time.perf_counter()
+        
+        # Por defecto el pico es el RSS del proceso (getrusage, sin costo). Con
+        # ETL_TRACK_MEMORY se usa tracemalloc, más detallado pero varias veces más
+        # lento. tracemalloc es global al proceso: el pico incluye lo que asignen
+        # otros hilos durante la ejecución. Solo se detiene si lo iniciamos nosotros
+        self._owns_tracemalloc = Config.ETL_TRACK_MEMORY and not tracemalloc.is_tracing()
+        if self._owns_tracemalloc:
+            tracemalloc.start()
+    
+    def start_phase(self, name, rows_in=None):
+        """
+        Marca el inicio de una fase
+        
+        Args:
+            name (str): Fase ('extract', 'clean', 'load', 'db_load')
+            rows_in (int): Filas de entrada de la fase
+        """
+        self.phases[name] = {'inicio': time.perf_counter(), 'duracion': None,
+                             'filas_entrada': rows_in, 'filas_salida': None}
+    
+    def end_phase(self, name, rows_out=None):
+        """
+        Marca el final de una fase
+        
+        Args:
+            name (str): Fase iniciada con start_phase
+            rows_out (int): Filas de salida de la fase
+        """
+        record = self.phases.get(name)
+        if record is not None:
+            record['duracion'] = time.perf_counter() - record['inicio']
+            record['filas_salida'] = rows_out
+    
+    def record_output(self, path):
+        """
+        Registra el tamaño del archivo de salida
+        
+        Args:
+            path (str): Ruta del archivo generado
+        """
+        if path and os.path.exists(path):
+            self.output_bytes = (self.output_bytes or 0) + os.path.getsize(path)
+    
+    def finish(self, success=True, error=None):
+        """
+        Cierra la medición y guarda la ejecución en el historial
+        
+        Args:
+            success (bool): Si el ETL terminó correctamente
+            error (str): Mensaje de error si falló
+            
+        Returns:
+            dict: Métricas guardadas
+        """
+        if self._owns_tracemalloc:
+            peak_memory = tracemalloc.get_traced_memory()[1]
+            memory_method = 'tracemalloc'
+            tracemalloc.stop()
+        else:
+            peak_memory = _peak_rss_bytes()
+            memory_method = 'rss' if peak_memory is not None else None
+        
+        run = {
+            'origen': self.origen,
+            'iniciado': self.iniciado.isoformat(),
+            'finalizado': datetime.now().isoformat(),
+            'exito': 1 if success else 0,
+            'error': error,
+            'duracion_total': round(time.perf_counter() - self._start, 4),
+            'duplicados_eliminados': self.duplicates_removed,
+            'bytes_salida': self.output_bytes,
+            'memoria_pico_bytes': peak_memory,
+            'memoria_metodo': memory_method
+        }
+        for name, record in self.phases.items():
+            if record['duracion'] is None:
+                record['duracion'] = time.perf_counter() - record['inicio']
+            run[f'duracion_{name}'] = round(record['duracion'], 4)
+            run[f'filas_{name}_entrada'] = record['filas_entrada']
+            run[f'filas_{name}_salida'] = record['filas_salida']
+        
+        run['id'] = ETLRunRepository.save(run)
+        return run
+
+
+class ETLRunService:
+    """Servicio de consulta del historial de ejecuciones del ETL"""
+    
+    @staticmethod
+    def get_run_history(limit=20, origen=None):
+        """
+        Obtiene las ejecuciones recientes y la tendencia de sus métricas. Las
+        tendencias solo usan las ejecuciones exitosas con el mismo método de
+        medición de memoria que la más reciente ('rss' o 'tracemalloc': los picos
+        no son comparables y tracemalloc cambia las duraciones)
+        
+        Args:
+            limit (int): Número máximo de ejecuciones
+            origen (str): Filtrar por origen
+            
+        Returns:
+            dict: Ejecuciones, tendencias por métrica y el método de memoria que usan las tendencias
+        """
+        try:
+            runs = ETLRunRepository.get_recent(limit, origen)
+            metrics = ['duracion_total'] + [f'duracion_{phase}' for phase in ETLRunRepository.PHASES] + \
+                      ['memoria_pico_bytes', 'bytes_salida']
+            
+            tendencias = {}
+            successful = [run for run in runs if run['exito']]
+            memory_method = successful[0]['memoria_metodo'] if successful else None
+            successful = [run for run in successful if run['memoria_metodo'] == memory_method]
+            for metric in metrics:
+                values = [run[metric] for run in successful if run[metric] is not None]
+                if not values:
+                    continue
+                
+                # values[0] es la ejecución más reciente
+                previous = values[1:]
+                previous_avg = sum(previous) / len(previous) if previous else None
+                tendencias[metric] = {
+                    'ultimo': values[0],
+                    'promedio': round(sum(values) / len(values), 4),
+                    'minimo': min(values),
+                    'maximo': max(values),
+                    'cambio_vs_promedio_anterior_pct': round((values[0] - previous_avg) / previous_avg * 100, 2)
+                    if previous_avg else None
+                }
+            
+            return {
+                'runs': runs,
+                'total': len(runs),
+                'tendencias': tendencias,
+                'tendencias_memoria_metodo': memory_method
+            }
+        except Exception as e:
+            return {'error': f'Error al obtener el historial del ETL: {str(e)}'}
@@ -1,17 +1,38 @@
 import pandas as pd
+from datetime import datetime
+from sqlalchemy import insert, select, bindparam, inspect, MetaData, String, cast, literal
 from Models.Pokemon import Pokemon
-from Config.Config import db
+from Config.Config import db, Config
+from Repositories.CountCache import CountCache
+from Repositories.DataVersionRepository import DataVersionRepository
+from Repositories.FullTextSearch import FullTextSearch
+from Repositories.PokemonStatsRepository import PokemonStatsRepository
+from Repositories.ReadRouting import ReadRouting
+from Repositories.Sharding import Sharding
+from Services.ResponseCache import ResponseCache
+from Repositories.ShardedRepository import ShardedPokemonRepository
+from Repositories.UnitOfWork import UnitOfWork
 
 class ETLService:
     """Servicio para cargar datos del ETL a la base de datos"""
     
+    # Columnas del CSV limpio agrupadas por el tipo con el que se guardan
+    INT_COLUMNS = ['id', 'hp', 'ataque', 'defensa', 'ataque_especial', 'defensa_especial',
+                   'velocidad', 'poder_total', 'generacion', 'poder_ofensivo', 'poder_defensivo']
+    FLOAT_COLUMNS = ['ratio_ataque_defensa']
+    BOOL_COLUMNS = ['es_legendario', 'es_mega']
+    STR_COLUMNS = ['nombre', 'tipo_principal', 'tipo_secundario', 'forma_especial',
+                   'combinacion_tipos', 'categoria_poder']
+    
     @staticmethod
-    def load_pokemon_from_csv(csv_path):
+    def load_pokemon_from_csv(csv_path, mode=None, batch_size=None):
         """
         Carga Pokemon desde un archivo CSV limpio a la base de datos
         
         Args:
             csv_path (str): Ruta al archivo CSV limpio
+            mode (str): Modo de carga (ver load_pokemon_from_dataframe)
+            batch_size (int): Registros por lote (ver load_pokemon_from_dataframe)
             
         Returns:
             dict: Resultado de la carga
@@ -19,63 +40,56 @@ class ETLService:
         try:
             # Leer el archivo CSV limpio
             df = pd.read_csv(csv_path)
-            
             print(f"📄 Leyendo datos limpios desde: {csv_path}")
-            print(f"📊 Registros encontrados: {len(df)}")
-            
-            # Limpiar la tabla existente
-            Pokemon.query.delete()
-            db.session.commit()
-            
-            # Cargar cada Pokemon
-            created_count = 0
-            errors = []
+        except Exception as e:
+            error_msg = f"Error al leer el archivo CSV limpio: {str(e)}"
+            print(f"❌ {error_msg}")
+            return {
+                'success': False,
+                'error': error_msg
+            }
+        
+        return ETLService.load_pokemon_from_dataframe(df, mode, batch_size)
+    
+    @staticmethod
+    def load_pokemon_from_dataframe(df, mode=None, batch_size=None):
+        """
+        Carga Pokemon a la base de datos directamente desde el DataFrame limpio,
+        sin pasar por un archivo intermedio
+        
+        Args:
+            df (pd.DataFrame): Datos limpios (salida de Clean.clean_data)
+            mode (str): 'bulk' (conversión por columnas e inserción por lotes),
+                'merge' (solo inserta, actualiza y elimina lo que cambió) u
+                'orm' (un objeto Pokemon por registro). Por defecto Config.ETL_LOAD_MODE
+            batch_size (int): Registros por lote. Por defecto Config.ETL_BATCH_SIZE
             
-            for index, row in df.iterrows():
-                try:
-                    # Crear el objeto Pokemon
-                    pokemon = Pokemon()
-                    
-                    # Asignar campos básicos
-                    pokemon.id = int(row['id'])
-                    pokemon.nombre = str(row['nombre'])
-                    pokemon.tipo_principal = str(row['tipo_principal'])
-                    pokemon.tipo_secundario = str(row['tipo_secundario'])
-                    
-                    # Estadísticas
-                    pokemon.hp = int(row['hp'])
-                    pokemon.ataque = int(row['ataque'])
-                    pokemon.defensa = int(row['defensa'])
-                    pokemon.ataque_especial = int(row['ataque_especial'])
-                    pokemon.defensa_especial = int(row['defensa_especial'])
-                    pokemon.velocidad = int(row['velocidad'])
-                    pokemon.poder_total = int(row['poder_total'])
-                    
-                    # Información adicional
-                    pokemon.generacion = int(row['generacion'])
-                    pokemon.es_legendario = bool(row['es_legendario'])
-                    pokemon.es_mega = bool(row['es_mega'])
-                    pokemon.forma_especial = str(row['forma_especial'])
-                    pokemon.combinacion_tipos = str(row['combinacion_tipos'])
-                    
-                    # Campos calculados
-                    pokemon.poder_ofensivo = int(row['poder_ofensivo'])
-                    pokemon.poder_defensivo = int(row['poder_defensivo'])
-                    pokemon.ratio_ataque_defensa = float(row['ratio_ataque_defensa'])
-                    pokemon.categoria_poder = str(row['categoria_poder'])
-                    
-                    # Agregar a la sesión
-                    db.session.add(pokemon)
-                    created_count += 1
-                    
-                except Exception as e:
-                    errors.append(f"Error en registro {index + 1} ({row.get('nombre', 'sin nombre')}): {str(e)}")
+        Returns:
+            dict: Resultado de la carga
+        """
+        mode = mode or Config.ETL_LOAD_MODE
+        batch_size = batch_size or Config.ETL_BATCH_SIZE
+        
+        try:
+            print(f"📊 Registros encontrados: {len(df)}")
             
-            # Commit de todos los cambios
-            db.session.commit()
+            if Sharding.active() is not None:
+                counts, errors = ETLService._load_rows_sharded(df, batch_size)
+            elif mode == 'orm':
+                counts, errors = ETLService._load_rows_orm(df, batch_size)
+            elif mode == 'bulk':
+                counts, errors = ETLService._load_rows_bulk(df, batch_size)
+            elif mode == 'merge':
+                counts, errors = ETLService._load_rows_merge(df, batch_size)
+            else:
+                raise ValueError(f"Modo de carga desconocido: {mode}")
             
             print(f"✅ Datos cargados a la base de datos:")
-            print(f"   📊 Pokemon creados: {created_count}")
+            print(f"   📊 Pokemon creados: {counts['created_count']}")
+            if 'updated_count' in counts:
+                print(f"   🔄 Pokemon actualizados: {counts['updated_count']}")
+                print(f"   🗑️ Pokemon eliminados: {counts['deleted_count']}")
+                print(f"   ⏸️ Pokemon sin cambios: {counts['unchanged_count']}")
             if errors:
                 print(f"   ❌ Errores: {len(errors)}")
                 for error in errors[:5]:  # Mostrar solo los primeros 5 errores
@@ -83,11 +97,12 @@ class ETLService:
             
             return {
                 'success': True,
-                'created_count': created_count,
+                'mode': mode,
+                **counts,
                 'error_count': len(errors),
                 'errors': errors
             }
-            
+        
         except Exception as e:
             db.session.rollback()
             error_msg = f"Error al cargar datos a la base de datos: {str(e)}"
@@ -95,4 +110,376 @@ class ETLService:
             return {
                 'success': False,
                 'error': error_msg
-            }
\ No newline at end of file
+            }
+        
+        finally:
+            # Los totales y respuestas en caché y los ETag de la API ya no corresponden a la tabla recargada
+            try:
+                DataVersionRepository.bump_committed()
+            except Exception as e:
+                print(f"⚠️ No se pudo actualizar la versión de los datos: {str(e)}")
+            CountCache.invalidate()
+            ResponseCache.invalidate()
+            UnitOfWork.invalidate()
+            ReadRouting.record_write()
+    
+    @staticmethod
+    def _load_rows_orm(df, batch_size):
+        """
+        Carga registro por registro creando un objeto Pokemon para cada fila
+        
+        Igual que en modo 'bulk', en SQLite las filas se escriben en la tabla de
+        staging y se intercambian con la viva; en otros motores se reemplazan en
+        una sola transacción. La API nunca ve la tabla vacía y una carga fallida
+        conserva los datos anteriores
+        
+        Args:
+            df (pd.DataFrame): Datos limpios
+            batch_size (int): Registros por lote al escribir en staging
+            
+        Returns:
+            tuple: (Conteos de la carga, Lista de errores)
+        """
+        # Crear un objeto por registro
+        pokemons = []
+        errors = []
+        
+        for index, row in df.iterrows():
+            try:
+                # Crear el objeto Pokemon
+                pokemon = Pokemon()
+                
+                # Asignar campos básicos
+                pokemon.id = int(row['id'])
+                pokemon.nombre = str(row['nombre'])
+                pokemon.tipo_principal = str(row['tipo_principal'])
+                pokemon.tipo_secundario = str(row['tipo_secundario'])
+                
+                # Estadísticas
+                pokemon.hp = int(row['hp'])
+                pokemon.ataque = int(row['ataque'])
+                pokemon.defensa = int(row['defensa'])
+                pokemon.ataque_especial = int(row['ataque_especial'])
+                pokemon.defensa_especial = int(row['defensa_especial'])
+                pokemon.velocidad = int(row['velocidad'])
+                pokemon.poder_total = int(row['poder_total'])
+                
+                # Información adicional
+                pokemon.generacion = int(row['generacion'])
+                pokemon.es_legendario = bool(row['es_legendario'])
+                pokemon.es_mega = bool(row['es_mega'])
+                pokemon.forma_especial = str(row['forma_especial'])
+                pokemon.combinacion_tipos = str(row['combinacion_tipos'])
+                
+                # Campos calculados
+                pokemon.poder_ofensivo = int(row['poder_ofensivo'])
+                pokemon.poder_defensivo = int(row['poder_defensivo'])
+                pokemon.ratio_ataque_defensa = float(row['ratio_ataque_defensa'])
+                pokemon.categoria_poder = str(row['categoria_poder'])
+                
+                pokemons.append(pokemon)
+            
+            except Exception as e:
+                errors.append(f"Error en registro {index + 1} ({row.get('nombre', 'sin nombre')}): {str(e)}")
+        
+        if db.engine.dialect.name == 'sqlite':
+            # Los atributos asignados de cada objeto son las filas de staging
+            records = [{key: value for key, value in vars(pokemon).items() if not key.startswith('_')}
+                       for pokemon in pokemons]
+            ETLService._load_and_swap(records, batch_size)
+        else:
+            # Vaciar e insertar en la misma transacción: si algo falla el rollback conserva los datos
+            db.session.execute(Pokemon.__table__.delete())
+            db.session.add_all(pokemons)
+            db.session.flush()
+            PokemonStatsRepository.rebuild(db.session.connection())
+            db.session.commit()
+        
+        return {'created_count': len(pokemons)}, errors
+    
+    @staticmethod
+    def _load_rows_bulk(df, batch_size):
+        """
+        Convierte el DataFrame por columnas una sola vez e inserta por lotes con
+        un insert() de Core (executemany), sin construir objetos del ORM
+        
+        En SQLite los datos se escriben en una tabla de staging que luego se
+        intercambia con la tabla viva, así la API nunca ve la tabla vacía
+        
+        Args:
+            df (pd.DataFrame): Datos limpios
+            batch_size (int): Registros por lote
+            
+        Returns:
+            tuple: (Conteos de la carga, Lista de errores)
+        """
+        records, errors = ETLService._prepare_records(df)
+        
+        if db.engine.dialect.name == 'sqlite':
+            ETLService._load_and_swap(records, batch_size)
+        else:
+            # Limpiar la tabla e insertar en la misma transacción: si algo falla
+            # el rollback conserva los datos anteriores
+            table = Pokemon.__table__
+            db.session.execute(table.delete())
+            for start in range(0, len(records), batch_size):
+                db.session.execute(insert(table), records[start:start + batch_size])
+            PokemonStatsRepository.rebuild(db.session.connection())
+            db.session.commit()
+        
+        return {'created_count': len(records)}, errors
+    
+    @staticmethod
+    def _load_rows_sharded(df, batch_size):
+        """
+        Carga con la tabla particionada (ver Sharding): cualquier modo
+        reemplaza el contenido de cada partición en su propia transacción, con
+        las particiones cargándose al mismo tiempo
+        
+        Args:
+            df (pd.DataFrame): Datos limpios
+            batch_size (int): Registros por lote
+            
+        Returns:
+            tuple: (Conteos de la carga, Lista de errores)
+        """
+        records, errors = ETLService._prepare_records(df)
+        ShardedPokemonRepository.replace_all(records, batch_size)
+        return {'created_count': len(records)}, errors
+    
+    @staticmethod
+    def _load_rows_merge(df, batch_size):
+        """
+        Compara los registros entrantes con los existentes por id y por un hash
+        del contenido de cada fila, y ejecuta solo los inserts, updates y deletes
+        necesarios, por lotes y en una sola transacción
+        
+        Args:
+            df (pd.DataFrame): Datos limpios
+            batch_size (int): Registros por lote
+            
+        Returns:
+            tuple: (Conteos de la carga, Lista de errores)
+        """
+        incoming, errors = ETLService._prepare_frame(df)
+        columns = list(incoming.columns)
+        table = Pokemon.__table__
+        
+        # Los registros existentes pasan por la misma conversión para que los
+        # hashes sean comparables
+        existing = pd.read_sql(select(*[table.c[col] for col in columns]), db.session.connection())
+        existing, _ = ETLService._prepare_frame(existing)
+        
+        incoming_hash = ETLService._row_hashes(incoming)
+        existing_hash = ETLService._row_hashes(existing)
+        
+        new_ids = incoming_hash.index.difference(existing_hash.index)
+        deleted_ids = existing_hash.index.difference(incoming_hash.index)
+        common_ids = incoming_hash.index.intersection(existing_hash.index)
+        changed_ids = common_ids[incoming_hash[common_ids].values != existing_hash[common_ids].values]
+        
+        incoming = incoming.set_index('id', drop=False)
+        now = datetime.utcnow()
+        
+        # Primero los deletes y updates para liberar nombres antes de insertar
+        deleted = deleted_ids.tolist()
+        for start in range(0, len(deleted), batch_size):
+            db.session.execute(table.delete().where(table.c.id.in_(deleted[start:start + batch_size])))
+        
+        if len(changed_ids):
+            # Los renombrados pueden intercambiar nombres entre filas (o tomar el
+            # que otra fila del lote deja): se mueven antes a un nombre temporal
+            # único para que ningún UPDATE viole UNIQUE(nombre) a mitad del lote
+            existing = existing.set_index('id', drop=False)
+            renamed = changed_ids[incoming.loc[changed_ids, 'nombre'].values !=
+                                  existing.loc[changed_ids, 'nombre'].values].tolist()
+            for start in range(0, len(renamed), batch_size):
+                db.session.execute(
+                    table.update()
+                    .where(table.c.id.in_(renamed[start:start + batch_size]))
+                    .values(nombre=literal('__merge_') + cast(table.c.id, String))
+                )
+            
+            changes = incoming.loc[changed_ids].rename(columns={'id': 'b_id'})
+            changes['fecha_actualizacion'] = now
+            # El SET se deriva de las claves de cada registro; b_id solo filtra
+            statement = table.update().where(table.c.id == bindparam('b_id'))
+            updates = changes.to_dict('records')
+            for start in range(0, len(updates), batch_size):
+                db.session.execute(statement, updates[start:start + batch_size])
+        
+        inserts = incoming.loc[new_ids].to_dict('records')
+        for start in range(0, len(inserts), batch_size):
+            db.session.execute(insert(table), inserts[start:start + batch_size])
+        
+        PokemonStatsRepository.rebuild(db.session.connection())
+        db.session.commit()
+        
+        return {
+            'created_count': len(new_ids),
+            'updated_count': len(changed_ids),
+            'deleted_count': len(deleted_ids),
+            'unchanged_count': len(common_ids) - len(changed_ids)
+        }, errors
+    
+    @staticmethod
+    def _load_and_swap(records, batch_size):
+        """
+        Carga los registros en la tabla de staging, crea sus índices y la
+        intercambia con la tabla viva en una sola transacción
+        
+        Args:
+            records (list): Registros listos para insertar
+            batch_size (int): Registros por lote
+        """
+        live_name = Pokemon.__tablename__
+        staging_name = f"{live_name}_staging"
+        old_name = f"{live_name}_old"
+        
+        # La sesión no debe mantener una lectura abierta sobre la tabla viva
+        db.session.close()
+        
+        engine = db.engine
+        staging = ETLService._build_staging_table(staging_name)
+        indexes = list(staging.indexes)
+        staging.indexes.clear()
+        
+        # 1. Escribir en staging: los lectores siguen viendo la tabla viva
+        with engine.begin() as conn:
+            conn.exec_driver_sql(f'DROP TABLE IF EXISTS "{staging_name}"')
+            staging.create(conn)
+            for start in range(0, len(records), batch_size):
+                conn.execute(insert(staging), records[start:start + batch_size])
+        
+        # 2. Crear los índices después de la carga (más rápido que mantenerlos fila a fila)
+        with engine.begin() as conn:
+            for index in indexes:
+                index.create(conn)
+        
+        # 3. Intercambio atómico. pysqlite no abre transacciones para DDL, así que
+        # se inicia de forma explícita para que los renombres sean atómicos
+        full_text_search = FullTextSearch.ensure()
+        with engine.connect() as conn:
+            try:
+                conn.exec_driver_sql('BEGIN IMMEDIATE')
+                conn.exec_driver_sql(f'ALTER TABLE "{live_name}" RENAME TO "{old_name}"')
+                conn.exec_driver_sql(f'ALTER TABLE "{staging_name}" RENAME TO "{live_name}"')
+                conn.exec_driver_sql(f'DROP TABLE "{old_name}"')
+                if full_text_search:
+                    # Los triggers del índice se fueron con la tabla anterior
+                    FullTextSearch.install(conn, rebuild=True)
+                # El resumen de estadísticas cambia junto con la tabla
+                PokemonStatsRepository.rebuild(conn)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                with engine.begin() as cleanup:
+                    cleanup.exec_driver_sql(f'DROP TABLE IF EXISTS "{staging_name}"')
+                raise
+    
+    @staticmethod
+    def _build_staging_table(staging_name):
+        """
+        Copia la definición de la tabla pokemon con otro nombre. SQLite no permite
+        renombrar índices, así que los índices de staging alternan entre el nombre
+        del modelo y el sufijo __swap según cuál esté libre en la tabla viva
+        
+        Args:
+            staging_name (str): Nombre de la tabla de staging
+            
+        Returns:
+            Table: Tabla de staging (sin crear)
+        """
+        live_indexes = {index['name'] for index in inspect(db.engine).get_indexes(Pokemon.__tablename__)}
+        staging = Pokemon.__table__.to_metadata(MetaData(), name=staging_name)
+        
+        for index in staging.indexes:
+            if index.name in live_indexes:
+                index.name = f"{index.name}__swap"
+        
+        return staging
+    
+    @staticmethod
+    def _row_hashes(data):
+        """
+        Calcula un hash del contenido de cada fila indexado por id. Los flotantes
+        se redondean para que un viaje de ida y vuelta por CSV no cuente como cambio
+        
+        Args:
+            data (pd.DataFrame): Datos convertidos con _prepare_frame
+            
+        Returns:
+            pd.Series: Hash de cada fila indexado por id
+        """
+        data = data.round({col: 9 for col in ETLService.FLOAT_COLUMNS})
+        hashes = pd.util.hash_pandas_object(data, index=False)
+        return pd.Series(hashes.values, index=data['id'].values)
+    
+    @staticmethod
+    def _prepare_records(df):
+        """
+        Convierte el DataFrame a registros listos para un insert() de Core
+        
+        Args:
+            df (pd.DataFrame): Datos limpios
+            
+        Returns:
+            tuple: (Lista de diccionarios listos para insertar, Lista de errores)
+        """
+        data, errors = ETLService._prepare_frame(df)
+        return data.to_dict('records'), errors
+    
+    @staticmethod
+    def _prepare_frame(df):
+        """
+        Convierte las columnas del DataFrame a los tipos del modelo y separa las
+        filas inválidas conservando un error por registro
+        
+        Args:
+            df (pd.DataFrame): Datos limpios
+            
+        Returns:
+            tuple: (DataFrame con las columnas del modelo, Lista de errores)
+        """
+        columns = (ETLService.INT_COLUMNS + ETLService.FLOAT_COLUMNS +
+                   ETLService.BOOL_COLUMNS + ETLService.STR_COLUMNS)
+        missing_columns = [col for col in columns if col not in df.columns]
+        if missing_columns:
+            raise ValueError(f"Columnas faltantes en los datos limpios: {', '.join(missing_columns)}")
+        
+        data = pd.DataFrame(index=df.index)
+        reasons = pd.Series('', index=df.index)
+        
+        # Columnas numéricas: los valores no convertibles quedan como NaN
+        for col in ETLService.INT_COLUMNS + ETLService.FLOAT_COLUMNS:
+            values = pd.to_numeric(df[col], errors='coerce')
+            invalid = values.isna()
+            reasons[invalid] += f"valor no numérico en {col}; "
+            data[col] = values
+        
+        for col in ETLService.BOOL_COLUMNS:
+            if pd.api.types.is_bool_dtype(df[col]):
+                data[col] = df[col]
+            else:
+                data[col] = df[col].astype(str).str.strip().str.lower().isin(['true', '1', '1.0'])
+        
+        for col in ETLService.STR_COLUMNS:
+            data[col] = df[col].fillna('nan').astype(str)
+        
+        # Duplicados de id o nombre: se conserva el primer registro
+        duplicated_id = data['id'].notna() & data['id'].duplicated(keep='first')
+        reasons[duplicated_id] += "id duplicado; "
+        duplicated_name = data['nombre'].duplicated(keep='first')
+        reasons[duplicated_name] += "nombre duplicado; "
+        
+        invalid_rows = reasons != ''
+        errors = [
+            f"Error en registro {position + 1} ({nombre}): {reason.rstrip('; ')}"
+            for position, (nombre, reason) in enumerate(zip(data['nombre'], reasons))
+            if reason
+        ]
+        
+        data = data[~invalid_rows]
+        data[ETLService.INT_COLUMNS] = data[ETLService.INT_COLUMNS].astype('int64')
+        
+        return data[columns], errors
@@ -0,0 +1,248 @@
+import functools
+import inspect
+import threading
+import time
+from collections import OrderedDict
+from Config.Config import Config, db
+from Repositories.ReadRouting import ReadRouting
+
+class ResponseCache:
+    """
+    Caché en memoria (LRU con TTL) de las respuestas de los servicios de
+    lectura que recorren la tabla: estadísticas, legendarios, por tipo y por
+    rango de poder. Cada escritura o recarga del ETL descarta las respuestas
+    """
+    
+    _lock = threading.Lock()
+    _entries = OrderedDict()  # clave -> (resultado, time.monotonic() al guardarlo), de la menos a la más usada
+    _generation = 0
+    hits = 0
+    misses = 0
+    evictions = 0
+    invalidations = 0
+    
+    @staticmethod
+    def make_key(database_url, endpoint, arguments):
+        """
+        Construye la clave de una respuesta: la base de datos, el servicio y
+        sus argumentos normalizados (las listas, como fields, se ordenan porque
+        el orden no cambia la respuesta)
+        
+        Args:
+            database_url (str): URL de la base de datos (separa bases distintas en el mismo proceso)
+            endpoint (str): Nombre del servicio
+            arguments (dict): Argumentos de la llamada por nombre
+            
+        Returns:
+            tuple: Clave de caché
+        """
+        normalized = tuple(
+            (name, tuple(sorted(value, key=str)) if isinstance(value, (list, tuple)) else value)
+            for name, value in sorted(arguments.items())
+        )
+        return database_url, endpoint, normalized
+    
+    @staticmethod
+    def get(key):
+        """
+        Obtiene una respuesta de la caché y la marca como la más reciente
+        
+        Args:
+            key (tuple): Clave creada con make_key
+            
+        Returns:
+            dict: Respuesta guardada o None si no está o ya expiró
+        """
+        with ResponseCache._lock:
+            entry = ResponseCache._entries.get(key)
+            if entry is not None and time.monotonic() - entry[1] < Config.RESPONSE_CACHE_TTL:
+                ResponseCache._entries.move_to_end(key)
+                ResponseCache.hits += 1
+                return entry[0]
+            
+            if entry is not None:
+                del ResponseCache._entries[key]
+            ResponseCache.misses += 1
+            return None
+    
+    @staticmethod
+    def generation():
+        """
+        Generación actual (ver CountCache.generation): se lee antes de calcular
+        la respuesta para no guardar una calculada antes de una invalidación
+        
+        Returns:
+            int: Generación actual
+        """
+        with ResponseCache._lock:
+            return ResponseCache._generation
+    
+    @staticmethod
+    def set(key, value, generation):
+        """
+        Guarda una respuesta. Si se supera RESPONSE_CACHE_SIZE se descarta la
+        usada hace más tiempo
+        
+        Args:
+            key (tuple): Clave creada con make_key
+            value (dict): Respuesta del servicio
+            generation (int): Generación leída antes de calcularla
+        """
+        if Config.RESPONSE_CACHE_TTL <= 0 or Config.RESPONSE_CACHE_SIZE <= 0:
+            return
+        
+        with ResponseCache._lock:
+            if generation != ResponseCache._generation:
+                return
+            
+            ResponseCache._entries[key] = (value, time.monotonic())
+            ResponseCache._entries.move_to_end(key)
+            while len(ResponseCache._entries) > Config.RESPONSE_CACHE_SIZE:
+                ResponseCache._entries.popitem(last=False)
+                ResponseCache.evictions += 1
+    
+    @staticmethod
+    def invalidate():
+        """
+        Descarta todas las respuestas (después de escrituras y recargas del
+        ETL). Todas dependen de la tabla completa: cualquier registro puede
+        cambiar las estadísticas, los legendarios, un tipo o un rango de poder
+        """
+        with ResponseCache._lock:
+            ResponseCache._entries.clear()
+            ResponseCache._generation += 1
+            ResponseCache.invalidations += 1
+    
+    @staticmethod
+    def stats():
+        """
+        Contadores de la caché
+        
+        Returns:
+            dict: Entradas, capacidad, TTL, aciertos, fallos, desalojos e invalidaciones
+        """
+        with ResponseCache._lock:
+            lookups = ResponseCache.hits + ResponseCache.misses
+            return {
+                'entradas': len(ResponseCache._entries),
+                'capacidad': Config.RESPONSE_CACHE_SIZE,
+                'ttl_segundos': Config.RESPONSE_CACHE_TTL,
+                'aciertos': ResponseCache.hits,
+                'fallos': ResponseCache.misses,
+                'tasa_aciertos': round(ResponseCache.hits / lookups, 4) if lookups else None,
+                'desalojos': ResponseCache.evictions,
+                'invalidaciones': ResponseCache.invalidations
+            }
+    
+    @staticmethod
+    def cached(method):
+        """
+        Decorador para servicios de lectura: devuelve la respuesta guardada
+        para los mismos argumentos o la calcula y la guarda (salvo errores).
+        Con la caché activa la respuesta se calcula en la base principal: una
+        réplica atrasada no debe quedar guardada después de una invalidación
+        
+        Args:
+            method (function): Servicio que devuelve un diccionario
+            
+        Returns:
+            function: Servicio con caché
+        """
+        signature = inspect.signature(method)
+        primary = ReadRouting.writes(method)  # writes fija las lecturas en la principal
+        
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            if Config.RESPONSE_CACHE_TTL <= 0 or Config.RESPONSE_CACHE_SIZE <= 0:
+                return method(*args, **kwargs)
+            
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = ResponseCache.make_key(str(db.engine.url), method.__name__, bound.arguments)
+            
+            result = ResponseCache.get(key)
+            if result is not None:
+                return result
+            
+            generation = ResponseCache.generation()
+            result = primary(*args, **kwargs)
+            if 'error' not in result:
+                ResponseCache.set(key, result, generation)
+            return result
+        
+        return wrapper
+    
+    @staticmethod
+    def cached_stream(endpoint, arguments, envelope, produce):
+        """
+        Versión de cached para respuestas transmitidas. Un acierto recorre la
+        lista guardada; un fallo lee de produce (en la base principal, como en
+        cached) y guarda lo transmitido al terminar, solo si no superó
+        RESPONSE_CACHE_MAX_ITEMS registros (las respuestas grandes no ocupan
+        memoria). Se guarda con la misma forma y clave que el servicio con
+        cached equivalente, así que ambos comparten las entradas
+        
+        Args:
+            endpoint (str): Nombre del servicio con cached equivalente
+            arguments (dict): Argumentos de ese servicio por nombre
+            envelope (dict): Resto de la respuesta (sin 'pokemon' ni 'total')
+            produce (function): Devuelve el iterador de registros
+            
+        Returns:
+            iterator: Registros de la respuesta
+        """
+        if Config.RESPONSE_CACHE_TTL <= 0 or Config.RESPONSE_CACHE_SIZE <= 0:
+            return produce()
+        
+        key = ResponseCache.make_key(str(db.engine.url), endpoint, arguments)
+        result = ResponseCache.get(key)
+        if result is not None:
+            return iter(result['pokemon'])
+        
+        generation = ResponseCache.generation()
+        return ResponseCache._fill(key, generation, envelope, ReadRouting.writes(produce)())
+    
+    @staticmethod
+    def _fill(key, generation, envelope, rows):
+        """Transmite los registros y guarda la respuesta completa si es pequeña"""
+        kept = []
+        for row in rows:
+            if kept is not None:
+                kept.append(row)
+                if len(kept) > Config.RESPONSE_CACHE_MAX_ITEMS:
+                    kept = None
+            yield row
+        
+        if kept is not None:
+            ResponseCache.set(key, {'pokemon': kept, 'total': len(kept), **envelope}, generation)
+    
+    @staticmethod
+    def invalidates(method):
+        """
+        Decorador para servicios de escritura (también los asíncronos): descarta
+        las respuestas guardadas al terminar, aunque la escritura falle
+        
+        Args:
+            method (function): Servicio de escritura
+            
+        Returns:
+            function: Servicio que invalida la caché
+        """
+        if inspect.iscoroutinefunction(method):
+            @functools.wraps(method)
+            async def async_wrapper(*args, **kwargs):
+                try:
+                    return await method(*args, **kwargs)
+                finally:
+                    ResponseCache.invalidate()
+            
+            return async_wrapper
+        
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            try:
+                return method(*args, **kwargs)
+            finally:
+                ResponseCache.invalidate()
+        
+        return wrapper
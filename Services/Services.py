@@ -1,28 +1,68 @@
 from Repositories.Repositories import PokemonRepository
-import pandas as pd
+from Repositories.DataVersionRepository import DataVersionRepository
+from Models.Pokemon import Pokemon
+from Repositories.ReadRouting import ReadRouting
+from Services.ResponseCache import ResponseCache
+import base64
+import json
 
 class PokemonService:
     """Servicio de lógica de negocio para Pokemon"""
     
+    # Campos admitidos para la paginación por cursor
+    SORTABLE_FIELDS = PokemonRepository.SORTABLE_COLUMNS
+    
+    # Campos que se pueden pedir con ?fields=
+    FIELDS = PokemonRepository.FIELDS
+    
+    # Campos con filtro de rango (<campo>_min y <campo>_max) en el listado
+    RANGE_FIELDS = PokemonRepository.RANGE_FIELDS
+    
+    # Campos numéricos que la creación masiva convierte a int
+    NUMERIC_FIELDS = ('hp', 'ataque', 'defensa', 'ataque_especial', 'defensa_especial', 'velocidad',
+                      'generacion', 'poder_total', 'id')
+    
     @staticmethod
-    def get_all_pokemon(page=1, per_page=20):
+    def get_all_pokemon(page=1, per_page=20, include_total=True, fields=None, filters=None, search=None):
         """
-        Obtiene todos los Pokemon con paginación
+        Obtiene todos los Pokemon con paginación, con filtros y búsqueda
+        opcionales combinados en una sola consulta (ver PokemonRepository.plan)
         
         Args:
             page (int): Número de página
             per_page (int): Registros por página
+            include_total (bool): Incluir total y número de páginas (conteo en caché).
+                Con False no se cuenta y has_next se calcula pidiendo un registro extra
+            fields (list): Campos a devolver de cada Pokemon (todos si es None)
+            filters (dict): Expresión de filtro (ver PokemonRepository.filter_conditions)
+            search (str): Texto a buscar en nombre y tipos
             
         Returns:
             dict: Datos paginados y metadatos
         """
         try:
             offset = (page - 1) * per_page
-            pokemon_list = PokemonRepository.get_all(limit=per_page, offset=offset)
-            total_count = PokemonRepository.count()
+            
+            if not include_total:
+                pokemon_list = PokemonRepository.get_all(limit=per_page + 1, offset=offset, columns=fields,
+                                                         filters=filters, search=search)
+                has_next = len(pokemon_list) > per_page
+                return {
+                    'pokemon': PokemonService._serialize(pokemon_list[:per_page], fields),
+                    'pagination': {
+                        'page': page,
+                        'per_page': per_page,
+                        'has_next': has_next,
+                        'has_prev': page > 1
+                    }
+                }
+            
+            pokemon_list = PokemonRepository.get_all(limit=per_page, offset=offset, columns=fields,
+                                                     filters=filters, search=search)
+            total_count = PokemonRepository.count(filters, search)
             
             return {
-                'pokemon': [pokemon.to_dict() for pokemon in pokemon_list],
+                'pokemon': PokemonService._serialize(pokemon_list, fields),
                 'pagination': {
                     'page': page,
                     'per_page': per_page,
@@ -35,6 +75,129 @@ class PokemonService:
         except Exception as e:
             return {'error': f'Error al obtener Pokemon: {str(e)}'}
     
+    @staticmethod
+    def get_pokemon_page(per_page=20, sort='id', order='asc', cursor=None, fields=None, filters=None, search=None):
+        """
+        Obtiene una página de Pokemon con paginación por cursor (keyset)
+        
+        Args:
+            per_page (int): Registros por página
+            sort (str): Campo de orden ('id', 'poder_total', 'velocidad')
+            order (str): 'asc' o 'desc'
+            cursor (dict): Cursor decodificado con decode_cursor (None para la primera página).
+                Si se indica, su orden reemplaza a sort/order
+            fields (list): Campos a devolver de cada Pokemon (todos si es None)
+            filters (dict): Expresión de filtro (la misma en todas las páginas)
+            search (str): Texto a buscar en nombre y tipos (el mismo en todas las páginas)
+            
+        Returns:
+            dict: Datos de la página y cursor de la siguiente
+        """
+        try:
+            after = None
+            if cursor:
+                sort, order = cursor['sort'], cursor['order']
+                after = (cursor['value'], cursor['id'])
+            
+            # Se pide un registro extra para saber si hay página siguiente
+            pokemon_list = PokemonRepository.get_page(per_page + 1, sort, order == 'desc', after, columns=fields,
+                                                      filters=filters, search=search)
+            has_next = len(pokemon_list) > per_page
+            pokemon_list = PokemonService._serialize(pokemon_list[:per_page], fields)
+            
+            next_cursor = None
+            if has_next and pokemon_list:
+                last = pokemon_list[-1]
+                next_cursor = PokemonService.encode_cursor(sort, order, last[sort], last['id'])
+            
+            # El repositorio agrega la columna de orden para el cursor aunque no se pidiera
+            if fields and sort not in fields and sort != 'id':
+                for pokemon in pokemon_list:
+                    pokemon.pop(sort, None)
+            
+            return {
+                'pokemon': pokemon_list,
+                'pagination': {
+                    'per_page': per_page,
+                    'sort': sort,
+                    'order': order,
+                    'has_next': has_next,
+                    'next_cursor': next_cursor
+                }
+            }
+        except Exception as e:
+            return {'error': f'Error al obtener Pokemon: {str(e)}'}
+    
+    @staticmethod
+    def _serialize(pokemon_list, fields=None):
+        """
+        Convierte el resultado del repositorio a diccionarios. Con fields el
+        repositorio ya devuelve diccionarios solo con esas columnas
+        
+        Args:
+            pokemon_list (list): Objetos Pokemon o diccionarios proyectados
+            fields (list): Campos pedidos
+            
+        Returns:
+            list: Lista de diccionarios
+        """
+        if fields:
+            return pokemon_list
+        return [pokemon.to_dict() for pokemon in pokemon_list]
+    
+    @staticmethod
+    def encode_cursor(sort, order, value, pokemon_id):
+        """
+        Codifica la última clave de una página en un token opaco
+        
+        Args:
+            sort (str): Campo de orden
+            order (str): 'asc' o 'desc'
+            value: Valor del campo de orden en el último registro
+            pokemon_id (int): ID del último registro
+            
+        Returns:
+            str: Cursor en base64 apto para URL
+        """
+        payload = json.dumps({'s': sort, 'o': order, 'v': value, 'id': pokemon_id}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+    
+    @staticmethod
+    def decode_cursor(token):
+        """
+        Decodifica un cursor generado por encode_cursor
+        
+        Args:
+            token (str): Cursor recibido del cliente
+            
+        Returns:
+            dict: {'sort', 'order', 'value', 'id'} o None si el cursor no es válido
+        """
+        try:
+            padded = token + '=' * (-len(token) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+            cursor = {'sort': payload['s'], 'order': payload['o'], 'value': payload['v'], 'id': payload['id']}
+        except (ValueError, KeyError, TypeError):
+            return None
+        
+        if cursor['sort'] not in PokemonRepository.SORTABLE_COLUMNS or cursor['order'] not in ('asc', 'desc'):
+            return None
+        if not isinstance(cursor['id'], int) or not isinstance(cursor['value'], int):
+            return None
+        
+        return cursor
+    
+    @staticmethod
+    def get_data_version():
+        """
+        Obtiene la versión actual de los datos (avanza con cada escritura y
+        recarga del ETL). Es la base de los ETag y Last-Modified de la API
+        
+        Returns:
+            tuple: (versión, fecha de la última escritura o None)
+        """
+        return DataVersionRepository.current()
+    
     @staticmethod
     def get_pokemon_by_id(pokemon_id):
         """
@@ -56,6 +219,8 @@ class PokemonService:
             return {'error': f'Error al obtener Pokemon: {str(e)}'}
     
     @staticmethod
+    @ResponseCache.invalidates
+    @ReadRouting.writes
     def create_pokemon(pokemon_data):
         """
         Crea un nuevo Pokemon
@@ -89,6 +254,153 @@ class PokemonService:
             return {'error': f'Error al crear Pokemon: {str(e)}'}
     
     @staticmethod
+    @ResponseCache.invalidates
+    @ReadRouting.writes
+    def create_pokemon_bulk(pokemon_list):
+        """
+        Crea varios Pokemon en una sola transacción. Todo el lote se valida antes
+        de escribir: los campos de cada registro, los nombres e ids repetidos
+        dentro del lote y los que ya existen en la base de datos (una consulta
+        IN). Los registros válidos se insertan juntos y los inválidos se
+        reportan sin detener al resto
+        
+        Args:
+            pokemon_list (list): Lista de diccionarios con datos de Pokemon
+            
+        Returns:
+            dict: Resultado por registro (en el orden recibido) y conteos
+        """
+        try:
+            results, pending = PokemonService.validate_bulk_items(pokemon_list)
+            
+            # Unicidad contra la base de datos: una consulta por columna para todo el lote
+            existing_names = PokemonRepository.find_existing('nombre', [record['nombre'] for _, record in pending])
+            existing_ids = PokemonRepository.find_existing('id', [record['id'] for _, record in pending])
+            valid = PokemonService.reject_existing(pending, existing_names, existing_ids)
+            
+            if valid:
+                try:
+                    ids = PokemonRepository.insert_records([record for _, record in valid])
+                    PokemonService.mark_created(valid, ids)
+                except Exception as e:
+                    for result, _ in valid:
+                        result['errors'] = [f'Error en la transacción: {str(e)}']
+            
+            return PokemonService.bulk_summary(results)
+            
+        except Exception as e:
+            return {'error': f'Error en la creación masiva: {str(e)}'}
+    
+    @staticmethod
+    def validate_bulk_items(pokemon_list):
+        """
+        Valida cada registro de una creación masiva y los nombres e ids
+        repetidos dentro del lote (sin consultar la base de datos)
+        
+        Args:
+            pokemon_list (list): Lista de diccionarios con datos de Pokemon
+            
+        Returns:
+            tuple: (resultados por registro, [(resultado, registro)] de los válidos)
+        """
+        results = []
+        pending = []  # (resultado, registro) de los que pasan la validación
+        seen_names = set()
+        seen_ids = set()
+        
+        for index, pokemon_data in enumerate(pokemon_list):
+            result = {'index': index, 'status': 'error'}
+            results.append(result)
+            
+            if not isinstance(pokemon_data, dict):
+                result['errors'] = ['Cada elemento debe ser un objeto JSON']
+                continue
+            
+            result['nombre'] = pokemon_data.get('nombre')
+            validation = PokemonService.validate_pokemon_data(pokemon_data)
+            if validation['warnings']:
+                result['warnings'] = validation['warnings']
+            if validation['errors']:
+                result['errors'] = validation['errors']
+                continue
+            
+            try:
+                # validate_pokemon_data acepta números como texto ("70")
+                pokemon_data = dict(pokemon_data)
+                for field in PokemonService.NUMERIC_FIELDS:
+                    if pokemon_data.get(field) is not None:
+                        pokemon_data[field] = int(pokemon_data[field])
+                record = Pokemon.build_record(pokemon_data)
+                errors = Pokemon.validate_record(record)
+            except Exception as e:
+                errors = [f'Datos inválidos: {str(e)}']
+            
+            if not errors and record['nombre'] in seen_names:
+                errors = [f'Nombre repetido en el lote: "{record["nombre"]}"']
+            if not errors and record['id'] is not None and record['id'] in seen_ids:
+                errors = [f'ID repetido en el lote: {record["id"]}']
+            if errors:
+                result['errors'] = errors
+                continue
+            
+            seen_names.add(record['nombre'])
+            seen_ids.add(record['id'])
+            pending.append((result, record))
+        
+        return results, pending
+    
+    @staticmethod
+    def reject_existing(pending, existing_names, existing_ids):
+        """
+        Marca como error los registros cuyo nombre o id ya existe
+        
+        Args:
+            pending (list): (resultado, registro) validados por validate_bulk_items
+            existing_names (set): Nombres que ya existen en la base de datos
+            existing_ids (set): IDs que ya existen en la base de datos
+            
+        Returns:
+            list: (resultado, registro) de los que se pueden insertar
+        """
+        valid = []
+        for result, record in pending:
+            if record['nombre'] in existing_names:
+                result['errors'] = [f'Ya existe un Pokemon con el nombre "{record["nombre"]}"']
+            elif record['id'] in existing_ids:
+                result['errors'] = [f'Ya existe un Pokemon con el ID {record["id"]}']
+            else:
+                valid.append((result, record))
+        return valid
+    
+    @staticmethod
+    def mark_created(valid, ids):
+        """Marca como creados los registros insertados con sus ids"""
+        for (result, _), pokemon_id in zip(valid, ids):
+            result['status'] = 'created'
+            result['id'] = pokemon_id
+    
+    @staticmethod
+    def bulk_summary(results):
+        """
+        Arma la respuesta de una creación masiva
+        
+        Args:
+            results (list): Resultado por registro
+            
+        Returns:
+            dict: Resultados y conteos
+        """
+        created_count = sum(1 for result in results if result['status'] == 'created')
+        return {
+            'results': results,
+            'created_count': created_count,
+            'error_count': len(results) - created_count,
+            'message': f'Se crearon {created_count} de {len(results)} Pokemon'
+        }
+    
+    @staticmethod
+    @ResponseCache.invalidates
+    @ReadRouting.writes
     def update_pokemon(pokemon_id, pokemon_data):
         """
         Actualiza un Pokemon existente
@@ -122,6 +434,8 @@ class PokemonService:
             return {'error': f'Error al actualizar Pokemon: {str(e)}'}
     
     @staticmethod
+    @ResponseCache.invalidates
+    @ReadRouting.writes
     def delete_pokemon(pokemon_id):
         """
         Elimina un Pokemon
@@ -148,13 +462,165 @@ class PokemonService:
             return {'error': f'Error al eliminar Pokemon: {str(e)}'}
     
     @staticmethod
-    def search_pokemon(query, search_type='all'):
+    def _bulk_target(ids, filters):
+        """
+        Valida los ids y la expresión de filtro de una escritura masiva
+        
+        Args:
+            ids (list): IDs de los Pokemon o None
+            filters (dict): Expresión de filtro o None
+            
+        Returns:
+            tuple: (ids como enteros, filtros, lista de errores)
+        """
+        errors = []
+        
+        if ids is not None:
+            try:
+                ids = [int(pokemon_id) for pokemon_id in ids]
+            except (ValueError, TypeError):
+                errors.append('ids debe ser una lista de números enteros')
+        
+        if filters is not None:
+            if not isinstance(filters, dict):
+                errors.append('filter debe ser un objeto JSON')
+            else:
+                filters = dict(filters)
+                try:
+                    PokemonRepository.filter_conditions(filters)
+                except ValueError as e:
+                    errors.append(str(e))
+                
+                for key in filters:
+                    if key.endswith(('_min', '_max')):
+                        try:
+                            filters[key] = int(filters[key])
+                        except (ValueError, TypeError):
+                            errors.append(f'El filtro {key} debe ser un número entero')
+        
+        if not ids and not filters and not errors:
+            errors.append('Se requieren ids o un filtro')
+        
+        return ids, filters, errors
+    
+    @staticmethod
+    def validate_bulk_changes(changes):
+        """
+        Valida los cambios de una actualización masiva con las mismas reglas
+        que validate_pokemon_data, solo para los campos presentes
+        
+        Args:
+            changes (dict): Campos a cambiar
+            
+        Returns:
+            tuple: (cambios con los números convertidos a int, lista de errores)
+        """
+        errors = []
+        if not isinstance(changes, dict) or not changes:
+            errors.append('changes debe ser un objeto JSON con los campos a actualizar')
+            changes = {}
+        
+        unknown = [field for field in changes if field not in PokemonRepository.BULK_UPDATE_FIELDS]
+        if unknown:
+            errors.append(f"Campos que no se pueden actualizar en lote: {', '.join(unknown)}")
+        
+        changes = dict(changes)
+        for field in PokemonService.NUMERIC_FIELDS:
+            if field in changes:
+                try:
+                    changes[field] = int(changes[field])
+                    if changes[field] < 0:
+                        errors.append(f'{field} no puede ser negativo')
+                except (ValueError, TypeError):
+                    errors.append(f'{field} debe ser un número entero')
+        if isinstance(changes.get('generacion'), int) and changes['generacion'] < 1:
+            errors.append('La generación debe ser mayor a 0')
+        if 'tipo_principal' in changes and not str(changes['tipo_principal'] or '').strip():
+            errors.append('El tipo principal es requerido')
+        
+        return changes, errors
+    
+    @staticmethod
+    @ResponseCache.invalidates
+    @ReadRouting.writes
+    def update_pokemon_bulk(changes, ids=None, filters=None):
+        """
+        Actualiza varios Pokemon con un solo UPDATE (por lista de ids y/o
+        expresión de filtro) y recalcula sus campos derivados en la base de datos
+        
+        Args:
+            changes (dict): Campos a cambiar (ver PokemonRepository.BULK_UPDATE_FIELDS)
+            ids (list): IDs de los Pokemon
+            filters (dict): Expresión de filtro (ver PokemonRepository.filter_conditions)
+            
+        Returns:
+            dict: IDs actualizados y conteos, o error (con validation_errors si la petición no es válida)
+        """
+        try:
+            ids, filters, errors = PokemonService._bulk_target(ids, filters)
+            changes, change_errors = PokemonService.validate_bulk_changes(changes)
+            errors.extend(change_errors)
+            
+            if errors:
+                return {'error': 'Datos inválidos', 'validation_errors': errors}
+            
+            updated_ids = PokemonRepository.update_many(changes, ids=ids, filters=filters)
+            
+            result = {
+                'ids': updated_ids,
+                'updated_count': len(updated_ids),
+                'message': f'Se actualizaron {len(updated_ids)} Pokemon'
+            }
+            if ids is not None:
+                result['not_found'] = sorted(set(ids) - set(updated_ids))
+            return result
+            
+        except Exception as e:
+            return {'error': f'Error en la actualización masiva: {str(e)}'}
+    
+    @staticmethod
+    @ResponseCache.invalidates
+    @ReadRouting.writes
+    def delete_pokemon_bulk(ids=None, filters=None):
+        """
+        Elimina varios Pokemon con un solo DELETE (por lista de ids y/o
+        expresión de filtro)
+        
+        Args:
+            ids (list): IDs de los Pokemon
+            filters (dict): Expresión de filtro (ver PokemonRepository.filter_conditions)
+            
+        Returns:
+            dict: IDs eliminados y conteos, o error (con validation_errors si la petición no es válida)
+        """
+        try:
+            ids, filters, errors = PokemonService._bulk_target(ids, filters)
+            if errors:
+                return {'error': 'Datos inválidos', 'validation_errors': errors}
+            
+            deleted_ids = PokemonRepository.delete_many(ids=ids, filters=filters)
+            
+            result = {
+                'ids': deleted_ids,
+                'deleted_count': len(deleted_ids),
+                'message': f'Se eliminaron {len(deleted_ids)} Pokemon'
+            }
+            if ids is not None:
+                result['not_found'] = sorted(set(ids) - set(deleted_ids))
+            return result
+            
+        except Exception as e:
+            return {'error': f'Error en la eliminación masiva: {str(e)}'}
+    
+    @staticmethod
+    def search_pokemon(query, search_type='all', fields=None):
         """
         Busca Pokemon según diferentes criterios
         
         Args:
             query (str): Término de búsqueda
             search_type (str): Tipo de búsqueda ('all', 'name', 'type', 'generation')
+            fields (list): Campos a devolver de cada Pokemon (todos si es None)
             
         Returns:
             dict: Resultados de la búsqueda
@@ -162,26 +628,25 @@ class PokemonService:
         try:
             pokemon_list = []
             
-            if search_type == 'all' or search_type == 'name':
-                pokemon_list.extend(PokemonRepository.search(query, ['nombre']))
+            if search_type == 'all':
+                # Nombre y tipos en el índice de texto completo, ordenados por relevancia
+                pokemon_list.extend(PokemonRepository.search(query, columns=fields))
             
-            if search_type == 'all' or search_type == 'type':
-                pokemon_list.extend(PokemonRepository.get_by_type(query))
+            if search_type == 'name':
+                pokemon_list.extend(PokemonRepository.search(query, ['nombre'], columns=fields))
+            
+            if search_type == 'type':
+                pokemon_list.extend(PokemonRepository.get_by_type(query, columns=fields))
             
             if search_type == 'generation' and query.isdigit():
-                pokemon_list.extend(PokemonRepository.get_by_generation(int(query)))
+                pokemon_list.extend(PokemonRepository.get_by_generation(int(query), columns=fields))
             
-            # Eliminar duplicados manteniendo el orden
-            unique_pokemon = []
-            seen_ids = set()
-            for pokemon in pokemon_list:
-                if pokemon.id not in seen_ids:
-                    unique_pokemon.append(pokemon)
-                    seen_ids.add(pokemon.id)
+            # Cada tipo de búsqueda es una sola consulta: no hay duplicados que eliminar
+            pokemon_list = PokemonService._serialize(pokemon_list, fields)
             
             return {
-                'pokemon': [pokemon.to_dict() for pokemon in unique_pokemon],
-                'total_found': len(unique_pokemon),
+                'pokemon': pokemon_list,
+                'total_found': len(pokemon_list),
                 'search_query': query,
                 'search_type': search_type
             }
@@ -190,20 +655,22 @@ class PokemonService:
             return {'error': f'Error en la búsqueda: {str(e)}'}
     
     @staticmethod
-    def get_pokemon_by_type(tipo):
+    @ResponseCache.cached
+    def get_pokemon_by_type(tipo, fields=None):
         """
         Obtiene Pokemon por tipo
         
         Args:
             tipo (str): Tipo de Pokemon
+            fields (list): Campos a devolver de cada Pokemon (todos si es None)
             
         Returns:
             dict: Lista de Pokemon del tipo especificado
         """
         try:
-            pokemon_list = PokemonRepository.get_by_type(tipo)
+            pokemon_list = PokemonRepository.get_by_type(tipo, columns=fields)
             return {
-                'pokemon': [pokemon.to_dict() for pokemon in pokemon_list],
+                'pokemon': PokemonService._serialize(pokemon_list, fields),
                 'total': len(pokemon_list),
                 'type': tipo
             }
@@ -211,84 +678,167 @@ class PokemonService:
             return {'error': f'Error al obtener Pokemon por tipo: {str(e)}'}
     
     @staticmethod
-    def get_legendary_pokemon():
+    @ResponseCache.cached
+    def get_legendary_pokemon(fields=None):
         """
         Obtiene todos los Pokemon legendarios
         
+        Args:
+            fields (list): Campos a devolver de cada Pokemon (todos si es None)
+            
         Returns:
             dict: Lista de Pokemon legendarios
         """
         try:
-            pokemon_list = PokemonRepository.get_legendary()
+            pokemon_list = PokemonRepository.get_legendary(columns=fields)
             return {
-                'pokemon': [pokemon.to_dict() for pokemon in pokemon_list],
+                'pokemon': PokemonService._serialize(pokemon_list, fields),
                 'total': len(pokemon_list)
             }
         except Exception as e:
             return {'error': f'Error al obtener Pokemon legendarios: {str(e)}'}
     
     @staticmethod
+    @ResponseCache.cached
     def get_pokemon_statistics():
         """
-        Obtiene estadísticas generales de los Pokemon
+        Obtiene estadísticas generales de los Pokemon desde el resumen
+        materializado (una lectura por clave primaria). El resumen se mantiene
+        en cada escritura y se reconstruye en cada carga del ETL
         
         Returns:
             dict: Estadísticas completas
         """
         try:
-            basic_stats = PokemonRepository.get_statistics()
+            return PokemonService.format_statistics(PokemonRepository.get_statistics_summary())
+        except Exception as e:
+            return {'error': f'Error al obtener estadísticas: {str(e)}'}
+    
+    @staticmethod
+    def format_statistics(summary):
+        """
+        Arma la respuesta de estadísticas a partir del resumen materializado
+        
+        Args:
+            summary (PokemonStatsSummary): Resumen actual
             
-            # Obtener estadísticas adicionales
-            all_pokemon = PokemonRepository.get_all()
+        Returns:
+            dict: Estadísticas completas
+        """
+        total = summary.total
+        
+        stats = {
+            'total_pokemon': total,
+            'pokemon_legendarios': summary.legendarios,
+            'pokemon_mega': summary.mega,
+            'generaciones': len(summary.por_generacion),
+            'tipos_principales': len(summary.por_tipo),
+            'poder_promedio': round(summary.suma_poder / total, 2) if total else 0.0
+        }
+        
+        if total:
+            by_count = lambda item: (-item[1], item[0])
+            generations = sorted((int(key), count) for key, count in summary.por_generacion.items())
             
-            if all_pokemon:
-                df = pd.DataFrame([pokemon.to_dict() for pokemon in all_pokemon])
-                
-                additional_stats = {
-                    'tipos_principales': df['tipo_principal'].value_counts().to_dict(),
-                    'distribución_por_generacion': df['generacion'].value_counts().sort_index().to_dict(),
-                    'distribución_por_categoria_poder': df['categoria_poder'].value_counts().to_dict(),
-                    'estadisticas_poder': {
-                        'promedio': df['poder_total'].mean(),
-                        'mediana': df['poder_total'].median(),
-                        'maximo': df['poder_total'].max(),
-                        'minimo': df['poder_total'].min(),
-                        'desviacion_estandar': df['poder_total'].std()
-                    },
-                    'top_5_mas_poderosos': df.nlargest(5, 'poder_total')[['nombre', 'poder_total']].to_dict('records'),
-                    'pokemon_mas_rapido': df.loc[df['velocidad'].idxmax(), ['nombre', 'velocidad']].to_dict(),
-                    'pokemon_mas_resistente': df.loc[df['hp'].idxmax(), ['nombre', 'hp']].to_dict()
-                }
-                
-                # Redondear valores numéricos
-                additional_stats['estadisticas_poder'] = {
-                    k: round(v, 2) if isinstance(v, float) else v
-                    for k, v in additional_stats['estadisticas_poder'].items()
-                }
-                
-                basic_stats.update(additional_stats)
+            stats.update({
+                'tipos_principales': dict(sorted(summary.por_tipo.items(), key=by_count)),
+                'distribución_por_generacion': dict(generations),
+                'distribución_por_categoria_poder': dict(sorted(summary.por_categoria.items(), key=by_count)),
+                'estadisticas_poder': PokemonService._power_statistics(summary),
+                'top_5_mas_poderosos': [{'nombre': nombre, 'poder_total': value}
+                                        for value, _, nombre in summary.top_poder[:5]],
+                'pokemon_mas_rapido': PokemonService._top_entry(summary.top_velocidad, 'velocidad'),
+                'pokemon_mas_resistente': PokemonService._top_entry(summary.top_hp, 'hp')
+            })
+        
+        return stats
+    
+    @staticmethod
+    def _power_statistics(summary):
+        """
+        Calcula promedio, mediana, máximo, mínimo y desviación estándar (muestral)
+        de poder_total a partir de las sumas y el histograma del resumen
+        
+        Args:
+            summary (PokemonStatsSummary): Resumen con al menos un registro
             
-            return basic_stats
+        Returns:
+            dict: Estadísticas de poder_total redondeadas a 2 decimales
+        """
+        n = summary.total
+        histogram = sorted((int(value), count) for value, count in summary.histograma_poder.items())
+        
+        # Valores en las posiciones centrales: una si n es impar, dos si es par
+        positions = sorted({(n - 1) // 2, n // 2})
+        middle = []
+        seen = 0
+        for value, count in histogram:
+            seen += count
+            while positions and positions[0] < seen:
+                middle.append(value)
+                positions.pop(0)
+        
+        std = None
+        if n > 1:
+            variance = (n * summary.suma_cuadrados_poder - summary.suma_poder ** 2) / (n * (n - 1))
+            std = round(max(variance, 0) ** 0.5, 2)
+        
+        return {
+            'promedio': round(summary.suma_poder / n, 2),
+            'mediana': round(sum(middle) / len(middle), 2),
+            'maximo': histogram[-1][0],
+            'minimo': histogram[0][0],
+            'desviacion_estandar': std
+        }
+    
+    @staticmethod
+    def _top_entry(top, column):
+        """
+        Convierte el primer elemento de una lista top-K del resumen
+        
+        Args:
+            top (list): Lista [[valor, id, nombre], ...]
+            column (str): Nombre de la columna del top
             
+        Returns:
+            dict: {'nombre', column} o None si la lista está vacía
+        """
+        if not top:
+            return None
+        value, _, nombre = top[0]
+        return {'nombre': nombre, column: value}
+    
+    @staticmethod
+    def verify_statistics():
+        """
+        Compara el resumen materializado con un recálculo completo sobre la tabla
+        
+        Returns:
+            dict: {'consistente': bool, 'diferencias': {...}}
+        """
+        try:
+            return PokemonRepository.verify_statistics()
         except Exception as e:
-            return {'error': f'Error al obtener estadísticas: {str(e)}'}
+            return {'error': f'Error al verificar estadísticas: {str(e)}'}
     
     @staticmethod
-    def get_pokemon_by_power_range(min_power=None, max_power=None):
+    @ResponseCache.cached
+    def get_pokemon_by_power_range(min_power=None, max_power=None, fields=None):
         """
         Obtiene Pokemon por rango de poder
         
         Args:
             min_power (int): Poder mínimo
             max_power (int): Poder máximo
+            fields (list): Campos a devolver de cada Pokemon (todos si es None)
             
         Returns:
             dict: Lista de Pokemon en el rango especificado
         """
         try:
-            pokemon_list = PokemonRepository.get_by_power_range(min_power, max_power)
+            pokemon_list = PokemonRepository.get_by_power_range(min_power, max_power, columns=fields)
             return {
-                'pokemon': [pokemon.to_dict() for pokemon in pokemon_list],
+                'pokemon': PokemonService._serialize(pokemon_list, fields),
                 'total': len(pokemon_list),
                 'filters': {
                     'min_power': min_power,
@@ -299,6 +849,100 @@ class PokemonService:
             return {'error': f'Error al obtener Pokemon por rango de poder: {str(e)}'}
     
     @staticmethod
+    def stream_pokemon_by_type(tipo, fields=None):
+        """
+        Versión transmitida de get_pokemon_by_type: los Pokemon se leen con un
+        cursor del servidor a medida que se envían
+        
+        Args:
+            tipo (str): Tipo de Pokemon
+            fields (list): Campos a devolver de cada Pokemon (todos si es None)
+            
+        Returns:
+            dict: Respuesta con 'pokemon' como iterador (sin 'total', se cuenta al transmitir)
+        """
+        return PokemonService._stream('get_pokemon_by_type', {'tipo': tipo, 'fields': fields}, {'type': tipo},
+                                      {'tipo': tipo}, fields, 'Error al obtener Pokemon por tipo')
+    
+    @staticmethod
+    def stream_legendary_pokemon(fields=None):
+        """
+        Versión transmitida de get_legendary_pokemon
+        
+        Args:
+            fields (list): Campos a devolver de cada Pokemon (todos si es None)
+            
+        Returns:
+            dict: Respuesta con 'pokemon' como iterador (sin 'total', se cuenta al transmitir)
+        """
+        return PokemonService._stream('get_legendary_pokemon', {'fields': fields}, {},
+                                      {'es_legendario': True}, fields, 'Error al obtener Pokemon legendarios')
+    
+    @staticmethod
+    def stream_pokemon_by_power_range(min_power=None, max_power=None, fields=None):
+        """
+        Versión transmitida de get_pokemon_by_power_range
+        
+        Args:
+            min_power (int): Poder mínimo
+            max_power (int): Poder máximo
+            fields (list): Campos a devolver de cada Pokemon (todos si es None)
+            
+        Returns:
+            dict: Respuesta con 'pokemon' como iterador (sin 'total', se cuenta al transmitir)
+        """
+        filters = {key: value for key, value in (('poder_total_min', min_power), ('poder_total_max', max_power))
+                   if value is not None}
+        return PokemonService._stream('get_pokemon_by_power_range',
+                                      {'min_power': min_power, 'max_power': max_power, 'fields': fields},
+                                      {'filters': {'min_power': min_power, 'max_power': max_power}},
+                                      filters, fields, 'Error al obtener Pokemon por rango de poder')
+    
+    @staticmethod
+    def export_pokemon(filters=None, fields=None):
+        """
+        Exporta la tabla completa (o los Pokemon que cumplen los filtros del
+        listado) transmitiéndola desde un cursor del servidor. No usa la caché
+        de respuestas
+        
+        Args:
+            filters (dict): Expresión de filtro (ver PokemonRepository.filter_conditions)
+            fields (list): Campos a devolver de cada Pokemon (todos si es None)
+            
+        Returns:
+            dict: Respuesta con 'pokemon' como iterador (sin 'total', se cuenta al transmitir)
+        """
+        try:
+            return {'pokemon': PokemonRepository.stream(filters, fields)}
+        except Exception as e:
+            return {'error': f'Error al exportar Pokemon: {str(e)}'}
+    
+    @staticmethod
+    def _stream(endpoint, arguments, envelope, filters, fields, error_message):
+        """
+        Prepara una respuesta transmitida que comparte la caché de respuestas
+        con el servicio endpoint (ver ResponseCache.cached_stream)
+        
+        Args:
+            endpoint (str): Servicio equivalente con la respuesta completa
+            arguments (dict): Argumentos de ese servicio
+            envelope (dict): Resto de la respuesta
+            filters (dict): Expresión de filtro de la consulta
+            fields (list): Campos a devolver de cada Pokemon
+            error_message (str): Prefijo del mensaje de error
+            
+        Returns:
+            dict: Respuesta con 'pokemon' como iterador o mensaje de error
+        """
+        try:
+            rows = ResponseCache.cached_stream(endpoint, arguments, envelope,
+                                               lambda: PokemonRepository.stream(filters, fields))
+            return {'pokemon': rows, **envelope}
+        except Exception as e:
+            return {'error': f'{error_message}: {str(e)}'}
+    
+    @staticmethod
+    @ResponseCache.invalidates
     def load_pokemon_from_csv(csv_data):
         """
         Carga Pokemon desde datos CSV (para el ETL)
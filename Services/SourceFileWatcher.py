@@ -0,0 +1,117 @@
+import os
+import threading
+import time
+
+class SourceFileWatcher:
+    """Vigila el archivo fuente del ETL por sondeo (mtime y tamaño) y dispara una recarga cuando cambia"""
+
+    def __init__(self, file_path, on_change, poll_interval=2.0, debounce_seconds=5.0, min_interval=60.0):
+        """
+        Inicializa el vigilante del archivo fuente
+
+        Args:
+            file_path (str): Ruta del archivo a vigilar
+            on_change (callable): Función que se llama (sin argumentos) cuando el archivo cambió.
+                Si devuelve (job, created) con created en False (ya había una recarga en
+                ejecución), el cambio sigue pendiente y se reintenta en un sondeo posterior
+            poll_interval (float): Segundos entre cada revisión del archivo
+            debounce_seconds (float): Segundos sin nuevas escrituras antes de disparar la recarga
+            min_interval (float): Segundos mínimos entre dos recargas consecutivas
+        """
+        self.file_path = file_path
+        self.on_change = on_change
+        self.poll_interval = poll_interval
+        self.debounce_seconds = debounce_seconds
+        self.min_interval = min_interval
+
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._last_signature = self._signature()
+        self._pending_since = None
+        self._last_trigger = None
+        self._deferred = False
+        self.trigger_count = 0
+
+    def start(self):
+        """Inicia el sondeo en un hilo de fondo"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name='source-file-watcher', daemon=True)
+            self._thread.start()
+            print(f"👀 Vigilando cambios en: {self.file_path}")
+        return self
+
+    def stop(self):
+        """Detiene el sondeo"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_interval + 1)
+
+    def _signature(self):
+        """
+        Obtiene la firma actual del archivo
+
+        Returns:
+            tuple: (mtime en ns, tamaño) o None si el archivo no existe
+        """
+        try:
+            stat = os.stat(self.file_path)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
+    def _run(self):
+        """Bucle de sondeo"""
+        while not self._stop_event.wait(self.poll_interval):
+            self.check()
+
+    def check(self, now=None):
+        """
+        Revisa el archivo una vez. Cada escritura reinicia la espera (debounce) y
+        la recarga se dispara solo cuando el archivo lleva debounce_seconds sin
+        cambiar y ya pasó min_interval desde la recarga anterior
+
+        Args:
+            now (float): Instante actual (time.monotonic), útil para pruebas
+
+        Returns:
+            bool: True si se disparó una recarga (False si ya había una en ejecución)
+        """
+        now = time.monotonic() if now is None else now
+        signature = self._signature()
+
+        if signature != self._last_signature:
+            self._last_signature = signature
+            # Un archivo que desaparece (reemplazo en curso) no dispara la recarga
+            self._pending_since = now if signature is not None else None
+            return False
+
+        if self._pending_since is None:
+            return False
+        if now - self._pending_since < self.debounce_seconds:
+            return False
+        if self._last_trigger is not None and now - self._last_trigger < self.min_interval:
+            return False
+
+        if not self._deferred:
+            print(f"🔁 Cambio detectado en {self.file_path}, iniciando recarga...")
+
+        try:
+            result = self.on_change()
+        except Exception as e:
+            print(f"❌ Error al disparar la recarga: {str(e)}")
+            result = None
+
+        # La recarga en curso pudo leer el archivo antes del cambio: se reintenta cuando termine
+        if isinstance(result, tuple) and len(result) == 2 and result[1] is False:
+            if not self._deferred:
+                print("⏳ Ya hay una recarga en ejecución, se reintentará cuando termine")
+            self._deferred = True
+            return False
+
+        self._pending_since = None
+        self._deferred = False
+        self._last_trigger = now
+        self.trigger_count += 1
+
+        return True
@@ -0,0 +1,115 @@
+import os
+import sys
+import json
+import asyncio
+import tempfile
+
+# Agregar el directorio padre al path para importar módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Config.Config import db
+from Services.ETLService import ETLService
+from Repositories.AsyncRepositories import AsyncDatabase
+from Fixtures import generar_datos_limpios, crear_app_temporal, configuracion, Comprobaciones
+
+# Rutas de lectura que ambas APIs deben responder igual
+RUTAS = [
+    '/api/pokemon?per_page=5',
+    '/api/pokemon?per_page=5&page=3&include_total=false',
+    '/api/pokemon?sort=poder_total&order=desc&per_page=4&fields=nombre',
+    '/api/pokemon?type=Fire,Water&generation=1,2&min_power=300&per_page=50',
+    '/api/pokemon?search=fire&per_page=10',
+    '/api/pokemon/7',
+    '/api/pokemon/99999',
+    '/api/pokemon/search?q=a&type=name&fields=id,nombre',
+    '/api/pokemon/types/fire?fields=id',
+    '/api/pokemon/legendary',
+    '/api/pokemon/power?min=400&max=500',
+    '/api/pokemon/statistics',
+    '/api/pokemon?legendary=quizas'
+]
+
+def probar_api_asincrona(n=300):
+    """
+    Compara las respuestas de la API Flask y la API ASGI (asgi.py) sobre la
+    misma base de datos, verifica que las escrituras asíncronas mantengan
+    el resumen de estadísticas y que no inicie con particiones configuradas
+    
+    Args:
+        n (int): Número de registros de prueba
+        
+    Returns:
+        bool: True si las respuestas coinciden y el resumen es consistente
+    """
+    import asgi
+    
+    print("🧪 Comparando la API Flask con la API asíncrona...")
+    print("=" * 60)
+    
+    comprobar = Comprobaciones()
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, 'asincrona.db')
+        app = crear_app_temporal(db_path, api=True)
+        with app.app_context():
+            ETLService.load_pokemon_from_dataframe(generar_datos_limpios(n), mode='bulk')
+        cliente_flask = app.test_client()
+        app_asgi = asgi.create_app(f'sqlite+aiosqlite:///{db_path}')
+        
+        def normalizar(datos):
+            return json.loads(json.dumps(datos, sort_keys=True))
+        
+        async def comparar():
+            async with app_asgi.test_app() as servidor:
+                cliente = servidor.test_client()
+                
+                for ruta in RUTAS:
+                    esperado = cliente_flask.get(ruta)
+                    respuesta = await cliente.get(ruta)
+                    comprobar(f"GET {ruta} ({respuesta.status_code})",
+                              esperado.status_code == respuesta.status_code and
+                              normalizar(esperado.get_json()) == normalizar(await respuesta.get_json()))
+                
+                # Escrituras asíncronas: el resumen debe seguir coincidiendo con la tabla
+                nuevo = {'nombre': 'Asincrono', 'tipo_principal': 'Fire', 'hp': 50, 'ataque': 60, 'defensa': 40}
+                respuesta = await cliente.post('/api/pokemon', json=nuevo)
+                nuevo_id = (await respuesta.get_json())['pokemon']['id']
+                escrituras = [
+                    (respuesta.status_code, 201),
+                    ((await cliente.put(f'/api/pokemon/{nuevo_id}', json=dict(nuevo, poder_total=650))).status_code, 200),
+                    ((await cliente.patch('/api/pokemon/bulk', json={'ids': [1, 2], 'changes': {'poder_total': 700}})).status_code, 200),
+                    ((await cliente.delete('/api/pokemon/bulk', json={'ids': [3, 4]})).status_code, 200),
+                    ((await cliente.delete(f'/api/pokemon/{nuevo_id}')).status_code, 200)
+                ]
+                ok = all(estado == esperado for estado, esperado in escrituras)
+                verificacion = await (await cliente.get('/api/pokemon/statistics/verify')).get_json()
+                comprobar("Escrituras asíncronas con el resumen consistente", ok and verificacion['consistente'])
+                
+                esperado = cliente_flask.get('/api/pokemon/statistics').get_json()
+                comprobar("Estadísticas iguales después de las escrituras",
+                          normalizar(esperado) == normalizar(await (await cliente.get('/api/pokemon/statistics')).get_json()))
+        
+        asyncio.run(comparar())
+        
+        # Con particiones los datos no están en la tabla pokemon: no debe iniciar
+        async def iniciar_particionada():
+            try:
+                await AsyncDatabase.init(f'sqlite+aiosqlite:///{db_path}')
+            except ValueError:
+                return AsyncDatabase.engine is None
+            await AsyncDatabase.close()
+            return False
+        
+        with configuracion(SHARD_BY='generacion'):
+            comprobar("Con SHARD_BY la API asíncrona se niega a iniciar", asyncio.run(iniciar_particionada()))
+        
+        with app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+    
+    print("\n" + ("✅ Ambas APIs responden igual" if comprobar.exito else "❌ Las respuestas difieren"))
+    return comprobar.exito
+
+
+if __name__ == "__main__":
+    sys.exit(0 if probar_api_asincrona() else 1)
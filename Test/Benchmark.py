@@ -0,0 +1,366 @@
+import numpy as np
+import os
+import sys
+import time
+import random
+import tempfile
+
+# Agregar el directorio padre al path para importar módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Config.Config import db
+from Services.ETLService import ETLService
+from Fixtures import generar_datos_limpios, crear_app_temporal
+
+
+def benchmark_carga_etl(tamanos=(100_000, 1_000_000), modos=('orm', 'bulk')):
+    """
+    Compara la carga a la base de datos registro por registro (ORM) con la carga
+    por lotes de ETLService.load_pokemon_from_csv
+    
+    Args:
+        tamanos (tuple): Número de registros a cargar en cada prueba
+        modos (tuple): Modos de carga a comparar
+    """
+    print("⏱️ Benchmark de carga ETL a la base de datos")
+    print("=" * 60)
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for n in tamanos:
+            csv_path = os.path.join(tmp_dir, f'pokemon_{n}.csv')
+            generar_datos_limpios(n).to_csv(csv_path, index=False)
+            
+            tiempos = {}
+            for modo in modos:
+                app = crear_app_temporal(os.path.join(tmp_dir, f'pokemon_{n}_{modo}.db'))
+                with app.app_context():
+                    start_time = time.perf_counter()
+                    result = ETLService.load_pokemon_from_csv(csv_path, mode=modo)
+                    tiempos[modo] = time.perf_counter() - start_time
+                    db.session.remove()
+                    db.engine.dispose()
+                
+                if not result['success']:
+                    print(f"❌ {modo} con {n} registros: {result['error']}")
+                    del tiempos[modo]
+            
+            print(f"\n📊 {n:,} registros")
+            for modo, duracion in tiempos.items():
+                print(f"   {modo:>5}: {duracion:8.2f} s  ({n / duracion:,.0f} registros/s)")
+            if 'orm' in tiempos and 'bulk' in tiempos:
+                print(f"   ⚡ Aceleración: {tiempos['orm'] / tiempos['bulk']:.1f}x")
+
+
+def benchmark_paginacion(n=200_000, paginas=(1, 100, 1_000, 5_000), por_pagina=20, repeticiones=20):
+    """
+    Compara el tiempo por página de la paginación con OFFSET (get_all) y por
+    cursor (get_page) a distintas profundidades
+    
+    Args:
+        n (int): Número de registros en la tabla
+        paginas (tuple): Números de página a medir
+        por_pagina (int): Registros por página
+        repeticiones (int): Veces que se repite cada consulta
+    """
+    from Repositories.Repositories import PokemonRepository
+    
+    print("⏱️ Benchmark de paginación: OFFSET (por id) vs. cursor (poder_total desc)")
+    print("=" * 60)
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        app = crear_app_temporal(os.path.join(tmp_dir, 'paginacion.db'))
+        with app.app_context():
+            ETLService.load_pokemon_from_dataframe(generar_datos_limpios(n), mode='bulk')
+            orden = sorted(((-p.poder_total, -p.id) for p in PokemonRepository.get_all()))
+            
+            print(f"\n📊 {n:,} registros, {por_pagina} por página")
+            for pagina in paginas:
+                offset = (pagina - 1) * por_pagina
+                if offset >= n:
+                    print(f"   página {pagina:>6,}: se omite (la tabla tiene {n:,} registros)")
+                    continue
+                after = None
+                if offset:
+                    valor, pokemon_id = orden[offset - 1]
+                    after = (-valor, -pokemon_id)
+                
+                start_time = time.perf_counter()
+                for _ in range(repeticiones):
+                    PokemonRepository.get_all(limit=por_pagina, offset=offset)
+                tiempo_offset = (time.perf_counter() - start_time) / repeticiones
+                
+                start_time = time.perf_counter()
+                for _ in range(repeticiones):
+                    PokemonRepository.get_page(por_pagina, 'poder_total', True, after)
+                tiempo_cursor = (time.perf_counter() - start_time) / repeticiones
+                
+                print(f"   página {pagina:>6,}: OFFSET {tiempo_offset * 1000:7.2f} ms   cursor {tiempo_cursor * 1000:7.2f} ms")
+            
+            db.session.remove()
+            db.engine.dispose()
+
+
+def benchmark_campos(n=50_000, por_pagina=100, repeticiones=50, campos='id,nombre'):
+    """
+    Mide el tamaño de la respuesta y el tiempo de GET /api/pokemon con todos los
+    campos y con una selección de campos (?fields=)
+    
+    Args:
+        n (int): Número de registros en la tabla
+        por_pagina (int): Registros por página
+        repeticiones (int): Veces que se repite cada petición
+        campos (str): Campos pedidos en la versión reducida
+    """
+    print(f"⏱️ Benchmark de selección de campos: todos vs. fields={campos}")
+    print("=" * 60)
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        app = crear_app_temporal(os.path.join(tmp_dir, 'campos.db'), api=True)
+        with app.app_context():
+            ETLService.load_pokemon_from_dataframe(generar_datos_limpios(n), mode='bulk')
+        
+        client = app.test_client()
+        print(f"\n📊 {n:,} registros, {por_pagina} por página")
+        for nombre, url in [('todos', f'/api/pokemon?per_page={por_pagina}&include_total=false'),
+                            (campos, f'/api/pokemon?per_page={por_pagina}&include_total=false&fields={campos}')]:
+            tamano = len(client.get(url).data)
+            start_time = time.perf_counter()
+            for _ in range(repeticiones):
+                client.get(url)
+            duracion = (time.perf_counter() - start_time) / repeticiones
+            print(f"   {nombre:>20}: {tamano:>8,} bytes  {duracion * 1000:7.2f} ms")
+        
+        with app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+
+
+def _proceso_concurrencia(rol, db_path, perfil, n, inicio, fin, cola):
+    """
+    Proceso lector o escritor del benchmark de concurrencia (cada proceso abre
+    su propia conexión, como los workers de un servidor WSGI)
+    
+    Args:
+        rol (str): 'lector' o 'escritor'
+        db_path (str): Ruta del archivo SQLite
+        perfil (bool): Aplicar el perfil de producción de SQLite
+        n (int): Número de registros en la tabla
+        inicio (float): Momento (time.time) en que empiezan las operaciones
+        fin (float): Momento (time.time) en que terminan
+        cola (multiprocessing.Queue): Recibe (rol, operaciones, errores, latencias en ms)
+    """
+    from Repositories.Repositories import PokemonRepository
+    
+    app = crear_app_temporal(db_path, perfil_sqlite=perfil)
+    rnd = random.Random()
+    operaciones = errores = 0
+    latencias = []
+    
+    with app.app_context():
+        time.sleep(max(0.0, inicio - time.time()))
+        while time.time() < fin:
+            start_time = time.perf_counter()
+            try:
+                if rol == 'lector':
+                    PokemonRepository.get_by_id(rnd.randint(1, n))
+                    PokemonRepository.get_page(20, 'poder_total', True, after=(rnd.randint(200, 1000), n))
+                    operaciones += 2
+                    latencias.append((time.perf_counter() - start_time) * 1000)
+                elif PokemonRepository.update(rnd.randint(1, n), {'hp': rnd.randint(5, 200)}):
+                    operaciones += 1
+                else:
+                    errores += 1
+            except Exception:
+                errores += 1
+            db.session.remove()
+        db.engine.dispose()
+    
+    cola.put((rol, operaciones, errores, latencias))
+
+
+def benchmark_concurrencia(n=50_000, lectores=4, segundos=5.0):
+    """
+    Mide lecturas y escrituras por segundo con varios procesos lectores y un
+    proceso escritor sobre el mismo archivo SQLite, sin y con el perfil de
+    producción (WAL, synchronous=NORMAL, caché, mmap y busy_timeout)
+    
+    Args:
+        n (int): Número de registros en la tabla
+        lectores (int): Procesos que leen (get_by_id y una página por poder_total)
+        segundos (float): Duración de cada medición
+    """
+    import multiprocessing
+    
+    print(f"⏱️ Benchmark de concurrencia: {lectores} lectores y 1 escritor durante {segundos:g} s")
+    print("=" * 60)
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for nombre, perfil in [('por defecto', False), ('producción', True)]:
+            db_path = os.path.join(tmp_dir, f'concurrencia_{perfil}.db')
+            app = crear_app_temporal(db_path, perfil_sqlite=perfil)
+            with app.app_context():
+                ETLService.load_pokemon_from_dataframe(generar_datos_limpios(n), mode='bulk')
+                modo = db.session.execute(db.text('PRAGMA journal_mode')).scalar()
+                db.session.remove()
+                db.engine.dispose()
+            
+            # Todos los procesos empiezan al mismo tiempo, después de crear su app
+            cola = multiprocessing.Queue()
+            inicio = time.time() + 3
+            roles = ['lector'] * lectores + ['escritor']
+            procesos = [multiprocessing.Process(target=_proceso_concurrencia,
+                                                args=(rol, db_path, perfil, n, inicio, inicio + segundos, cola))
+                        for rol in roles]
+            for proceso in procesos:
+                proceso.start()
+            resultados = [cola.get() for _ in procesos]
+            for proceso in procesos:
+                proceso.join()
+            
+            lecturas = sum(ops for rol, ops, _, _ in resultados if rol == 'lector')
+            escrituras = sum(ops for rol, ops, _, _ in resultados if rol == 'escritor')
+            errores = sum(err for _, _, err, _ in resultados)
+            latencias = np.array([ms for _, _, _, lista in resultados for ms in lista])
+            
+            print(f"\n📊 Perfil {nombre} (journal_mode={modo})")
+            print(f"   Lecturas/s:   {lecturas / segundos:10,.0f}")
+            print(f"   Escrituras/s: {escrituras / segundos:10,.0f}")
+            print(f"   Lectura p99:  {np.percentile(latencias, 99):10.2f} ms (máx. {latencias.max():.2f} ms)")
+            print(f"   Errores:      {errores:10,}")
+
+
+def _servidor_flask(db_path, puerto):
+    """Proceso del servidor Flask (servidor de desarrollo con un hilo por petición)"""
+    app = crear_app_temporal(db_path, api=True)
+    app.run(host='127.0.0.1', port=puerto, threaded=True)
+
+
+def _servidor_asgi(db_path, puerto):
+    """Proceso del servidor ASGI (asgi.py con uvicorn, un solo hilo con el bucle de eventos)"""
+    import uvicorn
+    import asgi
+    
+    uvicorn.run(asgi.create_app(f'sqlite+aiosqlite:///{db_path}'), host='127.0.0.1', port=puerto,
+                log_level='warning')
+
+
+def _carga_http(base_url, n, clientes, segundos):
+    """
+    Genera carga HTTP con clientes concurrentes que repiten una mezcla de
+    lecturas (por id, listado filtrado con total, búsqueda paginada y página por cursor)
+    
+    Args:
+        base_url (str): URL del servidor, ej: http://127.0.0.1:5001
+        n (int): Número de registros en la tabla
+        clientes (int): Peticiones simultáneas
+        segundos (float): Duración de la medición
+        
+    Returns:
+        tuple: (peticiones completadas, errores, latencias en ms)
+    """
+    import urllib.request
+    from concurrent.futures import ThreadPoolExecutor
+    
+    def cliente(semilla):
+        rnd = random.Random(semilla)
+        completadas = errores = 0
+        latencias = []
+        fin = time.time() + segundos
+        while time.time() < fin:
+            ruta = rnd.choice([
+                f'/api/pokemon/{rnd.randint(1, n)}',
+                f'/api/pokemon?type=Fire,Water&generation={rnd.randint(1, 9)}&per_page=20&page={rnd.randint(1, 5)}',
+                f'/api/pokemon?search={rnd.choice(["fire", "water", "dra", "grass"])}&per_page=20&fields=id,nombre',
+                f'/api/pokemon?sort=poder_total&order=desc&per_page=20&fields=id,nombre,poder_total'
+            ])
+            start_time = time.perf_counter()
+            try:
+                with urllib.request.urlopen(base_url + ruta, timeout=30) as respuesta:
+                    respuesta.read()
+                completadas += 1
+                latencias.append((time.perf_counter() - start_time) * 1000)
+            except Exception:
+                errores += 1
+        return completadas, errores, latencias
+    
+    with ThreadPoolExecutor(max_workers=clientes) as executor:
+        resultados = list(executor.map(cliente, range(clientes)))
+    
+    return (sum(r[0] for r in resultados), sum(r[1] for r in resultados),
+            np.array([ms for r in resultados for ms in r[2]]))
+
+
+def benchmark_asgi(n=20_000, clientes=(8, 32, 128), segundos=5.0):
+    """
+    Compara la API Flask (servidor de desarrollo, un hilo por petición) con la
+    API ASGI (asgi.py con uvicorn, sesiones asíncronas de SQLAlchemy) sobre la
+    misma base de datos: peticiones por segundo y latencia p99 con distintas
+    cantidades de clientes simultáneos
+    
+    Args:
+        n (int): Número de registros en la tabla
+        clientes (tuple): Cantidades de clientes simultáneos a medir
+        segundos (float): Duración de cada medición
+    """
+    import multiprocessing
+    import urllib.request
+    
+    print(f"⏱️ Benchmark Flask vs ASGI: {n:,} registros, {segundos:g} s por medición")
+    print("=" * 60)
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, 'asgi.db')
+        app = crear_app_temporal(db_path)
+        with app.app_context():
+            ETLService.load_pokemon_from_dataframe(generar_datos_limpios(n), mode='bulk')
+            db.session.remove()
+            db.engine.dispose()
+        
+        for nombre, servidor, puerto in [('Flask (hilos)', _servidor_flask, 5071), ('ASGI (uvicorn)', _servidor_asgi, 5072)]:
+            proceso = multiprocessing.Process(target=servidor, args=(db_path, puerto), daemon=True)
+            proceso.start()
+            base_url = f'http://127.0.0.1:{puerto}'
+            
+            try:
+                # Esperar a que el servidor acepte peticiones
+                for _ in range(100):
+                    try:
+                        urllib.request.urlopen(base_url + '/api/pokemon/1', timeout=1).read()
+                        break
+                    except Exception:
+                        time.sleep(0.1)
+                
+                print(f"\n📊 {nombre}")
+                for cantidad in clientes:
+                    completadas, errores, latencias = _carga_http(base_url, n, cantidad, segundos)
+                    p99 = np.percentile(latencias, 99) if len(latencias) else float('nan')
+                    print(f"   {cantidad:4d} clientes: {completadas / segundos:8,.0f} pet/s   "
+                          f"p50 {np.percentile(latencias, 50) if len(latencias) else float('nan'):8.2f} ms   "
+                          f"p99 {p99:8.2f} ms   errores {errores:,}")
+            finally:
+                proceso.terminate()
+                proceso.join()
+
+
+if __name__ == "__main__":
+    # Uso: python Test/Benchmark.py etl [tamaños separados por coma] | paginacion [registros] | campos [lista]
+    #      | concurrencia [lectores] | asgi [clientes separados por coma]
+    if len(sys.argv) > 1 and sys.argv[1] == "etl":
+        if len(sys.argv) > 2:
+            benchmark_carga_etl(tuple(int(n) for n in sys.argv[2].split(',')))
+        else:
+            benchmark_carga_etl()
+    elif len(sys.argv) > 1 and sys.argv[1] == "paginacion":
+        benchmark_paginacion(int(sys.argv[2]) if len(sys.argv) > 2 else 200_000)
+    elif len(sys.argv) > 1 and sys.argv[1] == "campos":
+        benchmark_campos(campos=sys.argv[2] if len(sys.argv) > 2 else 'id,nombre')
+    elif len(sys.argv) > 1 and sys.argv[1] == "concurrencia":
+        benchmark_concurrencia(lectores=int(sys.argv[2]) if len(sys.argv) > 2 else 4)
+    elif len(sys.argv) > 1 and sys.argv[1] == "asgi":
+        if len(sys.argv) > 2:
+            benchmark_asgi(clientes=tuple(int(c) for c in sys.argv[2].split(',')))
+        else:
+            benchmark_asgi()
+    else:
+        print("Uso: python Test/Benchmark.py etl [tamaños] | paginacion [registros] | campos [id,nombre,...] "
+              "| concurrencia [lectores] | asgi [clientes]")
@@ -0,0 +1,93 @@
+import os
+import sys
+import time
+import tempfile
+
+# Agregar el directorio padre al path para importar módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Config.Config import db
+from Services.ETLService import ETLService
+from Fixtures import generar_datos_limpios, crear_app_temporal, configuracion, Comprobaciones
+
+RUTAS = ['/api/pokemon?per_page=50', '/api/pokemon/5', '/api/pokemon/statistics']
+
+
+def probar_get_condicional(n=500):
+    """
+    Comprueba los ETag y Last-Modified de las rutas de lectura: una copia
+    vigente recibe 304 con una sola consulta (la versión de los datos) y
+    cualquier escritura o recarga del ETL cambia la versión
+    
+    Args:
+        n (int): Número de registros de prueba
+        
+    Returns:
+        bool: True si todas las comprobaciones pasan
+    """
+    print("🧪 Verificando las peticiones GET condicionales...")
+    print("=" * 60)
+    
+    comprobar = Comprobaciones()
+    
+    with configuracion(QUERY_COUNT_HEADER=True):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            app = crear_app_temporal(os.path.join(tmp_dir, 'condicional.db'), api=True)
+            with app.app_context():
+                ETLService.load_pokemon_from_dataframe(generar_datos_limpios(n), mode='bulk')
+            
+            cliente = app.test_client()
+            copias = {}
+            
+            for ruta in RUTAS:
+                respuesta = cliente.get(ruta)
+                copias[ruta] = respuesta
+                comprobar(f"GET {ruta} incluye ETag y Last-Modified",
+                          respuesta.status_code == 200 and respuesta.headers.get('ETag') is not None
+                          and respuesta.last_modified is not None)
+                
+                repetida = cliente.get(ruta, headers={'If-None-Match': respuesta.headers['ETag']})
+                comprobar(f"If-None-Match vigente en {ruta}: 304 sin cuerpo y con una consulta",
+                          repetida.status_code == 304 and not repetida.data
+                          and repetida.headers.get('X-Query-Count') == '1')
+                
+                desde = cliente.get(ruta, headers={'If-Modified-Since': respuesta.headers['Last-Modified']})
+                comprobar(f"If-Modified-Since vigente en {ruta}: 304", desde.status_code == 304)
+            
+            # Last-Modified viene de la segunda anterior: la escritura debe caer en otra
+            time.sleep(1.1)
+            cliente.put('/api/pokemon/7', json={'nombre': 'Condicional', 'tipo_principal': 'Fire',
+                                                'hp': 50, 'ataque': 50, 'defensa': 50})
+            
+            for ruta in RUTAS:
+                anterior = copias[ruta]
+                respuesta = cliente.get(ruta, headers={'If-None-Match': anterior.headers['ETag']})
+                comprobar(f"Después de una escritura {ruta} cambia de ETag",
+                          respuesta.status_code == 200 and respuesta.headers['ETag'] != anterior.headers['ETag'])
+            
+            desde = cliente.get('/api/pokemon/5', headers={'If-Modified-Since': copias['/api/pokemon/5'].headers['Last-Modified']})
+            comprobar("If-Modified-Since usa la fecha del registro (otro Pokemon cambió, este no): 304",
+                      desde.status_code == 304)
+            desde = cliente.get('/api/pokemon?per_page=50',
+                                headers={'If-Modified-Since': copias['/api/pokemon?per_page=50'].headers['Last-Modified']})
+            comprobar("If-Modified-Since anterior a la escritura en el listado: 200", desde.status_code == 200)
+            
+            etag = cliente.get('/api/pokemon/statistics').headers['ETag']
+            with app.app_context():
+                ETLService.load_pokemon_from_dataframe(generar_datos_limpios(n), mode='bulk')
+            respuesta = cliente.get('/api/pokemon/statistics', headers={'If-None-Match': etag})
+            comprobar("Una recarga del ETL cambia la versión", respuesta.status_code == 200)
+            
+            comprobar("Una ruta sin GET condicional no lleva ETag",
+                      cliente.get('/api/pokemon/legendary').headers.get('ETag') is None)
+            
+            with app.app_context():
+                db.session.remove()
+                db.engine.dispose()
+    
+    print("\n" + ("✅ GET condicional correcto" if comprobar.exito else "❌ Hay fallos en el GET condicional"))
+    return comprobar.exito
+
+
+if __name__ == "__main__":
+    sys.exit(0 if probar_get_condicional() else 1)
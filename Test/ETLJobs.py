@@ -0,0 +1,142 @@
+import os
+import sys
+import time
+import threading
+
+# Agregar el directorio padre al path para importar módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app_simple
+from Services.ETLJobRunner import ETLJobRunner
+from Fixtures import Comprobaciones
+
+
+def _esperar_final(runner, job_id, limite=5.0):
+    """Espera a que el trabajo termine y devuelve su estado final"""
+    fin = time.monotonic() + limite
+    while time.monotonic() < fin:
+        job = runner.get(job_id)
+        if job['estado'] in ('completado', 'fallido'):
+            return job
+        time.sleep(0.01)
+    return runner.get(job_id)
+
+
+class ETLLento:
+    """Función ETL de prueba que se detiene en la fase 'clean' hasta que se libera"""
+    
+    def __init__(self, resultado=True):
+        self.resultado = resultado
+        self.en_clean = threading.Event()
+        self.liberar = threading.Event()
+        self.llamadas = 0
+    
+    def __call__(self, progress):
+        self.llamadas += 1
+        progress('extract', 0)
+        progress('clean', 30, extraidas=50)
+        self.en_clean.set()
+        self.liberar.wait(5)
+        progress('load', 70, limpias=48)
+        if isinstance(self.resultado, Exception):
+            raise self.resultado
+        return self.resultado
+
+
+def probar_trabajos_etl():
+    """
+    Comprueba el ejecutor de trabajos del ETL: las peticiones mientras hay un
+    trabajo en ejecución devuelven el mismo job_id, el estado pasa de
+    pendiente/en ejecución a completado o fallido, se descartan los trabajos
+    más antiguos (max_jobs) y el flujo 202 + GET /api/etl/jobs/<id>
+    
+    Returns:
+        bool: True si todas las comprobaciones pasan
+    """
+    print("🧪 Verificando los trabajos del ETL en segundo plano...")
+    print("=" * 60)
+    
+    comprobar = Comprobaciones()
+    
+    # Coalescencia y estados
+    etl = ETLLento()
+    runner = ETLJobRunner(etl, max_jobs=3)
+    job, creado = runner.submit()
+    comprobar("El primer submit crea un trabajo", creado and job['estado'] in ('pendiente', 'en_ejecucion'))
+    
+    etl.en_clean.wait(5)
+    repetido, creado_otra_vez = runner.submit()
+    comprobar("Un submit durante la ejecución devuelve el mismo job_id sin crear otro",
+              not creado_otra_vez and repetido['job_id'] == job['job_id'])
+    
+    en_curso = runner.get(job['job_id'])
+    comprobar("Mientras corre: en_ejecucion, fase clean y filas informadas",
+              runner.is_running() and en_curso['estado'] == 'en_ejecucion' and en_curso['fase'] == 'clean'
+              and en_curso['progreso'] == 30 and en_curso['filas'] == {'extraidas': 50}
+              and 'extract' in en_curso['tiempos'])
+    
+    etl.liberar.set()
+    final = _esperar_final(runner, job['job_id'])
+    comprobar("Al terminar: completado, progreso 100 y tiempos por fase",
+              final['estado'] == 'completado' and final['progreso'] == 100 and final['error'] is None
+              and final['finalizado'] is not None and {'extract', 'clean', 'load', 'total'} <= set(final['tiempos'])
+              and not runner.is_running())
+    comprobar("La función se ejecutó una sola vez", etl.llamadas == 1)
+    
+    siguiente, creado = runner.submit()
+    comprobar("Después de terminar, submit crea un trabajo nuevo", creado and siguiente['job_id'] != job['job_id'])
+    etl.liberar.set()
+    _esperar_final(runner, siguiente['job_id'])
+    
+    # Fallos: resultado False y excepción
+    for resultado, etiqueta in ((False, 'devuelve False'), (RuntimeError('CSV ilegible'), 'lanza una excepción')):
+        fallido = ETLLento(resultado)
+        fallido.liberar.set()
+        runner_fallido = ETLJobRunner(fallido)
+        job_fallido, _ = runner_fallido.submit()
+        estado = _esperar_final(runner_fallido, job_fallido['job_id'])
+        comprobar(f"Si la función {etiqueta} el trabajo queda fallido con su error",
+                  estado['estado'] == 'fallido' and bool(estado['error'])
+                  and (not isinstance(resultado, Exception) or estado['error'] == 'CSV ilegible'))
+    
+    # max_jobs: solo se conservan los 3 más recientes
+    ids = [job['job_id'], siguiente['job_id']]
+    for _ in range(2):
+        nuevo, _ = runner.submit()
+        _esperar_final(runner, nuevo['job_id'])
+        ids.append(nuevo['job_id'])
+    comprobar("Con max_jobs=3 el trabajo más antiguo se descarta",
+              runner.get(ids[0]) is None and all(runner.get(job_id) is not None for job_id in ids[1:]))
+    
+    # Flujo HTTP de app_simple
+    etl_http = ETLLento()
+    original = app_simple.etl_jobs
+    app_simple.etl_jobs = ETLJobRunner(etl_http)
+    try:
+        cliente = app_simple.create_app().test_client()
+        respuesta = cliente.post('/api/etl/run')
+        datos = respuesta.get_json()
+        etl_http.en_clean.wait(5)
+        repetida = cliente.post('/api/etl/run').get_json()
+        comprobar("POST /api/etl/run responde 202 y repite el job_id mientras corre",
+                  respuesta.status_code == 202 and repetida['job_id'] == datos['job_id']
+                  and datos['url_estado'] == f"/api/etl/jobs/{datos['job_id']}")
+        
+        estado = cliente.get(datos['url_estado']).get_json()['job']
+        comprobar("GET /api/etl/jobs/<id> informa el trabajo en ejecución", estado['estado'] == 'en_ejecucion')
+        
+        etl_http.liberar.set()
+        _esperar_final(app_simple.etl_jobs, datos['job_id'])
+        estado = cliente.get(datos['url_estado']).get_json()['job']
+        comprobar("GET /api/etl/jobs/<id> informa el estado final", estado['estado'] == 'completado')
+        comprobar("Un job_id desconocido devuelve 404", cliente.get('/api/etl/jobs/noexiste').status_code == 404)
+    finally:
+        etl_http.liberar.set()
+        app_simple.etl_jobs = original
+    
+    print("\n" + ("✅ Trabajos del ETL correctos" if comprobar.exito else "❌ Hay fallos en los trabajos del ETL"))
+    return comprobar.exito
+
+
+if __name__ == "__main__":
+    sys.exit(0 if probar_trabajos_etl() else 1)
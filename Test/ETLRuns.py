@@ -0,0 +1,157 @@
+import os
+import sys
+import sqlite3
+import tempfile
+import importlib.util
+
+# Agregar el directorio padre al path para importar módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app_simple
+from Config.Config import Config
+from Repositories.ETLRunRepository import ETLRunRepository
+from Services.ETLRunService import ETLRunMetrics
+from Fixtures import configuracion, Comprobaciones
+
+# El pico de RSS se lee con el módulo resource (no existe en Windows)
+RSS = 'rss' if importlib.util.find_spec('resource') else None
+
+
+def ejecutar(filas, exito=True, origen='prueba'):
+    """
+    Simula una ejecución del ETL con las cuatro fases y la guarda en el historial
+    
+    Args:
+        filas (int): Filas extraídas
+        exito (bool): Si la ejecución terminó bien
+        origen (str): Origen de la ejecución
+        
+    Returns:
+        dict: Métricas guardadas
+    """
+    metricas = ETLRunMetrics(origen)
+    metricas.start_phase('extract')
+    metricas.end_phase('extract', rows_out=filas)
+    metricas.start_phase('clean', rows_in=filas)
+    datos = [list(range(100)) for _ in range(filas)]  # asignaciones para el pico de memoria
+    metricas.end_phase('clean', rows_out=filas - 1)
+    metricas.duplicates_removed = 1
+    del datos
+    if exito:
+        metricas.start_phase('load', rows_in=filas - 1)
+        metricas.end_phase('load', rows_out=filas - 1)
+    return metricas.finish(success=exito, error=None if exito else 'Fallo simulado')
+
+
+def tendencia_esperada(runs, metrica, metodo):
+    """Recalcula a mano la tendencia de una métrica (solo ejecuciones exitosas del mismo método de memoria)"""
+    valores = [run[metrica] for run in runs
+               if run['exito'] and run['memoria_metodo'] == metodo and run[metrica] is not None]
+    if not valores:
+        return None
+    anteriores = valores[1:]
+    promedio_anterior = sum(anteriores) / len(anteriores) if anteriores else None
+    return {
+        'ultimo': valores[0],
+        'promedio': round(sum(valores) / len(valores), 4),
+        'minimo': min(valores),
+        'maximo': max(valores),
+        'cambio_vs_promedio_anterior_pct': round((valores[0] - promedio_anterior) / promedio_anterior * 100, 2)
+        if promedio_anterior else None
+    }
+
+
+def probar_historial_etl():
+    """
+    Comprueba el historial de ejecuciones del ETL: las filas que guarda
+    ETLRunMetrics (con el pico de memoria en cada ejecución), el cálculo de
+    tendencias de GET /api/etl/runs, que las tendencias no mezclan los métodos
+    de medición de memoria y la migración de historiales sin memoria_metodo
+    
+    Returns:
+        bool: True si todas las comprobaciones pasan
+    """
+    print("🧪 Verificando el historial de ejecuciones del ETL...")
+    print("=" * 60)
+    
+    comprobar = Comprobaciones()
+    
+    with configuracion('ETL_RUNS_DB_PATH', 'ETL_TRACK_MEMORY'):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            Config.ETL_RUNS_DB_PATH = os.path.join(tmp_dir, 'etl_runs.db')
+            cliente = app_simple.create_app().test_client()
+            
+            def historial(consulta='?origen=prueba&limit=50'):
+                return cliente.get(f'/api/etl/runs{consulta}').get_json()
+            
+            comprobar("Por defecto tracemalloc está desactivado",
+                      Config.ETL_TRACK_MEMORY is False or 'ETL_TRACK_MEMORY' in os.environ)
+            
+            # Ejecuciones con el pico de RSS (una fallida y una de otro origen)
+            Config.ETL_TRACK_MEMORY = False
+            guardadas = [ejecutar(20), ejecutar(30), ejecutar(25, exito=False), ejecutar(40)]
+            ejecutar(10, origen='otro')
+            
+            datos = historial()
+            runs = datos['runs']
+            ultima = runs[0]
+            comprobar("Se guardan las ejecuciones del origen, de la más reciente a la más antigua",
+                      datos['total'] == 4 and [run['id'] for run in runs] == [run['id'] for run in reversed(guardadas)])
+            comprobar("Cada fila trae filas por fase, duplicados, error y el pico de memoria (RSS)",
+                      ultima['filas_extract_salida'] == 40 and ultima['filas_clean_entrada'] == 40
+                      and ultima['filas_clean_salida'] == 39 and ultima['filas_load_salida'] == 39
+                      and ultima['duplicados_eliminados'] == 1 and ultima['duracion_db_load'] is None
+                      and ultima['memoria_metodo'] == RSS and (RSS is None or ultima['memoria_pico_bytes'] > 0)
+                      and runs[1]['exito'] == 0 and runs[1]['error'] == 'Fallo simulado')
+            
+            metricas = ['duracion_total', 'duracion_extract', 'duracion_clean', 'duracion_load']
+            comprobar("Las tendencias coinciden con el cálculo a mano (sin la ejecución fallida)",
+                      datos['tendencias_memoria_metodo'] == RSS
+                      and all(datos['tendencias'][m] == tendencia_esperada(runs, m, RSS) for m in metricas)
+                      and 'duracion_db_load' not in datos['tendencias'])
+            
+            # Con tracemalloc: las tendencias solo usan ese método
+            Config.ETL_TRACK_MEMORY = True
+            medida = ejecutar(5000)
+            datos = historial()
+            tendencia = datos['tendencias']['duracion_total']
+            comprobar("Con ETL_TRACK_MEMORY el pico se mide con tracemalloc",
+                      medida['memoria_metodo'] == 'tracemalloc' and medida['memoria_pico_bytes'] > 0)
+            comprobar("Las tendencias solo usan las ejecuciones medidas con tracemalloc",
+                      datos['tendencias_memoria_metodo'] == 'tracemalloc' and tendencia['ultimo'] == medida['duracion_total']
+                      and tendencia['promedio'] == medida['duracion_total']
+                      and tendencia['cambio_vs_promedio_anterior_pct'] is None
+                      and datos['tendencias']['memoria_pico_bytes']['ultimo'] == medida['memoria_pico_bytes'])
+            
+            Config.ETL_TRACK_MEMORY = False
+            ejecutar(50)
+            datos = historial()
+            comprobar("Al volver al RSS se excluye la ejecución con tracemalloc",
+                      datos['tendencias_memoria_metodo'] == RSS
+                      and all(datos['tendencias'].get(m) == tendencia_esperada(datos['runs'], m, RSS)
+                              for m in metricas + ['memoria_pico_bytes']))
+            
+            datos = historial('?limit=2')
+            comprobar("limit y origen se aplican", datos['total'] == 2 and historial('?origen=otro')['total'] == 1)
+            comprobar("Un limit no numérico devuelve 400", cliente.get('/api/etl/runs?limit=abc').status_code == 400)
+            
+            # Historial creado antes de la columna memoria_metodo
+            Config.ETL_RUNS_DB_PATH = os.path.join(tmp_dir, 'etl_runs_antiguo.db')
+            columnas = [c for c in ETLRunRepository.COLUMNS if c != 'memoria_metodo']
+            conn = sqlite3.connect(Config.ETL_RUNS_DB_PATH)
+            conn.execute(f"CREATE TABLE etl_runs (id INTEGER PRIMARY KEY AUTOINCREMENT, {', '.join(columnas)})")
+            conn.execute("INSERT INTO etl_runs (origen, exito, duracion_total, memoria_pico_bytes) VALUES "
+                         "('prueba', 1, 2.0, 1000), ('prueba', 1, 1.0, NULL)")
+            conn.commit()
+            conn.close()
+            ejecutar(20)
+            runs = historial()['runs']
+            comprobar("Un historial antiguo se migra: los picos guardados eran de tracemalloc",
+                      [run['memoria_metodo'] for run in runs] == [RSS, None, 'tracemalloc'])
+    
+    print("\n" + ("✅ Historial del ETL correcto" if comprobar.exito else "❌ Hay fallos en el historial del ETL"))
+    return comprobar.exito
+
+
+if __name__ == "__main__":
+    sys.exit(0 if probar_historial_etl() else 1)
@@ -0,0 +1,126 @@
+import os
+import sys
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+# Agregar el directorio padre al path para importar módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from Config.Config import Config, db, configure_engine
+
+
+def generar_datos_limpios(n):
+    """
+    Genera un DataFrame sintético con el mismo formato que produce Clean
+    
+    Args:
+        n (int): Número de registros
+        
+    Returns:
+        pd.DataFrame: Datos limpios sintéticos
+    """
+    rng = np.random.default_rng(42)
+    tipos = np.array(['Grass', 'Fire', 'Water', 'Bug', 'Normal', 'Poison', 'Electric',
+                      'Ground', 'Fairy', 'Fighting', 'Psychic', 'Rock', 'Ghost', 'Ice',
+                      'Dragon', 'Dark', 'Steel', 'Flying'])
+    
+    df = pd.DataFrame({'id': np.arange(1, n + 1)})
+    df['nombre'] = 'Pokemon' + df['id'].astype(str)
+    df['tipo_principal'] = tipos[rng.integers(0, len(tipos), n)]
+    df['tipo_secundario'] = np.where(rng.random(n) < 0.5, 'Sin Tipo Secundario',
+                                     tipos[rng.integers(0, len(tipos), n)])
+    
+    for col in ['hp', 'ataque', 'defensa', 'ataque_especial', 'defensa_especial', 'velocidad']:
+        df[col] = rng.integers(5, 200, n)
+    df['poder_total'] = df[['hp', 'ataque', 'defensa', 'ataque_especial',
+                            'defensa_especial', 'velocidad']].sum(axis=1)
+    
+    df['generacion'] = rng.integers(1, 7, n)
+    df['es_legendario'] = rng.random(n) < 0.08
+    df['es_mega'] = rng.random(n) < 0.05
+    df['forma_especial'] = 'Forma base'
+    df['combinacion_tipos'] = np.where(df['tipo_secundario'] == 'Sin Tipo Secundario',
+                                       df['tipo_principal'],
+                                       df['tipo_principal'] + '/' + df['tipo_secundario'])
+    df['poder_ofensivo'] = df['ataque'] + df['ataque_especial']
+    df['poder_defensivo'] = df['defensa'] + df['defensa_especial']
+    df['ratio_ataque_defensa'] = df['poder_ofensivo'] / (df['poder_defensivo'] + 1)
+    df['categoria_poder'] = pd.cut(df['poder_total'], [-1, 299, 399, 499, 599, np.inf],
+                                   labels=['Muy Bajo', 'Bajo', 'Medio', 'Alto', 'Muy Alto']).astype(str)
+    
+    return df
+
+
+def crear_app_temporal(db_path, perfil_sqlite=True, api=False):
+    """
+    Crea una aplicación Flask conectada a una base de datos SQLite temporal
+    
+    Args:
+        db_path (str): Ruta del archivo SQLite
+        perfil_sqlite (bool): Aplicar el perfil de producción de SQLite (WAL y PRAGMAs)
+        api (bool): Registrar las rutas de la API en /api
+        
+    Returns:
+        Flask: Aplicación con las tablas creadas
+    """
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{db_path}'
+    db.init_app(app)
+    
+    with app.app_context():
+        if perfil_sqlite:
+            configure_engine(db.engine)
+        db.create_all()
+    
+    if api:
+        from Controllers.Controllers import pokemon_blueprint
+        app.register_blueprint(pokemon_blueprint, url_prefix='/api')
+    
+    return app
+
+
+@contextmanager
+def configuracion(*nombres, **valores):
+    """
+    Cambia atributos de Config durante el bloque y los restaura al salir,
+    aunque haya errores
+    
+    Args:
+        *nombres (str): Atributos que el bloque puede cambiar (solo se restauran)
+        **valores: Atributos y el valor que toman durante el bloque
+    """
+    originales = {nombre: getattr(Config, nombre) for nombre in (*nombres, *valores)}
+    try:
+        for nombre, valor in valores.items():
+            setattr(Config, nombre, valor)
+        yield
+    finally:
+        for nombre, valor in originales.items():
+            setattr(Config, nombre, valor)
+
+
+class Comprobaciones:
+    """Imprime el resultado de cada comprobación de un script de prueba y recuerda si alguna falló"""
+    
+    def __init__(self):
+        self.exito = True
+    
+    def __call__(self, nombre, ok):
+        """
+        Registra una comprobación
+        
+        Args:
+            nombre (str): Descripción de lo que se comprueba
+            ok (bool): Resultado
+            
+        Returns:
+            bool: El mismo resultado
+        """
+        ok = bool(ok)
+        self.exito = self.exito and ok
+        print(f"{'✅' if ok else '❌'} {nombre}")
+        return ok
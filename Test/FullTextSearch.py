@@ -0,0 +1,165 @@
+import io
+import os
+import sys
+import tempfile
+from contextlib import redirect_stdout
+
+# Agregar el directorio padre al path para importar módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Config.Config import db
+from Repositories.Repositories import PokemonRepository
+from Repositories.FullTextSearch import FullTextSearch
+from Services.ETLService import ETLService
+from Fixtures import generar_datos_limpios, crear_app_temporal, Comprobaciones
+
+
+def datos_busqueda(n):
+    """
+    Datos sintéticos con algunos nombres reales para buscar
+    
+    Args:
+        n (int): Número de registros
+        
+    Returns:
+        pd.DataFrame: Datos limpios
+    """
+    datos = generar_datos_limpios(n)
+    datos.loc[0, ['nombre', 'tipo_principal']] = ['Pikachu', 'Electric']
+    datos.loc[1, ['nombre', 'tipo_principal']] = ['Charmander', 'Fire']
+    datos.loc[2, ['nombre', 'tipo_principal']] = ['Charizard', 'Fire']
+    # Aparece en los tres campos: debe ser el más relevante al buscar 'dragon'
+    datos.loc[3, ['nombre', 'tipo_principal', 'tipo_secundario']] = ['Dragon Azul', 'Dragon', 'Dragon']
+    return datos
+
+
+def nombres(resultado):
+    """Nombres de una lista de Pokemon"""
+    return [pokemon.nombre for pokemon in resultado]
+
+
+def buscar(texto):
+    """
+    Busca con PokemonRepository.search y devuelve también si se registró un error
+    
+    Returns:
+        tuple: (Nombres encontrados, True si la búsqueda falló)
+    """
+    salida = io.StringIO()
+    with redirect_stdout(salida):
+        resultado = PokemonRepository.search(texto)
+    return nombres(resultado), 'Error en búsqueda' in salida.getvalue()
+
+
+def probar_busqueda(n=300):
+    """
+    Comprueba la búsqueda de texto completo (FTS5): prefijos, orden por
+    relevancia, sincronización por triggers con las escrituras, el índice
+    después de las recargas del ETL, textos con sintaxis de FTS5 y la búsqueda
+    con LIKE cuando el índice no se puede instalar
+    
+    Args:
+        n (int): Número de registros de prueba
+        
+    Returns:
+        bool: True si todas las comprobaciones pasan
+    """
+    print("🧪 Verificando la búsqueda de texto completo...")
+    print("=" * 60)
+    
+    comprobar = Comprobaciones()
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        app = crear_app_temporal(os.path.join(tmp_dir, 'busqueda.db'))
+        with app.app_context():
+            ETLService.load_pokemon_from_dataframe(datos_busqueda(n), mode='bulk')
+            comprobar("El índice FTS5 está disponible", FullTextSearch.ensure())
+            
+            # Prefijos y relevancia
+            comprobar("'pika' encuentra Pikachu por prefijo", buscar('pika') == (['Pikachu'], False))
+            comprobar("'chu' no encuentra nada (solo prefijos, no subcadenas)", buscar('chu') == ([], False))
+            comprobar("'char' encuentra Charmander y Charizard",
+                      sorted(buscar('char')[0]) == ['Charizard', 'Charmander'])
+            comprobar("'char fire' exige las dos palabras", sorted(buscar('char fire')[0]) == ['Charizard', 'Charmander']
+                      and buscar('char water') == ([], False))
+            
+            dragones, _ = buscar('dragon')
+            esperados = {pokemon.nombre for pokemon in PokemonRepository.get_all()
+                         if 'Dragon' in (pokemon.tipo_principal, pokemon.tipo_secundario)}
+            comprobar(f"'dragon' ordena por relevancia ({len(dragones)} resultados, el primero en los tres campos)",
+                      dragones[0] == 'Dragon Azul' and set(dragones) == esperados)
+            
+            # Textos con sintaxis de FTS5: resultado vacío, sin error
+            for texto in ('"', 'fire OR', 'AND', '*', 'nombre:pika', '(fire'):
+                encontrados, fallo = buscar(texto)
+                comprobar(f"{texto!r} no produce un error ({len(encontrados)} resultados)", not fallo)
+            comprobar("'\"' y 'fire OR' devuelven una lista vacía",
+                      buscar('"') == ([], False) and buscar('fire OR') == ([], False))
+            
+            # Triggers: creación, renombre, PATCH por lotes y eliminación
+            nuevo = PokemonRepository.create({
+                'nombre': 'Zapdosito', 'tipo_principal': 'Electric', 'tipo_secundario': 'Flying', 'hp': 90,
+                'ataque': 90, 'defensa': 85, 'ataque_especial': 125, 'defensa_especial': 90,
+                'velocidad': 100, 'generacion': 1
+            })
+            comprobar("Un Pokemon creado se encuentra de inmediato", buscar('zapdos') == (['Zapdosito'], False))
+            
+            PokemonRepository.update(nuevo.id, {'nombre': 'Moltresito'})
+            comprobar("Al renombrarlo se busca por el nombre nuevo y no por el anterior",
+                      buscar('moltres') == (['Moltresito'], False) and buscar('zapdos') == ([], False))
+            
+            actualizados = PokemonRepository.update_many({'tipo_secundario': 'Cosmico'}, ids=[nuevo.id, 1])
+            comprobar("Un PATCH por lotes reindexa los tipos",
+                      sorted(buscar('cosmico')[0]) == ['Moltresito', 'Pikachu'] and bool(actualizados))
+            
+            PokemonRepository.delete(nuevo.id)
+            PokemonRepository.delete_many(ids=[1])
+            comprobar("Los Pokemon eliminados desaparecen del índice",
+                      buscar('moltres') == ([], False) and buscar('cosmico') == ([], False)
+                      and buscar('pika') == ([], False))
+            
+            # Recargas del ETL: intercambio de tablas (rebuild) y merge
+            datos = datos_busqueda(n)
+            datos.loc[1, 'nombre'] = 'Bulbasaur'
+            ETLService.load_pokemon_from_dataframe(datos, mode='bulk')
+            comprobar("Después del intercambio de tablas el índice refleja la carga nueva",
+                      buscar('pika') == (['Pikachu'], False) and buscar('bulba') == (['Bulbasaur'], False)
+                      and buscar('charm') == ([], False))
+            PokemonRepository.update(3, {'nombre': 'Charmeleon'})
+            comprobar("Los triggers siguen activos en la tabla intercambiada", buscar('charme') == (['Charmeleon'], False))
+            
+            datos.loc[0, 'nombre'] = 'Raichu'
+            ETLService.load_pokemon_from_dataframe(datos, mode='merge')
+            comprobar("Una carga merge actualiza el índice",
+                      buscar('rai') == (['Raichu'], False) and buscar('pika') == ([], False)
+                      and buscar('chariz') == (['Charizard'], False) and buscar('charme') == ([], False))
+            
+            # Sin FTS5 (la instalación falla) se busca con LIKE
+            url = str(db.engine.url)
+            install = FullTextSearch.__dict__['install']
+            FullTextSearch._ready.pop(url, None)
+            
+            def falla(*args, **kwargs):
+                raise RuntimeError('fts5 no disponible')
+            
+            FullTextSearch.install = staticmethod(falla)
+            try:
+                with redirect_stdout(io.StringIO()):
+                    disponible = FullTextSearch.ensure()
+                comprobar("Si la instalación falla, ensure informa que no hay índice", not disponible)
+                comprobar("Con LIKE 'aich' encuentra Raichu (subcadena)", buscar('aich') == (['Raichu'], False))
+                comprobar("Con LIKE '\"' y 'fire OR' devuelven una lista vacía",
+                          buscar('"') == ([], False) and buscar('fire OR') == ([], False))
+            finally:
+                FullTextSearch.install = install
+                FullTextSearch._ready.pop(url, None)
+            
+            db.session.remove()
+            db.engine.dispose()
+    
+    print("\n" + ("✅ Búsqueda de texto completo correcta" if comprobar.exito else "❌ Hay fallos en la búsqueda de texto completo"))
+    return comprobar.exito
+
+
+if __name__ == "__main__":
+    sys.exit(0 if probar_busqueda() else 1)
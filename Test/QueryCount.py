@@ -0,0 +1,65 @@
+import os
+import sys
+import tempfile
+
+# Agregar el directorio padre al path para importar módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Config.Config import db
+from Services.ETLService import ETLService
+from Fixtures import generar_datos_limpios, crear_app_temporal, configuracion, Comprobaciones
+
+
+def probar_conteo_consultas(n=500):
+    """
+    Comprueba con el encabezado X-Query-Count que cada petición carga cada
+    Pokemon a lo sumo una vez (mapa de identidad por petición, ver UnitOfWork)
+    
+    Args:
+        n (int): Número de registros de prueba
+        
+    Returns:
+        bool: True si ninguna petición supera su máximo de consultas
+    """
+    print("🧪 Verificando el número de consultas por petición...")
+    print("=" * 60)
+    
+    comprobar = Comprobaciones()
+    
+    def contar(nombre, respuesta, estado, maximo):
+        consultas = int(respuesta.headers.get('X-Query-Count', -1))
+        comprobar(f"{nombre}: {consultas} consultas (máximo {maximo}), estado {respuesta.status_code}",
+                  respuesta.status_code == estado and 0 <= consultas <= maximo)
+        return respuesta
+    
+    with configuracion(QUERY_COUNT_HEADER=True):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            app = crear_app_temporal(os.path.join(tmp_dir, 'consultas.db'), api=True)
+            with app.app_context():
+                ETLService.load_pokemon_from_dataframe(generar_datos_limpios(n), mode='bulk')
+            
+            cliente = app.test_client()
+            nuevo = {'nombre': 'Contado', 'tipo_principal': 'Fire', 'hp': 50, 'ataque': 50, 'defensa': 50}
+            
+            # Cada escritura: buscar por nombre o id, escribir, actualizar el resumen
+            # y avanzar la versión de los datos. Las lecturas condicionales leen
+            # la versión antes de la consulta (ver Controllers.conditional)
+            contar("GET /pokemon/<id>", cliente.get('/api/pokemon/1'), 200, 2)
+            respuesta = contar("POST /pokemon", cliente.post('/api/pokemon', json=nuevo), 201, 5)
+            nuevo_id = respuesta.get_json()['pokemon']['id']
+            contar("PUT /pokemon/<id>", cliente.put(f'/api/pokemon/{nuevo_id}', json=dict(nuevo, hp=80)), 200, 5)
+            contar("PUT /pokemon/<id> con otro nombre",
+                      cliente.put(f'/api/pokemon/{nuevo_id}', json=dict(nuevo, nombre='Recontado')), 200, 6)
+            contar("DELETE /pokemon/<id>", cliente.delete(f'/api/pokemon/{nuevo_id}'), 200, 5)
+            contar("DELETE /pokemon/<id> inexistente", cliente.delete(f'/api/pokemon/{nuevo_id}'), 404, 1)
+            
+            with app.app_context():
+                db.session.remove()
+                db.engine.dispose()
+    
+    print("\n" + ("✅ Cada Pokemon se carga una sola vez por petición" if comprobar.exito else "❌ Hay consultas de más"))
+    return comprobar.exito
+
+
+if __name__ == "__main__":
+    sys.exit(0 if probar_conteo_consultas() else 1)
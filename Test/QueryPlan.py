@@ -0,0 +1,148 @@
+import os
+import sys
+import tempfile
+
+# Agregar el directorio padre al path para importar módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event, text
+from Config.Config import db, ensure_indexes
+from Models.Pokemon import Pokemon
+from Repositories.Repositories import PokemonRepository
+from Services.ETLService import ETLService
+from Fixtures import generar_datos_limpios, crear_app_temporal, Comprobaciones
+
+
+class CapturaSQL:
+    """Guarda las sentencias SELECT que ejecuta el repositorio sobre la tabla pokemon"""
+    
+    def __init__(self, engine):
+        self.engine = engine
+        self.sentencias = []
+    
+    def __enter__(self):
+        event.listen(self.engine, 'before_cursor_execute', self._capturar)
+        return self
+    
+    def __exit__(self, *args):
+        event.remove(self.engine, 'before_cursor_execute', self._capturar)
+    
+    def _capturar(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT') and 'FROM pokemon' in statement:
+            self.sentencias.append((statement, parameters))
+
+
+def plan_de_consulta(statement, parameters):
+    """
+    Obtiene el plan de ejecución de SQLite para una sentencia
+    
+    Args:
+        statement (str): Sentencia SQL con parámetros posicionales
+        parameters (tuple): Parámetros de la sentencia
+        
+    Returns:
+        list: Líneas del plan (columna detail de EXPLAIN QUERY PLAN)
+    """
+    raw = db.engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        return [row[3] for row in cursor.fetchall()]
+    finally:
+        raw.close()
+
+
+def usa_indice(plan, nombre_indice):
+    """
+    Indica si el plan busca por el índice indicado (o su variante __swap de la
+    recarga por staging) y no recorre la tabla completa
+    
+    Args:
+        plan (list): Líneas del plan
+        nombre_indice (str): Nombre del índice esperado
+        
+    Returns:
+        bool: True si el plan usa el índice
+    """
+    recorre_tabla = any(linea.startswith('SCAN pokemon') and 'INDEX' not in linea for linea in plan)
+    return not recorre_tabla and any(nombre_indice in linea for linea in plan)
+
+
+def probar_planes(n=20_000):
+    """
+    Carga datos sintéticos y comprueba que los filtros de PokemonRepository usan
+    los índices secundarios en lugar de recorrer la tabla
+    
+    Args:
+        n (int): Número de registros de prueba
+        
+    Returns:
+        bool: True si todas las consultas usan el índice esperado
+    """
+    print("🧪 Verificando planes de consulta de PokemonRepository...")
+    print("=" * 60)
+    
+    casos = [
+        ("get_by_type (principal o secundario)", lambda: PokemonRepository.get_by_type('Fire'),
+         ['ix_pokemon_tipo_principal_generacion', 'ix_pokemon_tipo_secundario']),
+        ("get_by_type (solo secundario)", lambda: PokemonRepository.get_by_type('Fire', is_secondary=True),
+         ['ix_pokemon_tipo_secundario']),
+        ("get_legendary", lambda: PokemonRepository.get_legendary(),
+         ['ix_pokemon_es_legendario_poder_total']),
+        ("get_by_generation", lambda: PokemonRepository.get_by_generation(3),
+         ['ix_pokemon_generacion_poder_total']),
+        ("get_by_power_range", lambda: PokemonRepository.get_by_power_range(500, 520),
+         ['ix_pokemon_poder_total']),
+        ("get_page (cursor por poder_total desc)",
+         lambda: PokemonRepository.get_page(20, 'poder_total', True, after=(450, 1000)),
+         ['ix_pokemon_poder_total']),
+        ("get_page (cursor por velocidad)",
+         lambda: PokemonRepository.get_page(20, 'velocidad', after=(120, 1000)),
+         ['ix_pokemon_velocidad']),
+        ("search (texto completo FTS5)", lambda: PokemonRepository.search('pokemon12 fire'),
+         ['pokemon_fts VIRTUAL TABLE INDEX', 'INTEGER PRIMARY KEY']),
+        ("plan: generación y rango de poder",
+         lambda: PokemonRepository.get_all(20, filters={'generacion': [3], 'poder_total_min': 500}),
+         ['ix_pokemon_generacion_poder_total']),
+        ("plan: legendarios con cursor por poder_total",
+         lambda: PokemonRepository.get_page(20, 'poder_total', True, filters={'es_legendario': True}),
+         ['ix_pokemon_es_legendario_poder_total']),
+        ("plan: búsqueda con filtros",
+         lambda: PokemonRepository.get_all(20, filters={'es_mega': False}, search='pokemon12'),
+         ['pokemon_fts VIRTUAL TABLE INDEX', 'INTEGER PRIMARY KEY']),
+    ]
+    
+    comprobar = Comprobaciones()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        app = crear_app_temporal(os.path.join(tmp_dir, 'plan.db'))
+        with app.app_context():
+            ETLService.load_pokemon_from_dataframe(generar_datos_limpios(n), mode='bulk')
+            
+            for nombre, consulta, indices in casos:
+                with CapturaSQL(db.engine) as captura:
+                    consulta()
+                
+                plan = plan_de_consulta(*captura.sentencias[-1])
+                comprobar(nombre, all(usa_indice(plan, indice) for indice in indices))
+                for linea in plan:
+                    print(f"      {linea}")
+            
+            # Una base de datos creada antes de declarar los índices los recibe al iniciar
+            for index in Pokemon.__table__.indexes:
+                db.session.execute(text(f'DROP INDEX IF EXISTS "{index.name}"'))
+                db.session.execute(text(f'DROP INDEX IF EXISTS "{index.name}__swap"'))
+            db.session.commit()
+            
+            creados = ensure_indexes()
+            comprobar("ensure_indexes crea los índices faltantes en una base existente",
+                      len(creados) == len(Pokemon.__table__.indexes) and not ensure_indexes())
+            
+            db.session.remove()
+            db.engine.dispose()
+    
+    print("\n" + ("✅ Todas las consultas usan índices" if comprobar.exito else "❌ Hay consultas que recorren la tabla"))
+    return comprobar.exito
+
+
+if __name__ == "__main__":
+    sys.exit(0 if probar_planes() else 1)
@@ -0,0 +1,146 @@
+import os
+import sys
+import time
+import sqlite3
+import tempfile
+
+# Agregar el directorio padre al path para importar módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event, text
+from Config.Config import Config, db, read_engine
+from Repositories.ReadRouting import ReadRouting
+from Services.ETLService import ETLService
+from Services.Services import PokemonService
+from Controllers.Controllers import data_etag
+from Fixtures import generar_datos_limpios, crear_app_temporal, configuracion, Comprobaciones
+
+
+class ContadorConsultas:
+    """Cuenta las sentencias que recibe cada motor (principal y réplicas)"""
+    
+    def __init__(self, motores):
+        self.conteo = {}
+        for nombre, engine in motores.items():
+            event.listen(engine, 'before_cursor_execute', self._contador(nombre))
+    
+    def _contador(self, nombre):
+        def contar(*args):
+            self.conteo[nombre] = self.conteo.get(nombre, 0) + 1
+        return contar
+    
+    def tomar(self):
+        """Devuelve los motores usados desde la última llamada"""
+        usados = set(self.conteo)
+        self.conteo.clear()
+        return usados
+
+
+def probar_replicas(n=2_000):
+    """
+    Comprueba el enrutamiento de lecturas a réplicas SQLite locales: lecturas
+    en las réplicas, escrituras en la principal, leer lo escrito según
+    READ_REPLICA_CONSISTENCY y el ETag de réplicas en estados distintos
+    
+    Args:
+        n (int): Número de registros de prueba
+        
+    Returns:
+        bool: True si todas las comprobaciones pasan
+    """
+    print("🧪 Verificando el enrutamiento a réplicas de lectura...")
+    print("=" * 60)
+    
+    comprobar = Comprobaciones()
+    
+    # Dos réplicas locales que se refrescan a mano
+    with configuracion('READ_REPLICA_CONSISTENCY', READ_REPLICA_LOCAL_COUNT=2, READ_REPLICA_REFRESH_INTERVAL=3600):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            app = crear_app_temporal(os.path.join(tmp_dir, 'principal.db'), api=True)
+            with app.app_context():
+                ETLService.load_pokemon_from_dataframe(generar_datos_limpios(n), mode='bulk')
+                principal = db.engine
+            
+            replicas = ReadRouting.init_app(app)
+            motores = {'principal': principal}
+            motores.update({f'replica_{i}': replica.engine for i, replica in enumerate(replicas.replicas)})
+            contador = ContadorConsultas(motores)
+            
+            cliente, otro_cliente = app.test_client(), app.test_client()
+            
+            cliente.get('/api/pokemon/1')
+            cliente.get('/api/pokemon/2')
+            comprobar("Las lecturas se reparten entre las réplicas", contador.tomar() == {'replica_0', 'replica_1'})
+            
+            nuevo = {'nombre': 'Replicado', 'tipo_principal': 'Fire', 'hp': 50, 'ataque': 50, 'defensa': 50}
+            respuesta = cliente.post('/api/pokemon', json=nuevo)
+            nuevo_id = respuesta.get_json()['pokemon']['id']
+            comprobar("Las escrituras y sus validaciones usan la principal",
+                      respuesta.status_code == 201 and contador.tomar() == {'principal'})
+            
+            Config.READ_REPLICA_CONSISTENCY = 'session'
+            comprobar("session: quien escribió lee su escritura",
+                      cliente.get(f'/api/pokemon/{nuevo_id}').status_code == 200)
+            comprobar("session: otro cliente lee la réplica (aún sin la escritura)",
+                      otro_cliente.get(f'/api/pokemon/{nuevo_id}').status_code == 404)
+            
+            Config.READ_REPLICA_CONSISTENCY = 'strong'
+            contador.tomar()
+            comprobar("strong: todos leen de la principal hasta el refresco",
+                      otro_cliente.get(f'/api/pokemon/{nuevo_id}').status_code == 200
+                      and contador.tomar() == {'principal'})
+            
+            replicas.refresh()
+            comprobar("Después del refresco la réplica tiene la escritura",
+                      otro_cliente.get(f'/api/pokemon/{nuevo_id}').status_code == 200
+                      and 'principal' not in contador.tomar())
+            
+            # Réplicas en estados distintos: solo la primera recibe la escritura
+            Config.READ_REPLICA_CONSISTENCY = 'eventual'
+            cliente.put(f'/api/pokemon/{nuevo_id}', json=dict(nuevo, hp=99))
+            al_dia, atrasada = replicas.replicas
+            fuente, destino = sqlite3.connect(replicas.primary_path), sqlite3.connect(al_dia.path)
+            fuente.backup(destino)
+            fuente.close()
+            destino.close()
+            al_dia.snapshot_time = time.time()
+            
+            with app.app_context():
+                etiquetas = {}
+                for replica, hp in ((al_dia, 99), (atrasada, 50)):
+                    token = read_engine.set(replica.engine)
+                    etiquetas[hp] = data_etag(*PokemonService.get_data_version())
+                    read_engine.reset(token)
+            respuestas = [otro_cliente.get(f'/api/pokemon/{nuevo_id}') for _ in range(4)]
+            comprobar("Con réplicas en estados distintos el ETag es el de la réplica que dio los datos",
+                      etiquetas[99] != etiquetas[50]
+                      and {respuesta.get_json()['pokemon']['hp'] for respuesta in respuestas} == {99, 50}
+                      and all(respuesta.get_etag()[0] == etiquetas[respuesta.get_json()['pokemon']['hp']]
+                              for respuesta in respuestas))
+            contador.tomar()
+            
+            for replica in replicas.replicas:
+                replica.snapshot_time -= Config.READ_REPLICA_MAX_STALENESS + 1
+            otro_cliente.get('/api/pokemon/1')
+            comprobar("Una réplica más atrasada que READ_REPLICA_MAX_STALENESS no se usa",
+                      contador.tomar() == {'principal'})
+            
+            try:
+                with replicas.replicas[0].engine.begin() as conn:
+                    conn.execute(text('DELETE FROM pokemon'))
+                solo_lectura = False
+            except Exception:
+                solo_lectura = True
+            comprobar("Las réplicas son de solo lectura", solo_lectura)
+            
+            ReadRouting.shutdown(app)
+            with app.app_context():
+                db.session.remove()
+                db.engine.dispose()
+    
+    print("\n" + ("✅ Enrutamiento a réplicas correcto" if comprobar.exito else "❌ Hay fallos en el enrutamiento"))
+    return comprobar.exito
+
+
+if __name__ == "__main__":
+    sys.exit(0 if probar_replicas() else 1)
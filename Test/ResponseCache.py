@@ -0,0 +1,167 @@
+import os
+import sys
+import json
+import time
+import tempfile
+from sqlalchemy import event
+
+# Agregar el directorio padre al path para importar módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Config.Config import Config, db
+from Services.ETLService import ETLService
+from Services.ResponseCache import ResponseCache
+from Repositories.Repositories import PokemonRepository
+from Fixtures import generar_datos_limpios, crear_app_temporal, configuracion, Comprobaciones
+
+RUTAS = [
+    '/api/pokemon/statistics',
+    '/api/pokemon/legendary',
+    '/api/pokemon/types/fire?fields=id,nombre',
+    '/api/pokemon/power?min=400&max=500'
+]
+
+
+def probar_cache_respuestas(n=800):
+    """
+    Comprueba la caché de respuestas: aciertos sin consultas, claves
+    normalizadas, desalojo del menos usado, vencimiento e invalidación con
+    escrituras y recargas del ETL (la respuesta siempre coincide con la de la
+    base de datos)
+    
+    Args:
+        n (int): Número de registros de prueba
+        
+    Returns:
+        bool: True si todas las comprobaciones pasan
+    """
+    print("🧪 Verificando la caché de respuestas...")
+    print("=" * 60)
+    
+    comprobar = Comprobaciones()
+    
+    with configuracion(QUERY_COUNT_HEADER=True, RESPONSE_CACHE_SIZE=256, RESPONSE_CACHE_TTL=300):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            app = crear_app_temporal(os.path.join(tmp_dir, 'respuestas.db'), api=True)
+            with app.app_context():
+                ETLService.load_pokemon_from_dataframe(generar_datos_limpios(n), mode='bulk')
+            
+            cliente = app.test_client()
+            
+            def sin_cache(ruta):
+                """Respuesta calculada en la base de datos (caché desactivada)"""
+                with configuracion(RESPONSE_CACHE_TTL=0):
+                    return cliente.get(ruta).get_json()
+            
+            def comparar_con_base(etiqueta):
+                for ruta in RUTAS:
+                    antes = ResponseCache.stats()
+                    respuesta = cliente.get(ruta).get_json()  # consume la respuesta transmitida
+                    fallo = ResponseCache.stats()['fallos'] == antes['fallos'] + 1
+                    comprobar(f"{etiqueta} GET {ruta} se recalcula y coincide con la base de datos",
+                              fallo and respuesta == sin_cache(ruta))
+            
+            for ruta in RUTAS:
+                antes = ResponseCache.stats()
+                primera = cliente.get(ruta).get_json()
+                segunda = cliente.get(ruta).get_json()
+                despues = ResponseCache.stats()
+                comprobar(f"GET {ruta}: un fallo y luego un acierto con la misma respuesta",
+                          despues['fallos'] == antes['fallos'] + 1 and despues['aciertos'] == antes['aciertos'] + 1
+                          and primera == segunda)
+            
+            # La única consulta es la versión de los datos del GET condicional
+            acierto = cliente.get('/api/pokemon/statistics')
+            comprobar("Un acierto no ejecuta consultas", acierto.headers.get('X-Query-Count') == '1')
+            
+            # Las rutas transmitidas consultan después de after_request (fuera de X-Query-Count):
+            # se cuentan las sentencias del motor y las llamadas a stream mientras se consume el cuerpo
+            esperado = cliente.get('/api/pokemon/legendary').get_json()
+            sentencias, lecturas = [], []
+            stream = PokemonRepository.stream
+            
+            def contar_stream(*args, **kwargs):
+                lecturas.append(args)
+                return stream(*args, **kwargs)
+            
+            def contar_sentencia(*args):
+                sentencias.append(args[2])
+            
+            with app.app_context():
+                motor = db.engine
+            respuesta = cliente.get('/api/pokemon/legendary', buffered=False)
+            PokemonRepository.stream = contar_stream
+            event.listen(motor, 'before_cursor_execute', contar_sentencia)
+            try:
+                cuerpo = b''.join(respuesta.response)
+                respuesta.close()
+            finally:
+                event.remove(motor, 'before_cursor_execute', contar_sentencia)
+                PokemonRepository.stream = stream
+            comprobar("Un acierto transmitido reproduce la lista guardada sin consultas",
+                      not sentencias and not lecturas and respuesta.status_code == 200
+                      and json.loads(cuerpo) == esperado)
+            
+            antes = ResponseCache.stats()
+            cliente.get('/api/pokemon/types/FIRE?fields=nombre,id').get_data()
+            comprobar("El tipo y el orden de fields no cambian la clave",
+                      ResponseCache.stats()['aciertos'] == antes['aciertos'] + 1)
+            
+            # Escrituras de la API: cada una invalida las respuestas guardadas
+            escrituras = [
+                ('post', '/api/pokemon', {'nombre': 'Cacheado', 'tipo_principal': 'Fire', 'hp': 90, 'ataque': 150,
+                                          'defensa': 160, 'generacion': 2}),
+                ('put', '/api/pokemon/7', {'nombre': 'Recalculado', 'tipo_principal': 'Fire', 'hp': 100,
+                                            'ataque': 150, 'defensa': 150}),
+                ('patch', '/api/pokemon/bulk', {'filter': {'tipo': 'Fire'}, 'changes': {'es_legendario': True}}),
+                ('delete', '/api/pokemon/bulk', {'ids': [11, 12, 13]})
+            ]
+            for metodo, ruta, cuerpo in escrituras:
+                antes = ResponseCache.stats()
+                getattr(cliente, metodo)(ruta, json=cuerpo)
+                despues = ResponseCache.stats()
+                comprobar(f"{metodo.upper()} {ruta} invalida la caché",
+                          despues['invalidaciones'] > antes['invalidaciones'] and despues['entradas'] == 0)
+                comparar_con_base(f"Después de {metodo.upper()}:")
+            
+            with app.app_context():
+                ETLService.load_pokemon_from_dataframe(generar_datos_limpios(n // 2), mode='bulk')
+            comprobar("Una recarga del ETL invalida la caché", ResponseCache.stats()['entradas'] == 0)
+            comparar_con_base("Después de recargar:")
+            
+            # Desalojo del menos usado cuando se supera la capacidad
+            Config.RESPONSE_CACHE_SIZE = 3
+            antes = ResponseCache.stats()
+            for minimo in range(300, 800, 100):
+                cliente.get(f'/api/pokemon/power?min={minimo}').get_data()
+            despues = ResponseCache.stats()
+            comprobar(f"Con capacidad 3 se guardan 3 respuestas ({despues['entradas']}) y se desalojan las demás",
+                      despues['entradas'] == 3 and despues['desalojos'] >= antes['desalojos'] + 2)
+            cliente.get('/api/pokemon/power?min=300').get_data()
+            comprobar("La respuesta desalojada se vuelve a calcular",
+                      ResponseCache.stats()['fallos'] == despues['fallos'] + 1)
+            
+            # Vencimiento
+            Config.RESPONSE_CACHE_TTL = 0.2
+            cliente.get('/api/pokemon/legendary').get_data()
+            time.sleep(0.3)
+            antes = ResponseCache.stats()
+            cliente.get('/api/pokemon/legendary').get_data()
+            comprobar("Una respuesta vencida se vuelve a calcular",
+                      ResponseCache.stats()['fallos'] == antes['fallos'] + 1)
+            
+            contadores = cliente.get('/api/pokemon/cache/stats')
+            comprobar("GET /api/pokemon/cache/stats expone los contadores",
+                      contadores.status_code == 200 and
+                      {'aciertos', 'fallos', 'desalojos', 'invalidaciones'} <= set(contadores.get_json()))
+            
+            with app.app_context():
+                db.session.remove()
+                db.engine.dispose()
+    
+    print("\n" + ("✅ Caché de respuestas correcta" if comprobar.exito else "❌ Hay fallos en la caché de respuestas"))
+    return comprobar.exito
+
+
+if __name__ == "__main__":
+    sys.exit(0 if probar_cache_respuestas() else 1)
@@ -0,0 +1,154 @@
+import os
+import sys
+import json
+import tempfile
+
+# Agregar el directorio padre al path para importar módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Config.Config import Config, db
+from Repositories.Sharding import Sharding
+from Services.ETLService import ETLService
+from Fixtures import generar_datos_limpios, crear_app_temporal, configuracion, Comprobaciones
+
+# Rutas que deben responder igual con y sin particiones. Las marcadas con
+# True no tienen un orden definido y se comparan ordenando por id
+RUTAS = [
+    ('/api/pokemon?per_page=5', False),
+    ('/api/pokemon?per_page=5&page=3', False),
+    ('/api/pokemon?sort=poder_total&order=desc&per_page=7&fields=nombre', False),
+    ('/api/pokemon?sort=velocidad&per_page=6&generation=2', False),
+    ('/api/pokemon?type=Fire,Water&generation=1,2&min_power=300&per_page=50', False),
+    ('/api/pokemon/7', False),
+    ('/api/pokemon/99999', False),
+    ('/api/pokemon/search?q=a&type=name&fields=id,nombre', True),
+    ('/api/pokemon/types/fire?fields=id', True),
+    ('/api/pokemon/legendary', True),
+    ('/api/pokemon/power?min=400&max=500', True),
+    ('/api/pokemon/export?fields=id,generacion&generation=2,3', True),
+    ('/api/pokemon/statistics', False),
+    ('/api/pokemon/statistics/verify', False)
+]
+
+# Búsquedas con relevancia: FTS5 la calcula en cada partición con sus propias
+# frecuencias, así que solo se compara cuántos resultados hay
+RUTAS_TOTAL = [
+    '/api/pokemon?search=fire&fields=id',
+    '/api/pokemon?search=fire&generation=3&fields=id'
+]
+
+def _normalizar(datos, sin_orden):
+    """
+    Copia comparable de una respuesta: sin las fechas (cada base las asigna al
+    cargar) y con las listas de Pokemon ordenadas por id si no tienen orden
+    """
+    def sin_fechas(valor):
+        if isinstance(valor, dict):
+            return {clave: sin_fechas(v) for clave, v in valor.items() if not clave.startswith('fecha_')}
+        if isinstance(valor, list):
+            return [sin_fechas(v) for v in valor]
+        return valor
+    
+    datos = sin_fechas(json.loads(json.dumps(datos, sort_keys=True)))
+    if sin_orden and isinstance(datos, dict):
+        for clave, valor in datos.items():
+            if isinstance(valor, list) and valor and isinstance(valor[0], dict) and 'id' in valor[0]:
+                datos[clave] = sorted(valor, key=lambda pokemon: pokemon['id'])
+    return datos
+
+def _crear_app(db_path, particiones=None, n=0):
+    """Aplicación de prueba con los datos cargados, particionada si se pide"""
+    shard_by, shard_count = particiones or ('', Config.SHARD_COUNT)
+    with configuracion(SHARD_BY=shard_by, SHARD_COUNT=shard_count):
+        app = crear_app_temporal(db_path, api=True)
+        Sharding.init_app(app)
+    
+    with app.app_context():
+        ETLService.load_pokemon_from_dataframe(generar_datos_limpios(n), mode='bulk')
+    return app
+
+def probar_particiones(n=1_500):
+    """
+    Compara la API sobre la tabla particionada (por generación y por hash del
+    id) con la misma API sobre una sola tabla, antes y después de escrituras
+    que mueven registros entre particiones
+    
+    Args:
+        n (int): Número de registros de prueba
+        
+    Returns:
+        bool: True si las respuestas coinciden
+    """
+    print("🧪 Comparando la tabla particionada con la tabla única...")
+    print("=" * 60)
+    
+    comprobar = Comprobaciones()
+    
+    def comparar_rutas(referencia, cliente, etiqueta):
+        for ruta, sin_orden in RUTAS:
+            esperado, respuesta = referencia.get(ruta), cliente.get(ruta)
+            comprobar(f"{etiqueta} GET {ruta} ({respuesta.status_code})",
+                      esperado.status_code == respuesta.status_code and
+                      _normalizar(esperado.get_json(), sin_orden) == _normalizar(respuesta.get_json(), sin_orden))
+        for ruta in RUTAS_TOTAL:
+            esperado = referencia.get(ruta).get_json()['pagination']['total']
+            total = cliente.get(ruta).get_json()['pagination']['total']
+            comprobar(f"{etiqueta} GET {ruta} ({total} resultados)", esperado == total)
+    
+    # Escrituras que ejercitan la secuencia de ids y el cambio de partición
+    escrituras = [
+        ('post', '/api/pokemon', {'nombre': 'Particionado', 'tipo_principal': 'Fire', 'hp': 90, 'ataque': 250,
+                                   'defensa': 250, 'generacion': 3}),
+        ('put', '/api/pokemon/10', {'nombre': 'Mudado', 'tipo_principal': 'Water', 'hp': 80, 'ataque': 70,
+                                     'defensa': 60, 'generacion': 5}),
+        ('patch', '/api/pokemon/bulk', {'filter': {'generacion': 1, 'tipo': 'Fire'}, 'changes': {'generacion': 4}}),
+        ('patch', '/api/pokemon/bulk', {'ids': [20, 21, 22], 'changes': {'poder_total': 720}}),
+        ('delete', '/api/pokemon/bulk', {'ids': [30, 31, 32]}),
+        ('delete', '/api/pokemon/40', None),
+        ('post', '/api/pokemon/bulk', [{'nombre': f'Lote {i}', 'tipo_principal': 'Grass', 'hp': 40 + i,
+                                        'ataque': 50, 'defensa': 50, 'generacion': 1 + i % 6} for i in range(8)])
+    ]
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        referencia_app = _crear_app(os.path.join(tmp_dir, 'unica.db'), n=n)
+        referencia = referencia_app.test_client()
+        
+        for estrategia in Sharding.STRATEGIES:
+            app = _crear_app(os.path.join(tmp_dir, f'{estrategia}.db'), (estrategia, 4), n=n)
+            cliente = app.test_client()
+            
+            with app.app_context():
+                ubicacion = [shard.path for shard in Sharding.active().shards_for({'generacion': 2})]
+            comprobar(f"[{estrategia}] Una consulta por generación usa {len(ubicacion)} partición(es)",
+                      len(ubicacion) == (1 if estrategia == 'generacion' else 4))
+            
+            comparar_rutas(referencia, cliente, f"[{estrategia}]")
+            
+            # Las mismas escrituras en ambas: deben devolver lo mismo
+            for metodo, ruta, cuerpo in escrituras:
+                esperado = getattr(referencia, metodo)(ruta, json=cuerpo)
+                respuesta = getattr(cliente, metodo)(ruta, json=cuerpo)
+                comprobar(f"[{estrategia}] {metodo.upper()} {ruta} ({respuesta.status_code})",
+                          esperado.status_code == respuesta.status_code and
+                          _normalizar(esperado.get_json(), True) == _normalizar(respuesta.get_json(), True))
+            
+            comparar_rutas(referencia, cliente, f"[{estrategia}] después de escribir:")
+            
+            # La referencia vuelve al estado inicial para la siguiente estrategia
+            Sharding.shutdown(app)
+            with app.app_context():
+                db.session.remove()
+                db.engine.dispose()
+            with referencia_app.app_context():
+                ETLService.load_pokemon_from_dataframe(generar_datos_limpios(n), mode='bulk')
+        
+        with referencia_app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+    
+    print("\n" + ("✅ La tabla particionada responde igual" if comprobar.exito else "❌ Las respuestas difieren"))
+    return comprobar.exito
+
+
+if __name__ == "__main__":
+    sys.exit(0 if probar_particiones() else 1)
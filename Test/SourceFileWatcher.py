@@ -0,0 +1,135 @@
+import os
+import sys
+import time
+import tempfile
+import threading
+
+# Agregar el directorio padre al path para importar módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Services.ETLJobRunner import ETLJobRunner
+from Services.SourceFileWatcher import SourceFileWatcher
+from Fixtures import Comprobaciones
+
+
+def _escribir(ruta, contenido):
+    """Escribe el archivo con un mtime distinto en cada llamada"""
+    with open(ruta, 'w') as f:
+        f.write(contenido)
+    _escribir.mtime += 1_000_000_000
+    os.utime(ruta, ns=(_escribir.mtime, _escribir.mtime))
+
+
+_escribir.mtime = 1_600_000_000 * 1_000_000_000
+
+
+class Recarga:
+    """on_change de prueba: cuenta las llamadas y devuelve (job, created) como ETLJobRunner.submit"""
+    
+    def __init__(self):
+        self.llamadas = 0
+        self.crear = True
+    
+    def __call__(self):
+        self.llamadas += 1
+        return {'job_id': str(self.llamadas)}, self.crear
+
+
+def probar_vigilante(debounce=5.0, intervalo=60.0):
+    """
+    Comprueba el vigilante del archivo fuente con instantes simulados
+    (check(now=...)): la espera sin escrituras (debounce), el intervalo mínimo
+    entre recargas y el reintento cuando ya había una recarga en ejecución
+    
+    Args:
+        debounce (float): Segundos sin escrituras antes de disparar la recarga
+        intervalo (float): Segundos mínimos entre dos recargas
+        
+    Returns:
+        bool: True si todas las comprobaciones pasan
+    """
+    print("🧪 Verificando el vigilante del archivo fuente...")
+    print("=" * 60)
+    
+    comprobar = Comprobaciones()
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        ruta = os.path.join(tmp_dir, 'pokemon.csv')
+        _escribir(ruta, 'a')
+        recarga = Recarga()
+        vigilante = SourceFileWatcher(ruta, recarga, debounce_seconds=debounce, min_interval=intervalo)
+        
+        comprobar("Sin cambios no se dispara nada", not vigilante.check(now=0) and recarga.llamadas == 0)
+        
+        # Debounce: cada escritura reinicia la espera
+        _escribir(ruta, 'ab')
+        resultados = [vigilante.check(now=10), vigilante.check(now=12)]
+        _escribir(ruta, 'abc')
+        resultados += [vigilante.check(now=13), vigilante.check(now=17)]
+        comprobar("Las escrituras seguidas reinician la espera", not any(resultados) and recarga.llamadas == 0)
+        comprobar("Se dispara tras debounce_seconds sin escrituras",
+                  vigilante.check(now=13 + debounce) and recarga.llamadas == 1 and vigilante.trigger_count == 1)
+        comprobar("El cambio ya atendido no se vuelve a disparar", not vigilante.check(now=100) and recarga.llamadas == 1)
+        
+        # Intervalo mínimo entre recargas
+        ultima = 13 + debounce
+        _escribir(ruta, 'abcd')
+        vigilante.check(now=ultima + 1)
+        comprobar("Antes de min_interval el cambio espera",
+                  not vigilante.check(now=ultima + intervalo - 1) and recarga.llamadas == 1)
+        comprobar("Al cumplirse min_interval se dispara",
+                  vigilante.check(now=ultima + intervalo) and recarga.llamadas == 2)
+        
+        # Reintento: submit devolvió created=False (ya había una recarga en ejecución)
+        _escribir(ruta, 'abcde')
+        vigilante.check(now=200)
+        recarga.crear = False
+        resultados = [vigilante.check(now=200 + debounce), vigilante.check(now=202 + debounce)]
+        comprobar("Con una recarga en ejecución el cambio queda pendiente y se reintenta en cada sondeo",
+                  not any(resultados) and recarga.llamadas == 4 and vigilante.trigger_count == 2)
+        recarga.crear = True
+        comprobar("Cuando se crea el trabajo el cambio se da por atendido",
+                  vigilante.check(now=204 + debounce) and recarga.llamadas == 5 and vigilante.trigger_count == 3
+                  and not vigilante.check(now=400) and recarga.llamadas == 5)
+        
+        # Un archivo que desaparece no dispara la recarga hasta que vuelve
+        os.remove(ruta)
+        vigilante.check(now=500)
+        comprobar("Un archivo borrado no dispara la recarga", not vigilante.check(now=600) and recarga.llamadas == 5)
+        _escribir(ruta, 'nuevo')
+        vigilante.check(now=700)
+        comprobar("El archivo reemplazado sí la dispara", vigilante.check(now=700 + debounce) and recarga.llamadas == 6)
+        
+        # Con ETLJobRunner real: el cambio llegado durante una carga se recarga al terminar
+        liberar = threading.Event()
+        cargas = []
+        
+        def etl(progress):
+            cargas.append(1)
+            liberar.wait(5)
+            return True
+        
+        runner = ETLJobRunner(etl)
+        vigilante = SourceFileWatcher(ruta, runner.submit, debounce_seconds=debounce, min_interval=intervalo)
+        en_curso, _ = runner.submit()
+        _escribir(ruta, 'cambio durante la carga')
+        vigilante.check(now=0)
+        comprobar("ETLJobRunner: con una carga en curso no se pierde el cambio",
+                  not vigilante.check(now=debounce) and vigilante._pending_since is not None)
+        liberar.set()
+        fin = time.monotonic() + 5
+        while runner.is_running() and time.monotonic() < fin:
+            time.sleep(0.01)
+        comprobar("ETLJobRunner: al terminar la carga el siguiente sondeo lanza otra",
+                  vigilante.check(now=debounce + 2) and vigilante._pending_since is None)
+        fin = time.monotonic() + 5
+        while runner.is_running() and time.monotonic() < fin:
+            time.sleep(0.01)
+        comprobar("ETLJobRunner: se ejecutaron dos cargas", len(cargas) == 2 and runner.get(en_curso['job_id']) is not None)
+    
+    print("\n" + ("✅ Vigilante del archivo fuente correcto" if comprobar.exito else "❌ Hay fallos en el vigilante del archivo fuente"))
+    return comprobar.exito
+
+
+if __name__ == "__main__":
+    sys.exit(0 if probar_vigilante() else 1)
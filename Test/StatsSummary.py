@@ -0,0 +1,135 @@
+import os
+import sys
+import random
+import tempfile
+
+# Agregar el directorio padre al path para importar módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Config.Config import db
+from Repositories.Repositories import PokemonRepository
+from Repositories.PokemonStatsRepository import PokemonStatsRepository
+from Services.ETLService import ETLService
+from Fixtures import generar_datos_limpios, crear_app_temporal, Comprobaciones
+
+
+def datos_aleatorios(rnd, i):
+    """
+    Genera los datos de un Pokemon aleatorio para las escrituras de prueba
+    
+    Args:
+        rnd (random.Random): Generador de números aleatorios
+        i (int): Número para el nombre
+        
+    Returns:
+        dict: Datos del Pokemon
+    """
+    return {
+        'nombre': f'Prueba{i}',
+        'tipo_principal': rnd.choice(['Fire', 'Water', 'Grass', 'Dragon']),
+        'tipo_secundario': 'Ninguno',
+        'hp': rnd.randint(1, 255),
+        'ataque': rnd.randint(1, 190),
+        'defensa': rnd.randint(1, 230),
+        'ataque_especial': rnd.randint(1, 190),
+        'defensa_especial': rnd.randint(1, 230),
+        'velocidad': rnd.randint(1, 200),
+        'generacion': rnd.randint(1, 9),
+        'es_legendario': rnd.random() < 0.1
+    }
+
+
+def probar_resumen(n=5_000, escrituras=300, semilla=1):
+    """
+    Carga datos sintéticos, aplica escrituras aleatorias por PokemonRepository
+    (create, update, delete, bulk_create, update_many y delete_many) y comprueba después de cada una que
+    el resumen materializado coincide con un recálculo completo
+    
+    Args:
+        n (int): Número de registros de la carga inicial
+        escrituras (int): Número de escrituras aleatorias
+        semilla (int): Semilla del generador aleatorio
+        
+    Returns:
+        bool: True si el resumen fue consistente en todo momento
+    """
+    print("🧪 Verificando el resumen materializado de estadísticas...")
+    print("=" * 60)
+    
+    rnd = random.Random(semilla)
+    comprobar = Comprobaciones()
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        app = crear_app_temporal(os.path.join(tmp_dir, 'resumen.db'))
+        with app.app_context():
+            for modo in ('bulk', 'merge', 'orm'):
+                ETLService.load_pokemon_from_dataframe(generar_datos_limpios(n), mode=modo)
+                comprobar(f"Carga del ETL en modo {modo}", PokemonStatsRepository.verify()['consistente'])
+            
+            # Una carga orm fallida (nombres repetidos) conserva la tabla anterior
+            datos = generar_datos_limpios(n)
+            datos.loc[datos.index[1], 'nombre'] = datos.loc[datos.index[0], 'nombre']
+            resultado = ETLService.load_pokemon_from_dataframe(datos, mode='orm')
+            comprobar("Una carga orm fallida conserva los datos anteriores",
+                      not resultado['success'] and PokemonRepository.count() == n and
+                      PokemonStatsRepository.verify()['consistente'])
+            
+            # Recarga en modo merge que intercambia nombres y entrega uno liberado a otra fila
+            datos = generar_datos_limpios(n)
+            primero, segundo, tercero = datos.index[:3]
+            nombres = datos.loc[[primero, segundo, tercero], 'nombre'].tolist()
+            datos.loc[[primero, segundo, tercero], 'nombre'] = [nombres[1], nombres[0], 'Renombrado']
+            datos.loc[datos.index[3], 'nombre'] = nombres[2]
+            resultado = ETLService.load_pokemon_from_dataframe(datos, mode='merge')
+            comprobar("Carga merge con nombres intercambiados entre filas",
+                      resultado['success'] and resultado['updated_count'] == 4 and
+                      [PokemonRepository.get_by_id(int(datos.loc[i, 'id'])).nombre for i in datos.index[:4]] ==
+                      [nombres[1], nombres[0], 'Renombrado', nombres[2]] and PokemonStatsRepository.verify()['consistente'])
+            
+            ids = [pokemon.id for pokemon in PokemonRepository.get_all()]
+            fallos = 0
+            for i in range(escrituras):
+                operacion = rnd.random()
+                if operacion < 0.35:
+                    pokemon = PokemonRepository.create(datos_aleatorios(rnd, i))
+                    if pokemon:
+                        ids.append(pokemon.id)
+                elif operacion < 0.65:
+                    PokemonRepository.update(rnd.choice(ids), {
+                        'hp': rnd.randint(1, 255),
+                        'velocidad': rnd.randint(1, 250),
+                        'ataque': rnd.randint(1, 190),
+                        'tipo_principal': rnd.choice(['Fire', 'Ice'])
+                    })
+                elif operacion < 0.85:
+                    PokemonRepository.delete(ids.pop(rnd.randrange(len(ids))))
+                elif operacion < 0.9:
+                    creados, _ = PokemonRepository.bulk_create(
+                        [datos_aleatorios(rnd, escrituras + i * 10 + k) for k in range(5)]
+                    )
+                    ids.extend(pokemon['id'] for pokemon in creados)
+                elif operacion < 0.95:
+                    PokemonRepository.update_many(
+                        {'poder_total': rnd.randint(200, 720), 'es_legendario': rnd.random() < 0.5},
+                        filters={'tipo': rnd.choice(['Fire', 'Ice']), 'generacion': rnd.randint(1, 9)}
+                    )
+                else:
+                    eliminados = set(PokemonRepository.delete_many(ids=rnd.sample(ids, min(20, len(ids)))))
+                    ids = [pokemon_id for pokemon_id in ids if pokemon_id not in eliminados]
+                
+                resultado = PokemonStatsRepository.verify()
+                if not resultado['consistente']:
+                    fallos += 1
+                    print(f"❌ Escritura {i}: diferencias en {', '.join(resultado['diferencias'])}")
+            
+            comprobar(f"{escrituras} escrituras aleatorias ({fallos} inconsistencias)", fallos == 0)
+            
+            db.session.remove()
+            db.engine.dispose()
+    
+    print("\n" + ("✅ El resumen coincide con el recálculo completo" if comprobar.exito else "❌ El resumen no es consistente"))
+    return comprobar.exito
+
+
+if __name__ == "__main__":
+    sys.exit(0 if probar_resumen() else 1)
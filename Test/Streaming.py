@@ -0,0 +1,127 @@
+import os
+import sys
+import json
+import tempfile
+import tracemalloc
+
+# Agregar el directorio padre al path para importar módulos
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Config.Config import db
+from Services.ETLService import ETLService
+from Services.Services import PokemonService
+from Fixtures import generar_datos_limpios, crear_app_temporal, configuracion, Comprobaciones
+
+# Rutas transmitidas y el servicio con la respuesta completa equivalente
+RUTAS = [
+    ('/api/pokemon/types/fire', lambda: PokemonService.get_pokemon_by_type('Fire')),
+    ('/api/pokemon/types/water?fields=nombre,id', lambda: PokemonService.get_pokemon_by_type('Water', ['nombre', 'id'])),
+    ('/api/pokemon/legendary', lambda: PokemonService.get_legendary_pokemon()),
+    ('/api/pokemon/power?min=400&max=500&fields=poder_total',
+     lambda: PokemonService.get_pokemon_by_power_range(400, 500, ['poder_total'])),
+    ('/api/pokemon/power?max=350', lambda: PokemonService.get_pokemon_by_power_range(None, 350))
+]
+
+
+def _por_id(datos):
+    """Copia de la respuesta con la lista de Pokemon ordenada por id"""
+    datos = json.loads(json.dumps(datos))
+    datos['pokemon'].sort(key=lambda pokemon: pokemon['id'])
+    return datos
+
+
+def _pico_exportacion(cliente, ruta):
+    """Pico de memoria (bytes) al consumir una exportación fragmento a fragmento"""
+    tracemalloc.start()
+    try:
+        respuesta = cliente.get(ruta, buffered=False)
+        recibidos = sum(len(fragmento) for fragmento in respuesta.response)
+        respuesta.close()
+        return tracemalloc.get_traced_memory()[1], recibidos
+    finally:
+        tracemalloc.stop()
+
+
+def probar_transmision(n=2_000, grande=20_000):
+    """
+    Comprueba las respuestas transmitidas: el mismo contenido que la
+    respuesta completa en JSON y en NDJSON, el primer fragmento antes del
+    resto, la exportación con filtros y campos, y que la memoria no crece con
+    el tamaño del resultado
+    
+    Args:
+        n (int): Número de registros de prueba
+        grande (int): Registros de la exportación grande (para comparar la memoria)
+        
+    Returns:
+        bool: True si todas las comprobaciones pasan
+    """
+    print("🧪 Verificando las respuestas transmitidas...")
+    print("=" * 60)
+    
+    comprobar = Comprobaciones()
+    
+    # Sin caché de respuestas: cada petición lee de la base de datos
+    with configuracion(RESPONSE_CACHE_TTL=0):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            app = crear_app_temporal(os.path.join(tmp_dir, 'transmision.db'), api=True)
+            with app.app_context():
+                ETLService.load_pokemon_from_dataframe(generar_datos_limpios(n), mode='bulk')
+            
+            cliente = app.test_client()
+            
+            for ruta, servicio in RUTAS:
+                with app.app_context():
+                    esperado = _por_id(servicio())
+                respuesta = cliente.get(ruta)
+                comprobar(f"GET {ruta}: misma respuesta que la completa ({esperado['total']} Pokemon)",
+                          respuesta.status_code == 200 and respuesta.mimetype == 'application/json'
+                          and _por_id(respuesta.get_json()) == esperado)
+                
+                lineas = cliente.get(ruta, headers={'Accept': 'application/x-ndjson'}).get_data(as_text=True)
+                registros = sorted((json.loads(linea) for linea in lineas.splitlines()), key=lambda p: p['id'])
+                comprobar(f"GET {ruta} en NDJSON: un Pokemon por línea", registros == esperado['pokemon'])
+            
+            respuesta = cliente.get('/api/pokemon/legendary', buffered=False)
+            fragmentos = iter(respuesta.response)
+            primero = next(fragmentos) + next(fragmentos)
+            comprobar("El primer fragmento sale con el primer registro, antes del resto",
+                      primero.startswith(b'{"pokemon":[{') and primero.endswith(b'}'))
+            respuesta.close()
+            
+            exportacion = cliente.get('/api/pokemon/export').get_json()
+            comprobar(f"GET /api/pokemon/export devuelve la tabla completa ({exportacion['total']})",
+                      exportacion['total'] == n and len({p['id'] for p in exportacion['pokemon']}) == n)
+            
+            lineas = cliente.get('/api/pokemon/export?format=ndjson&fields=id,nombre&generation=2').get_data(as_text=True)
+            registros = [json.loads(linea) for linea in lineas.splitlines()]
+            with app.app_context():
+                generacion = PokemonService.get_all_pokemon(per_page=1, filters={'generacion': [2]})
+            comprobar(f"Exportación NDJSON con filtros y campos ({len(registros)} líneas)",
+                      len(registros) == generacion['pagination']['total']
+                      and all(set(registro) == {'id', 'nombre'} for registro in registros))
+            
+            comprobar("Un formato desconocido devuelve 400",
+                      cliente.get('/api/pokemon/export?format=xml').status_code == 400)
+            comprobar("Un campo desconocido devuelve 400 antes de transmitir",
+                      cliente.get('/api/pokemon/types/fire?fields=color').status_code == 400)
+            
+            pico_pequena, bytes_pequena = _pico_exportacion(cliente, '/api/pokemon/export?format=ndjson')
+            with app.app_context():
+                ETLService.load_pokemon_from_dataframe(generar_datos_limpios(grande), mode='bulk')
+            pico_grande, bytes_grande = _pico_exportacion(cliente, '/api/pokemon/export?format=ndjson')
+            print(f"   📊 {n} registros: {bytes_pequena / 1024:.0f} KB enviados, pico {pico_pequena / 1024:.0f} KB")
+            print(f"   📊 {grande} registros: {bytes_grande / 1024:.0f} KB enviados, pico {pico_grande / 1024:.0f} KB")
+            comprobar("La memoria no crece con el tamaño de la exportación",
+                      pico_grande < 2 * pico_pequena and pico_grande < bytes_grande / 5)
+            
+            with app.app_context():
+                db.session.remove()
+                db.engine.dispose()
+    
+    print("\n" + ("✅ Respuestas transmitidas correctas" if comprobar.exito else "❌ Hay fallos en las respuestas transmitidas"))
+    return comprobar.exito
+
+
+if __name__ == "__main__":
+    sys.exit(0 if probar_transmision() else 1)
@@ -2,6 +2,9 @@ from Config.Config import Config
 from Extract.Extract import Extract
 from Clean.Clean import Clean
 from Load.Load import Load
+from Services.ETLJobRunner import ETLJobRunner
+from Services.SourceFileWatcher import SourceFileWatcher
+from Services.ETLRunService import ETLRunMetrics, ETLRunService
 import time
 from flask import Flask, jsonify, request
 import pandas as pd
@@ -10,15 +13,29 @@ import os
 # Variable global para almacenar los datos procesados
 pokemon_data = None
 
-def run_etl():
-    """Ejecuta el proceso ETL y devuelve los datos procesados"""
+def run_etl(progress=None):
+    """
+    Ejecuta el proceso ETL y devuelve los datos procesados
+    
+    Args:
+        progress (callable): Callback opcional progress(fase, progreso, **filas)
+            para informar el avance a un trabajo en segundo plano
+    """
     global pokemon_data
     
+    if progress is None:
+        progress = lambda fase, progreso, **filas: None
+    
+    # Métricas de la ejecución para el historial (GET /api/etl/runs)
+    metrics = ETLRunMetrics('app_simple')
+    
     try:
         print("\n🚀 Iniciando proceso ETL para datos Pokemon...")
         start_time = time.time()
 
         # Extract
+        progress('extract', 0)
+        metrics.start_phase('extract')
         print("\n📥 Fase de Extracción:")
         print(f"Leyendo datos desde: {Config.INPUT_PATH}")
         extractor = Extract(Config.INPUT_PATH)
@@ -26,12 +43,17 @@ def run_etl():
 
         if df is not None:
             print(f"✅ Datos extraídos exitosamente. Registros encontrados: {len(df)}")
+            metrics.end_phase('extract', rows_out=len(df))
 
             # Transform/Clean
+            progress('clean', 30, extraidas=len(df))
+            metrics.start_phase('clean', rows_in=len(df))
             print("\n🔄 Fase de Limpieza y Transformación:")
             print("Limpiando y preparando los datos...")
             cleaner = Clean(df)
             df_clean = cleaner.clean_data()
+            metrics.end_phase('clean', rows_out=len(df_clean))
+            metrics.duplicates_removed = cleaner.duplicates_removed
             
             print("\n📊 Resumen de datos limpios:")
             print(f"- Total de registros: {len(df_clean)}")
@@ -40,6 +62,8 @@ def run_etl():
             print(df_clean.head())
 
             # Load
+            progress('load', 70, limpias=len(df_clean))
+            metrics.start_phase('load', rows_in=len(df_clean))
             print("\n📤 Fase de Carga:")
             loader = Load(df_clean)
             
@@ -54,19 +78,29 @@ def run_etl():
             print(f"\n✨ Proceso ETL completado exitosamente en {duration} segundos")
             print(f"📁 CSV guardado en: {csv_path}")
             
-            # Almacenar los datos procesados en memoria
+            # Almacenar los datos procesados en memoria. Se reemplaza la referencia
+            # completa para que las peticiones en curso sigan viendo la versión anterior
             pokemon_data = df_clean.to_dict('records')
+            progress('load', 100, cargadas=len(pokemon_data))
+            metrics.end_phase('load', rows_out=len(pokemon_data))
+            metrics.record_output(csv_path)
+            metrics.finish(success=True)
             
             return True
 
         else:
             print("❌ Error: No se pudieron extraer los datos")
+            metrics.finish(success=False, error='No se pudieron extraer los datos')
             return False
 
     except Exception as e:
         print(f"\n❌ Error en el proceso ETL: {str(e)}")
+        metrics.finish(success=False, error=str(e))
         return False
 
+# Ejecutor de trabajos ETL en segundo plano (una ejecución a la vez)
+etl_jobs = ETLJobRunner(run_etl)
+
 def create_app():
     """Crea la aplicación Flask"""
     app = Flask(__name__)
@@ -89,7 +123,10 @@ def create_app():
                 "GET /api/pokemon/type/<tipo>": "Obtener pokémons por tipo",
                 "GET /api/pokemon/search?q=<termino>": "Buscar pokémons",
                 "GET /api/pokemon/stats": "Obtener estadísticas generales",
-                "GET /api/pokemon/legendary": "Obtener pokémons legendarios"
+                "GET /api/pokemon/legendary": "Obtener pokémons legendarios",
+                "POST /api/etl/run": "Iniciar el ETL en segundo plano",
+                "GET /api/etl/jobs/<job_id>": "Consultar el estado de un ETL",
+                "GET /api/etl/runs": "Historial de ejecuciones del ETL con métricas y tendencias"
             },
             "estadísticas": {
                 "total_pokemon": len(pokemon_data) if pokemon_data else 0,
@@ -101,7 +138,8 @@ def create_app():
     @app.route('/api/pokemon')
     def get_all_pokemon():
         """Obtiene todos los Pokemon"""
-        if not pokemon_data:
+        data = pokemon_data  # Snapshot: una recarga en curso no cambia esta respuesta
+        if not data:
             return jsonify({"error": "No hay datos disponibles. Ejecute el ETL primero."}), 500
         
         # Paginación
@@ -111,16 +149,16 @@ def create_app():
         start_idx = (page - 1) * per_page
         end_idx = start_idx + per_page
         
-        paginated_data = pokemon_data[start_idx:end_idx]
+        paginated_data = data[start_idx:end_idx]
         
         return jsonify({
             "pokemon": paginated_data,
             "pagination": {
                 "page": page,
                 "per_page": per_page,
-                "total": len(pokemon_data),
-                "pages": (len(pokemon_data) + per_page - 1) // per_page,
-                "has_next": end_idx < len(pokemon_data),
+                "total": len(data),
+                "pages": (len(data) + per_page - 1) // per_page,
+                "has_next": end_idx < len(data),
                 "has_prev": page > 1
             }
         }), 200
@@ -206,14 +244,15 @@ def create_app():
     @app.route('/api/pokemon/stats')
     def get_pokemon_stats():
         """Obtiene estadísticas generales"""
-        if not pokemon_data:
+        data = pokemon_data  # Snapshot: una recarga en curso no cambia esta respuesta
+        if not data:
             return jsonify({"error": "No hay datos disponibles"}), 500
         
-        df = pd.DataFrame(pokemon_data)
+        df = pd.DataFrame(data)
         
         # Calcular estadísticas
         stats = {
-            "total_pokemon": len(pokemon_data),
+            "total_pokemon": len(data),
             "pokemon_legendarios": df['es_legendario'].sum(),
             "pokemon_mega": df['es_mega'].sum(),
             "tipos_principales": df['tipo_principal'].value_counts().to_dict(),
@@ -239,18 +278,42 @@ def create_app():
         
         return jsonify(stats), 200
 
-    # Ruta para re-ejecutar ETL
+    # Ruta para re-ejecutar ETL en segundo plano
     @app.route('/api/etl/run', methods=['POST'])
     def run_etl_endpoint():
-        """Re-ejecuta el proceso ETL"""
-        success = run_etl()
-        if success:
-            return jsonify({
-                "mensaje": "ETL ejecutado exitosamente",
-                "total_pokemon": len(pokemon_data) if pokemon_data else 0
-            }), 200
-        else:
-            return jsonify({"error": "Error al ejecutar ETL"}), 500
+        """Inicia el ETL en segundo plano y devuelve el id del trabajo"""
+        job, created = etl_jobs.submit()
+        
+        return jsonify({
+            "mensaje": "ETL iniciado en segundo plano" if created
+                       else "Ya hay un ETL en ejecución, se devuelve el trabajo activo",
+            "job_id": job['job_id'],
+            "estado": job['estado'],
+            "url_estado": f"/api/etl/jobs/{job['job_id']}"
+        }), 202
+
+    @app.route('/api/etl/jobs/<string:job_id>')
+    def get_etl_job(job_id):
+        """Obtiene la fase, el progreso, las filas y los tiempos de un trabajo ETL"""
+        job = etl_jobs.get(job_id)
+        if job is None:
+            return jsonify({"error": f"Trabajo ETL {job_id} no encontrado"}), 404
+        
+        return jsonify({"job": job}), 200
+
+    @app.route('/api/etl/runs')
+    def get_etl_runs():
+        """Lista las ejecuciones recientes del ETL con sus métricas y tendencias"""
+        try:
+            limit = min(int(request.args.get('limit', 20)), 200)
+        except ValueError:
+            return jsonify({"error": "El parámetro 'limit' debe ser un número entero"}), 400
+        
+        result = ETLRunService.get_run_history(limit, request.args.get('origen'))
+        if 'error' in result:
+            return jsonify(result), 500
+        
+        return jsonify(result), 200
 
     # Manejadores de errores
     @app.errorhandler(404)
@@ -276,6 +339,18 @@ if __name__ == '__main__':
     
     # Crear y ejecutar la aplicación Flask
     app = create_app()
+    
+    # Recargar automáticamente cuando cambie el archivo fuente. Con el recargador
+    # de Flask solo se vigila desde el proceso que atiende las peticiones
+    if Config.WATCH_SOURCE and os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        watcher = SourceFileWatcher(
+            Config.INPUT_PATH,
+            on_change=etl_jobs.submit,
+            poll_interval=Config.WATCH_POLL_INTERVAL,
+            debounce_seconds=Config.WATCH_DEBOUNCE_SECONDS,
+            min_interval=Config.WATCH_MIN_RELOAD_INTERVAL
+        ).start()
+    
     print("\n🌐 Iniciando servidor API en http://127.0.0.1:5000")
     print("📋 Visita http://127.0.0.1:5000 para ver la documentación de la API")
     
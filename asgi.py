@@ -0,0 +1,56 @@
+from quart import Quart, jsonify
+from Config.Config import Config
+from Repositories.AsyncRepositories import AsyncDatabase
+from Controllers.AsyncControllers import async_pokemon_blueprint
+
+def create_app(database_url=None):
+    """
+    Crea la aplicación ASGI: las rutas de /api/pokemon con manejadores
+    asíncronos y sesiones de la extensión asyncio de SQLAlchemy. Mientras una
+    consulta espera a la base de datos el proceso sigue atendiendo otras
+    peticiones, sin ocupar un hilo por petición
+    
+    Ejecutar con: uvicorn asgi:app  (o hypercorn asgi:app)
+    
+    Args:
+        database_url (str): URL asíncrona de la base de datos (por defecto async_database_url())
+        
+    Returns:
+        Quart: Aplicación ASGI
+    """
+    app = Quart(__name__)
+    app.config.from_object(Config)
+    
+    @app.before_serving
+    async def startup():
+        await AsyncDatabase.init(database_url)
+    
+    @app.after_serving
+    async def shutdown():
+        await AsyncDatabase.close()
+    
+    @app.route('/')
+    async def welcome():
+        return jsonify({
+            "mensaje": "¡Bienvenido a la API de Pokémon! (ASGI)",
+            "versión": "1.0",
+            "rutas_disponibles": {
+                "GET /api/pokemon": "Obtener todos los pokémons",
+                "GET /api/pokemon/<id>": "Obtener un pokémon específico",
+                "POST /api/pokemon": "Crear un nuevo pokémon",
+                "PUT /api/pokemon/<id>": "Actualizar un pokémon existente",
+                "DELETE /api/pokemon/<id>": "Eliminar un pokémon"
+            }
+        }), 200
+    
+    app.register_blueprint(async_pokemon_blueprint, url_prefix='/api')
+    
+    return app
+
+app = create_app()
+
+if __name__ == '__main__':
+    import uvicorn
+    
+    print("\n🚀 Iniciando servidor ASGI de la API...")
+    uvicorn.run(app, host='127.0.0.1', port=8000)
@@ -3,11 +3,34 @@ from Extract.Extract import Extract
 from Clean.Clean import Clean
 from Load.Load import Load
 from Services.ETLService import ETLService
+from Services.ETLJobRunner import ETLJobRunner
+from Services.SourceFileWatcher import SourceFileWatcher
+from Services.ETLRunService import ETLRunMetrics, ETLRunService
+from Repositories.ReadRouting import ReadRouting
+from Repositories.Sharding import Sharding
+import os
 import time
-from flask import Flask, jsonify
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask, jsonify, request
 from Controllers.Controllers import pokemon_blueprint
 
-def run_etl():
+def run_etl(write_csv=None, metrics=None):
+    """
+    Ejecuta Extract y Clean y devuelve el DataFrame limpio en memoria.
+    
+    El CSV limpio es una salida secundaria: si está habilitado se
+    escribe en un hilo aparte mientras los datos se cargan a la base de datos.
+    
+    Args:
+        write_csv (bool): Escribir el CSV limpio (por defecto Config.ETL_WRITE_CSV)
+        metrics (ETLRunMetrics): Métricas de la ejecución, opcional
+    
+    Returns:
+        tuple: (DataFrame limpio o None, Future con la ruta del CSV o None)
+    """
+    if write_csv is None:
+        write_csv = Config.ETL_WRITE_CSV
+
     try:
         print("\n🚀 Iniciando proceso ETL para datos Pokemon...")
         start_time = time.time()
@@ -15,17 +38,25 @@ def run_etl():
         # Extract
         print("\n📥 Fase de Extracción:")
         print(f"Leyendo datos desde: {Config.INPUT_PATH}")
+        if metrics:
+            metrics.start_phase('extract')
         extractor = Extract(Config.INPUT_PATH)
         df = extractor.extract_first_n_rows(50)  # Solo los primeros 50 registros
 
         if df is not None:
             print(f"✅ Datos extraídos exitosamente. Registros encontrados: {len(df)}")
+            if metrics:
+                metrics.end_phase('extract', rows_out=len(df))
+                metrics.start_phase('clean', rows_in=len(df))
 
             # Transform/Clean
             print("\n🔄 Fase de Limpieza y Transformación:")
             print("Limpiando y preparando los datos...")
             cleaner = Clean(df)
             df_clean = cleaner.clean_data()
+            if metrics:
+                metrics.end_phase('clean', rows_out=len(df_clean))
+                metrics.duplicates_removed = cleaner.duplicates_removed
             
             print("\n📊 Resumen de datos limpios:")
             print(f"- Total de registros: {len(df_clean)}")
@@ -33,35 +64,88 @@ def run_etl():
             print("\nPrimeros 5 registros:")
             print(df_clean.head())
 
-            # Load
-            print("\n📤 Fase de Carga:")
-            loader = Load(df_clean)
-            
-            # Guardar en CSV
-            print("\n💾 Guardando datos en CSV...")
-            csv_path = loader.to_csv(Config.OUTPUT_PATH)
+            # Load: el CSV es una salida secundaria en paralelo
+            csv_future = None
+            if write_csv:
+                print("\n💾 Guardando datos en CSV en segundo plano...")
+                loader = Load(df_clean)
+                
+                def write_csv_file():
+                    if metrics:
+                        metrics.start_phase('load', rows_in=len(df_clean))
+                    csv_path = loader.to_csv(Config.OUTPUT_PATH)
+                    if metrics:
+                        metrics.end_phase('load', rows_out=len(df_clean) if csv_path else 0)
+                        metrics.record_output(csv_path)
+                    return csv_path
+                
+                executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='csv-writer')
+                csv_future = executor.submit(write_csv_file)
+                executor.shutdown(wait=False)
             
             # Resumen final
             end_time = time.time()
             duration = round(end_time - start_time, 2)
-            print(f"\n✨ Proceso ETL completado exitosamente en {duration} segundos")
-            print(f"📁 CSV guardado en: {csv_path}")
+            print(f"\n✨ Extracción y limpieza completadas en {duration} segundos")
             
-            return csv_path
+            return df_clean, csv_future
 
         else:
             print("❌ Error: No se pudieron extraer los datos")
-            return None
+            return None, None
 
     except Exception as e:
         print(f"\n❌ Error en el proceso ETL: {str(e)}")
-        return None
+        return None, None
+
+def refresh_database(app, progress=None):
+    """
+    Ejecuta el ETL y carga el resultado a la base de datos en segundo plano.
+    Usa Config.WATCH_LOAD_MODE (por defecto 'merge') para que la recarga solo
+    escriba lo que cambió mientras la API sigue atendiendo con los datos actuales.
+    
+    Args:
+        app (Flask): Aplicación con la base de datos inicializada
+        progress (callable): Callback opcional progress(fase, progreso, **filas)
+        
+    Returns:
+        bool: True si la recarga terminó correctamente
+    """
+    if progress is None:
+        progress = lambda fase, progreso, **filas: None
+
+    metrics = ETLRunMetrics('main')
+    with app.app_context():
+        progress('etl', 0)
+        df_clean, csv_future = run_etl(metrics=metrics)
+        if df_clean is None:
+            metrics.finish(success=False, error='No se pudieron extraer o limpiar los datos')
+            return False
+
+        progress('db_load', 60, limpias=len(df_clean))
+        metrics.start_phase('db_load', rows_in=len(df_clean))
+        result = ETLService.load_pokemon_from_dataframe(df_clean, mode=Config.WATCH_LOAD_MODE)
+        if csv_future is not None:
+            csv_future.result()
+        if not result['success']:
+            metrics.finish(success=False, error=result.get('error'))
+            return False
+
+        metrics.end_phase('db_load', rows_out=result['created_count'] + result.get('updated_count', 0) +
+                          result.get('unchanged_count', 0))
+        metrics.finish(success=True)
+        progress('db_load', 100, creadas=result['created_count'],
+                 actualizadas=result.get('updated_count', 0),
+                 eliminadas=result.get('deleted_count', 0))
+        return True
 
 def create_app():
     app = Flask(__name__)
 
-    # Inicializar la base de datos
+    # Inicializar la base de datos, las réplicas de lectura y las particiones (si están configuradas)
     init_db(app)
+    ReadRouting.init_app(app)
+    Sharding.init_app(app)
 
     # Ruta de bienvenida
     @app.route('/')
@@ -75,7 +159,10 @@ def create_app():
                 "GET /api/pokemon/<id>": "Obtener un pokémon específico",
                 "POST /api/pokemon": "Crear un nuevo pokémon",
                 "PUT /api/pokemon/<id>": "Actualizar un pokémon existente",
-                "DELETE /api/pokemon/<id>": "Eliminar un pokémon"
+                "DELETE /api/pokemon/<id>": "Eliminar un pokémon",
+                "GET /api/etl/runs": "Historial de ejecuciones del ETL con métricas y tendencias",
+                "GET /api/pokemon/cache/stats": "Contadores de la caché de respuestas",
+                "GET /api/pokemon/export": "Exportar la tabla completa transmitida (JSON o NDJSON)"
             },
             "formato_json": {
                 "crear_actualizar": {
@@ -90,6 +177,20 @@ def create_app():
             }
         }), 200
 
+    # Historial de ejecuciones del ETL
+    @app.route('/api/etl/runs')
+    def get_etl_runs():
+        try:
+            limit = min(int(request.args.get('limit', 20)), 200)
+        except ValueError:
+            return jsonify({"error": "El parámetro 'limit' debe ser un número entero"}), 400
+
+        result = ETLRunService.get_run_history(limit, request.args.get('origen'))
+        if 'error' in result:
+            return jsonify(result), 500
+
+        return jsonify(result), 200
+
     # Registrar los blueprints
     app.register_blueprint(pokemon_blueprint, url_prefix='/api')
 
@@ -101,19 +202,45 @@ if __name__ == '__main__':
     
     with app.app_context():
         # Ejecutar el proceso ETL primero
-        csv_path = run_etl()
+        metrics = ETLRunMetrics('main')
+        df_clean, csv_future = run_etl(metrics=metrics)
+        result = None
         
-        if csv_path:
-            # Cargar datos a la base de datos
+        if df_clean is not None:
+            # Cargar el DataFrame limpio directamente a la base de datos
             print("\n🗄️ Cargando datos a la base de datos...")
-            result = ETLService.load_pokemon_from_csv(csv_path)
+            metrics.start_phase('db_load', rows_in=len(df_clean))
+            result = ETLService.load_pokemon_from_dataframe(df_clean)
             
             if result['success']:
+                metrics.end_phase('db_load', rows_out=result['created_count'])
                 print(f"✅ Base de datos cargada con {result['created_count']} Pokemon")
             else:
                 print(f"❌ Error al cargar base de datos: {result.get('error', 'Error desconocido')}")
         
+        if csv_future is not None:
+            csv_path = csv_future.result()
+            if csv_path:
+                print(f"📁 CSV guardado en: {csv_path}")
+        
+        if result is None:
+            metrics.finish(success=False, error='No se pudieron extraer o limpiar los datos')
+        else:
+            metrics.finish(success=result['success'], error=result.get('error'))
+        
         print("\n🚀 Iniciando servidor de la API...")
     
+    # Recargar automáticamente cuando cambie el archivo fuente. Con el recargador
+    # de Flask solo se vigila desde el proceso que atiende las peticiones
+    if Config.WATCH_SOURCE and os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        refresh_jobs = ETLJobRunner(lambda progress: refresh_database(app, progress))
+        watcher = SourceFileWatcher(
+            Config.INPUT_PATH,
+            on_change=refresh_jobs.submit,
+            poll_interval=Config.WATCH_POLL_INTERVAL,
+            debounce_seconds=Config.WATCH_DEBOUNCE_SECONDS,
+            min_interval=Config.WATCH_MIN_RELOAD_INTERVAL
+        ).start()
+    
     # Iniciar la API Flask
     app.run(debug=True)